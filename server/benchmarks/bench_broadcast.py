@@ -0,0 +1,173 @@
+"""
+Broadcast throughput of ``ConnectionManager`` at 1, 10 and 100 clients.
+
+Clients are null sockets (``send_text`` just counts), so the numbers are the
+server-side cost: serializing each message, queueing it per client and the
+writer tasks handing frames to the socket. Three message shapes:
+
+  caption       a final caption with usage fields, encoded per broadcast
+  audio_levels  the ~13 Hz meter frame — ``dict`` + encode vs ``FrameTemplate``
+  model_status  a status update — the full list encoded each time vs
+                ``broadcast_status`` with nothing changed (diffed, not sent)
+
+Each is run with JSON (stdlib encoder, then orjson when installed) and with
+each binary encoding that is installed (msgpack, cbor). ``msgs/s`` counts
+messages fully delivered to every client; ``broadcast µs`` is the time
+``broadcast`` itself holds the event loop; ``bytes`` is the frame size.
+
+Usage:
+    python benchmarks/bench_broadcast.py [--messages 2000] [--clients 1,10,100] [--json]
+        [--encodings json-stdlib,json-orjson,msgpack,cbor]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np  # noqa: E402
+
+from src.network import serialization  # noqa: E402
+from src.network.serialization import AUDIO_LEVELS, CODECS, JSON, Codec  # noqa: E402
+from src.network.ws_manager import ConnectionManager  # noqa: E402
+
+_CAPTION = {
+    "type": "caption", "text": "Bonjour tout le monde, comment allez-vous aujourd'hui ?",
+    "original": "Hello everyone, how are you today?", "is_final": True, "session_id": 3,
+    "trace_id": "a1b2c3-00002a",
+}
+_STATUS = {
+    "type": "model_status",
+    "models": [
+        {"name": name, "status": "ready", "ready": True, "message": f"{name} is ready.", "progress": 1.0,
+         "details": {"loading": False, "has_key": True}}
+        for name in ("riva-asr", "riva-nmt", "llama", "google_api", "google_translate", "mymemory", "whisper")
+    ] + [{"name": "gpu", "vram_used_mb": np.float32(1834.5), "vram_total_mb": np.int64(8192)}],
+}
+
+
+class _NullClient:
+    def __init__(self):
+        self.frames = 0
+        self.last_size = 0
+
+    async def send_text(self, text: str):
+        self.frames += 1
+        self.last_size = len(text.encode())
+
+    async def send_bytes(self, data: bytes):
+        self.frames += 1
+        self.last_size = len(data)
+
+
+def _levels(i: int):
+    return {"type": "audio_levels", "input_level": (i % 97) / 97, "output_level": (i % 89) / 89,
+            "input_peak": (i % 83) / 83, "output_peak": (i % 79) / 79}
+
+
+async def _case(clients: int, messages: int, send: Callable[[ConnectionManager, int], Any],
+                codec: Codec) -> Dict[str, float]:
+    manager = ConnectionManager(send_queue_max=messages + 1)
+    sockets = [_NullClient() for _ in range(clients)]
+    manager.active_connections.update(sockets)
+    for sock in sockets:
+        manager._client(sock).codec = codec
+    await send(manager, 0)  # create writer tasks outside the timed region
+    while any(s.frames < 1 for s in sockets):
+        await asyncio.sleep(0)
+    expected = [s.frames for s in sockets]
+
+    in_broadcast = 0.0
+    start = time.perf_counter()
+    for i in range(1, messages + 1):
+        t0 = time.perf_counter()
+        await send(manager, i)
+        in_broadcast += time.perf_counter() - t0
+        if i % 64 == 0:
+            await asyncio.sleep(0)  # let writers run, like the real loop between broadcasts
+    # audio_levels coalesces, so wait for queues to drain rather than a frame count
+    while any(c.queued for c in manager._clients.values()):
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    delivered = min(s.frames - e for s, e in zip(sockets, expected))
+    for client in list(manager._clients.values()):
+        client.close()
+    return {
+        "msgs_per_s": round(messages / elapsed),
+        "broadcast_us": round(in_broadcast / messages * 1e6, 2),
+        "delivered": delivered,
+        "bytes": sockets[0].last_size,
+    }
+
+
+def _cases() -> Dict[str, Callable[[ConnectionManager, int], Any]]:
+    async def caption(manager, i):
+        await manager.broadcast(_CAPTION)
+
+    async def levels_dict(manager, i):
+        await manager.broadcast(_levels(i))
+
+    async def levels_template(manager, i):
+        await manager.broadcast_template(AUDIO_LEVELS, (i % 97) / 97, (i % 89) / 89, (i % 83) / 83, (i % 79) / 79)
+
+    async def status_encode(manager, i):
+        await manager.broadcast(_STATUS)
+
+    class _Orchestrator:
+        def get_all_statuses(self):
+            return _STATUS["models"]
+
+    orchestrator = _Orchestrator()
+
+    async def status_cached(manager, i):
+        await manager.broadcast_status(orchestrator)
+
+    return {
+        "caption": caption,
+        "audio_levels dict": levels_dict,
+        "audio_levels template": levels_template,
+        "model_status encode": status_encode,
+        "model_status unchanged": status_cached,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--clients", default="1,10,100")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--encodings", default="json-stdlib,json-orjson,msgpack,cbor",
+                        help="uninstalled ones are skipped")
+    args = parser.parse_args()
+
+    counts = [int(c) for c in args.clients.split(",")]
+    has_orjson = serialization.HAS_ORJSON
+    available = {"json-stdlib": JSON, **({"json-orjson": JSON} if has_orjson else {}),
+                 **{name: codec for name, codec in CODECS.items() if codec.binary}}
+    encoders = [e for e in args.encodings.split(",") if e in available]
+    rows: List[Dict[str, Any]] = []
+    for encoder in encoders:
+        serialization.HAS_ORJSON = has_orjson and encoder != "json-stdlib"
+        for name, send in _cases().items():
+            for clients in counts:
+                result = asyncio.run(_case(clients, args.messages, send, available[encoder]))
+                rows.append({"encoder": encoder, "message": name, "clients": clients, **result})
+    serialization.HAS_ORJSON = has_orjson
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{args.messages} messages per case")
+    print(f"{'encoder':<12} {'message':<22} {'clients':>7} {'msgs/s':>10} {'broadcast µs':>13} {'bytes':>6}")
+    for r in rows:
+        print(f"{r['encoder']:<12} {r['message']:<22} {r['clients']:>7} {r['msgs_per_s']:>10} "
+              f"{r['broadcast_us']:>13} {r['bytes']:>6}")
+
+
+if __name__ == "__main__":
+    main()
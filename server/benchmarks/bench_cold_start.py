@@ -0,0 +1,155 @@
+"""
+Cold-start benchmark: interpreter launch to the first ``/status`` response.
+
+Starts the server in a fresh interpreter under ``python -X importtime``,
+polls ``GET /status`` until it answers, and reports the wall time plus the
+slowest imports. Heavy engine packages (riva.client, openai,
+deep_translator, speech_recognition, pysbd, torch, whisper) should not
+show up at all — they are imported when an engine is first built.
+
+``--target pipeline`` skips the HTTP server and times ``import src.pipeline``
+plus constructing an ``InferenceOrchestrator``. Use it where the server
+can't start, e.g. off Windows without PyAudioWPatch.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--target server|pipeline] [--runs 3] [--top 15] [--json]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Packages that must stay out of the startup path
+_DEFERRED = ("riva.client", "openai", "deep_translator", "speech_recognition", "pysbd", "torch", "whisper")
+
+_SERVER_BOOT = """
+import sys, uvicorn
+import flutter_server
+uvicorn.run(flutter_server.app, host="127.0.0.1", port=int(sys.argv[1]), log_level="warning")
+"""
+
+_PIPELINE_BOOT = """
+import time
+t0 = time.perf_counter()
+from src.pipeline import InferenceOrchestrator
+orch = InferenceOrchestrator()
+print(f"READY {(time.perf_counter() - t0) * 1000:.1f}", flush=True)
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _parse_importtime(stderr: str) -> dict:
+    """``{module: (self_us, cumulative_us)}`` from ``-X importtime`` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            _, self_us, cum_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+            modules[name] = (int(self_us), int(cum_us))
+        except ValueError:
+            continue
+    return modules
+
+
+def run_once(target: str, timeout_s: float = 60.0) -> dict:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    start = time.perf_counter()
+    if target == "server":
+        port = _free_port()
+        proc = subprocess.Popen(
+            [sys.executable, "-X", "importtime", "-c", _SERVER_BOOT, str(port)],
+            cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        ready_ms = None
+        try:
+            while time.perf_counter() - start < timeout_s and proc.poll() is None:
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}/status", timeout=0.5) as resp:
+                        if resp.status == 200:
+                            ready_ms = (time.perf_counter() - start) * 1000
+                            break
+                except OSError:
+                    time.sleep(0.02)
+        finally:
+            proc.terminate()
+            _, stderr = proc.communicate(timeout=10)
+        if ready_ms is None:
+            tail = [l for l in stderr.splitlines() if not l.startswith("import time:")][-3:]
+            raise RuntimeError("server never answered /status: " + " | ".join(tail))
+        construct_ms = None
+    else:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _PIPELINE_BOOT],
+            cwd=SERVER_DIR, env=env, capture_output=True, text=True, timeout=timeout_s,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.splitlines()[-1] if proc.stderr else "pipeline import failed")
+        ready_ms = (time.perf_counter() - start) * 1000
+        construct_ms = float(proc.stdout.split("READY", 1)[1])
+        stderr = proc.stderr
+
+    modules = _parse_importtime(stderr)
+    return {
+        "ready_ms": round(ready_ms, 1),
+        "in_process_ms": construct_ms,
+        "import_total_ms": round(sum(s for s, _ in modules.values()) / 1000, 1),
+        "modules": modules,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("server", "pipeline"), default="server")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    try:
+        runs = [run_once(args.target) for _ in range(args.runs)]
+    except RuntimeError as e:
+        sys.exit(f"[{args.target}] {e}")
+
+    last = runs[-1]["modules"]
+    top = sorted(last.items(), key=lambda kv: kv[1][1], reverse=True)[:args.top]
+    deferred_loaded = sorted(m for m in last if m in _DEFERRED)
+    result = {
+        "target": args.target,
+        "ready_ms": {"median": statistics.median(r["ready_ms"] for r in runs),
+                     "runs": [r["ready_ms"] for r in runs]},
+        "in_process_ms": runs[-1]["in_process_ms"],
+        "import_total_ms": runs[-1]["import_total_ms"],
+        "deferred_packages_imported": deferred_loaded,
+        "top_cumulative_ms": {name: round(cum / 1000, 1) for name, (_, cum) in top},
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    label = "first /status" if args.target == "server" else "process exit"
+    print(f"{args.target}: launch -> {label}: median {result['ready_ms']['median']} ms over {args.runs} runs")
+    if result["in_process_ms"] is not None:
+        print(f"  import + InferenceOrchestrator(): {result['in_process_ms']} ms")
+    print(f"  imports (self time): {result['import_total_ms']} ms")
+    print(f"  deferred packages imported at startup: {deferred_loaded or 'none'}")
+    print("  slowest imports (cumulative):")
+    for name, ms in result["top_cumulative_ms"].items():
+        print(f"    {ms:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Per-request latency of the REST translation path: a fresh urllib connection
+per caption (old MyMemory behaviour) vs the shared pooled keep-alive client.
+
+Runs against a local stub server. With ``--tls`` (needs the ``openssl`` CLI
+for a throwaway self-signed cert) every fresh connection also pays the TLS
+handshake, as it does against the real HTTPS endpoints. Loopback has no
+network RTT or DNS, so production gaps are larger still.
+
+Usage:
+    python benchmarks/bench_http_pool.py [--requests 200] [--tls] [--json]
+"""
+
+import argparse
+import json
+import os
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.http_client import SharedHTTPClient  # noqa: E402
+
+_BODY = json.dumps({"responseData": {"translatedText": "bonjour"}}).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_BODY)))
+        self.end_headers()
+        self.wfile.write(_BODY)
+
+
+def _summary(samples: list) -> dict:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": round(ordered[len(ordered) // 2], 3),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1], 3),
+    }
+
+
+def _self_signed_context(workdir: str) -> ssl.SSLContext:
+    cert, key = os.path.join(workdir, "cert.pem"), os.path.join(workdir, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-keyout", key, "-out", cert],
+        check=True, capture_output=True,
+    )
+    ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    ctx.load_cert_chain(cert, key)
+    return ctx
+
+
+def run(n: int, tls: bool = False) -> dict:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    client_ctx = None
+    if tls:
+        with tempfile.TemporaryDirectory() as workdir:
+            server.socket = _self_signed_context(workdir).wrap_socket(server.socket, server_side=True)
+        client_ctx = ssl.create_default_context()
+        client_ctx.check_hostname = False
+        client_ctx.verify_mode = ssl.CERT_NONE
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    url = f"{'https' if tls else 'http'}://{host}:{port}/get"
+    params = {"q": "hello", "langpair": "en|fr"}
+
+    fresh = []
+    for _ in range(n):
+        start = time.perf_counter()
+        with urllib.request.urlopen(f"{url}?{urllib.parse.urlencode(params)}", timeout=8, context=client_ctx) as resp:
+            json.loads(resp.read().decode())
+        fresh.append((time.perf_counter() - start) * 1000)
+
+    client = SharedHTTPClient(verify=client_ctx or True)
+    pooled = []
+    for _ in range(n):
+        start = time.perf_counter()
+        client.get(url, params=params).json()
+        pooled.append((time.perf_counter() - start) * 1000)
+    client.close()
+
+    server.shutdown()
+    server.server_close()
+    return {"requests": n, "tls": tls, "urlopen_per_request": _summary(fresh), "pooled_keepalive": _summary(pooled)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--tls", action="store_true", help="serve HTTPS with a throwaway self-signed cert")
+    parser.add_argument("--json", action="store_true", help="emit machine-readable JSON")
+    args = parser.parse_args()
+
+    results = run(args.requests, tls=args.tls)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for label in ("urlopen_per_request", "pooled_keepalive"):
+        r = results[label]
+        print(f"{label:>20}: mean {r['mean_ms']:.3f} ms | p50 {r['p50_ms']:.3f} ms | p95 {r['p95_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Prompt-token report for Llama translation with and without the rolling
+conversation window.
+
+Runs offline: builds the exact message lists LlamaModel would send for a
+sample caption stream and estimates tokens with ``estimate_tokens``. The
+"uncached" column counts only tokens past the byte-identical prefix shared
+with the previous request — what a server with prefix caching re-processes.
+
+Usage:
+    python benchmarks/bench_llama_context.py [--pairs 4] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.models.translation.context_window import ConversationWindow  # noqa: E402
+from src.models.translation.llama_translation import LlamaModel  # noqa: E402
+from src.utils.server_utils import estimate_tokens  # noqa: E402
+
+_CAPTIONS = [
+    ("so what we are going to do today", "donc ce que nous allons faire aujourd'hui"),
+    ("is look at how the pipeline", "c'est regarder comment le pipeline"),
+    ("handles captions that arrive", "gère les sous-titres qui arrivent"),
+    ("in the middle of a sentence", "au milieu d'une phrase"),
+    ("and whether the translation stays", "et si la traduction reste"),
+    ("consistent from one chunk to the next", "cohérente d'un morceau à l'autre"),
+    ("because the speaker keeps going", "parce que l'orateur continue"),
+    ("without really pausing at all", "sans vraiment faire de pause"),
+]
+
+
+def _messages_tokens(messages: list) -> int:
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+
+def _shared_prefix_tokens(prev: list, cur: list) -> int:
+    shared = 0
+    for a, b in zip(prev, cur):
+        if a != b:
+            break
+        shared += estimate_tokens(b["content"])
+    return shared
+
+
+def run(pairs: int, target_lang: str = "French") -> dict:
+    system = LlamaModel.build_system_prompt(target_lang)
+    results = {}
+    for label, window_pairs in (("isolated", 0), ("windowed", pairs)):
+        window = ConversationWindow(window_pairs, LlamaModel.CONTEXT_TOKEN_BUDGET)
+        prev: list = []
+        rows = []
+        for source, target in _CAPTIONS:
+            history = window.messages(target_lang) if window.enabled else []
+            messages = [{"role": "system", "content": system}, *history, {"role": "user", "content": source}]
+            total = _messages_tokens(messages)
+            uncached = total - _shared_prefix_tokens(prev, messages)
+            rows.append({"prompt_tokens": total, "uncached_tokens": uncached, "context_pairs": len(history) // 2})
+            window.add(source, target, target_lang)
+            prev = messages
+        n = len(rows)
+        results[label] = {
+            "captions": n,
+            "avg_prompt_tokens": round(sum(r["prompt_tokens"] for r in rows) / n, 1),
+            "avg_uncached_tokens": round(sum(r["uncached_tokens"] for r in rows) / n, 1),
+            "per_caption": rows,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=LlamaModel.CONTEXT_MAX_PAIRS)
+    parser.add_argument("--json", action="store_true", help="emit machine-readable JSON")
+    args = parser.parse_args()
+
+    results = run(args.pairs)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for label, r in results.items():
+        print(f"{label:>9}: avg prompt tokens {r['avg_prompt_tokens']:>6} | "
+              f"avg uncached (prefix-cache) {r['avg_uncached_tokens']:>6}")
+
+
+if __name__ == "__main__":
+    main()
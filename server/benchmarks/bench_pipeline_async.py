@@ -0,0 +1,175 @@
+"""
+Threaded vs asyncio pipeline: caption latency and context switches.
+
+Both runs use the same orchestrator with stub engines (fixed-latency ASR and
+translation, no network) and the same producer: a "capture" thread pushing
+chunks at a fixed interval. The threaded run goes through a poll thread
+that mirrors ``audio_poll_loop`` (10 ms polling — the real one lives in
+``src.audio``, which needs the Windows-only PyAudio build) and the worker
+threads; the async run pushes into ``AsyncPipeline`` on an event loop, as
+the server does with ``"pipeline": "async"``. Latency is measured from chunk push to caption
+callback; context switches come from ``getrusage`` over the whole run.
+
+Usage:
+    python benchmarks/bench_pipeline_async.py [--chunks 60] [--interval-ms 50]
+        [--asr-ms 30] [--translate-ms 20] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import queue
+import resource
+import statistics
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np  # noqa: E402
+
+from src.pipeline import AsyncPipeline, InferenceOrchestrator  # noqa: E402
+
+_MODEL_CLASSES = (
+    "RivaASRModel", "RivaNMTModel", "LlamaModel", "GoogleModel",
+    "GoogleCloudTranslationModel", "MyMemoryModel", "SpeechRecognitionModel", "WhisperModel",
+)
+_SESSION = {"source_lang": "en", "target_lang": "fr", "translation_model": "google",
+            "transcription_model": "online", "sentence_max_wait_ms": 0}
+
+
+def _make_orchestrator(asr_s: float, translate_s: float) -> InferenceOrchestrator:
+    patches = [patch(f"src.pipeline.orchestrator.{name}") for name in _MODEL_CLASSES]
+    for p in patches:
+        p.start()
+    try:
+        orch = InferenceOrchestrator()
+    finally:
+        for p in patches:
+            p.stop()
+
+    def _asr(chunk, config, trace=None):
+        time.sleep(asr_s)
+        return {"text": str(int(chunk[0])), "asr_stats": None, "created_at": time.time()}
+
+    def _translate(text, hint=None, on_partial=None, trace=None):
+        time.sleep(translate_s)
+        return text, {"engine": "stub"}
+
+    orch.asr_dispatcher.process_chunk = _asr
+    orch.translation_dispatcher.translate = _translate
+    return orch
+
+
+class _Recorder:
+    def __init__(self, n: int):
+        self.sent = {}
+        self.latencies = []
+        self.done = threading.Event()
+        self.n = n
+
+    def callback(self, text, is_error, is_final=True, original_text=None, usage_stats=None, trace=None):
+        if is_error or not is_final:
+            return
+        self.latencies.append((time.perf_counter() - self.sent[int(original_text)]) * 1000)
+        if len(self.latencies) >= self.n:
+            self.done.set()
+
+
+def _produce(push, rec: _Recorder, n: int, interval_s: float):
+    for i in range(n):
+        rec.sent[i] = time.perf_counter()
+        push(np.full(1600, i, dtype=np.int16))
+        time.sleep(interval_s)
+
+
+def _poll_loop(is_running, q: "queue.Queue", orch: InferenceOrchestrator):
+    """Same drain/sleep cadence as src.audio.handler.audio_poll_loop."""
+    while is_running():
+        try:
+            chunk, _sample_rate = q.get_nowait()
+        except queue.Empty:
+            time.sleep(0.01)
+            continue
+        orch.append_audio(chunk)
+
+
+def run_threaded(args) -> dict:
+    orch = _make_orchestrator(args.asr_ms / 1000, args.translate_ms / 1000)
+    rec = _Recorder(args.chunks)
+    capture_q: "queue.Queue" = queue.Queue()
+    running = [True]
+    orch.start_stream(16000, callback=rec.callback, **_SESSION)
+    threading.Thread(target=_poll_loop, args=(lambda: running[0], capture_q, orch), daemon=True).start()
+
+    before = resource.getrusage(resource.RUSAGE_SELF)
+    _produce(lambda c: capture_q.put((c, 16000)), rec, args.chunks, args.interval_ms / 1000)
+    rec.done.wait(30)
+    after = resource.getrusage(resource.RUSAGE_SELF)
+    running[0] = False
+    orch.stop_stream()
+    return _summary(rec, before, after)
+
+
+def run_async(args) -> dict:
+    orch = _make_orchestrator(args.asr_ms / 1000, args.translate_ms / 1000)
+    rec = _Recorder(args.chunks)
+
+    async def _main():
+        pipeline = AsyncPipeline(orch)
+        await pipeline.start(16000, callback=rec.callback, **_SESSION)
+        before = resource.getrusage(resource.RUSAGE_SELF)
+        producer = threading.Thread(
+            target=_produce, args=(pipeline.append_audio, rec, args.chunks, args.interval_ms / 1000), daemon=True
+        )
+        producer.start()
+        await asyncio.get_running_loop().run_in_executor(None, rec.done.wait, 30)
+        after = resource.getrusage(resource.RUSAGE_SELF)
+        pipeline.stop()
+        return before, after
+
+    before, after = asyncio.run(_main())
+    return _summary(rec, before, after)
+
+
+def _summary(rec: _Recorder, before, after) -> dict:
+    lat = sorted(rec.latencies)
+
+    def _pct(p):
+        return round(lat[min(len(lat) - 1, int(p / 100 * len(lat)))], 2) if lat else None
+
+    return {
+        "captions": len(lat),
+        "latency_ms": {"mean": round(statistics.fmean(lat), 2) if lat else None,
+                       "p50": _pct(50), "p95": _pct(95), "max": round(lat[-1], 2) if lat else None},
+        "voluntary_ctx_switches": after.ru_nvcsw - before.ru_nvcsw,
+        "involuntary_ctx_switches": after.ru_nivcsw - before.ru_nivcsw,
+        "cpu_s": round((after.ru_utime + after.ru_stime) - (before.ru_utime + before.ru_stime), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=60)
+    parser.add_argument("--interval-ms", type=float, default=50)
+    parser.add_argument("--asr-ms", type=float, default=30)
+    parser.add_argument("--translate-ms", type=float, default=20)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = {"threaded": run_threaded(args), "async": run_async(args)}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'pipeline':<10} {'captions':>8} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8} {'vol.cs':>8} {'invol.cs':>9} {'cpu_s':>7}")
+    for name, r in results.items():
+        lat = r["latency_ms"]
+        print(f"{name:<10} {r['captions']:>8} {lat['mean']:>8} {lat['p50']:>8} {lat['p95']:>8} {lat['max']:>8} "
+              f"{r['voluntary_ctx_switches']:>8} {r['involuntary_ctx_switches']:>9} {r['cpu_s']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,451 @@
+"""
+Offline end-to-end replay: WAV audio → captions, with stub engines.
+
+Each WAV file (16-bit PCM, any rate/channels) is read in 1024-frame blocks,
+paced at real time (``--speed``), and cut by the capture ``VadChunker``.
+The chunks then go through the real pipeline:
+``ASRDispatcher.process_chunk`` → sentence aggregator →
+``TranslationDispatcher.translate`` → ``caption_callback`` →
+``ConnectionManager`` with one recording client. Only the engines are
+stubs: ASR and translation sleep for a latency drawn from a seeded
+distribution and return deterministic text, so runs are repeatable and need
+no network or GPU.
+
+``--engines fake`` keeps the real Riva ASR / Riva NMT / Llama clients and
+points them at the servers from ``fake_engines.py``, started in-process.
+``--error-rate`` and ``--throttle-rate`` then exercise retries and the
+Riva → Llama fallback over real gRPC and HTTP.
+
+``--pipeline threaded`` uses the capture queue + ``audio_poll_loop`` +
+worker threads; ``--pipeline async`` pushes chunks into ``AsyncPipeline``
+the way ``"pipeline": "async"`` does.
+
+The report is one JSON document. It covers captions/s, caption latency from
+chunk flush to broadcast (p50/p95/p99), CPU seconds and RSS, plus the
+per-stage histograms from ``src.utils.metrics``. ``--out`` saves it.
+``--compare`` diffs against a saved report, for example from another
+commit, and exits non-zero on regressions beyond ``--tolerance``.
+
+Latency specs: ``fixed:MS``, ``uniform:LO,HI``, ``normal:MEAN,SD``,
+``lognormal:MEDIAN,SIGMA``.
+
+Usage:
+    python benchmarks/bench_replay.py [talk.wav ...] [--synthetic 30] [--speed 1.0]
+        [--pipeline threaded|async] [--asr-latency lognormal:250,0.4]
+        [--translate-latency lognormal:120,0.5] [--seed 1]
+        [--engines stub|fake] [--error-rate SERVICE=P] [--throttle-rate SERVICE=P]
+        [--out report.json] [--compare baseline.json] [--tolerance 0.1]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+import wave
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np  # noqa: E402
+
+from src.audio.chunker import VadChunker  # noqa: E402
+from src.audio.handler import audio_poll_loop, caption_callback  # noqa: E402
+from src.network.ws_manager import ConnectionManager  # noqa: E402
+from src.pipeline import AsyncPipeline, InferenceOrchestrator  # noqa: E402
+from src.utils.bounded_queue import BoundedQueue  # noqa: E402
+from src.utils.metrics import metrics, CAPTURE_ENQUEUE  # noqa: E402
+from src.utils.tracing import Trace, traces  # noqa: E402
+
+from fake_engines import SERVICES, FakeEngines, FaultProfile, LatencyDist, _per_service  # noqa: E402
+
+try:
+    import psutil
+except ImportError:  # RSS falls back to ru_maxrss only
+    psutil = None
+
+_MODEL_CLASSES = (
+    "RivaASRModel", "RivaNMTModel", "LlamaModel", "GoogleModel",
+    "GoogleCloudTranslationModel", "MyMemoryModel", "SpeechRecognitionModel", "WhisperModel",
+)
+_FRAMES = 1024
+_SYNTHETIC_RATE = 48000
+# Fields compared by --compare: (path, higher_is_better)
+_COMPARED = (
+    (("captions_per_s",), True),
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p95"), False),
+    (("latency_ms", "p99"), False),
+    (("cpu_s",), False),
+    (("peak_rss_mb",), False),
+)
+
+
+# ── Stub engines ─────────────────────────────────────────────────────────────
+
+class _StubEngine:
+    """Call counter + per-call RNG, so latency for call N doesn't depend on thread timing."""
+
+    def __init__(self, name: str, latency: LatencyDist, seed: int):
+        self.name = name
+        self.latency = latency
+        self.seed = seed
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _next(self) -> Tuple[int, float]:
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        delay = self.latency.sample(random.Random(self.seed * 1_000_003 + n))
+        time.sleep(delay)
+        return n, delay
+
+    def is_ready(self) -> bool:
+        return True
+
+
+class StubASR(_StubEngine):
+    """Stands in for ``SpeechRecognitionModel`` (the ``"online"`` transcription model)."""
+
+    def transcribe(self, audio_bytes: bytes, sample_rate: int, language: str = "auto"):
+        n, delay = self._next()
+        seconds = len(audio_bytes) / 2 / sample_rate
+        return f"Replay sentence number {n} lasting {seconds:.1f} seconds.", {
+            "engine": self.name, "latency_ms": int(delay * 1000), "input_tokens": 0, "output_tokens": 0,
+        }
+
+
+class StubTranslator(_StubEngine):
+    """Stands in for ``GoogleModel`` (the ``"google"`` translation model)."""
+
+    def translate(self, text: str, source: str, target: str):
+        _, delay = self._next()
+        return f"[{target}] {text}", {
+            "engine": self.name, "latency_ms": int(delay * 1000),
+            "input_tokens": len(text), "output_tokens": len(text) + 5,
+        }
+
+
+def _make_orchestrator(asr: StubASR, translator: StubTranslator) -> InferenceOrchestrator:
+    patches = [patch(f"src.pipeline.orchestrator.{name}") for name in _MODEL_CLASSES]
+    for p in patches:
+        p.start()
+    try:
+        orch = InferenceOrchestrator()
+    finally:
+        for p in patches:
+            p.stop()
+    orch.asr_dispatcher.google_free = asr
+    orch.translation_dispatcher.google_free = translator
+    return orch
+
+
+# ── Audio ────────────────────────────────────────────────────────────────────
+
+def read_wav(path: str) -> Tuple[np.ndarray, int]:
+    """Mono int16 samples and rate of a 16-bit PCM WAV file."""
+    with wave.open(path, "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM WAV is supported")
+        channels, rate = wf.getnchannels(), wf.getframerate()
+        samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return samples, rate
+
+
+def synthetic_speech(seconds: float, seed: int, rate: int = _SYNTHETIC_RATE) -> np.ndarray:
+    """Noise bursts of 1-4 s ("speech") separated by 0.3-1.5 s pauses."""
+    rng = np.random.default_rng(seed)
+    parts, total = [], 0
+    while total < seconds * rate:
+        speech = int(rng.uniform(1.0, 4.0) * rate)
+        pause = int(rng.uniform(0.3, 1.5) * rate)
+        parts.append((rng.standard_normal(speech) * rng.uniform(1500, 5000)).astype(np.int16))
+        parts.append((rng.standard_normal(pause) * 40).astype(np.int16))
+        total += speech + pause
+    return np.concatenate(parts)[: int(seconds * rate)]
+
+
+class _ReplayCapture:
+    """The parts of ``AudioCapture`` the pipeline touches: the capture queue or ``on_chunk``."""
+
+    def __init__(self, sample_rate: int = 16000):
+        self.sample_rate = sample_rate
+        self.audio_queue = BoundedQueue(16, on_wait=partial(metrics.observe, CAPTURE_ENQUEUE))
+        self.on_chunk = None
+        self.flushed: List[Trace] = []
+        self.flush_times: Dict[str, float] = {}
+
+    def emit(self, chunk_16k: np.ndarray):
+        trace = Trace()
+        self.flushed.append(trace)
+        self.flush_times[trace.trace_id] = time.perf_counter()
+        if self.on_chunk is not None:
+            self.on_chunk(chunk_16k, trace)
+        else:
+            self.audio_queue.put((chunk_16k, self.sample_rate, trace))
+
+    def get_audio_chunk(self):
+        try:
+            return self.audio_queue.get_nowait()
+        except Exception:
+            return None
+
+
+def _replay(capture: _ReplayCapture, sources: List[Tuple[np.ndarray, int]], speed: float, chunk_duration: float):
+    """Feed every source through a VadChunker at *speed* × real time."""
+    start = time.perf_counter()
+    played_s = 0.0
+    for samples, rate in sources:
+        chunker = VadChunker(rate, capture.sample_rate, chunk_duration=chunk_duration)
+        for offset in range(0, len(samples), _FRAMES):
+            frame = samples[offset:offset + _FRAMES]
+            played_s += len(frame) / rate
+            if speed > 0:
+                delay = start + played_s / speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            chunk = chunker.push(frame)
+            if chunk is not None:
+                capture.emit(chunk)
+        chunk = chunker.flush()
+        if chunk is not None:
+            capture.emit(chunk)
+
+
+# ── Run ──────────────────────────────────────────────────────────────────────
+
+class _RecordingClient:
+    """WebSocket stand-in registered with the real ``ConnectionManager``; records final captions."""
+
+    def __init__(self, flush_times: Dict[str, float]):
+        self.flush_times = flush_times
+        self.latencies_ms: List[float] = []
+        self.last_caption_at = 0.0
+
+    async def send_text(self, text: str):
+        now = time.perf_counter()
+        message = json.loads(text)
+        if message.get("type") != "caption" or not message.get("is_final"):
+            return
+        flushed = self.flush_times.get(message.get("trace_id", ""))
+        if flushed is not None:
+            self.latencies_ms.append((now - flushed) * 1000)
+        self.last_caption_at = now
+
+
+def _start_fake_engines(args) -> FakeEngines:
+    """Fake servers with the bench's latencies, and this process's engines pointed at them."""
+    errors = _per_service(args.error_rate, float)
+    throttles = _per_service(args.throttle_rate, float)
+    latency = {"riva_asr": args.asr_latency, "riva_nmt": args.translate_latency, "nim": args.translate_latency,
+               "google": args.translate_latency}
+    profiles = {
+        name: FaultProfile(latency.get(name, "fixed:0"), errors.get(name, 0.0), throttles.get(name, 0.0),
+                           seed=args.seed + i)
+        for i, name in enumerate(SERVICES)
+    }
+    engines = FakeEngines(profiles).start()
+    os.environ.update(engines.env())
+    return engines
+
+
+async def _run(args, sources: List[Tuple[np.ndarray, int]]) -> Dict[str, Any]:
+    fakes = None
+    if args.engines == "fake":
+        fakes = _start_fake_engines(args)
+        orch = InferenceOrchestrator(nvidia_api_key="fake-key")
+        asr_model, translation_model = "riva-asr", "riva-nmt"
+    else:
+        asr = StubASR("stub-asr", LatencyDist(args.asr_latency), args.seed)
+        translator = StubTranslator("stub-translate", LatencyDist(args.translate_latency), args.seed + 1)
+        orch = _make_orchestrator(asr, translator)
+        asr_model, translation_model = "online", "google"
+    capture = _ReplayCapture()
+    sink = _RecordingClient(capture.flush_times)
+    manager = ConnectionManager()
+    manager.active_connections.add(sink)
+    loop = asyncio.get_running_loop()
+    callback = partial(caption_callback, event_loop=loop, manager=manager, source_lang="en", target_lang="fr")
+    config = {
+        "session_id": 1, "source_lang": "en", "target_lang": "fr", "ai_engine": "google",
+        "transcription_model": asr_model, "translation_model": translation_model,
+        "sentence_max_wait_ms": args.sentence_wait_ms,
+    }
+
+    metrics.reset()
+    traces.clear()
+    running = [True]
+    pipeline = None
+    if args.pipeline == "async":
+        pipeline = AsyncPipeline(orch)
+        await pipeline.start(capture.sample_rate, callback=callback,
+                             source_lang="en", target_lang="fr", ai_engine="google",
+                             transcription_model=asr_model, translation_model=translation_model,
+                             sentence_max_wait_ms=args.sentence_wait_ms)
+        capture.on_chunk = pipeline.append_audio
+    else:
+        threading.Thread(
+            target=audio_poll_loop,
+            args=(1, lambda: running[0], capture, orch, lambda: config, callback),
+            daemon=True,
+        ).start()
+        while not orch.is_running:
+            await asyncio.sleep(0.005)
+
+    before = resource.getrusage(resource.RUSAGE_SELF)
+    started = time.perf_counter()
+    await loop.run_in_executor(None, _replay, capture, sources, args.speed, args.chunk_duration)
+    fed_at = time.perf_counter()
+
+    # Done once every flushed chunk's trace is closed (captioned, merged or dropped)
+    deadline = fed_at + args.drain_timeout
+    while time.perf_counter() < deadline and any(t.status == "open" for t in capture.flushed):
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)  # let the last broadcasts run
+    after = resource.getrusage(resource.RUSAGE_SELF)
+
+    running[0] = False
+    if pipeline is not None:
+        pipeline.stop()
+    else:
+        orch.stop_stream()
+    if fakes is not None:
+        engine_calls = {name: stats for name, stats in fakes.stats().items() if stats["requests"]}
+        fakes.stop()
+    else:
+        engine_calls = {"asr": asr.calls, "translation": translator.calls}
+
+    audio_s = sum(len(s) / r for s, r in sources)
+    elapsed = (sink.last_caption_at or time.perf_counter()) - started
+    outcomes: Dict[str, int] = {}
+    for t in capture.flushed:
+        outcomes[t.status] = outcomes.get(t.status, 0) + 1
+    return {
+        "audio_s": round(audio_s, 2),
+        "chunks": len(capture.flushed),
+        "chunk_outcomes": outcomes,
+        "captions": len(sink.latencies_ms),
+        "captions_per_s": round(len(sink.latencies_ms) / elapsed, 3) if elapsed > 0 else 0.0,
+        "wall_s": round(elapsed, 2),
+        "latency_ms": _percentiles(sink.latencies_ms),
+        "cpu_s": round((after.ru_utime + after.ru_stime) - (before.ru_utime + before.ru_stime), 3),
+        "rss_mb": round(psutil.Process().memory_info().rss / 2**20, 1) if psutil else None,
+        "peak_rss_mb": round(after.ru_maxrss / 1024, 1),  # ru_maxrss is KiB on Linux
+        "engine_calls": engine_calls,
+        "stages": metrics.snapshot(),
+    }
+
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"mean": None, "p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(values)
+
+    def _pct(p):
+        return round(ordered[min(len(ordered) - 1, int(math.ceil(p / 100 * len(ordered))) - 1)], 2)
+
+    return {"mean": round(sum(ordered) / len(ordered), 2), "p50": _pct(50), "p95": _pct(95),
+            "p99": _pct(99), "max": round(ordered[-1], 2)}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+# ── Compare ──────────────────────────────────────────────────────────────────
+
+def _lookup(results: Dict[str, Any], path: Tuple[str, ...]) -> Optional[float]:
+    value: Any = results
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value if isinstance(value, (int, float)) else None
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Print a delta table; return the metrics that regressed beyond *tolerance*."""
+    regressions = []
+    print(f"\nvs {baseline['meta'].get('commit') or 'baseline'} (tolerance {tolerance:.0%}):")
+    for path, higher_is_better in _COMPARED:
+        old, new = _lookup(baseline["results"], path), _lookup(report["results"], path)
+        name = ".".join(path)
+        if old is None or new is None or old == 0:
+            print(f"  {name:<16} {old!s:>10} -> {new!s:>10}")
+            continue
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+        flag = "  REGRESSION" if worse > tolerance else ""
+        if flag:
+            regressions.append(name)
+        print(f"  {name:<16} {old:>10} -> {new:>10}  ({change:+.1%}){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("wav", nargs="*", help="16-bit PCM WAV files, replayed back to back")
+    parser.add_argument("--synthetic", type=float, default=30.0,
+                        help="seconds of generated speech-like audio when no WAV is given")
+    parser.add_argument("--pipeline", choices=("threaded", "async"), default="threaded")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed (× real time, 0 = unpaced)")
+    parser.add_argument("--chunk-duration", type=float, default=3.0)
+    parser.add_argument("--sentence-wait-ms", type=int, default=0)
+    parser.add_argument("--asr-latency", default="lognormal:250,0.4")
+    parser.add_argument("--translate-latency", default="lognormal:120,0.5")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--engines", choices=("stub", "fake"), default="stub",
+                        help="in-process stub engines, or real clients against fake_engines.py servers")
+    parser.add_argument("--error-rate", action="append", metavar="SERVICE=P", help="--engines fake only")
+    parser.add_argument("--throttle-rate", action="append", metavar="SERVICE=P", help="--engines fake only")
+    parser.add_argument("--drain-timeout", type=float, default=30.0)
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline JSON report to diff against")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    sources = [read_wav(p) for p in args.wav] or [(synthetic_speech(args.synthetic, args.seed), _SYNTHETIC_RATE)]
+    results = asyncio.run(_run(args, sources))
+    report = {
+        "meta": {
+            "benchmark": "replay",
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "inputs": args.wav or [f"synthetic:{args.synthetic}s"],
+            "config": {k: getattr(args, k) for k in ("pipeline", "speed", "chunk_duration", "sentence_wait_ms",
+                                                       "asr_latency", "translate_latency", "seed",
+                                                       "engines", "error_rate", "throttle_rate")},
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""
+Local stand-ins for the remote engines, for offline load and fallback tests.
+
+One process serves:
+
+  gRPC   Riva ASR  (RivaSpeechRecognition/Recognize)
+         Riva NMT  (RivaTranslation/TranslateText)
+  HTTP   POST /v1/chat/completions      NIM Llama (OpenAI-compatible, streaming too)
+         GET  /m                        Google free web translate (HTML)
+         GET  /get                      MyMemory (JSON)
+         POST /speech-api/v2/recognize  Google web speech API (SpeechRecognition)
+         GET  /_stats                   per-service request / error / 429 counts
+         POST /_faults                  change fault profiles while running
+
+Each service has a ``FaultProfile``: a latency distribution (the same
+``fixed:MS``, ``uniform:LO,HI``, ``normal:MEAN,SD``, ``lognormal:MEDIAN,SIGMA``
+specs as ``bench_replay.py``), an error rate (HTTP 500 / gRPC UNAVAILABLE)
+and a throttle rate (HTTP 429 / gRPC RESOURCE_EXHAUSTED). Decisions are
+drawn from a per-request seeded RNG, so the N-th request to a service gets
+the same latency and fault on every run.
+
+Point the server at them with the environment variables it prints
+(see ``src/utils/endpoints.py``), then use any NVIDIA key, e.g.:
+
+    python benchmarks/fake_engines.py --latency riva_asr=lognormal:300,0.3 \\
+        --throttle-rate nim=0.2 --error-rate riva_nmt=0.05
+    curl -X POST localhost:8811/_faults -d '{"nim": {"throttle_rate": 0.5}}'
+
+Usage:
+    python benchmarks/fake_engines.py [--host 127.0.0.1] [--http-port 8811] [--grpc-port 8812]
+        [--latency SERVICE=SPEC ...] [--error-rate SERVICE=P ...] [--throttle-rate SERVICE=P ...]
+        [--seed 1]
+
+SERVICE is one of riva_asr, riva_nmt, nim, google, mymemory, google_asr, or ``all``.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.endpoints import (  # noqa: E402
+    GOOGLE, GOOGLE_ASR, MYMEMORY, NIM, RIVA, env_var,
+)
+
+SERVICES = ("riva_asr", "riva_nmt", "nim", "google", "mymemory", "google_asr")
+
+ERROR = "error"
+THROTTLE = "throttle"
+
+
+class LatencyDist:
+    """Seeded latency distribution parsed from a ``kind:params`` spec (milliseconds)."""
+
+    def __init__(self, spec: str):
+        kind, _, params = spec.partition(":")
+        self.spec = spec
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p]
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(self.params) != expected[kind]:
+            raise ValueError(f"bad latency spec {spec!r} (fixed:MS, uniform:LO,HI, normal:MEAN,SD, lognormal:MEDIAN,SIGMA)")
+
+    def sample(self, rng: random.Random) -> float:
+        """One latency in seconds."""
+        p = self.params
+        if self.kind == "fixed":
+            ms = p[0]
+        elif self.kind == "uniform":
+            ms = rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            ms = rng.gauss(p[0], p[1])
+        else:
+            ms = p[0] * math.exp(rng.gauss(0.0, p[1]))
+        return max(0.0, ms) / 1000
+
+
+class FaultProfile:
+    """Latency + error/429 rates for one service, with request counters. Thread-safe."""
+
+    def __init__(self, latency: str = "fixed:0", error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 seed: int = 1):
+        self.latency = LatencyDist(latency)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.seed = seed
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def update(self, latency: Optional[str] = None, error_rate: Optional[float] = None,
+               throttle_rate: Optional[float] = None):
+        with self._lock:
+            if latency is not None:
+                self.latency = LatencyDist(latency)
+            if error_rate is not None:
+                self.error_rate = float(error_rate)
+            if throttle_rate is not None:
+                self.throttle_rate = float(throttle_rate)
+
+    def next(self) -> Tuple[int, float, Optional[str]]:
+        """``(request_number, delay_s, fault)`` for the next request; fault is ERROR, THROTTLE or None."""
+        with self._lock:
+            self.requests += 1
+            n = self.requests
+            latency, error_rate, throttle_rate = self.latency, self.error_rate, self.throttle_rate
+        rng = random.Random(self.seed * 1_000_003 + n)
+        delay = latency.sample(rng)
+        roll = rng.random()
+        fault = THROTTLE if roll < throttle_rate else ERROR if roll < throttle_rate + error_rate else None
+        with self._lock:
+            if fault == THROTTLE:
+                self.throttled += 1
+            elif fault == ERROR:
+                self.errors += 1
+        return n, delay, fault
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests, "errors": self.errors, "throttled": self.throttled,
+                "latency": self.latency.spec, "error_rate": self.error_rate, "throttle_rate": self.throttle_rate,
+            }
+
+
+# ── gRPC (Riva) ──────────────────────────────────────────────────────────────
+
+def _grpc_servicers(profiles: Dict[str, FaultProfile]):
+    import grpc
+    from riva.client.proto import riva_asr_pb2, riva_asr_pb2_grpc, riva_nmt_pb2, riva_nmt_pb2_grpc
+
+    def _apply(profile: FaultProfile, context) -> int:
+        n, delay, fault = profile.next()
+        time.sleep(delay)
+        if fault == THROTTLE:
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "429 Too Many Requests (fake)")
+        if fault == ERROR:
+            context.abort(grpc.StatusCode.UNAVAILABLE, "503 Service Unavailable (fake)")
+        return n
+
+    class FakeASR(riva_asr_pb2_grpc.RivaSpeechRecognitionServicer):
+        def Recognize(self, request, context):
+            n = _apply(profiles["riva_asr"], context)
+            rate = request.config.sample_rate_hertz or 16000
+            seconds = len(request.audio) / 2 / rate
+            alt = riva_asr_pb2.SpeechRecognitionAlternative(
+                transcript=f"Fake Riva sentence number {n} lasting {seconds:.1f} seconds.", confidence=0.9,
+            )
+            result = riva_asr_pb2.SpeechRecognitionResult(alternatives=[alt], audio_processed=seconds)
+            return riva_asr_pb2.RecognizeResponse(results=[result])
+
+    class FakeNMT(riva_nmt_pb2_grpc.RivaTranslationServicer):
+        def TranslateText(self, request, context):
+            _apply(profiles["riva_nmt"], context)
+            return riva_nmt_pb2.TranslateTextResponse(translations=[
+                riva_nmt_pb2.Translation(text=f"[{request.target_language}] {text}", language=request.target_language)
+                for text in request.texts
+            ])
+
+    def _add(server):
+        riva_asr_pb2_grpc.add_RivaSpeechRecognitionServicer_to_server(FakeASR(), server)
+        riva_nmt_pb2_grpc.add_RivaTranslationServicer_to_server(FakeNMT(), server)
+
+    return _add
+
+
+# ── HTTP (NIM, Google, MyMemory, Google ASR) ─────────────────────────────────
+
+class _FakeHTTPHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoints
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def profiles(self) -> Dict[str, FaultProfile]:
+        return self.server.profiles  # type: ignore[attr-defined]
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _send(self, status: int, body: Any, ctype: str = "application/json", headers: Optional[dict] = None):
+        data = body if isinstance(body, bytes) else (body if isinstance(body, str) else json.dumps(body)).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _apply(self, service: str) -> Optional[int]:
+        """Sleep and maybe fail; the request number, or None when a fault response was sent."""
+        n, delay, fault = self.profiles[service].next()
+        time.sleep(delay)
+        if fault == THROTTLE:
+            self._send(429, {"error": {"message": "Too Many Requests (fake)", "type": "rate_limit"}},
+                       headers={"Retry-After": "1"})
+            return None
+        if fault == ERROR:
+            self._send(500, {"error": {"message": "Internal Server Error (fake)"}})
+            return None
+        return n
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path == "/_stats":
+            self._send(200, {name: p.stats() for name, p in self.profiles.items()})
+        elif url.path == "/get":
+            if self._apply("mymemory") is not None:
+                src, _, tgt = query.get("langpair", "en|fr").partition("|")
+                self._send(200, {"responseData": {"translatedText": f"[{tgt}] {query.get('q', '')}"},
+                                 "responseStatus": 200})
+        elif url.path == "/m":
+            if self._apply("google") is not None:
+                self._send(200, f'<html><div class="result-container">[{query.get("tl", "")}] '
+                                f'{query.get("q", "")}</div></html>', "text/html; charset=utf-8")
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        body = self._body()
+        if url.path == "/_faults":
+            try:
+                for name, changes in json.loads(body or b"{}").items():
+                    for profile in (self.profiles.values() if name == "all" else [self.profiles[name]]):
+                        profile.update(**changes)
+            except (KeyError, TypeError, ValueError) as e:
+                self._send(400, {"error": str(e)})
+                return
+            self._send(200, {name: p.stats() for name, p in self.profiles.items()})
+        elif url.path.endswith("/chat/completions"):
+            self._chat(json.loads(body))
+        elif url.path == "/speech-api/v2/recognize":
+            n = self._apply("google_asr")
+            if n is not None:
+                # One JSON object per line; the first is an empty interim result, like Google's
+                result = {"result": [{"alternative": [{"transcript": f"Fake Google sentence number {n}",
+                                                        "confidence": 0.9}], "final": True}], "result_index": 0}
+                self._send(200, '{"result":[]}\n' + json.dumps(result) + "\n", "application/json; charset=utf-8")
+        else:
+            self._send(404, {"error": "not found"})
+
+    def _chat(self, request: dict):
+        n = self._apply("nim")
+        if n is None:
+            return
+        user = next((m["content"] for m in reversed(request.get("messages", [])) if m.get("role") == "user"), "")
+        content = f"[llama] {user}"
+        usage = {"prompt_tokens": sum(len(m.get("content", "")) // 4 for m in request.get("messages", [])),
+                 "completion_tokens": len(content) // 4}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        base = {"id": f"cmpl-{n}", "created": int(time.time()), "model": request.get("model", "")}
+        if not request.get("stream"):
+            self._send(200, {**base, "object": "chat.completion", "usage": usage, "choices": [
+                {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}]})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        chunk = {**base, "object": "chat.completion.chunk"}
+        for word in content.split(" "):
+            delta = {"index": 0, "delta": {"content": word + " "}, "finish_reason": None}
+            self.wfile.write(f"data: {json.dumps({**chunk, 'choices': [delta]})}\n\n".encode())
+            self.wfile.flush()
+        if (request.get("stream_options") or {}).get("include_usage"):
+            self.wfile.write(f"data: {json.dumps({**chunk, 'choices': [], 'usage': usage})}\n\n".encode())
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+# ── Both servers ─────────────────────────────────────────────────────────────
+
+class FakeEngines:
+    """gRPC + HTTP fake engine servers sharing one set of fault profiles."""
+
+    def __init__(self, profiles: Optional[Dict[str, FaultProfile]] = None, host: str = "127.0.0.1",
+                 http_port: int = 0, grpc_port: int = 0, grpc_workers: int = 32):
+        self.profiles = {name: FaultProfile() for name in SERVICES}
+        self.profiles.update(profiles or {})
+        self.host = host
+        self._http = ThreadingHTTPServer((host, http_port), _FakeHTTPHandler)
+        self._http.daemon_threads = True
+        self._http.profiles = self.profiles  # type: ignore[attr-defined]
+        self.http_port = self._http.server_address[1]
+
+        import grpc
+        self._grpc = grpc.server(ThreadPoolExecutor(max_workers=grpc_workers))
+        _grpc_servicers(self.profiles)(self._grpc)
+        self.grpc_port = self._grpc.add_insecure_port(f"{host}:{grpc_port}")
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "FakeEngines":
+        self._grpc.start()
+        self._thread = threading.Thread(target=self._http.serve_forever, daemon=True, name="FakeEnginesHTTP")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._http.shutdown()
+        self._http.server_close()
+        self._grpc.stop(grace=None)
+
+    def env(self) -> Dict[str, str]:
+        """Endpoint overrides pointing the server's engines here."""
+        http = f"http://{self.host}:{self.http_port}"
+        return {
+            env_var(RIVA): f"grpc://{self.host}:{self.grpc_port}",
+            env_var(NIM): f"{http}/v1",
+            env_var(GOOGLE): f"{http}/m",
+            env_var(MYMEMORY): f"{http}/get",
+            env_var(GOOGLE_ASR): f"{http}/speech-api/v2/recognize",
+        }
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: p.stats() for name, p in self.profiles.items()}
+
+
+def _per_service(values, cast) -> Dict[str, Any]:
+    """``["nim=0.2", "all=0.01"]`` → ``{"nim": 0.2, ...}``; ``all`` applies first, then specific ones."""
+    out: Dict[str, Any] = {}
+    for item in sorted(values or [], key=lambda v: not v.startswith("all=")):
+        name, _, value = item.partition("=")
+        names = SERVICES if name == "all" else [name]
+        if any(n not in SERVICES for n in names) or not value:
+            raise SystemExit(f"bad value {item!r}: expected SERVICE=VALUE with SERVICE in {', '.join(SERVICES)}, all")
+        for n in names:
+            out[n] = cast(value)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--http-port", type=int, default=8811)
+    parser.add_argument("--grpc-port", type=int, default=8812)
+    parser.add_argument("--latency", action="append", metavar="SERVICE=SPEC")
+    parser.add_argument("--error-rate", action="append", metavar="SERVICE=P")
+    parser.add_argument("--throttle-rate", action="append", metavar="SERVICE=P")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    latency = _per_service(args.latency, str)
+    errors = _per_service(args.error_rate, float)
+    throttles = _per_service(args.throttle_rate, float)
+    profiles = {
+        name: FaultProfile(latency.get(name, "fixed:0"), errors.get(name, 0.0), throttles.get(name, 0.0),
+                           seed=args.seed + i)
+        for i, name in enumerate(SERVICES)
+    }
+    engines = FakeEngines(profiles, args.host, args.http_port, args.grpc_port).start()
+    print("Fake engines running. Start the server with:")
+    for key, value in engines.env().items():
+        print(f"  {key}={value}")
+    print(f"Stats: GET http://{args.host}:{engines.http_port}/_stats")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(json.dumps(engines.stats(), indent=2))
+        engines.stop()
+
+
+if __name__ == "__main__":
+    main()
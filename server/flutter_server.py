@@ -4,17 +4,23 @@ import asyncio
 import os
 import sys
 import logging
-import json
 import uvicorn
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
+from typing import Optional
 
 # Internal imports
 from src.utils.server_utils import kill_other_instances, setup_logging
+from src.utils.http_client import close_http_client
+from src.utils.metrics import metrics
+from src.utils.tracing import traces
+from src.utils.system_probe import system_probe
 from src.network.ws_manager import ConnectionManager
+from src.network.serialization import available_encodings
 from src.network.router import CommandRouter
-from src.network.handlers import ServerContext, SessionHandler, ConfigHandler, DeviceHandler, StatusHandler
+from src.network.handlers import ServerContext, SessionHandler, ConfigHandler, DeviceHandler, StatusHandler, IngestHandler, JobHandler
 
 # --- Setup Logging ---
 def get_log_dir():
@@ -40,6 +46,8 @@ session_h = SessionHandler(ctx)
 config_h = ConfigHandler(ctx)
 device_h = DeviceHandler(ctx)
 status_h = StatusHandler(ctx)
+ingest_h = IngestHandler(ctx)
+job_h = JobHandler(ctx)
 
 # Register Commands
 router.register("start", session_h.start)
@@ -48,13 +56,23 @@ router.register("settings_update", config_h.update_settings)
 router.register("volume_update", config_h.update_volume)
 router.register("list_devices", device_h.list_devices)
 router.register("reset_session", status_h.reset_session)
+router.register("open_pipeline", session_h.open_pipeline)
+router.register("close_pipeline", session_h.close_pipeline)
+router.register("set_encoding", manager.set_encoding)
+router.register("get_model_status", status_h.send_model_status)
+router.register("set_audio_levels_mode", manager.set_audio_levels_mode)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Server starting up...")
     # Any boot-time logic (e.g. killing instances) happens in __main__
+    system_probe.start()
     yield
     logger.info("Server shutting down...")
+    system_probe.stop()
+    ctx.jobs.shutdown()
+    ctx.sessions.close_all()
+    close_http_client()
 
 app = FastAPI(lifespan=lifespan)
 app.add_middleware(
@@ -79,37 +97,97 @@ async def devices():
     """Returns audio devices."""
     return await device_h.get_device_list()
 
+@app.get("/sessions")
+async def sessions():
+    """Extra concurrent pipelines and shared model reference counts."""
+    return ctx.sessions.get_status()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Per-stage latency histograms in Prometheus text format."""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/traces/recent")
+async def recent_traces(limit: int = 50, status: Optional[str] = None):
+    """Newest finished per-chunk traces (spans from capture flush to broadcast)."""
+    return {"traces": traces.recent(max(1, min(limit, 256)), status)}
+
+@app.get("/debug/profile")
+async def debug_profile(seconds: float = 5.0, interval_ms: float = 5.0, threads: str = "",
+                        idle: bool = True, format: str = "collapsed"):
+    """Stack samples of all threads (opt-in via OMNI_BRIDGE_PROFILING=true)."""
+    return await status_h.get_profile(seconds, interval_ms, threads, idle, format)
+
 @app.post("/whisper/unload")
 async def whisper_unload():
     """Unload Whisper to save memory."""
     return await status_h.whisper_unload()
 
+@app.post("/jobs")
+async def create_job(request: Request):
+    """Transcribe/translate an uploaded WAV file (request body) faster than real time."""
+    return await job_h.create_job(request)
+
+@app.get("/jobs")
+async def list_jobs():
+    """Queued, running and recently finished file jobs."""
+    return ctx.jobs.get_status()
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job status and progress."""
+    return await job_h.get_job(job_id)
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str, format: str = "json"):
+    """Finished job as SRT, WebVTT or JSON."""
+    return await job_h.get_result(job_id, format)
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job."""
+    return await job_h.cancel_job(job_id)
+
+@app.websocket("/ingest")
+async def ingest_ws(websocket: WebSocket):
+    """Audio from a thin client for a session started with audio_source "remote"."""
+    await ingest_h.serve(websocket)
+
 @app.websocket("/captions")
 async def captions_ws(websocket: WebSocket):
     logger.info(f"New WebSocket connection attempt from {websocket.client}")
-    await manager.connect(websocket)
+    await manager.connect(websocket, encoding=websocket.query_params.get("encoding"))
     logger.info(f"WebSocket connection accepted. Total active: {len(manager.active_connections)}")
     # Capabilities Handshake
     if ctx.orchestrator:
         caps = ctx.orchestrator.get_capabilities()
-        await websocket.send_text(json.dumps({"type": "capabilities", "capabilities": caps}))
-        await manager.broadcast_status(ctx.orchestrator)
+        await manager.send(websocket, {"type": "capabilities", "capabilities": caps,
+                                       "encodings": available_encodings(),
+                                       "encoding": manager.codec_for(websocket).name})
+        await manager.send_status(websocket, ctx.orchestrator)
+        # Build the remaining engines in the background, once per handshake (no-op when all are built)
+        ctx.orchestrator.prewarm_engines()
     
     try:
         while True:
-            data = await websocket.receive_text()
-            await router.handle(websocket, data)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            data = frame["text"] if frame.get("text") is not None else frame.get("bytes")
+            await router.handle(websocket, data, manager.codec_for(websocket))
     except WebSocketDisconnect:
         await manager.disconnect(websocket)
         if not manager.active_connections:
             logger.info("Last client disconnected. Stopping session...")
             await session_h.stop(None, {})
+            ctx.sessions.close_all()
     except Exception as e:
         logger.error(f"WebSocket Error: {e}")
         await manager.disconnect(websocket)
         if not manager.active_connections:
             logger.info("Last client disconnected due to error. Stopping session...")
             await session_h.stop(None, {})
+            ctx.sessions.close_all()
 
 if __name__ == "__main__":
     kill_other_instances()
@@ -1 +1,3 @@
 from .asr_dispatcher import ASRDispatcher
+from .transcript_dedup import TranscriptDedup
+from .language_tracker import LanguageTracker
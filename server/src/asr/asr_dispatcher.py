@@ -1,12 +1,16 @@
 import logging
 import time
 import numpy as np
-import pysbd
 from typing import Any, Dict, Optional, Tuple
 
 from src.models.asr.riva_asr import RivaASRModel
 from src.models.asr.whisper_asr import WhisperModel
 from src.models.asr.local_asr import SpeechRecognitionModel
+from src.utils.language_support import make_segmenter
+from src.utils.metrics import metrics, ASR_INFERENCE
+from src.utils.tracing import Trace
+from .language_tracker import LanguageTracker
+from .transcript_dedup import TranscriptDedup
 
 class ASRDispatcher:
     """
@@ -27,17 +31,28 @@ class ASRDispatcher:
         self.transcription_model = "online"
         self.source_lang = "auto"
         
-        self.seg = pysbd.Segmenter(language="en", clean=False)
-        self._last_transcript: Optional[str] = None
-        self._last_transcript_time: float = 0.0
-        self._DEDUP_WINDOW_S = 6.0
+        self._seg: Optional[Tuple[str, Any]] = None  # (language, pysbd segmenter), built on first transcript
+        # Drops near-repeats of recent transcripts, trims overlap with the previous one
+        self.dedup = TranscriptDedup()
+        # With source_lang="auto": locks onto the session's dominant detected language
+        self.language = LanguageTracker()
         self._ASR_RMS_THRESHOLD = 120
 
-    def process_chunk(self, chunk: Any, config: Any) -> Optional[Dict[str, Any]]:
+    @property
+    def seg(self):
+        lang = self.language.locked or self.source_lang
+        if self._seg is None or self._seg[0] != lang:
+            self._seg = (lang, make_segmenter(lang))
+        return self._seg[1]
+
+    def process_chunk(self, chunk: Any, config: Any, trace: Optional[Trace] = None) -> Optional[Dict[str, Any]]:
         """
         Process a single audio chunk and return transcription data if successful.
-        chunk can be bytes or np.ndarray.
+        chunk can be bytes or np.ndarray. *trace* (started at capture flush) gets
+        the queue-wait and ASR spans and rides along in the result.
         """
+        if trace is not None:
+            trace.step("asr_queue_wait")
         # Convert bytes to numpy if needed
         if isinstance(chunk, bytes):
             audio_array = np.frombuffer(chunk, dtype=np.int16)
@@ -45,34 +60,54 @@ class ASRDispatcher:
             audio_array = chunk
 
         if audio_array.size == 0:
-            return None
+            return _drop(trace, "empty")
 
         chunk_rms = int(np.sqrt(np.mean(audio_array.astype(np.float32) ** 2)))
         if chunk_rms < self._ASR_RMS_THRESHOLD:
-            return None
+            return _drop(trace, "silence")
+
+        # Riva's language is fixed by the session config; the others take one per call
+        auto = self.source_lang == "auto"
+        forced_lang = self.language.language_for_chunk() if auto and self.transcription_model != "riva-asr" else None
 
-        transcript, asr_stats = self._perform_asr(audio_array, config)
+        start = time.perf_counter()
+        transcript, asr_stats = self._perform_asr(audio_array, config, forced_lang or self.source_lang)
+        metrics.observe(ASR_INFERENCE, time.perf_counter() - start, self.transcription_model)
+        if trace is not None:
+            trace.step("asr", engine=self.transcription_model)
+
+        if transcript and auto and asr_stats is not None:
+            self._track_language(asr_stats, forced_lang)
 
         if transcript:
             cleaned = self._clean_stutters(transcript)
-            now = time.monotonic()
-
-            if cleaned == self._last_transcript and (now - self._last_transcript_time) < self._DEDUP_WINDOW_S:
+            deduped = self.dedup.filter(cleaned)
+            if deduped is None:
                 logging.debug(f"[ASRDispatcher] Duplicate suppressed: {cleaned!r}")
-                return None
-            
-            self._last_transcript = cleaned
-            self._last_transcript_time = now
+                return _drop(trace, "duplicate")
+            if deduped != cleaned:
+                logging.debug(f"[ASRDispatcher] Overlap trimmed: {cleaned!r} -> {deduped!r}")
+                cleaned = deduped
 
             return {
                 "text": cleaned,
                 "asr_stats": asr_stats,
-                "created_at": time.time()
+                "created_at": time.time(),
+                "trace": trace,
             }
-        return None
+        return _drop(trace, "no_transcript")
+
+    def _track_language(self, asr_stats: Dict[str, Any], forced_lang: Optional[str]):
+        """Feed a detected language to the tracker; once locked, it's the translation hint."""
+        if forced_lang is None:
+            self.language.observe(asr_stats.get("detected_lang"), asr_stats.get("confidence"))
+        locked = self.language.locked
+        if locked:
+            asr_stats["detected_lang"] = locked
+            asr_stats["lang_locked"] = True
 
-    def _perform_asr(self, chunk: np.ndarray, config: Any) -> Tuple[Optional[str], Optional[Dict]]:
-        """Dispatcher for different ASR models."""
+    def _perform_asr(self, chunk: np.ndarray, config: Any, lang: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """Dispatcher for different ASR models. *lang* is "auto" or the language to transcribe in."""
         model = self.transcription_model
         audio_bytes = chunk.tobytes()
         try:
@@ -80,10 +115,10 @@ class ASRDispatcher:
                 return self.riva.transcribe(audio_bytes, config)
             
             if model.startswith("whisper"):
-                return self.whisper.transcribe(audio_bytes, self.sample_rate, self.source_lang)
+                return self.whisper.transcribe(audio_bytes, self.sample_rate, lang)
 
             # Default: Local/Google Online via SpeechRecognition
-            return self.google_free.transcribe(audio_bytes, self.sample_rate, self.source_lang)
+            return self.google_free.transcribe(audio_bytes, self.sample_rate, lang)
         except Exception as e:
             logging.error(f"[ASRDispatcher] ASR Error ({model}): {e}")
             return None, None
@@ -109,3 +144,9 @@ class ASRDispatcher:
         except Exception:
             return deduped_text
 
+
+def _drop(trace: Optional[Trace], reason: str) -> None:
+    """Close the trace of a chunk that produced no transcript."""
+    if trace is not None:
+        trace.finish(reason)
+    return None
@@ -0,0 +1,144 @@
+"""
+language_tracker.py — Session-level spoken-language lock for ``source_lang="auto"``.
+
+In auto-detect mode, Whisper runs its language-detection pass on every
+chunk. Each caption's language is decided again in translation as well:
+from the ASR hint, or from ``_detect_lang_from_script``. A speaker rarely
+switches language between chunks. ``LanguageTracker`` collects the languages
+ASR reports, each weighted by confidence where the engine gives one, over
+the last ``window`` chunks:
+
+  - It locks onto a language once it has been detected in at least
+    ``lock_after`` of those chunks and holds ``lock_share`` of their weight. Locked
+    chunks are transcribed with that language (no detection pass), and it is
+    the source language for translation.
+  - Every ``recheck_every``-th chunk still runs detection, so a locked session
+    keeps collecting evidence; after a disagreeing one, the next chunk does
+    too. The language returned by a forced chunk is only the forced one
+    echoed back, so it is not counted.
+  - It unlocks when the last ``unlock_after`` observations agree on another
+    language, or when the locked language falls below ``unlock_share`` of
+    the window. Observations of the old language are dropped on unlock, so
+    the new one can lock after ``lock_after`` chunks.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+_WINDOW = 8
+_LOCK_AFTER = 3
+_LOCK_SHARE = 0.75
+_UNLOCK_AFTER = 2
+_UNLOCK_SHARE = 0.5
+_RECHECK_EVERY = 5
+
+
+def normalize_lang(lang: Optional[str]) -> Optional[str]:
+    """``"en-US"`` → ``"en"``; None for empty / ``"multi"`` / ``"auto"``."""
+    if not lang:
+        return None
+    code = str(lang).split("-")[0].lower().strip()
+    return None if code in ("", "multi", "auto") else code
+
+
+class LanguageTracker:
+    """Locks onto a session's dominant detected language. Thread-safe."""
+
+    def __init__(self, window: int = _WINDOW, lock_after: int = _LOCK_AFTER,
+                 lock_share: float = _LOCK_SHARE, unlock_after: int = _UNLOCK_AFTER,
+                 unlock_share: float = _UNLOCK_SHARE, recheck_every: int = _RECHECK_EVERY):
+        self.lock_after = max(1, lock_after)
+        self.lock_share = lock_share
+        self.unlock_after = max(1, unlock_after)
+        self.unlock_share = unlock_share
+        self.recheck_every = recheck_every
+        self._history: Deque[Tuple[str, float]] = deque(maxlen=max(window, self.lock_after))
+        self._locked: Optional[str] = None
+        self._since_check = 0
+        self._lock = threading.Lock()
+        self.locks = 0
+        self.unlocks = 0
+        self.forced_chunks = 0
+
+    @property
+    def locked(self) -> Optional[str]:
+        return self._locked
+
+    def language_for_chunk(self) -> Optional[str]:
+        """Language to transcribe the next chunk with, or None to let ASR detect it."""
+        with self._lock:
+            if self._locked is None:
+                return None
+            self._since_check += 1
+            if self.recheck_every > 0 and self._since_check >= self.recheck_every:
+                self._since_check = 0
+                return None
+            self.forced_chunks += 1
+            return self._locked
+
+    def observe(self, lang: Optional[str], confidence: Optional[float] = None) -> Optional[str]:
+        """One detected language (weight: *confidence*, 1.0 if not given). Returns the locked language."""
+        lang = normalize_lang(lang)
+        if lang is None:
+            return self._locked
+        weight = 1.0 if confidence is None or confidence <= 0 else min(float(confidence), 1.0)
+        with self._lock:
+            self._history.append((lang, weight))
+            if self._locked is not None and lang != self._locked:
+                self._since_check = self.recheck_every  # disagreement: detect the next chunk too
+            if self._locked is not None and self._should_unlock():
+                self._history = deque(((l, w) for l, w in self._history if l != self._locked),
+                                      maxlen=self._history.maxlen)
+                self._locked = None
+                self.unlocks += 1
+            if self._locked is None:
+                best, share = self._dominant()
+                if best is not None and share >= self.lock_share and self._count(best) >= self.lock_after:
+                    self._locked = best
+                    self._since_check = 0
+                    self.locks += 1
+            return self._locked
+
+    def reset(self):
+        with self._lock:
+            self._history.clear()
+            self._locked = None
+            self._since_check = 0
+            self.locks = self.unlocks = self.forced_chunks = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            best, share = self._dominant()
+            return {
+                "locked": self._locked,
+                "dominant": best,
+                "share": round(share, 2),
+                "observations": len(self._history),
+                "locks": self.locks,
+                "unlocks": self.unlocks,
+                "forced_chunks": self.forced_chunks,
+            }
+
+    def _dominant(self) -> Tuple[Optional[str], float]:
+        weights: Dict[str, float] = {}
+        for lang, weight in self._history:
+            weights[lang] = weights.get(lang, 0.0) + weight
+        total = sum(weights.values())
+        if not total:
+            return None, 0.0
+        best = max(weights, key=weights.__getitem__)
+        return best, weights[best] / total
+
+    def _count(self, lang: str) -> int:
+        return sum(1 for l, _ in self._history if l == lang)
+
+    def _share(self, lang: str) -> float:
+        total = sum(w for _, w in self._history)
+        return sum(w for l, w in self._history if l == lang) / total if total else 0.0
+
+    def _should_unlock(self) -> bool:
+        recent = [lang for lang, _ in list(self._history)[-self.unlock_after:]]
+        if len(recent) == self.unlock_after and len(set(recent)) == 1 and recent[0] != self._locked:
+            return True
+        return self._share(self._locked) < self.unlock_share  # type: ignore[arg-type]
@@ -0,0 +1,140 @@
+"""
+transcript_dedup.py — Near-duplicate and overlapping transcripts, caught before translation.
+
+Consecutive chunks often transcribe the same speech twice: a word said
+across a chunk boundary lands in both, and a short utterance can come back
+from the next chunk as well, re-punctuated or with one word different. An
+exact-match check catches neither, and each repeat is translated and billed
+again. ``TranscriptDedup`` compares words case- and punctuation-insensitively
+and keeps the last few seconds of transcripts in a bounded index:
+
+  - Every transcript's word ``shingle``-grams (word trigrams by default) are
+    counted in one index. It holds at most ``max_entries`` transcripts from
+    the last ``window_s`` seconds; older ones are evicted and their shingles
+    removed. If at least ``near_duplicate`` of a new transcript's shingles are
+    already indexed, it repeats what was just said and is dropped. Transcripts
+    shorter than one shingle are dropped only as exact repeats.
+  - Otherwise, if the previous transcript ends with the words this one starts
+    with (at least ``min_overlap_words``), that prefix is cut off. Only the new
+    part is translated.
+
+``window_s = 0`` turns it off. Batch jobs do that: their segments don't
+overlap and finish out of order.
+"""
+
+import re
+import threading
+import time
+from collections import Counter, deque
+from typing import Deque, FrozenSet, List, Optional, Tuple
+
+_WINDOW_S = 6.0
+_MAX_ENTRIES = 8
+_SHINGLE = 3
+_NEAR_DUPLICATE = 0.8
+_MIN_OVERLAP_WORDS = 2
+
+_NON_WORD = re.compile(r"[^\w]+", re.UNICODE)
+
+Entry = Tuple[float, FrozenSet[Tuple[str, ...]], List[str]]
+
+
+def _words(text: str) -> Tuple[List[str], List[int]]:
+    """Normalized words and, for each, the index of its whitespace token in *text*."""
+    words, positions = [], []
+    for i, token in enumerate(text.split()):
+        word = _NON_WORD.sub("", token.lower())
+        if word:
+            words.append(word)
+            positions.append(i)
+    return words, positions
+
+
+def _shingles(words: List[str], size: int) -> FrozenSet[Tuple[str, ...]]:
+    size = min(size, len(words))
+    return frozenset(tuple(words[i:i + size]) for i in range(len(words) - size + 1)) if size else frozenset()
+
+
+class TranscriptDedup:
+    """Drops near-repeats of recent transcripts and trims overlap with the previous one. Thread-safe."""
+
+    def __init__(self, window_s: float = _WINDOW_S, max_entries: int = _MAX_ENTRIES,
+                 shingle: int = _SHINGLE, near_duplicate: float = _NEAR_DUPLICATE,
+                 min_overlap_words: int = _MIN_OVERLAP_WORDS):
+        self.window_s = window_s
+        self.shingle = max(1, shingle)
+        self.near_duplicate = near_duplicate
+        self.min_overlap_words = max(1, min_overlap_words)
+        self._entries: Deque[Entry] = deque()
+        self._max_entries = max(1, max_entries)
+        self._index: Counter = Counter()
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.trimmed = 0
+        self.chars_saved = 0
+
+    def filter(self, text: str, now: Optional[float] = None) -> Optional[str]:
+        """*text* with any overlap with the previous transcript removed, or None if it is a repeat."""
+        if self.window_s <= 0:
+            return text
+        now = time.monotonic() if now is None else now
+        words, positions = _words(text)
+        if not words:
+            return text
+        with self._lock:
+            self._expire(now)
+            if self._is_repeat(words):
+                self.dropped += 1
+                self.chars_saved += len(text)
+                return None
+
+            overlap = self._overlap(words)
+            if overlap:
+                tokens = text.split()
+                kept = " ".join(tokens[positions[overlap]:])
+                self.trimmed += 1
+                self.chars_saved += len(text) - len(kept)
+                text, words = kept, words[overlap:]
+            self._add(now, _shingles(words, self.shingle), words)
+            return text
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self._index.clear()
+            self.dropped = self.trimmed = self.chars_saved = 0
+
+    def _is_repeat(self, words: List[str]) -> bool:
+        if len(words) < self.shingle:
+            # Too short to shingle ("Yes.", "Thank you"): only an exact repeat counts
+            return any(entry_words == words for _, _, entry_words in self._entries)
+        shingles = _shingles(words, self.shingle)
+        seen = sum(1 for s in shingles if self._index[s] > 0)
+        return seen >= self.near_duplicate * len(shingles)
+
+    def _overlap(self, words: List[str]) -> int:
+        """Longest prefix of *words* (leaving at least one word) that ends the previous transcript."""
+        if not self._entries:
+            return 0
+        previous = self._entries[-1][2]
+        for n in range(min(len(previous), len(words) - 1), self.min_overlap_words - 1, -1):
+            if previous[-n:] == words[:n]:
+                return n
+        return 0
+
+    def _add(self, now: float, shingles: FrozenSet[Tuple[str, ...]], words: List[str]):
+        self._entries.append((now, shingles, words))
+        self._index.update(shingles)
+        while len(self._entries) > self._max_entries:
+            self._evict()
+
+    def _expire(self, now: float):
+        while self._entries and now - self._entries[0][0] > self.window_s:
+            self._evict()
+
+    def _evict(self):
+        _, shingles, _ = self._entries.popleft()
+        self._index.subtract(shingles)
+        for s in shingles:
+            if self._index[s] <= 0:
+                del self._index[s]
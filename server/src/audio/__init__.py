@@ -1,3 +1,14 @@
-from .capture import AudioCapture
-from .meter import AudioMeter
-
+# AudioCapture needs PyAudioWPatch (Windows-only); import it on first use so
+# chunker/handler/remote stay importable elsewhere (a Linux inference box
+# fed over /ingest, benchmarks, tests). AudioMeter imports it only once started.
+def __getattr__(name):
+    if name == "AudioCapture":
+        from .capture import AudioCapture
+        return AudioCapture
+    if name == "RemoteAudioSource":
+        from .remote import RemoteAudioSource
+        return RemoteAudioSource
+    if name == "AudioMeter":
+        from .meter import AudioMeter
+        return AudioMeter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
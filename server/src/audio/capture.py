@@ -11,30 +11,12 @@ import queue
 import time
 import logging
 
-def resample_audio(audio_data, orig_sr, target_sr=16000):
-    if orig_sr == target_sr:
-        return audio_data
-    try:
-        from scipy.signal import resample_poly
-        from math import gcd
-        g = gcd(int(orig_sr), int(target_sr))
-        up = int(target_sr) // g
-        down = int(orig_sr) // g
-        resampled = resample_poly(audio_data.astype(np.float32), up, down)
-        return np.clip(resampled, -32768, 32767).astype(np.int16)
-    except ImportError:
-        try:
-            import resampy
-            resampled = resampy.resample(audio_data.astype(np.float32), orig_sr, target_sr, filter='kaiser_fast')
-            return np.clip(resampled, -32768, 32767).astype(np.int16)
-        except ImportError:
-            # Fallback: linear interpolation
-            duration = len(audio_data) / orig_sr
-            target_length = int(duration * target_sr)
-            x_old = np.linspace(0, duration, len(audio_data))
-            x_new = np.linspace(0, duration, target_length)
-            audio_new = np.interp(x_new, x_old, audio_data)
-            return np.round(audio_new).astype(np.int16)
+from functools import partial
+
+from src.utils.bounded_queue import BoundedQueue, MERGE
+from src.utils.metrics import metrics, CAPTURE_ENQUEUE
+from src.utils.tracing import Trace
+from .chunker import CAPTURE_QUEUE_MAX, VadChunker, merge_chunks, resample_audio
 
 class AudioCapture:
     def __init__(self, sample_rate=16000, chunk_duration=3.0, use_mic=False,
@@ -53,14 +35,20 @@ class AudioCapture:
         self.desktop_volume = max(0.0, float(desktop_volume))
         self.mic_volume = max(0.0, float(mic_volume))
         self.is_recording = False
-        self.audio_queue = queue.Queue()
+        # The poll loop hands each chunk straight to the orchestrator, so time
+        # spent here is the threaded pipeline's capture-to-enqueue latency
+        self.audio_queue = BoundedQueue(CAPTURE_QUEUE_MAX, policy=MERGE, merge_fn=merge_chunks,
+                                        on_wait=partial(metrics.observe, CAPTURE_ENQUEUE))
+        # Push-mode consumer (AsyncPipeline.append_audio). When set, flushed
+        # chunks go straight to it instead of the queue the poll loop drains.
+        self.on_chunk = None
         self.recording_thread = None
 
     def start(self):
         if self.is_recording:
             return
         self.is_recording = True
-        self.recording_thread = threading.Thread(target=self._record_loop, daemon=True)
+        self.recording_thread = threading.Thread(target=self._record_loop, name="AudioCapture", daemon=True)
         self.recording_thread.start()
 
     def stop(self):
@@ -68,6 +56,15 @@ class AudioCapture:
         if self.recording_thread:
             self.recording_thread.join(timeout=1.0)
 
+    def _emit_chunk(self, chunk_16k):
+        # The chunk's trace starts here, at flush
+        trace = Trace()
+        on_chunk = self.on_chunk
+        if on_chunk is not None:
+            on_chunk(chunk_16k, trace)
+        else:
+            self.audio_queue.put((chunk_16k, self.sample_rate, trace))
+
     def get_audio_chunk(self):
         try:
             return self.audio_queue.get_nowait()
@@ -242,26 +239,12 @@ class AudioCapture:
                 logging.info(f"[AudioCapture] Mic ignored due to error: {e}")
                 mic_stream = None
 
-        # ── VAD + Time-based chunking ─────────────────────────────────────
-        # Primary: flush every MAX_CHUNK_DURATION seconds (guaranteed captions)
-        # Secondary: flush early when silence follows speech (lower latency)
-        # Tuning for API Rate Limit (e.g. 40 RPM ~ 1 chunk per 1.5s per service)
-        # using max 3.5s chunk ensures ~17 RPM continuous speech.
-        SILENCE_THRESHOLD = 250      # Increased from 150 to reduce phantom captions from background noise
-        SILENCE_DURATION  = 0.9      # Increased from 0.5s to capture natural pauses
-        MIN_SPEECH_DURATION = 1.5    # Increased from 1.0s to provide more ASR context
-        MAX_CHUNK_DURATION  = self.chunk_duration
-        FIRST_CHUNK_DURATION = self.first_chunk_duration
-
-        silence_frames_needed = int(native_rate * SILENCE_DURATION)
-        min_speech_frames     = int(native_rate * MIN_SPEECH_DURATION)
-        max_chunk_frames      = int(native_rate * MAX_CHUNK_DURATION)
-        first_chunk_frames    = int(native_rate * FIRST_CHUNK_DURATION)
-
-        speech_buffer   = []
-        silence_counter = 0
-        in_speech       = False
-        first_chunk_pending = True
+        # ── VAD + Time-based chunking (see chunker.py) ───────────────────
+        chunker = VadChunker(
+            native_rate, self.sample_rate,
+            chunk_duration=self.chunk_duration,
+            first_chunk_duration=self.first_chunk_duration,
+        )
 
         import time
         while self.is_recording:
@@ -332,55 +315,19 @@ class AudioCapture:
                 except Exception:
                     pass
 
-            rms       = np.sqrt(np.mean(audio_data_int16.astype(np.float32) ** 2))
-            is_silent = rms < SILENCE_THRESHOLD
-
-            speech_buffer.extend(audio_data_int16.tolist())
-
-            if not is_silent:
-                in_speech       = True
-                silence_counter = 0
-            elif in_speech:
-                silence_counter += len(audio_data_int16)
-
-            # Decide whether to flush
-            should_flush = False
-            buf_len      = len(speech_buffer)
-            current_max_chunk_frames = first_chunk_frames if first_chunk_pending else max_chunk_frames
-
-            # 1. Time-based: always flush at max duration (guaranteed captions)
-            if buf_len >= current_max_chunk_frames:
-                should_flush = True
-
-            # 2. VAD-based: flush early when silence follows enough speech
-            elif (
-                in_speech
-                and buf_len >= min_speech_frames
-                and silence_counter >= silence_frames_needed
-            ):
-                should_flush = True
-
-            if should_flush:
-                if in_speech:
-                    chunk     = np.array(speech_buffer, dtype=np.int16)
-                    chunk_16k = resample_audio(chunk, native_rate, self.sample_rate)
-                    self.audio_queue.put((chunk_16k, self.sample_rate))
-                    if first_chunk_pending:
-                        logging.info(
-                            "[AudioCapture] First spoken chunk flushed after %.2fs.",
-                            buf_len / native_rate,
-                        )
-                    first_chunk_pending = False
-                
-                # Reset for next chunk regardless of whether we queued or discarded
-                speech_buffer   = []
-                silence_counter = 0
-                in_speech       = False
-
-        if speech_buffer and in_speech:
-            chunk = np.array(speech_buffer, dtype=np.int16)
-            chunk_16k = resample_audio(chunk, native_rate, self.sample_rate)
-            self.audio_queue.put((chunk_16k, self.sample_rate))
+            first_chunk_pending = chunker.first_chunk_pending
+            chunk_16k = chunker.push(audio_data_int16)
+            if chunk_16k is not None:
+                self._emit_chunk(chunk_16k)
+                if first_chunk_pending:
+                    logging.info(
+                        "[AudioCapture] First spoken chunk flushed after %.2fs.",
+                        len(chunk_16k) / self.sample_rate,
+                    )
+
+        chunk_16k = chunker.flush()
+        if chunk_16k is not None:
+            self._emit_chunk(chunk_16k)
 
         stream.stop_stream()
         stream.close()
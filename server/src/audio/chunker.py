@@ -0,0 +1,147 @@
+# Copyright (c) 2026 Omni Bridge. All rights reserved.
+#
+# Licensed under the PERSONAL STUDY & LEARNING LICENSE v1.0.
+# Commercial use and public redistribution of modified versions are strictly prohibited.
+# See the LICENSE file in the project root for full license terms.
+
+"""
+chunker.py — VAD + time-based chunking of a mono int16 stream.
+
+Split out of ``AudioCapture._stream_device`` so the same flush decisions
+can be replayed from a WAV file (``benchmarks/bench_replay.py``) without a
+sound device or PyAudioWPatch.
+"""
+
+import numpy as np
+
+from src.utils.tracing import merge_traces
+
+# Tuning for API Rate Limit (e.g. 40 RPM ~ 1 chunk per 1.5s per service)
+# using max 3.5s chunk ensures ~17 RPM continuous speech.
+# The budget itself is enforced by the orchestrator's RateLimiter.
+SILENCE_THRESHOLD = 250      # Increased from 150 to reduce phantom captions from background noise
+SILENCE_DURATION = 0.9       # Increased from 0.5s to capture natural pauses
+MIN_SPEECH_DURATION = 1.5    # Increased from 1.0s to provide more ASR context
+
+# Capture → poll loop queue bound. The poll loop drains every 10 ms, so this
+# only fills if that thread stalls; overflow merges into the newest chunk.
+CAPTURE_QUEUE_MAX = 16
+_MAX_MERGED_CHUNK_S = 15.0
+
+
+def merge_chunks(a, b):
+    """Merge two queued (chunk_16k, sample_rate, trace) items, or None if too long."""
+    (chunk_a, sr, trace_a), (chunk_b, _, trace_b) = a, b
+    if len(chunk_a) + len(chunk_b) > _MAX_MERGED_CHUNK_S * sr:
+        return None
+    return np.concatenate([chunk_a, chunk_b]), sr, merge_traces(trace_a, trace_b)
+
+
+def resample_audio(audio_data, orig_sr, target_sr=16000):
+    if orig_sr == target_sr:
+        return audio_data
+    try:
+        from scipy.signal import resample_poly
+        from math import gcd
+        g = gcd(int(orig_sr), int(target_sr))
+        up = int(target_sr) // g
+        down = int(orig_sr) // g
+        resampled = resample_poly(audio_data.astype(np.float32), up, down)
+        return np.clip(resampled, -32768, 32767).astype(np.int16)
+    except ImportError:
+        try:
+            import resampy
+            resampled = resampy.resample(audio_data.astype(np.float32), orig_sr, target_sr, filter='kaiser_fast')
+            return np.clip(resampled, -32768, 32767).astype(np.int16)
+        except ImportError:
+            # Fallback: linear interpolation
+            duration = len(audio_data) / orig_sr
+            target_length = int(duration * target_sr)
+            x_old = np.linspace(0, duration, len(audio_data))
+            x_new = np.linspace(0, duration, target_length)
+            audio_new = np.interp(x_new, x_old, audio_data)
+            return np.round(audio_new).astype(np.int16)
+
+
+class VadChunker:
+    """Buffers mono frames at *native_rate* and decides when to flush a chunk.
+
+    Primary: flush every ``chunk_duration`` seconds (guaranteed captions).
+    Secondary: flush early when silence follows speech (lower latency).
+    Buffers that never contained speech are discarded, not flushed.
+    """
+
+    def __init__(self, native_rate, target_rate=16000, chunk_duration=3.0, first_chunk_duration=None):
+        self.native_rate = native_rate
+        self.target_rate = target_rate
+        if first_chunk_duration is None:
+            first_chunk_duration = chunk_duration
+        self.silence_frames_needed = int(native_rate * SILENCE_DURATION)
+        self.min_speech_frames = int(native_rate * MIN_SPEECH_DURATION)
+        self.max_chunk_frames = int(native_rate * chunk_duration)
+        self.first_chunk_frames = int(native_rate * first_chunk_duration)
+
+        self.speech_buffer = []
+        self.silence_counter = 0
+        self.in_speech = False
+        self.first_chunk_pending = True
+
+    @property
+    def buffered_frames(self):
+        return len(self.speech_buffer)
+
+    def push(self, frame):
+        """Add one int16 frame; return a chunk resampled to ``target_rate`` when one is flushed."""
+        rms = np.sqrt(np.mean(frame.astype(np.float32) ** 2))
+        is_silent = rms < SILENCE_THRESHOLD
+
+        self.speech_buffer.extend(frame.tolist())
+
+        if not is_silent:
+            self.in_speech = True
+            self.silence_counter = 0
+        elif self.in_speech:
+            self.silence_counter += len(frame)
+
+        # Decide whether to flush
+        should_flush = False
+        buf_len = len(self.speech_buffer)
+        current_max_chunk_frames = self.first_chunk_frames if self.first_chunk_pending else self.max_chunk_frames
+
+        # 1. Time-based: always flush at max duration (guaranteed captions)
+        if buf_len >= current_max_chunk_frames:
+            should_flush = True
+
+        # 2. VAD-based: flush early when silence follows enough speech
+        elif (
+            self.in_speech
+            and buf_len >= self.min_speech_frames
+            and self.silence_counter >= self.silence_frames_needed
+        ):
+            should_flush = True
+
+        if not should_flush:
+            return None
+
+        chunk = None
+        if self.in_speech:
+            chunk = self._resampled()
+            self.first_chunk_pending = False
+
+        # Reset for next chunk regardless of whether we queued or discarded
+        self.speech_buffer = []
+        self.silence_counter = 0
+        self.in_speech = False
+        return chunk
+
+    def flush(self):
+        """End of stream: the buffered chunk if it contains speech, else None."""
+        chunk = self._resampled() if self.speech_buffer and self.in_speech else None
+        self.speech_buffer = []
+        self.silence_counter = 0
+        self.in_speech = False
+        return chunk
+
+    def _resampled(self):
+        chunk = np.array(self.speech_buffer, dtype=np.int16)
+        return resample_audio(chunk, self.native_rate, self.target_rate)
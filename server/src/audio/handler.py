@@ -3,7 +3,11 @@ import json
 import logging
 import threading
 import time
-from typing import Any, Callable, Dict, TYPE_CHECKING
+from typing import Any, Callable, Dict, Set, TYPE_CHECKING
+
+from src.network.serialization import AUDIO_LEVELS
+from .levels import LevelStream
+from src.pipeline import stream_kwargs
 
 if TYPE_CHECKING:
     from .capture import AudioCapture
@@ -11,10 +15,37 @@ if TYPE_CHECKING:
     from src.network.ws_manager import ConnectionManager
     from .meter import AudioMeter
 
+# Status re-check while a model is loading/downloading, and when nothing is
+_STATUS_BUSY_POLL_S = 2.0
+_STATUS_IDLE_CHECK_S = 30.0
+
+# Tasks created by _schedule; the loop keeps only weak references to them
+_pending_tasks: Set[asyncio.Task] = set()
+
+def _schedule(coro, loop):
+    """Run *coro* on *loop*: directly when already on it (AsyncPipeline), else thread-safe."""
+    try:
+        if asyncio.get_running_loop() is loop:
+            task = loop.create_task(coro)
+            _pending_tasks.add(task)
+            task.add_done_callback(_pending_tasks.discard)
+            return task
+    except RuntimeError:
+        pass
+    return asyncio.run_coroutine_threadsafe(coro, loop)
+
+async def _broadcast_caption(manager, msg, trace=None):
+    """Broadcast a caption, then close its trace with the send time."""
+    await manager.broadcast(msg)
+    if trace is not None:
+        trace.step("ws_broadcast")
+        trace.finish()
+
 def caption_callback(text, is_error, is_final=True, original_text=None, usage_stats=None, 
-                    event_loop=None, manager=None, session_id=0, source_lang="auto", target_lang="en"):
+                    event_loop=None, manager=None, session_id=0, source_lang="auto", target_lang="en",
+                    trace=None):
     """Called by the orchestrator on each transcript/translation. Broadcasts to all clients.
-    This runs in a background sync thread, so we schedule onto uvicorn's event loop."""
+    This usually runs in a background sync thread, so we schedule onto uvicorn's event loop."""
     msg = {
         "type": "error" if is_error else "caption",
         "text": text,
@@ -22,17 +53,25 @@ def caption_callback(text, is_error, is_final=True, original_text=None, usage_st
         "is_final": is_final,
         "session_id": session_id,
     }
+    if trace is not None:
+        msg["trace_id"] = trace.trace_id
+    # Partials share the final caption's trace; only the final one closes it
+    closing = trace if is_final and not is_error else None
     stats_list = (usage_stats if isinstance(usage_stats, list) else [usage_stats]) if usage_stats else []
     asr_stat   = stats_list[0] if len(stats_list) > 0 else None
     trans_stat = stats_list[1] if len(stats_list) > 1 else None
 
     def _engine_name(s): return s.get("engine") or s.get("model") or "?"
     asr_src = original_text or text
-    logging.info(f"[ASR]   '{asr_src[:70]}' | {_engine_name(asr_stat)} | {asr_stat.get('latency_ms', '?')}ms" if asr_stat else f"[ASR]   '{asr_src[:70]}'")
-    if trans_stat:
-        logging.info(f"[Trans] '{text[:70]}' | {_engine_name(trans_stat)} | {trans_stat.get('latency_ms', '?')}ms")
+    if not is_final and not is_error:
+        # Streaming partials arrive once per word — keep them out of the INFO log
+        logging.debug(f"[Partial] '{text[:70]}'")
+    else:
+        logging.info(f"[ASR]   '{asr_src[:70]}' | {_engine_name(asr_stat)} | {asr_stat.get('latency_ms', '?')}ms" if asr_stat else f"[ASR]   '{asr_src[:70]}'")
+        if trans_stat:
+            logging.info(f"[Trans] '{text[:70]}' | {_engine_name(trans_stat)} | {trans_stat.get('latency_ms', '?')}ms")
     if event_loop and not event_loop.is_closed() and manager:
-        asyncio.run_coroutine_threadsafe(manager.broadcast(msg), event_loop)
+        _schedule(_broadcast_caption(manager, msg, closing), event_loop)
         # Emit usage stats as a separate message so Flutter can log them independently
         if usage_stats and not is_error and is_final:
             if isinstance(usage_stats, list):
@@ -50,7 +89,7 @@ def caption_callback(text, is_error, is_final=True, original_text=None, usage_st
                         "target_lang": target_lang,
                         **stat,
                     }
-                    asyncio.run_coroutine_threadsafe(manager.broadcast(stats_msg), event_loop)
+                    _schedule(manager.broadcast(stats_msg), event_loop)
             else:
                 if not usage_stats.get("total_tokens"):
                     # Robust total tokens calculation
@@ -65,24 +104,39 @@ def caption_callback(text, is_error, is_final=True, original_text=None, usage_st
                     "target_lang": target_lang,
                     **usage_stats,
                 }
-                asyncio.run_coroutine_threadsafe(manager.broadcast(stats_msg), event_loop)
+                _schedule(manager.broadcast(stats_msg), event_loop)
+    elif closing is not None:
+        closing.finish("not_delivered")
 
 async def audio_level_broadcast_loop(is_running_func, audio_meter, manager):
-    """Broadcast audio RMS levels to all connected Flutter clients ~13 fps."""
+    """Broadcast audio levels when they change: per reading (~13 fps) or in batches.
+
+    ``LevelStream`` decides which readings are worth sending; silence sends nothing.
+    """
+    stream = LevelStream()
     while is_running_func():
-        msg = {
-            "type": "audio_levels",
-            "input_level": audio_meter.input_level,
-            "output_level": audio_meter.output_level,
-        }
-        await manager.broadcast(msg)
-        await asyncio.sleep(0.075)
+        levels = stream.sample(audio_meter.input_level, audio_meter.output_level,
+                               audio_meter.input_peak, audio_meter.output_peak)
+        live, batched = manager.level_subscribers()
+        if levels is not None and live:
+            await manager.broadcast_template(AUDIO_LEVELS, *levels, clients=live)
+        batch = stream.take_batch()
+        if batch is not None and batched:
+            await manager.broadcast({"type": "audio_levels_batch", "samples": batch}, clients=batched)
+        await asyncio.sleep(stream.interval_s)
 
 async def status_broadcast_loop(is_running_func, manager, orchestrator):
-    """Broadcast model statuses periodically while the server is running."""
+    """Broadcast model status changes while the server is running.
+
+    Wakes when the orchestrator reports a change, every 2 s while a model is
+    loading or downloading, and otherwise only for an occasional re-check.
+    Unchanged statuses send nothing.
+    """
+    if orchestrator:
+        orchestrator.on_status_change = manager.status.notify
     while is_running_func():
         await manager.broadcast_status(orchestrator)
-        await asyncio.sleep(2.0)
+        await manager.status.wait(_STATUS_BUSY_POLL_S if manager.status.busy else _STATUS_IDLE_CHECK_S)
 
 def audio_poll_loop(session_id, is_running_func, audio_capture, orchestrator, get_context_func, callback):
     """Background thread: polls audio capture queue and feeds to orchestrator."""
@@ -91,12 +145,8 @@ def audio_poll_loop(session_id, is_running_func, audio_capture, orchestrator, ge
         ctx = get_context_func()
         orchestrator.start_stream(
             sample_rate=getattr(audio_capture, "sample_rate", 16000),
-            source_lang=ctx["source_lang"],
-            target_lang=ctx["target_lang"],
-            ai_engine=ctx["ai_engine"],
-            transcription_model=ctx["transcription_model"],
-            translation_model=ctx["translation_model"],
             callback=callback,
+            **stream_kwargs(ctx),
         )
         while is_running_func() and session_id == get_context_func()["session_id"]:
             if audio_capture is None:
@@ -104,8 +154,8 @@ def audio_poll_loop(session_id, is_running_func, audio_capture, orchestrator, ge
                 continue
             item = audio_capture.get_audio_chunk()
             if item is not None:
-                chunk, _sample_rate = item
-                orchestrator.append_audio(chunk)
+                chunk, _sample_rate, trace = item
+                orchestrator.append_audio(chunk, trace)
             else:
                 time.sleep(0.01)
         
@@ -0,0 +1,89 @@
+"""
+levels.py — Which meter readings are worth sending to clients.
+
+The meter is read every 75 ms, but most readings match the last one sent,
+and during silence they are all zero. ``LevelStream`` drops those:
+
+  - A noise gate with hysteresis per channel: a level under ``gate_open``
+    reads as 0 until it crosses ``gate_open``, and it stays open until it
+    falls below ``gate_close``. Room noise hovering near one threshold
+    doesn't flicker the meter.
+  - A reading is sent only when some value (RMS or peak-hold, input or
+    output) moved more than ``threshold`` from the last one sent, or
+    reached or left zero. Once everything reads 0, nothing more is sent.
+  - While idle (everything sent as 0) the broadcaster reads the meter less
+    often (``interval_s``).
+
+Batched clients get the same change events in one ``audio_levels_batch``
+frame every ``batch_interval_s``. Each sample is prefixed with its offset in
+ms from the batch start.
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+Levels = Tuple[float, float, float, float]  # input, output, input peak, output peak
+
+_THRESHOLD = 0.02
+_GATE_OPEN = 0.06
+_GATE_CLOSE = 0.03
+_ACTIVE_INTERVAL_S = 0.075
+_IDLE_INTERVAL_S = 0.25
+_BATCH_INTERVAL_S = 0.5
+
+
+class LevelStream:
+    """Gates, thresholds and batches meter readings for ``audio_level_broadcast_loop``."""
+
+    def __init__(self, threshold: float = _THRESHOLD, gate_open: float = _GATE_OPEN,
+                 gate_close: float = _GATE_CLOSE, batch_interval_s: float = _BATCH_INTERVAL_S):
+        self.threshold = threshold
+        self.gate_open = gate_open
+        self.gate_close = gate_close
+        self.batch_interval_s = batch_interval_s
+        self._open = [False, False]  # input, output
+        self._last: Levels = (0.0, 0.0, 0.0, 0.0)
+        self._batch: List[List[float]] = []
+        self._batch_start = time.monotonic()
+        self.read = 0
+        self.sent = 0
+
+    @property
+    def idle(self) -> bool:
+        """True when the last values sent were all zero."""
+        return not any(self._last)
+
+    @property
+    def interval_s(self) -> float:
+        return _IDLE_INTERVAL_S if self.idle else _ACTIVE_INTERVAL_S
+
+    def _gate(self, channel: int, rms: float, peak: float) -> Tuple[float, float]:
+        threshold = self.gate_close if self._open[channel] else self.gate_open
+        self._open[channel] = rms >= threshold
+        return (rms, peak) if self._open[channel] else (0.0, 0.0)
+
+    def sample(self, input_level: float, output_level: float, input_peak: float = 0.0,
+               output_peak: float = 0.0, now: Optional[float] = None) -> Optional[Levels]:
+        """Gate one meter reading; the values to send, or None if it isn't worth sending."""
+        self.read += 1
+        in_rms, in_peak = self._gate(0, input_level, max(input_peak, input_level))
+        out_rms, out_peak = self._gate(1, output_level, max(output_peak, output_level))
+        levels = (round(in_rms, 3), round(out_rms, 3), round(in_peak, 3), round(out_peak, 3))
+        if not any(abs(v - l) > self.threshold or (v == 0.0) != (l == 0.0)
+                   for v, l in zip(levels, self._last)):
+            return None
+        self._last = levels
+        self.sent += 1
+        now = time.monotonic() if now is None else now
+        if not self._batch:
+            self._batch_start = now
+        self._batch.append([round((now - self._batch_start) * 1000), *levels])
+        return levels
+
+    def take_batch(self, now: Optional[float] = None) -> Optional[List[List[float]]]:
+        """The samples sent since the last batch, once ``batch_interval_s`` has passed."""
+        now = time.monotonic() if now is None else now
+        if not self._batch or now - self._batch_start < self.batch_interval_s:
+            return None
+        batch, self._batch = self._batch, []
+        return batch
@@ -8,16 +8,45 @@
 audio_meter.py — Lightweight real-time RMS audio level meter.
 
 Runs two separate pyaudio input streams (mic/loopback) in background threads
-and exposes the latest normalised level (0.0–1.0) for each.
+and exposes the latest normalised level (0.0–1.0) for each, plus a peak-hold
+level: the loudest sample seen, held for ``_PEAK_HOLD_S`` and then falling
+back at ``_PEAK_FALL_PER_S``. Reads happen every ~12 ms, so the peak catches
+transients the 75 ms broadcaster would miss.
 """
 
 import logging
 import threading
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pyaudiowpatch as pyaudio
+
+if TYPE_CHECKING:
+    import pyaudiowpatch as pyaudio
 
 _FRAMES = 512
 _MAX_RMS = 8000.0  # clamp to this RMS for normalisation
+_PEAK_HOLD_S = 1.0
+_PEAK_FALL_PER_S = 1.5  # level units per second once the hold expires
+
+
+def _to_level(amplitude: float) -> float:
+    """Map an int16 amplitude to 0.0–1.0: roughly -50 dB (quiet) → 0.0, 0 dB (loud) → 1.0."""
+    if amplitude <= 1.0:  # Ignore microscopic noise floor
+        return 0.0
+    db = 20 * np.log10(amplitude / 32768.0)
+    return max(0.0, min((db + 50.0) / 50.0, 1.0))
+
+
+def _peak_shown(held: float, held_at: float, now: float) -> float:
+    """The held peak as displayed at *now*: flat for the hold time, then falling."""
+    return max(0.0, held - _PEAK_FALL_PER_S * max(0.0, now - held_at - _PEAK_HOLD_S))
+
+
+def _hold_peak(held: float, held_at: float, peak: float, now: float) -> tuple[float, float]:
+    """New (held peak, time it was set) after a read whose peak level is *peak*."""
+    if peak >= _peak_shown(held, held_at, now):
+        return peak, now
+    return held, held_at
 
 
 class AudioMeter:
@@ -26,6 +55,8 @@ class AudioMeter:
     def __init__(self):
         self._input_level: float = 0.0
         self._output_level: float = 0.0
+        self._input_peak: float = 0.0
+        self._output_peak: float = 0.0
         self._input_thread: threading.Thread | None = None
         self._output_thread: threading.Thread | None = None
         self._running = False
@@ -42,6 +73,14 @@ class AudioMeter:
     def output_level(self) -> float:
         return self._output_level
 
+    @property
+    def input_peak(self) -> float:
+        return self._input_peak
+
+    @property
+    def output_peak(self) -> float:
+        return self._output_peak
+
     def configure(self, input_device_index: int | None, output_device_index: int | None):
         """Update device selection and restart streams. Both sources metered independently."""
         self._input_device_index = input_device_index
@@ -54,8 +93,8 @@ class AudioMeter:
         if self._running:
             return
         self._running = True
-        self._input_level = 0.0
-        self._output_level = 0.0
+        self._input_level = self._input_peak = 0.0
+        self._output_level = self._output_peak = 0.0
         self._input_thread = threading.Thread(
             target=self._measure_loop,
             args=(True,),
@@ -79,13 +118,14 @@ class AudioMeter:
             self._output_thread.join(timeout=1.0)
         self._input_thread = None
         self._output_thread = None
-        self._input_level = 0.0
-        self._output_level = 0.0
+        self._input_level = self._input_peak = 0.0
+        self._output_level = self._output_peak = 0.0
 
     # ── Internal ──────────────────────────────────────────────────────────────
 
     def _measure_loop(self, is_input: bool):
         """Open a pyaudio stream and continuously read RMS levels."""
+        import pyaudiowpatch as pyaudio
         from .shared_pyaudio import get_pyaudio
         try:
             p = get_pyaudio()
@@ -106,6 +146,7 @@ class AudioMeter:
             )
 
             import time
+            held, held_at = 0.0, 0.0
             while self._running:
                 try:
                     if not stream.is_active():
@@ -124,19 +165,18 @@ class AudioMeter:
                         
                     # Calculate true RMS
                     rms = float(np.sqrt(np.mean(arr ** 2)))
-                    
-                    if rms > 1.0:  # Ignore microscopic noise floor
-                        db = 20 * np.log10(rms / 32768.0)
-                        # Map roughly -50dB (quiet) to 0.0, and 0dB (loud) to 1.0
-                        level = (db + 50.0) / 50.0
-                        level = max(0.0, min(level, 1.0))
-                    else:
-                        level = 0.0
+                    level = _to_level(rms)
+                    peak = _to_level(float(np.max(np.abs(arr)))) if arr.size else 0.0
+                    now = time.monotonic()
+                    held, held_at = _hold_peak(held, held_at, peak, now)
+                    shown = _peak_shown(held, held_at, now)
 
                     if is_input:
                         self._input_level = level
+                        self._input_peak = shown
                     else:
                         self._output_level = level
+                        self._output_peak = shown
                 except Exception as e:
                     logging.warning(f"[AudioMeter] {'input' if is_input else 'output'} read error: {e}")
                     break
@@ -148,12 +188,13 @@ class AudioMeter:
             logging.error(f"[AudioMeter] {'input' if is_input else 'output'} error: {e}")
         finally:
             if is_input:
-                self._input_level = 0.0
+                self._input_level = self._input_peak = 0.0
             else:
-                self._output_level = 0.0
+                self._output_level = self._output_peak = 0.0
 
-    def _resolve_device(self, p: pyaudio.PyAudio, is_input: bool):
+    def _resolve_device(self, p: "pyaudio.PyAudio", is_input: bool):
         """Return the device_info dict to open, or None on failure."""
+        import pyaudiowpatch as pyaudio
         try:
             # 1. Resolve WASAPI host API index safely (avoid get_host_api_info_by_type)
             wasapi_index = -1
@@ -0,0 +1,306 @@
+"""
+remote.py — Session audio streamed from a thin client over the ``/ingest`` WebSocket.
+
+With ``audio_source: "remote"`` the session gets a ``RemoteAudioSource``
+instead of an ``AudioCapture``. It has the same queue, ``on_chunk`` hook and
+level properties, so the poll loop, ``AsyncPipeline`` and the levels
+broadcaster work unchanged. Audio arrives through ``/ingest`` and goes
+through the same ``VadChunker`` as local capture, so capture can run on one
+machine and inference on another.
+
+Wire format, client → server:
+
+  /ingest?sample_rate=48000&channels=2&codec=pcm16&jitter_frames=5
+
+  binary frame   4-byte little-endian sequence number + payload: int16
+                 little-endian interleaved PCM (``pcm16``), or one Opus
+                 packet (``opus``, needs ``opuslib``)
+  text frame     ``{"cmd": "end"}`` flushes the last chunk and closes
+
+Server → client, every ``_ACK_EVERY`` frames (and whenever the window closes):
+
+  {"type": "audio_ack", "seq": <last frame consumed>, "window": <frames the
+   client may send beyond seq>, "received", "lost", "late", "buffered"}
+
+``JitterBuffer`` puts frames back in sequence order. A missing frame is given
+up for lost once ``jitter_frames`` later frames have arrived. It is replaced
+by silence of the same length, so VAD timing stays correct. The window
+shrinks to 0 while the ASR queue behind the source is backed up. A client
+that honours it slows down instead of having its audio merged under
+overload.
+"""
+
+import logging
+import queue
+import struct
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.utils.bounded_queue import BoundedQueue, MERGE
+from src.utils.metrics import metrics, CAPTURE_ENQUEUE
+from src.utils.tracing import Trace
+from .chunker import CAPTURE_QUEUE_MAX, VadChunker, merge_chunks
+from .meter import _hold_peak, _peak_shown, _to_level
+
+try:
+    import opuslib  # type: ignore[import]
+    HAS_OPUS = True
+except ImportError:
+    opuslib = None
+    HAS_OPUS = False
+
+_SEQ = struct.Struct("<I")
+PCM16 = "pcm16"
+OPUS = "opus"
+_JITTER_FRAMES = 5
+# A jump further ahead than this is a restarted sender, not loss
+_RESYNC_FRAMES = 500
+_ACK_EVERY = 10
+_WINDOW_FRAMES = 50
+# Largest Opus frame (120 ms at 48 kHz), per channel
+_OPUS_MAX_SAMPLES = 5760
+
+
+class JitterBuffer:
+    """Releases frames in sequence order; gives up on a gap after *max_delay_frames* later frames."""
+
+    def __init__(self, max_delay_frames: int = _JITTER_FRAMES):
+        self.max_delay_frames = max(0, max_delay_frames)
+        self.next_seq: Optional[int] = None
+        self._pending: Dict[int, bytes] = {}
+        self.lost = 0
+        self.late = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def push(self, seq: int, payload: bytes) -> List[Optional[bytes]]:
+        """Frames now ready, in order; None stands for a frame given up for lost."""
+        if self.next_seq is None or abs(seq - self.next_seq) > _RESYNC_FRAMES:
+            if self.next_seq is not None:
+                logging.info(f"[Ingest] Sequence jumped {self.next_seq} → {seq}; resyncing")
+            self._pending.clear()
+            self.next_seq = seq
+        if seq < self.next_seq or seq in self._pending:
+            self.late += 1  # already played (or given up on), or a duplicate
+            return []
+        self._pending[seq] = payload
+        ready: List[Optional[bytes]] = []
+        while self._pending:
+            if self.next_seq in self._pending:
+                ready.append(self._pending.pop(self.next_seq))
+            elif max(self._pending) - self.next_seq >= self.max_delay_frames:
+                ready.append(None)
+                self.lost += 1
+            else:
+                break
+            self.next_seq += 1
+        return ready
+
+    def drain(self) -> List[Optional[bytes]]:
+        """Everything still held, in order, with gaps as None (end of stream)."""
+        ready: List[Optional[bytes]] = []
+        seq = self.next_seq
+        if seq is None:
+            return ready  # nothing was ever pushed
+        while self._pending:
+            payload = self._pending.pop(seq, None)
+            if payload is None:
+                self.lost += 1
+            ready.append(payload)
+            seq += 1
+        self.next_seq = seq
+        return ready
+
+
+class IngestStream:
+    """One ``/ingest`` connection: sequence-numbered frames → mono int16 → the source's chunker."""
+
+    def __init__(self, source: "RemoteAudioSource", native_rate: int, channels: int = 1,
+                 codec: str = PCM16, jitter_frames: int = _JITTER_FRAMES):
+        if codec not in (PCM16, OPUS):
+            raise ValueError(f"Unsupported audio codec: {codec}")
+        if codec == OPUS and (not HAS_OPUS or opuslib is None):
+            raise ValueError("Opus ingest needs the opuslib package")
+        if native_rate <= 0 or channels <= 0:
+            raise ValueError("sample_rate and channels must be positive")
+        self.source = source
+        self.native_rate = native_rate
+        self.channels = channels
+        self.codec = codec
+        self.jitter = JitterBuffer(jitter_frames)
+        self.chunker = VadChunker(
+            native_rate, source.sample_rate,
+            chunk_duration=source.chunk_duration,
+            first_chunk_duration=source.first_chunk_duration,
+        )
+        self._decoder = opuslib.Decoder(native_rate, channels) if codec == OPUS and opuslib is not None else None
+        self._frame_samples = 0  # mono samples in the last frame, for loss concealment
+        self._samples = 0  # stream clock for the peak hold
+        self.received = 0
+        self.consumed = 0
+        self._window = _WINDOW_FRAMES
+
+    def feed(self, frame: bytes) -> Optional[Dict[str, Any]]:
+        """Take one binary frame; returns an ``audio_ack`` when one is due."""
+        if len(frame) < _SEQ.size:
+            logging.warning("[Ingest] Ignoring frame shorter than its sequence header")
+            return None
+        (seq,) = _SEQ.unpack_from(frame)
+        self.received += 1
+        for payload in self.jitter.push(seq, frame[_SEQ.size:]):
+            self._consume(payload)
+        window = self._current_window()
+        if self.received % _ACK_EVERY == 0 or (window == 0) != (self._window == 0):
+            self._window = window
+            return self.ack()
+        return None
+
+    def ack(self) -> Dict[str, Any]:
+        next_seq = self.jitter.next_seq
+        return {
+            "type": "audio_ack",
+            "seq": next_seq - 1 if next_seq is not None else -1,
+            "window": self._current_window(),
+            "received": self.received,
+            "lost": self.jitter.lost,
+            "late": self.jitter.late,
+            "buffered": self.jitter.depth,
+        }
+
+    def close(self):
+        """End of stream: play out what the jitter buffer holds and flush the last chunk."""
+        for payload in self.jitter.drain():
+            self._consume(payload)
+        chunk = self.chunker.flush()
+        if chunk is not None:
+            self.source._emit_chunk(chunk)
+
+    def _current_window(self) -> int:
+        pressure = min(1.0, max(0.0, self.source.backlog()))
+        return 0 if pressure >= 0.5 else int(_WINDOW_FRAMES * (1.0 - 2 * pressure))
+
+    def _consume(self, payload: Optional[bytes]):
+        if payload is None:
+            if not self._frame_samples:
+                return
+            mono = np.zeros(self._frame_samples, dtype=np.int16)
+        else:
+            try:
+                mono = self._decode(payload)
+            except Exception as e:
+                logging.warning(f"[Ingest] Undecodable {self.codec} frame: {e}")
+                return
+            self._frame_samples = len(mono)
+        self.consumed += 1
+        if self.source.desktop_volume != 1.0:
+            mono = np.clip(mono.astype(np.float32) * self.source.desktop_volume, -32768, 32767).astype(np.int16)
+        self._samples += len(mono)
+        self.source._meter(mono, self._samples / self.native_rate)
+        chunk = self.chunker.push(mono)
+        if chunk is not None:
+            self.source._emit_chunk(chunk)
+
+    def _decode(self, payload: bytes) -> np.ndarray:
+        if self._decoder is not None:
+            payload = self._decoder.decode(payload, _OPUS_MAX_SAMPLES)
+        samples = np.frombuffer(payload, dtype="<i2")
+        if self.channels > 1:
+            samples = samples[: len(samples) - len(samples) % self.channels]
+            samples = samples.reshape(-1, self.channels).mean(axis=1)
+        return samples.astype(np.int16)
+
+
+class RemoteAudioSource:
+    """Stands in for ``AudioCapture`` when the session's audio arrives over ``/ingest``."""
+
+    def __init__(self, sample_rate=16000, chunk_duration=3.0, first_chunk_duration=None, desktop_volume=1.0):
+        self.sample_rate = sample_rate
+        self.chunk_duration = chunk_duration
+        if first_chunk_duration is None:
+            first_chunk_duration = chunk_duration
+        self.first_chunk_duration = max(0.5, min(float(first_chunk_duration), float(chunk_duration)))
+        self.desktop_volume = max(0.0, float(desktop_volume))
+        self.mic_volume = 1.0  # the client mixes its own sources
+        self.is_recording = False
+        self.audio_queue = BoundedQueue(CAPTURE_QUEUE_MAX, policy=MERGE, merge_fn=merge_chunks,
+                                        on_wait=partial(metrics.observe, CAPTURE_ENQUEUE))
+        self.on_chunk = None
+        # Fill fraction (0–1) of the queue this source feeds; drives the ack window
+        self.backlog: Callable[[], float] = lambda: self.audio_queue.qsize() / CAPTURE_QUEUE_MAX
+        self.stream: Optional[IngestStream] = None
+        self._input_level = self._input_peak = 0.0
+        self._held = self._held_at = 0.0
+
+    # AudioMeter-compatible levels, so audio_level_broadcast_loop can meter remote audio
+    @property
+    def input_level(self) -> float:
+        return self._input_level
+
+    @property
+    def input_peak(self) -> float:
+        return self._input_peak
+
+    output_level = 0.0
+    output_peak = 0.0
+
+    def start(self):
+        self.is_recording = True
+
+    def stop(self):
+        self.is_recording = False
+        self.close_stream()
+        self._input_level = self._input_peak = 0.0
+
+    def open_stream(self, native_rate: int, channels: int = 1, codec: str = PCM16,
+                    jitter_frames: int = _JITTER_FRAMES) -> IngestStream:
+        """Start a new ingest stream (ending any previous one). Raises ValueError for bad parameters."""
+        stream = IngestStream(self, native_rate, channels, codec, jitter_frames)
+        self.close_stream()
+        self.stream = stream
+        self._input_level = self._input_peak = self._held = self._held_at = 0.0
+        return stream
+
+    def close_stream(self, stream: Optional[IngestStream] = None):
+        """Close *stream* (default: the current one), if it is still the current one."""
+        current = self.stream
+        if current is None or (stream is not None and stream is not current):
+            return
+        self.stream = None
+        current.close()
+
+    def _emit_chunk(self, chunk_16k):
+        if not self.is_recording:
+            return
+        # The chunk's trace starts here, at flush
+        trace = Trace()
+        on_chunk = self.on_chunk
+        if on_chunk is not None:
+            on_chunk(chunk_16k, trace)
+        else:
+            self.audio_queue.put((chunk_16k, self.sample_rate, trace))
+
+    def _meter(self, mono: np.ndarray, now: float):
+        if not len(mono):
+            return
+        samples = mono.astype(np.float32)
+        self._input_level = _to_level(float(np.sqrt(np.mean(samples ** 2))))
+        self._held, self._held_at = _hold_peak(self._held, self._held_at,
+                                               _to_level(float(np.max(np.abs(samples)))), now)
+        self._input_peak = _peak_shown(self._held, self._held_at, now)
+
+    def get_audio_chunk(self):
+        try:
+            return self.audio_queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def clear(self):
+        while not self.audio_queue.empty():
+            try:
+                self.audio_queue.get_nowait()
+            except queue.Empty:
+                break
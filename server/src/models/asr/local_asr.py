@@ -5,7 +5,8 @@ Uses Google's undocumented web speech API — no key needed, requires internet.
 
 import io
 import wave
-import speech_recognition as sr
+
+from src.utils.endpoints import GOOGLE_ASR, resolve
 
 
 # BCP-47 language codes — must match InferenceOrchestrator's lang_map
@@ -23,7 +24,11 @@ _LANG_MAP = {
 class SpeechRecognitionModel:
     """Online ASR using Google's free web speech API."""
 
-    def __init__(self):
+    ENDPOINT = "http://www.google.com/speech-api/v2/recognize"
+
+    def __init__(self, endpoint: str = ""):
+        import speech_recognition as sr  # deferred until the engine is built
+        self.endpoint = endpoint or resolve(GOOGLE_ASR, self.ENDPOINT)
         # Reuse a single Recognizer — avoid overhead of creating one per chunk
         self._recognizer = sr.Recognizer()
         self._recognizer.dynamic_energy_threshold = True
@@ -58,6 +63,7 @@ class SpeechRecognitionModel:
             return None, None
         
         import time
+        import speech_recognition as sr
         start = time.monotonic()
 
         try:
@@ -75,7 +81,7 @@ class SpeechRecognitionModel:
 
             # Google's recognize_google requires a string for language, so default to en-US for "auto"
             lang_tag = "en-US" if source_lang == "auto" else _LANG_MAP.get(source_lang, "en-US")
-            result = self._recognizer.recognize_google(audio, language=lang_tag)  # type: ignore[attr-defined]
+            result = self._recognizer.recognize_google(audio, language=lang_tag, endpoint=self.endpoint)  # type: ignore[attr-defined]
             transcript = result.strip() if result else None
             stats = None
             if transcript:
@@ -4,16 +4,19 @@ NVIDIA Riva ASR implementation.
 
 import logging
 import time
-import riva.client  # type: ignore[import]
+from src.utils.endpoints import RIVA, grpc_target, resolve
 from src.utils.language_support import RIVA_PARAKEET_ASR_LANGS
 
 class RivaASRModel:
     """Wraps NVIDIA Riva ASR (Parakeet and Canary)."""
 
-    def __init__(self, api_key: str, parakeet_fid: str = "", canary_fid: str = ""):
+    URI = "grpc.nvcf.nvidia.com:443"
+
+    def __init__(self, api_key: str, parakeet_fid: str = "", canary_fid: str = "", uri: str = ""):
         self.api_key = api_key.strip() if api_key else ""
         self.parakeet_fid = parakeet_fid.strip() if parakeet_fid else ""
         self.canary_fid = canary_fid.strip() if canary_fid else ""
+        self.uri, self.use_ssl = grpc_target(uri or resolve(RIVA, self.URI))
         self.asr_parakeet = None
         self.asr_canary = None
         self._is_loading = False
@@ -25,6 +28,7 @@ class RivaASRModel:
             if not self.api_key:
                 logging.warning("[RivaASR] No API key provided, skipping setup.")
                 return
+            import riva.client  # type: ignore[import]  # deferred: gRPC + protobuf stubs
             
             # Redact API key for logs
             redacted_key = f"{self.api_key[:6]}...{self.api_key[-4:]}" if len(self.api_key) > 10 else "***"
@@ -33,8 +37,8 @@ class RivaASRModel:
             # Parakeet Multilingual
             auth_parakeet = riva.client.Auth(
                 None,
-                use_ssl=True,
-                uri="grpc.nvcf.nvidia.com:443",
+                use_ssl=self.use_ssl,
+                uri=self.uri,
                 metadata_args=[
                     ["authorization", f"Bearer {self.api_key}"],
                     ["function-id", self.parakeet_fid],
@@ -45,8 +49,8 @@ class RivaASRModel:
             # Canary
             auth_canary = riva.client.Auth(
                 None,
-                use_ssl=True,
-                uri="grpc.nvcf.nvidia.com:443",
+                use_ssl=self.use_ssl,
+                uri=self.uri,
                 metadata_args=[
                     ["authorization", f"Bearer {self.api_key}"],
                     ["function-id", self.canary_fid],
@@ -69,6 +73,14 @@ class RivaASRModel:
     def is_ready(self) -> bool:
         return not self._is_loading and getattr(self, "asr_parakeet", None) is not None and bool(self.api_key)
 
+    def close(self):
+        """Close the gRPC channels (last session using these credentials ended)."""
+        for service in (self.asr_parakeet, self.asr_canary):
+            channel = getattr(getattr(service, "auth", None), "channel", None)
+            if channel is not None:
+                channel.close()
+        self.asr_parakeet = self.asr_canary = None
+
     def warmup(self, sample_rate: int = 16000, lang: str = "en-US") -> None:
         """Send a silent dummy chunk to pre-establish the gRPC TLS connection.
         The first real offline_recognize call otherwise pays ~5-6s cold-start
@@ -124,6 +136,7 @@ class RivaASRModel:
 
         transcript = None
         detected_lang = None
+        confidence = None
         if response and response.results:
             result = response.results[0]
             if result.alternatives:
@@ -156,6 +169,7 @@ class RivaASRModel:
                 "input_tokens": len(transcript),
                 "output_tokens": 0,
                 "detected_lang": safe_lang,
+                "confidence": confidence or None,  # 0.0 means "not reported"
             }
         return transcript, stats
 
@@ -187,7 +201,8 @@ class RivaASRModel:
         # Riva Triton server does not accept 'multi' as a valid BCP-47 code.
         # Fallback to en-US to prevent grpc exception. 
         safe_lang = "en-US" if lang.lower() == "multi" else lang
-        
+        import riva.client  # type: ignore[import]
+
         return riva.client.RecognitionConfig(
             encoding=riva.client.AudioEncoding.LINEAR_PCM,
             sample_rate_hertz=sample_rate,
@@ -11,6 +11,8 @@ from typing import Literal, Any, Optional
 
 import numpy as np
 
+from src.utils.system_probe import probe_gpu, system_probe
+
 # ── Model metadata ────────────────────────────────────────────────────────────
 
 WhisperSize = Literal["tiny", "base", "small", "medium"]
@@ -34,6 +36,9 @@ _state_lock = threading.Lock()
 _MODEL_CACHE: dict[str, Any] = {}
 _GLOBAL_LOAD_LOCK = threading.Lock()
 _GLOBAL_METER_LOCK = threading.Lock() # For meter access if needed
+# Running sessions per size — with several sessions in one process, ending one
+# must not unload weights another is still transcribing with
+_ACTIVE_USERS: dict[str, int] = {}
 
 
 def _model_file(size: str) -> str:
@@ -79,30 +84,8 @@ def is_gpu_available() -> bool:
 
 
 def get_gpu_info() -> dict:
-    """Return details about the available GPU, if any."""
-    available = is_gpu_available()
-    info = {
-        "available": available, 
-        "name": "None",
-        "vram_used": 0.0,
-        "vram_total": 0.0
-    }
-    if available:
-        try:
-            import torch
-            info["name"] = torch.cuda.get_device_name(0)
-            
-            # Get VRAM info in GB
-            properties = torch.cuda.get_device_properties(0)
-            info["vram_total"] = round(properties.total_memory / (1024**3), 2)
-            
-            # memory_allocated is what's actually used by tensors
-            # memory_reserved is what's held by the caching allocator
-            # Using memory_reserved gives a better idea of what the OS/Driver sees as used
-            info["vram_used"] = round(torch.cuda.memory_reserved(0) / (1024**3), 2)
-        except Exception:
-            info["name"] = "Unknown CUDA Device"
-    return info
+    """Return details about the available GPU, if any (imports torch; status paths use ``system_probe``)."""
+    return probe_gpu(import_torch=True)
 
 
 def start_download(size: str = "base") -> bool:
@@ -120,7 +103,7 @@ def start_download(size: str = "base") -> bool:
         st["status"] = "downloading"
         st["progress"] = 0.0
 
-    thread = threading.Thread(target=_do_download, args=(size,), daemon=True)
+    thread = threading.Thread(target=_do_download, args=(size,), name="WhisperDownload", daemon=True)
     thread.start()
     return True
 
@@ -190,6 +173,7 @@ class WhisperModel:
         self._size = model_size if model_size in _MODEL_INFO else "base"
         self._is_loading = False
         self._lock = threading.Lock()
+        self._held: Optional[str] = None
 
     @property
     def model_size(self) -> str:
@@ -228,15 +212,38 @@ class WhisperModel:
                     "device": device
                 }
                 logging.info(f"[WhisperModel] {self._size} model loaded on {device}.")
+                system_probe.refresh()  # torch is loaded now — pick up the device name and VRAM
             finally:
                 self._is_loading = False
 
-    def unload_model(self):
-        """Unload the model from the global cache and clear resources."""
+    def hold(self):
+        """Mark the current size as in use by this instance's session."""
         with _GLOBAL_LOAD_LOCK:
-            if self._size in _MODEL_CACHE:
-                logging.info(f"[WhisperModel] Unloading {self._size} model from memory...")
-                del _MODEL_CACHE[self._size]
+            if self._held == self._size:
+                return
+            if self._held:
+                _ACTIVE_USERS[self._held] = max(0, _ACTIVE_USERS.get(self._held, 0) - 1)
+            _ACTIVE_USERS[self._size] = _ACTIVE_USERS.get(self._size, 0) + 1
+            self._held = self._size
+
+    def release(self):
+        """Drop this session's hold and unload the weights if no other session uses them."""
+        with _GLOBAL_LOAD_LOCK:
+            size = self._held or self._size
+            if self._held:
+                _ACTIVE_USERS[self._held] = max(0, _ACTIVE_USERS.get(self._held, 0) - 1)
+                self._held = None
+            in_use = _ACTIVE_USERS.get(size, 0) > 0
+        if not in_use:
+            self.unload_model(size)
+
+    def unload_model(self, size: Optional[str] = None):
+        """Unload a model size (default: the current one) from the global cache and clear resources."""
+        size = size or self._size
+        with _GLOBAL_LOAD_LOCK:
+            if size in _MODEL_CACHE:
+                logging.info(f"[WhisperModel] Unloading {size} model from memory...")
+                del _MODEL_CACHE[size]
                 import gc
                 gc.collect()
                 try:
@@ -341,6 +348,7 @@ class WhisperModel:
                     "latency_ms": latency_ms,
                     "input_tokens": len(transcript),
                     "output_tokens": 0,
+                    "detected_lang": result.get("language") or "",
                 }
             return transcript, stats
         except Exception:
@@ -3,3 +3,4 @@ from .mymemory_translation import MyMemoryModel
 from .google_translation import GoogleModel
 from .google_api_translation import GoogleCloudTranslationModel
 from .riva_nmt import RivaNMTModel
+from .context_window import ConversationWindow
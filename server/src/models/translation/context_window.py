@@ -0,0 +1,86 @@
+"""
+Rolling conversation window for LLM translation.
+
+Keeps the last K (source, translation) pairs of the current session so the
+LLM sees the surrounding captions when translating a fragment. The window
+is trimmed in blocks rather than one pair at a time: the message prefix
+(system prompt + oldest kept pairs) then stays byte-identical across several
+consecutive captions, which lets server-side prefix caching apply.
+"""
+
+import threading
+from collections import deque
+from typing import Deque, List, Tuple
+
+from src.utils.server_utils import estimate_tokens
+
+
+class ConversationWindow:
+    """Session-scoped history of (source, target) caption pairs with a token budget."""
+
+    def __init__(self, max_pairs: int = 4, token_budget: int = 256):
+        self.max_pairs = max(0, int(max_pairs))
+        self.token_budget = max(0, int(token_budget))
+        self._pairs: Deque[Tuple[str, str, int]] = deque()
+        self._tokens = 0
+        self._target_lang = ""
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_pairs > 0 and self.token_budget > 0
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    @property
+    def tokens(self) -> int:
+        return self._tokens
+
+    def configure(self, max_pairs: int, token_budget: int | None = None):
+        with self._lock:
+            self.max_pairs = max(0, int(max_pairs))
+            if token_budget is not None:
+                self.token_budget = max(0, int(token_budget))
+            self._trim()
+
+    def clear(self):
+        with self._lock:
+            self._pairs.clear()
+            self._tokens = 0
+
+    def messages(self, target_lang: str) -> List[dict]:
+        """Return prior turns as chat messages. History for another target language is dropped."""
+        with self._lock:
+            if target_lang != self._target_lang:
+                self._pairs.clear()
+                self._tokens = 0
+                self._target_lang = target_lang
+            out: List[dict] = []
+            for source, target, _ in self._pairs:
+                out.append({"role": "user", "content": source})
+                out.append({"role": "assistant", "content": target})
+            return out
+
+    def add(self, source: str, target: str, target_lang: str):
+        if not self.enabled or not source or not target:
+            return
+        cost = estimate_tokens(source) + estimate_tokens(target)
+        with self._lock:
+            if target_lang != self._target_lang:
+                self._pairs.clear()
+                self._tokens = 0
+                self._target_lang = target_lang
+            self._pairs.append((source, target, cost))
+            self._tokens += cost
+            self._trim()
+
+    def _trim(self):
+        """Evict down to half capacity once either limit is exceeded (caller holds the lock)."""
+        if len(self._pairs) <= self.max_pairs and self._tokens <= self.token_budget:
+            return
+        keep_pairs = self.max_pairs // 2
+        keep_tokens = self.token_budget // 2
+        while self._pairs and (len(self._pairs) > keep_pairs or self._tokens > keep_tokens):
+            _, _, cost = self._pairs.popleft()
+            self._tokens -= cost
@@ -11,6 +11,8 @@ import time
 import logging
 from typing import Any, Union, Optional
 
+from src.utils.endpoints import GOOGLE_CLOUD, resolve
+
 
 class GoogleCloudTranslationModel:
     """
@@ -19,8 +21,10 @@ class GoogleCloudTranslationModel:
     Credentials are stored in Firestore and cached in Flutter secure storage.
     """
 
-    def __init__(self, credentials: Any = ""):
+    def __init__(self, credentials: Any = "", api_endpoint: str = ""):
         self._credentials = credentials
+        # Empty = the client library's default (translate.googleapis.com)
+        self._api_endpoint = api_endpoint or resolve(GOOGLE_CLOUD)
         self._client = None
         self._project_id = ""
         self._location = "global"
@@ -74,7 +78,8 @@ class GoogleCloudTranslationModel:
                 info,
                 scopes=["https://www.googleapis.com/auth/cloud-translation"],
             )
-            self._client = translate.TranslationServiceClient(credentials=credentials)
+            client_options = {"api_endpoint": self._api_endpoint} if self._api_endpoint else None
+            self._client = translate.TranslationServiceClient(credentials=credentials, client_options=client_options)
             logging.info("[GoogleCloudTranslationModel] gRPC client initialized successfully.")
         except (json.JSONDecodeError, ValueError) as e:
             # If parsing fails, log a bit more context if it's a string
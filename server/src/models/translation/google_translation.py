@@ -1,17 +1,69 @@
 """
-Google Translate model via deep-translator.
+Google Translate model (free web endpoint).
 Used when 'google' engine is selected.
+
+deep-translator is used only to validate and normalise language codes (through
+its public supported-languages table); the request itself goes through the shared pooled HTTP client so consecutive
+captions reuse one keep-alive connection instead of a fresh requests.get.
 """
 
 import time
-from deep_translator import GoogleTranslator
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
 
+from src.utils.endpoints import GOOGLE, resolve
+from src.utils.http_client import get_http_client
+
+# Result container classes on translate.google.com/m (same lookups deep-translator uses)
+_RESULT_CLASSES = ("t0", "result-container")
 
-class GoogleModel:
-    """Wraps deep-translator's GoogleTranslator."""
+
+class _ResultParser(HTMLParser):
+    """Text of the innermost result container, like BeautifulSoup.get_text(strip=True)."""
 
     def __init__(self):
-        self._translators = {}  # Cache translators by (source, target)
+        super().__init__(convert_charrefs=True)  # entities arrive decoded in handle_data
+        self._divs: List[bool] = []  # open <div>s, True for result containers
+        self._parts: List[str] = []
+        self.result: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "div":
+            return
+        classes = (dict(attrs).get("class") or "").split()
+        is_result = any(c in _RESULT_CLASSES for c in classes)
+        if is_result:
+            self._parts = []  # a nested container replaces its parent's text
+        self._divs.append(is_result)
+
+    def handle_endtag(self, tag):
+        if tag != "div" or not self._divs:
+            return
+        # Containers close innermost-first, so the first one closed is the answer
+        if self._divs.pop() and self.result is None:
+            self.result = "".join(self._parts).strip()
+
+    def handle_data(self, data):
+        if self.result is None and any(self._divs):
+            self._parts.append(data)
+
+
+def _extract_result(page: str) -> Optional[str]:
+    parser = _ResultParser()
+    parser.feed(page)
+    parser.close()
+    return parser.result
+
+
+class GoogleModel:
+    """Translates via Google's free web endpoint on the shared HTTP client."""
+
+    BASE_URL = "https://translate.google.com/m"
+
+    def __init__(self, base_url: str = ""):
+        self.base_url = base_url or resolve(GOOGLE, self.BASE_URL)
+        self._languages: Optional[Dict[str, str]] = None  # deep-translator's name -> code table
+        self._pairs: Dict[Tuple[str, str], Tuple[str, str]] = {}  # Cache validated (sl, tl) code pairs
 
     def is_ready(self) -> bool:
         return True  # Always available — no API key needed
@@ -26,6 +78,46 @@ class GoogleModel:
             "details": {}
         }
 
+    def _code(self, lang: str) -> str:
+        """Google code for *lang* (a code like ``"zh-CN"`` or a name like ``"hindi"``)."""
+        from deep_translator.exceptions import LanguageNotSupportedException
+
+        if self._languages is None:
+            from deep_translator import GoogleTranslator  # deferred until first caption
+            table = GoogleTranslator().get_supported_languages(as_dict=True)
+            self._languages = table if isinstance(table, dict) else {}
+        languages = self._languages
+        if lang in languages.values():
+            return lang
+        code = languages.get(lang.lower())
+        if code is None:
+            raise LanguageNotSupportedException(lang)
+        return code
+
+    def _resolve_pair(self, source_lang: str, target_lang: str) -> Tuple[str, str]:
+        key = (source_lang, target_lang)
+        if key not in self._pairs:
+            sl = "auto" if source_lang == "auto" else self._code(source_lang)
+            self._pairs[key] = (sl, self._code(target_lang))
+        return self._pairs[key]
+
+    def _request(self, text: str, source: str, target: str) -> str | None:
+        from deep_translator.exceptions import TooManyRequests, RequestError, TranslationNotFound
+
+        text = text.strip()
+        if not text:
+            return text
+        params = {"sl": source, "tl": target, "q": text}
+        resp = get_http_client().get(self.base_url, params=params)
+        if resp.status_code == 429:
+            raise TooManyRequests()
+        if resp.status_code != 200:
+            raise RequestError()
+        result = _extract_result(resp.text)
+        if result is None:
+            raise TranslationNotFound(text)
+        return result
+
     def translate(self, text: str, source_lang: str, target_lang: str) -> tuple[str | None, dict]:
         """
         Translate *text* from *source_lang* to *target_lang*.
@@ -45,12 +137,8 @@ class GoogleModel:
                     "output_tokens": len(text),
                     "same_lang_passthrough": True,
                 }
-            key = (src, target_lang)
-            
-            if key not in self._translators:
-                self._translators[key] = GoogleTranslator(source=src, target=target_lang)
-            
-            result = self._translators[key].translate(text)
+            sl, tl = self._resolve_pair(src, target_lang)
+            result = self._request(text, sl, tl)
             latency_ms = int((time.monotonic() - start) * 1000)
             stats = {
                 "engine": "google-translate",
@@ -6,27 +6,78 @@ reliable fallback from other engines.
 
 import time
 import re
-from openai import OpenAI
+from functools import lru_cache
+from typing import Callable, Optional
+
+from src.utils.endpoints import NIM, resolve
+from src.utils.server_utils import estimate_tokens
+from .context_window import ConversationWindow
+
+# Common model preamble artifacts ("Translation:", "Sure! ...") stripped from output
+_PREAMBLE_RE = re.compile(
+    r'^(translation[:\s]+|translated text[:\s]+|here is.*?:|output[:\s]+|prompt[:\s]+|notes[:\s]+|p[:\s]+|in [a-z]+[:\s]+|sure[!,\s]+)',
+    flags=re.IGNORECASE,
+)
+
+# Streaming: hold partial output until this many chars arrived so a preamble
+# split across several tokens ("Transl" + "ation:") is never shown on screen.
+_PREAMBLE_HOLD_CHARS = 24
+# "Here is the translation in French:" has no fixed length — hold until the
+# colon shows up, but give up after this many chars (it was not a preamble).
+_PREAMBLE_HOLD_MAX_CHARS = 96
+
+
+def _strip_preamble(text: str) -> str:
+    return _PREAMBLE_RE.sub("", text.strip()).strip()
+
+
+def _cached_prompt_tokens(usage) -> int:
+    """Prompt tokens served from the server's prefix cache, when reported."""
+    details = getattr(usage, "prompt_tokens_details", None) if usage else None
+    return int(getattr(details, "cached_tokens", 0) or 0) if details else 0
+
+
+def _preamble_pending(raw: str) -> bool:
+    """True while *raw* may still turn out to start with a preamble."""
+    head = raw.lstrip()
+    if len(head) < _PREAMBLE_HOLD_CHARS:
+        return True
+    return (
+        head[:7].lower() == "here is"
+        and ":" not in head
+        and len(head) < _PREAMBLE_HOLD_MAX_CHARS
+    )
 
 
 class LlamaModel:
     """Wraps the Llama 3.1 8B Instruct endpoint served through NVIDIA NIM."""
 
     MODEL_ID = "meta/llama-3.1-8b-instruct"
+    BASE_URL = "https://integrate.api.nvidia.com/v1"
+
+    # Rolling context defaults: last K caption pairs, capped by estimated tokens
+    CONTEXT_MAX_PAIRS = 4
+    CONTEXT_TOKEN_BUDGET = 256
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def build_system_prompt(target_lang: str) -> str:
+        # Cached so the exact same string (byte-stable prompt prefix) is reused
+        # for every caption of a session — a precondition for prefix caching.
         return (
             f"You are a live speech translator. Translate the following spoken text into {target_lang}. "
             "The input may be a partial sentence, mid-thought, or contain mixed scripts — translate it anyway. "
+            "Earlier turns are previous captions, given only as context: translate ONLY the latest message. "
             f"NEVER transliterate. NEVER skip. ALWAYS output the {target_lang} translation and nothing else. "
             "No explanations, no labels, no original text."
         )
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, base_url: str = "", context_pairs: int = 0):
         self.api_key = api_key.strip() if api_key else ""
+        self.base_url = base_url or resolve(NIM, self.BASE_URL)
         self.client = None
         self._is_loading = False
+        self.context = ConversationWindow(context_pairs, self.CONTEXT_TOKEN_BUDGET)
         self._setup()
 
     # ── Setup ────────────────────────────────────────────────────────────────
@@ -36,8 +87,9 @@ class LlamaModel:
         try:
             if not self.api_key:
                 return
+            from openai import OpenAI  # deferred: ~0.5 s to import, unused without a NIM key
             self.client = OpenAI(
-                base_url="https://integrate.api.nvidia.com/v1",
+                base_url=self.base_url,
                 api_key=self.api_key,
             )
         except Exception as e:
@@ -50,6 +102,11 @@ class LlamaModel:
         self.api_key = api_key.strip() if api_key else ""
         self._setup()
 
+    def set_context_window(self, max_pairs: int, token_budget: int | None = None):
+        """Configure and reset the session conversation window (0 pairs disables it)."""
+        self.context.configure(max_pairs, token_budget)
+        self.context.clear()
+
     def is_ready(self) -> bool:
         return not self._is_loading and self.client is not None and bool(self.api_key)
 
@@ -81,46 +138,107 @@ class LlamaModel:
 
     # ── Translation ──────────────────────────────────────────────────────────
 
-    def translate(self, text: str, target_lang: str) -> tuple[str, dict]:
+    def translate(
+        self,
+        text: str,
+        target_lang: str,
+        on_partial: Optional[Callable[[str], None]] = None,
+    ) -> tuple[str, dict]:
         """
         Translate *text* to *target_lang* using Llama 3.1 8B.
         Returns (translated_text, usage_stats).
+
+        When *on_partial* is given the completion is streamed and
+        ``on_partial(text_so_far)`` is called at each word boundary with the
+        preamble-stripped translation, so the caption can be shown before the
+        model has finished generating.
         """
         if not self.client:
             raise RuntimeError("Llama client not initialized (missing API key).")
         start = time.monotonic()
         try:
             system_prompt = self.build_system_prompt(target_lang)
-            completion = self.client.chat.completions.create(
-                model=self.MODEL_ID,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": text},
-                ],
-                temperature=0,
-                max_tokens=512,
-            )
+            history = self.context.messages(target_lang) if self.context.enabled else []
+            messages = [
+                {"role": "system", "content": system_prompt},
+                *history,
+                {"role": "user", "content": text},
+            ]
+            if on_partial is not None:
+                raw, usage, ttft_ms = self._stream_completion(messages, on_partial)
+            else:
+                completion = self.client.chat.completions.create(
+                    model=self.MODEL_ID,
+                    messages=messages,
+                    temperature=0,
+                    max_tokens=512,
+                )
+                usage = completion.usage
+                raw = completion.choices[0].message.content or ""
+                ttft_ms = None
             latency_ms = int((time.monotonic() - start) * 1000)
-            usage = completion.usage
-            result = (completion.choices[0].message.content or "").strip()
-            # Strip common model preamble artifacts
-            result = re.sub(
-                r'^(translation[:\s]+|translated text[:\s]+|here is.*?:|output[:\s]+|prompt[:\s]+|notes[:\s]+|p[:\s]+|in [a-z]+[:\s]+|sure[!,\s]+)',
-                "",
-                result,
-                flags=re.IGNORECASE,
-            ).strip()
+            result = _strip_preamble(raw)
+            context_chars = sum(len(m["content"]) for m in history)
+            context_tokens = sum(estimate_tokens(m["content"]) for m in history)
             stats = {
                 "engine": "llama-translate",
                 "model": self.MODEL_ID,
                 "latency_ms": latency_ms,
                 "api_prompt_tokens": usage.prompt_tokens if usage else 0,
                 "api_completion_tokens": usage.completion_tokens if usage else 0,
-                "input_tokens": len(text) + len(system_prompt),
+                "api_cached_tokens": _cached_prompt_tokens(usage),
+                "prompt_tokens_est": estimate_tokens(system_prompt) + context_tokens + estimate_tokens(text),
+                "context_pairs": len(history) // 2,
+                "input_tokens": len(text) + len(system_prompt) + context_chars,
                 "output_tokens": len(result),
             }
+            if ttft_ms is not None:
+                stats["streamed"] = True
+                stats["ttft_ms"] = ttft_ms
+            self.context.add(text, result, target_lang)
             return result, stats
         except Exception as e:
             import logging
             logging.error(f"Llama translation error: {e}")
             raise
+
+    def _stream_completion(self, messages: list, on_partial: Callable[[str], None]) -> tuple:
+        """Stream a chat completion, emitting cleaned partials as tokens arrive.
+        Returns (raw_text, usage_or_None, ttft_ms)."""
+        assert self.client is not None
+        start = time.monotonic()
+        stream = self.client.chat.completions.create(
+            model=self.MODEL_ID,
+            messages=messages,
+            temperature=0,
+            max_tokens=512,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        raw = ""
+        emitted = ""
+        usage = None
+        ttft_ms = None
+        for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            if not delta:
+                continue
+            if ttft_ms is None:
+                ttft_ms = int((time.monotonic() - start) * 1000)
+            raw += delta
+            # Only push at word boundaries — one WS frame per word, not per token
+            if not any(ch.isspace() for ch in delta) or _preamble_pending(raw):
+                continue
+            partial = _strip_preamble(raw)
+            if partial and partial != emitted:
+                emitted = partial
+                try:
+                    on_partial(partial)
+                except Exception as e:
+                    import logging
+                    logging.warning(f"[Llama] Partial callback error: {e}")
+        return raw, usage, (ttft_ms if ttft_ms is not None else int((time.monotonic() - start) * 1000))
@@ -5,9 +5,9 @@ Free tier: ~1000 words/day per IP. Pass an email for 10x higher quota.
 """
 
 import time
-import urllib.parse
-import urllib.request
-import json
+
+from src.utils.endpoints import MYMEMORY, resolve
+from src.utils.http_client import get_http_client
 
 
 class MyMemoryModel:
@@ -15,9 +15,10 @@ class MyMemoryModel:
 
     BASE_URL = "https://api.mymemory.translated.net/get"
 
-    def __init__(self, email: str = ""):
+    def __init__(self, email: str = "", base_url: str = ""):
         # Optional: provide an email for higher daily quota
         self._email = email
+        self.base_url = base_url or resolve(MYMEMORY, self.BASE_URL)
 
     def is_ready(self) -> bool:
         return True
@@ -41,9 +42,10 @@ class MyMemoryModel:
             if self._email:
                 params["de"] = self._email
 
-            url = f"{self.BASE_URL}?{urllib.parse.urlencode(params)}"
-            with urllib.request.urlopen(url, timeout=8) as resp:
-                data = json.loads(resp.read().decode())
+            # Pooled keep-alive client — no per-caption DNS/TCP/TLS setup
+            resp = get_http_client().get(self.base_url, params=params, timeout=8)
+            resp.raise_for_status()
+            data = resp.json()
 
             match = data.get("responseData", {})
             result = match.get("translatedText") or None
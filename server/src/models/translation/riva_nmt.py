@@ -4,15 +4,18 @@ NVIDIA Riva NMT implementation.
 
 import logging
 import time
-import riva.client  # type: ignore[import]
+from src.utils.endpoints import RIVA, grpc_target, resolve
 from src.utils.language_support import RIVA_NMT_LANGS as RIVA_SUPPORTED_LANGS
 
 class RivaNMTModel:
     """Wraps NVIDIA Riva Neural Machine Translation (NMT)."""
 
-    def __init__(self, api_key: str, function_id: str = ""):
+    URI = "grpc.nvcf.nvidia.com:443"
+
+    def __init__(self, api_key: str, function_id: str = "", uri: str = ""):
         self.api_key = api_key.strip() if api_key else ""
         self.function_id = function_id.strip() if function_id else ""
+        self.uri, self.use_ssl = grpc_target(uri or resolve(RIVA, self.URI))
         self.nmt_client = None
         self._is_loading = False
         self._setup()
@@ -22,13 +25,14 @@ class RivaNMTModel:
         try:
             if not self.api_key:
                 return
-            
+            import riva.client  # type: ignore[import]  # deferred: gRPC + protobuf stubs
+
             auth_nmt = riva.client.Auth(
                 # Change the order to auth, then other args if needed, 
                 # but riva.client.Auth(None) is used for Bearer token usually.
                 None,
-                use_ssl=True,
-                uri="grpc.nvcf.nvidia.com:443",
+                use_ssl=self.use_ssl,
+                uri=self.uri,
                 metadata_args=[
                     ["authorization", f"Bearer {self.api_key}"],
                     ["function-id", self.function_id],
@@ -49,6 +53,13 @@ class RivaNMTModel:
     def is_ready(self) -> bool:
         return not self._is_loading and self.nmt_client is not None and bool(self.api_key)
 
+    def close(self):
+        """Close the gRPC channel (last session using these credentials ended)."""
+        channel = getattr(getattr(self.nmt_client, "auth", None), "channel", None)
+        if channel is not None:
+            channel.close()
+        self.nmt_client = None
+
     def supports_translation_pair(self, source_lang: str, target_lang: str) -> bool:
         src = "en" if source_lang == "auto" else source_lang
         # Riva does not support translating a language to itself (e.g., en:en)
@@ -3,3 +3,5 @@ from .session_handler import SessionHandler
 from .config_handler import ConfigHandler
 from .device_handler import DeviceHandler
 from .status_handler import StatusHandler
+from .ingest_handler import IngestHandler
+from .job_handler import JobHandler
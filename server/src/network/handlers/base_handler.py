@@ -1,17 +1,27 @@
 # Copyright (c) 2026 Omni Bridge. All rights reserved.
 
 import asyncio
-from typing import Dict, Any, Optional
-from src.pipeline import InferenceOrchestrator
-from src.audio.capture import AudioCapture
+from typing import Dict, Any, Optional, Union, TYPE_CHECKING
+from src.pipeline import InferenceOrchestrator, AsyncPipeline, SessionManager, JobManager
 from src.audio.meter import AudioMeter
 
+if TYPE_CHECKING:
+    from src.audio.capture import AudioCapture
+    from src.audio.remote import RemoteAudioSource
+
 class ServerContext:
     """Holds global server state to avoid global variables in entry point."""
     def __init__(self, manager):
         self.manager = manager
         self.orchestrator: Optional[InferenceOrchestrator] = None
-        self.audio_capture: Optional[AudioCapture] = None
+        # Event-loop pipeline for the current session (config "pipeline": "async")
+        self.pipeline: Optional[AsyncPipeline] = None
+        # Extra concurrent caption streams sharing the capture (open_pipeline)
+        self.sessions = SessionManager()
+        # Uploaded-file transcription (POST /jobs); shares models and rate limits with sessions
+        self.jobs = JobManager(registry=self.sessions.registry, rate_limiter=self.sessions.rate_limiter)
+        # AudioCapture, or RemoteAudioSource when audio_source is "remote" (/ingest)
+        self.audio_capture: Optional[Union["AudioCapture", "RemoteAudioSource"]] = None
         self.audio_meter: AudioMeter = AudioMeter()
         self.is_running = False
         self.session_id = 0
@@ -39,11 +49,31 @@ class ServerContext:
             "output_device_index": None,
             "desktop_volume": 1.0,
             "mic_volume": 1.0,
+            # Stream Llama output as non-final captions (time-to-first-word = TTFT)
+            "llama_streaming": False,
+            # Rolling caption context sent to Llama (0 = translate each caption alone)
+            "llama_context_pairs": 0,
+            # Max ms a trailing sentence fragment is held for the rest of the sentence (0 = off)
+            "sentence_max_wait_ms": 0,
+            # Pipeline queue bounds/policies, e.g. {"translation_policy": "drop_oldest"}
+            "queue_policy": {},
+            # Per-engine RPM/TPM overrides, e.g. {"llama": {"rpm": 30, "tpm": 20000}}
+            "rate_limits": {},
+            # "threaded" (worker threads) or "async" (asyncio tasks on the server loop)
+            "pipeline": "threaded",
+            # "local" (WASAPI capture) or "remote" (PCM/Opus streamed to /ingest)
+            "audio_source": "local",
         }
 
     def reset(self):
         """Clears user-specific configuration and the orchestrator to ensure a fresh session."""
         self.quota_remaining = -1
+        if self.pipeline:
+            self.pipeline.stop()
+            self.pipeline = None
+        self.sessions.close_all()
+        if self.orchestrator:
+            self.orchestrator.close()
         self.orchestrator = None
         self.config["nvidia_nim_key"] = ""
         self.config["google_credentials"] = {}
@@ -58,6 +88,13 @@ class ServerContext:
         self.config["ai_engine"] = "google"
         self.config["transcription_model"] = "online"
         self.config["translation_model"] = "google"
+        self.config["llama_context_pairs"] = 0
+        self.config["sentence_max_wait_ms"] = 0
+        self.config["queue_policy"] = {}
+        self.config["rate_limits"] = {}
+        self.sessions.rate_limiter.reset()
+        self.config["pipeline"] = "threaded"
+        self.config["audio_source"] = "local"
 
     def get_server_context(self):
         """Returns context for audio_poll_loop."""
@@ -68,6 +105,10 @@ class ServerContext:
             "ai_engine": self.config["ai_engine"],
             "transcription_model": self.config["transcription_model"],
             "translation_model": self.config["translation_model"],
+            "llama_streaming": self.config["llama_streaming"],
+            "llama_context_pairs": self.config["llama_context_pairs"],
+            "sentence_max_wait_ms": self.config["sentence_max_wait_ms"],
+            "queue_policy": self.config["queue_policy"],
         }
 
 class BaseHandler:
@@ -2,6 +2,8 @@
 
 import logging
 from typing import Dict, Any
+from src.utils import safe_int
+from src.utils.bounded_queue import clean_queue_policy
 from .base_handler import BaseHandler
 
 class ConfigHandler(BaseHandler):
@@ -17,6 +19,28 @@ class ConfigHandler(BaseHandler):
         new_riva_tl_id = msg.get("riva_translation_function_id", self.ctx.config["riva_translation_function_id"]) or msg.get("rivaTranslationFunctionId") or ""
         new_riva_asr_p_id = msg.get("riva_asr_parakeet_function_id", self.ctx.config["riva_asr_parakeet_function_id"]) or msg.get("rivaAsrParakeetFunctionId") or ""
         new_riva_asr_c_id = msg.get("riva_asr_canary_function_id", self.ctx.config["riva_asr_canary_function_id"]) or msg.get("rivaAsrCanaryFunctionId") or ""
+        new_llama_streaming = bool(msg.get("llama_streaming", self.ctx.config["llama_streaming"]))
+        new_llama_context = safe_int(msg.get("llama_context_pairs", self.ctx.config["llama_context_pairs"]),
+                                     default=self.ctx.config["llama_context_pairs"])
+        new_sentence_wait = safe_int(msg.get("sentence_max_wait_ms", self.ctx.config["sentence_max_wait_ms"]),
+                                     default=self.ctx.config["sentence_max_wait_ms"])
+
+        # Queue bounds/policies and rate limits apply live — no pipeline restart needed
+        new_queue_policy = clean_queue_policy(msg.get("queue_policy"))
+        if new_queue_policy:
+            self.ctx.config["queue_policy"] = {**self.ctx.config["queue_policy"], **new_queue_policy}
+            if self.ctx.pipeline:
+                self.ctx.pipeline.configure_queues(self.ctx.config["queue_policy"])
+            elif self.ctx.orchestrator:
+                self.ctx.orchestrator.configure_queues(self.ctx.config["queue_policy"])
+
+        new_rate_limits = msg.get("rate_limits")
+        if isinstance(new_rate_limits, dict):
+            # One limiter shared by the primary orchestrator and every extra session;
+            # only the limits it accepted are kept in the config
+            applied = self.ctx.sessions.rate_limiter.configure(new_rate_limits)
+            self.ctx.config["rate_limits"] = {**self.ctx.config["rate_limits"], **applied}
+            logging.info(f"[Handler] Rate limits updated: {applied}")
  
         # Whether model-level settings changed (requires full pipeline restart + model reinit)
         has_model_changed = (
@@ -37,7 +61,10 @@ class ConfigHandler(BaseHandler):
             self.ctx.config["source_lang"] != new_source or
             self.ctx.config["target_lang"] != new_target or
             self.ctx.config["ai_engine"] != new_engine or
-            self.ctx.config["use_mic"] != new_mic
+            self.ctx.config["use_mic"] != new_mic or
+            self.ctx.config["llama_streaming"] != new_llama_streaming or
+            self.ctx.config["llama_context_pairs"] != new_llama_context or
+            self.ctx.config["sentence_max_wait_ms"] != new_sentence_wait
         )
 
         self.ctx.config.update({
@@ -52,6 +79,9 @@ class ConfigHandler(BaseHandler):
             "riva_translation_function_id": new_riva_tl_id,
             "riva_asr_parakeet_function_id": new_riva_asr_p_id,
             "riva_asr_canary_function_id": new_riva_asr_c_id,
+            "llama_streaming": new_llama_streaming,
+            "llama_context_pairs": new_llama_context,
+            "sentence_max_wait_ms": new_sentence_wait,
         })
 
         if self.ctx.is_running and has_changed:
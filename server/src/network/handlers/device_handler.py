@@ -61,8 +61,7 @@ class DeviceHandler(BaseHandler):
 
     async def list_devices(self, websocket, msg: Dict[str, Any]):
         devices = await self.get_device_list()
-        import json
         response = {"type": "devices"}
         if isinstance(devices, dict):
             response.update(devices)
-        await websocket.send_text(json.dumps(response))
+        await self.ctx.manager.send(websocket, response)
@@ -0,0 +1,67 @@
+# Copyright (c) 2026 Omni Bridge. All rights reserved.
+
+import json
+import logging
+from typing import Optional
+
+from fastapi import WebSocket
+
+from .base_handler import BaseHandler
+from src.audio.remote import PCM16, RemoteAudioSource
+from src.network.serialization import encode
+
+# Close codes: no remote-audio session to feed (try again later), bad stream parameters
+_NO_SESSION_CLOSE_CODE = 1013
+_BAD_PARAMS_CLOSE_CODE = 1003
+
+
+class IngestHandler(BaseHandler):
+    async def serve(self, websocket: WebSocket):
+        """``/ingest`` — feed a thin client's audio into the running remote-audio session."""
+        await websocket.accept()
+        source = self.ctx.audio_capture
+        if not isinstance(source, RemoteAudioSource) or not self.ctx.is_running:
+            await websocket.close(code=_NO_SESSION_CLOSE_CODE,
+                                  reason='no session with audio_source "remote" is running')
+            return
+
+        params = websocket.query_params
+        try:
+            stream = source.open_stream(
+                native_rate=int(params.get("sample_rate", source.sample_rate)),
+                channels=int(params.get("channels", 1)),
+                codec=params.get("codec", PCM16),
+                jitter_frames=int(params.get("jitter_frames", 5)),
+            )
+        except ValueError as e:
+            await websocket.close(code=_BAD_PARAMS_CLOSE_CODE, reason=str(e))
+            return
+        logging.info(f"[Ingest] Stream opened from {websocket.client}: {stream.native_rate} Hz, "
+                     f"{stream.channels} ch, {stream.codec}")
+
+        try:
+            while source.stream is stream:
+                frame = await websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    break
+                if frame.get("bytes") is not None:
+                    ack = stream.feed(frame["bytes"])
+                    text = encode(ack) if ack is not None else None
+                    if text is not None:
+                        await websocket.send_text(text)
+                elif _command(frame.get("text")) == "end":
+                    break
+        except Exception as e:
+            logging.warning(f"[Ingest] Stream ended with error: {e}")
+        finally:
+            source.close_stream(stream)
+            logging.info(f"[Ingest] Stream closed: {stream.received} frames, {stream.jitter.lost} lost, "
+                         f"{stream.jitter.late} late")
+
+
+def _command(text: Optional[str]) -> Optional[str]:
+    try:
+        msg = json.loads(text or "")
+    except json.JSONDecodeError:
+        return None
+    return msg.get("cmd") if isinstance(msg, dict) else None
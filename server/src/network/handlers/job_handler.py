@@ -0,0 +1,59 @@
+# Copyright (c) 2026 Omni Bridge. All rights reserved.
+
+from typing import Any, Dict
+
+from fastapi import HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from .base_handler import BaseHandler
+from src.pipeline.batch_jobs import BatchJob, DONE, FORMATS
+
+# Session settings a job may override per request (query parameters)
+_JOB_PARAMS = ("source_lang", "target_lang", "transcription_model", "translation_model")
+_MEDIA_TYPES = {"srt": "application/x-subrip", "vtt": "text/vtt"}
+
+
+class JobHandler(BaseHandler):
+    async def create_job(self, request: Request) -> Dict[str, Any]:
+        """``POST /jobs`` — the request body is a WAV file; languages and models
+        default to the current session settings."""
+        params = request.query_params
+        config = dict(self.ctx.config)
+        config.update({key: params[key] for key in _JOB_PARAMS if params.get(key)})
+        if params.get("max_segment_s"):
+            try:
+                config["max_segment_s"] = float(params["max_segment_s"])
+            except ValueError:
+                raise HTTPException(status_code=400, detail="max_segment_s must be a number")
+        audio = await request.body()
+        try:
+            job = self.ctx.jobs.submit(audio, config)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except RuntimeError as e:
+            raise HTTPException(status_code=429, detail=str(e))
+        return job.get_status()
+
+    async def get_job(self, job_id: str) -> Dict[str, Any]:
+        return self._job(job_id).get_status()
+
+    async def get_result(self, job_id: str, fmt: str) -> Any:
+        job = self._job(job_id)
+        if fmt not in FORMATS:
+            raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(FORMATS)}")
+        if job.status != DONE:
+            raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+        result = job.render(fmt)
+        if fmt in _MEDIA_TYPES:
+            return PlainTextResponse(result, media_type=_MEDIA_TYPES[fmt])
+        return result
+
+    async def cancel_job(self, job_id: str) -> Dict[str, Any]:
+        job = self._job(job_id)
+        return {"job_id": job_id, "cancelled": self.ctx.jobs.cancel(job_id), "status": job.status}
+
+    def _job(self, job_id: str) -> BatchJob:
+        job = self.ctx.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"No job {job_id!r}")
+        return job
@@ -3,18 +3,24 @@
 import asyncio
 import logging
 import threading
+from functools import partial
 from typing import Dict, Any
 
 from .base_handler import BaseHandler
-from src.pipeline import InferenceOrchestrator
-from src.audio.capture import AudioCapture
+from src.pipeline import InferenceOrchestrator, AsyncPipeline, stream_kwargs
+from src.audio.remote import RemoteAudioSource
 from src.audio.handler import (
     audio_poll_loop, 
     audio_level_broadcast_loop, 
     status_broadcast_loop,
-    caption_callback
+    caption_callback,
 )
 
+def _audio_backlog(pipeline) -> float:
+    """Fill fraction of *pipeline*'s ASR audio queue."""
+    audio = pipeline.get_queue_stats()["audio"]
+    return audio["size"] / max(1, audio["maxsize"])
+
 class SessionHandler(BaseHandler):
     async def start(self, websocket, msg: Dict[str, Any], reload_models: bool = True):
         # Update config from message
@@ -33,6 +39,12 @@ class SessionHandler(BaseHandler):
             "output_device_index": msg.get("output_device_index"),
             "desktop_volume": msg.get("desktop_volume"),
             "mic_volume": msg.get("mic_volume"),
+            "llama_streaming": msg.get("llama_streaming"),
+            "llama_context_pairs": msg.get("llama_context_pairs"),
+            "sentence_max_wait_ms": msg.get("sentence_max_wait_ms"),
+            "queue_policy": msg.get("queue_policy"),
+            "pipeline": msg.get("pipeline"),
+            "audio_source": msg.get("audio_source"),
         }
 
         for key, value in updates.items():
@@ -86,8 +98,11 @@ class SessionHandler(BaseHandler):
                     google_credentials=self.ctx.config["google_credentials"],
                     riva_translation_id=self.ctx.config["riva_translation_function_id"],
                     riva_asr_parakeet_id=self.ctx.config["riva_asr_parakeet_function_id"],
-                    riva_asr_canary_id=self.ctx.config["riva_asr_canary_function_id"]
+                    riva_asr_canary_id=self.ctx.config["riva_asr_canary_function_id"],
+                    registry=self.ctx.sessions.registry,
+                    rate_limiter=self.ctx.sessions.rate_limiter,
                 )
+                self.ctx.orchestrator.rate_limiter.configure(self.ctx.config["rate_limits"])
             elif reload_models:
                 # Only reinitialize models when model/key settings actually changed.
                 # Skipping this for lang/device-only changes avoids the 5-20s Riva reinit delay.
@@ -116,80 +131,165 @@ class SessionHandler(BaseHandler):
                 f"(first chunk: {_first_chunk_dur}s, NIM models: {num_nim})"
             )
 
-            self.ctx.audio_capture = AudioCapture(
-                sample_rate=16000,
-                chunk_duration=_chunk_dur,
-                first_chunk_duration=_first_chunk_dur,
-                use_mic=self.ctx.config["use_mic"],
-                input_device_index=self.ctx.config["input_device_index"],
-                output_device_index=self.ctx.config["output_device_index"],
-                desktop_volume=self.ctx.config["desktop_volume"],
-                mic_volume=self.ctx.config["mic_volume"],
-            )
+            if self.ctx.config["audio_source"] == "remote":
+                # Audio arrives over /ingest (IngestHandler) instead of a local device
+                self.ctx.audio_capture = RemoteAudioSource(
+                    sample_rate=16000,
+                    chunk_duration=_chunk_dur,
+                    first_chunk_duration=_first_chunk_dur,
+                    desktop_volume=self.ctx.config["desktop_volume"],
+                )
+            else:
+                from src.audio.capture import AudioCapture  # PyAudioWPatch — Windows only
+                self.ctx.audio_capture = AudioCapture(
+                    sample_rate=16000,
+                    chunk_duration=_chunk_dur,
+                    first_chunk_duration=_first_chunk_dur,
+                    use_mic=self.ctx.config["use_mic"],
+                    input_device_index=self.ctx.config["input_device_index"],
+                    output_device_index=self.ctx.config["output_device_index"],
+                    desktop_volume=self.ctx.config["desktop_volume"],
+                    mic_volume=self.ctx.config["mic_volume"],
+                )
+
+            if self.ctx.config["pipeline"] == "async":
+                # Capture pushes chunks straight onto the loop — no poll thread
+                self.ctx.pipeline = AsyncPipeline(self.ctx.orchestrator)
+            self.ctx.audio_capture.on_chunk = self._route_chunk
+            if isinstance(self.ctx.audio_capture, RemoteAudioSource):
+                # Ack window follows the ASR queue the chunks end up in
+                self.ctx.audio_capture.backlog = partial(_audio_backlog, self.ctx.pipeline or self.ctx.orchestrator)
 
             self.ctx.is_running = True
             self.ctx.audio_capture.start()
 
             loop = asyncio.get_running_loop()
 
-            def wrap_callback(text, is_error, is_final=True, original_text=None, usage_stats=None):
-                # Mid-session quota enforcement: deduct chars consumed by this chunk.
-                # quota_remaining == -1 means unlimited — skip tracking entirely.
-                if not is_error and is_final and self.ctx.quota_remaining >= 0 and usage_stats:
-                    stats_list = usage_stats if isinstance(usage_stats, list) else [usage_stats]
-                    chars_used = sum(
-                        (s.get("input_tokens", 0) + s.get("output_tokens", 0))
-                        for s in stats_list if s
-                    )
-                    self.ctx.quota_remaining -= chars_used
-                    if self.ctx.quota_remaining <= 0:
-                        asyncio.run_coroutine_threadsafe(
-                            self.ctx.manager.broadcast({
-                                "type": "quota_exceeded",
-                                "text": "Daily character quota reached. Session stopped.",
-                                "is_final": True,
-                                "original": "",
-                            }),
-                            loop,
-                        )
-                        self.ctx.is_running = False
-                        if self.ctx.orchestrator:
-                            self.ctx.orchestrator.stop_stream()
-                        logging.warning("[Handler] Session stopped — daily quota reached mid-session.")
-                        return
-
-                caption_callback(
-                    text, is_error,
-                    is_final=is_final,
-                    original_text=original_text,
-                    usage_stats=usage_stats,
-                    event_loop=loop,
-                    manager=self.ctx.manager,
-                    session_id=self.ctx.session_id,
-                    source_lang=self.ctx.config["source_lang"],
-                    target_lang=self.ctx.config["target_lang"],
-                )
+            wrap_callback = self._make_callback(loop)
 
-            threading.Thread(
-                target=audio_poll_loop,
-                args=(self.ctx.session_id, lambda: self.ctx.is_running, self.ctx.audio_capture, 
-                      self.ctx.orchestrator, self.ctx.get_server_context, wrap_callback),
-                daemon=True
-            ).start()
+            if self.ctx.pipeline:
+                started = await self.ctx.pipeline.start(
+                    sample_rate=self.ctx.audio_capture.sample_rate,
+                    callback=wrap_callback,
+                    **stream_kwargs(self.ctx.get_server_context()),
+                )
+                if not started:
+                    logging.warning(f"[Handler] Async pipeline failed preflight for session {self.ctx.session_id}")
+            else:
+                threading.Thread(
+                    target=audio_poll_loop,
+                    args=(self.ctx.session_id, lambda: self.ctx.is_running, self.ctx.audio_capture, 
+                          self.ctx.orchestrator, self.ctx.get_server_context, wrap_callback),
+                    name="AudioPoll",
+                    daemon=True
+                ).start()
 
             await self._start_metering()
             await self.ctx.manager.broadcast_status(self.ctx.orchestrator)
             logging.info(f"[Handler] Started session {self.ctx.session_id}")
 
+    def _make_callback(self, loop, session_id=None, source_lang=None, target_lang=None):
+        """Caption callback for a pipeline. With no explicit ids/langs it reports the
+        primary session's current values; extra sessions pass their own."""
+        ctx = self.ctx
+
+        def wrap_callback(text, is_error, is_final=True, original_text=None, usage_stats=None, trace=None):
+            # Mid-session quota enforcement: deduct chars consumed by this chunk.
+            # quota_remaining == -1 means unlimited — skip tracking entirely.
+            # Extra sessions draw on the same daily quota as the primary one.
+            if not is_error and is_final and ctx.quota_remaining >= 0 and usage_stats:
+                stats_list = usage_stats if isinstance(usage_stats, list) else [usage_stats]
+                chars_used = sum(
+                    (s.get("input_tokens", 0) + s.get("output_tokens", 0))
+                    for s in stats_list if s
+                )
+                ctx.quota_remaining -= chars_used
+                if ctx.quota_remaining <= 0:
+                    asyncio.run_coroutine_threadsafe(
+                        ctx.manager.broadcast({
+                            "type": "quota_exceeded",
+                            "text": "Daily character quota reached. Session stopped.",
+                            "is_final": True,
+                            "original": "",
+                        }),
+                        loop,
+                    )
+                    ctx.is_running = False
+                    self._stop_pipeline()
+                    loop.call_soon_threadsafe(ctx.sessions.close_all)
+                    logging.warning("[Handler] Session stopped — daily quota reached mid-session.")
+                    return
+
+            caption_callback(
+                text, is_error,
+                is_final=is_final,
+                original_text=original_text,
+                usage_stats=usage_stats,
+                event_loop=loop,
+                manager=ctx.manager,
+                session_id=ctx.session_id if session_id is None else session_id,
+                source_lang=source_lang or ctx.config["source_lang"],
+                target_lang=target_lang or ctx.config["target_lang"],
+                trace=trace,
+            )
+
+        return wrap_callback
+
+    def _route_chunk(self, chunk, trace=None):
+        """Capture thread → primary pipeline, plus every extra session."""
+        if self.ctx.pipeline:
+            self.ctx.pipeline.append_audio(chunk, trace)
+        elif self.ctx.audio_capture:
+            self.ctx.audio_capture.audio_queue.put((chunk, self.ctx.audio_capture.sample_rate, trace))
+        self.ctx.sessions.append_audio(chunk, trace)
+
+    async def open_pipeline(self, websocket, msg: Dict[str, Any]):
+        """Open an extra caption stream (own language pair/engines) on the shared capture."""
+        config = {**self.ctx.config}
+        overrides = {
+            "source_lang": msg.get("source"),
+            "target_lang": msg.get("target"),
+            "translation_model": msg.get("translation_model"),
+            "transcription_model": msg.get("transcription_model"),
+            "llama_streaming": msg.get("llama_streaming"),
+            "llama_context_pairs": msg.get("llama_context_pairs"),
+            "sentence_max_wait_ms": msg.get("sentence_max_wait_ms"),
+            "queue_policy": msg.get("queue_policy"),
+        }
+        config.update({k: v for k, v in overrides.items() if v is not None})
+        loop = asyncio.get_running_loop()
+        try:
+            session = await self.ctx.sessions.open(
+                config,
+                lambda sid: self._make_callback(loop, sid, config["source_lang"], config["target_lang"]),
+            )
+        except RuntimeError as e:
+            await self.ctx.manager.broadcast({"type": "error", "text": f"⚠ {e}", "is_final": True, "original": ""})
+            return
+        if session is None:
+            return  # preflight already reported the error through the callback
+        await self.ctx.manager.broadcast({"type": "pipeline_opened", **session.get_status()})
+        if not self.ctx.is_running:
+            logging.info(f"[Handler] {session.session_id} opened; captions start with the next capture session.")
+
+    async def close_pipeline(self, websocket, msg: Dict[str, Any]):
+        session_id = str(msg.get("session_id", ""))
+        if self.ctx.sessions.close(session_id):
+            await self.ctx.manager.broadcast({"type": "pipeline_closed", "session_id": session_id})
+
     async def _start_metering(self):
         await asyncio.sleep(2.0)
         if not self.ctx.is_running: return
-        self.ctx.audio_meter.configure(
-            input_device_index=self.ctx.config["input_device_index"] if self.ctx.config["use_mic"] else None,
-            output_device_index=self.ctx.config["output_device_index"]
-        )
-        self.ctx.audio_meter.start()
-        self.ctx.meter_task = asyncio.create_task(audio_level_broadcast_loop(lambda: self.ctx.is_running, self.ctx.audio_meter, self.ctx.manager))
+        if isinstance(self.ctx.audio_capture, RemoteAudioSource):
+            meter = self.ctx.audio_capture  # levels of the ingested audio
+        else:
+            self.ctx.audio_meter.configure(
+                input_device_index=self.ctx.config["input_device_index"] if self.ctx.config["use_mic"] else None,
+                output_device_index=self.ctx.config["output_device_index"]
+            )
+            self.ctx.audio_meter.start()
+            meter = self.ctx.audio_meter
+        self.ctx.meter_task = asyncio.create_task(audio_level_broadcast_loop(lambda: self.ctx.is_running, meter, self.ctx.manager))
         asyncio.create_task(status_broadcast_loop(lambda: self.ctx.is_running, self.ctx.manager, self.ctx.orchestrator))
 
     async def stop(self, websocket, msg: Dict[str, Any]):
@@ -200,6 +300,14 @@ class SessionHandler(BaseHandler):
         self.ctx.audio_meter.stop()
         if self.ctx.audio_capture:
             self.ctx.audio_capture.stop()
-        if self.ctx.orchestrator:
-            self.ctx.orchestrator.stop_stream()
+        self._stop_pipeline()
+        self.ctx.manager.status.notify()  # let the status loop see is_running and exit
         logging.info("[Handler] Stopped session")
+
+    def _stop_pipeline(self):
+        """Stop whichever pipeline runs the session. Safe from any thread."""
+        if self.ctx.pipeline:
+            self.ctx.pipeline.stop()
+            self.ctx.pipeline = None
+        elif self.ctx.orchestrator:
+            self.ctx.orchestrator.stop_stream()
@@ -1,8 +1,17 @@
 # Copyright (c) 2026 Omni Bridge. All rights reserved.
 
+import asyncio
+from functools import partial
 from typing import Dict, Any
+
+from fastapi import HTTPException
+from fastapi.responses import PlainTextResponse
+
 from .base_handler import BaseHandler
 from src.pipeline import InferenceOrchestrator
+from src.utils.metrics import metrics
+from src.utils import profiler as profiling
+from src.utils.system_probe import system_probe
 
 class StatusHandler(BaseHandler):
     async def get_system_status(self):
@@ -11,15 +20,32 @@ class StatusHandler(BaseHandler):
             "status": "online",
             "session_id": self.ctx.session_id,
             "is_running": self.ctx.is_running,
-            "active_clients": len(self.ctx.manager.active_connections)
+            "active_clients": len(self.ctx.manager.active_connections),
+            "websocket": self.ctx.manager.get_stats(),
+            "queues": self.get_queue_stats(),
+            "latency": metrics.snapshot(),
+            "system": system_probe.snapshot(),
         }
 
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """Queue depth, high-water marks and overload counters per pipeline stage."""
+        queues: Dict[str, Any] = {}
+        if self.ctx.audio_capture:
+            queues["capture"] = self.ctx.audio_capture.audio_queue.stats()
+        if self.ctx.pipeline:
+            queues.update(self.ctx.pipeline.get_queue_stats())
+        elif self.ctx.orchestrator:
+            queues.update(self.ctx.orchestrator.get_queue_stats())
+        return queues
+
     async def get_model_status(self):
         """Physical model health and capabilities."""
         if not self.ctx.orchestrator:
             self.ctx.orchestrator = InferenceOrchestrator(
                 nvidia_api_key=self.ctx.config.get("nvidia_nim_key", ""),
-                google_credentials=self.ctx.config.get("google_credentials", {})
+                google_credentials=self.ctx.config.get("google_credentials", {}),
+                registry=self.ctx.sessions.registry,
+                rate_limiter=self.ctx.sessions.rate_limiter,
             )
         
         return {
@@ -27,6 +53,10 @@ class StatusHandler(BaseHandler):
             "models": self.ctx.orchestrator.get_all_statuses()
         }
 
+    async def send_model_status(self, websocket, msg: Dict[str, Any]) -> None:
+        """``get_model_status`` — full snapshot to this client; ``deltas: true`` opts into delta updates."""
+        await self.ctx.manager.send_status(websocket, self.ctx.orchestrator, deltas=msg.get("deltas"))
+
     async def whisper_unload(self):
         """Unload Whisper model from memory."""
         if self.ctx.orchestrator:
@@ -34,6 +64,24 @@ class StatusHandler(BaseHandler):
             return {"status": "unloaded"}
         return {"status": "no_orchestrator"}
 
+    async def get_profile(self, seconds: float, interval_ms: float, threads: str = "",
+                          idle: bool = True, fmt: str = "collapsed"):
+        """Sample every thread's stack for *seconds*: collapsed stacks, or JSON with per-thread CPU."""
+        if not profiling.enabled():
+            raise HTTPException(status_code=404,
+                                detail=f"Profiling is off; start the server with {profiling.PROFILING_ENV}=true")
+        if fmt not in ("collapsed", "json"):
+            raise HTTPException(status_code=400, detail="format must be collapsed or json")
+        prefixes = [t.strip() for t in threads.split(",") if t.strip()]
+        run = partial(profiling.profiler.run, seconds, interval_ms / 1000.0, prefixes, idle)
+        try:
+            profile = await asyncio.get_running_loop().run_in_executor(None, run)
+        except RuntimeError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        if fmt == "collapsed":
+            return PlainTextResponse(profile.collapsed())
+        return profile.to_dict()
+
     async def reset_session(self, websocket, data) -> None:
         """Resets the server context and informs all clients."""
         self.ctx.reset()
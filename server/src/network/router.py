@@ -2,7 +2,9 @@
 
 import json
 import logging
-from typing import Dict, Any, Callable, Awaitable
+from typing import Dict, Any, Callable, Awaitable, Optional, Union
+
+from .serialization import Codec
 
 class CommandRouter:
     """
@@ -15,10 +17,19 @@ class CommandRouter:
         """Register a handler function for a specific command."""
         self.handlers[cmd] = handler
 
-    async def handle(self, websocket, data: str):
-        """Parse and route the message."""
+    async def handle(self, websocket, data: Union[str, bytes], codec: Optional[Codec] = None):
+        """Parse and route the message. Binary frames are decoded with the client's *codec*."""
         try:
-            msg = json.loads(data)
+            if isinstance(data, (bytes, bytearray)):
+                if codec is None or not codec.binary:
+                    logging.warning("[Router] Binary frame from a client that did not negotiate a binary encoding")
+                    return
+                msg = codec.decode(bytes(data))
+            else:
+                msg = json.loads(data)
+            if not isinstance(msg, dict):
+                logging.warning(f"[Router] Ignoring non-object message: {msg!r:.80}")
+                return
             cmd = msg.get("cmd")
             
             if not cmd:
@@ -31,5 +42,8 @@ class CommandRouter:
                 logging.warning(f"[Router] No handler registered for command: {cmd}")
         except json.JSONDecodeError:
             logging.error(f"[Router] Failed to decode JSON message: {data}")
+        except (ValueError, TypeError) as e:
+            # msgpack/cbor decode errors subclass ValueError
+            logging.error(f"[Router] Failed to decode {codec.name if codec else 'binary'} message: {e}")
         except Exception as e:
             logging.error(f"[Router] Error handling command: {e}", exc_info=True)
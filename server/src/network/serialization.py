@@ -0,0 +1,220 @@
+"""
+serialization.py — One JSON encoder for every WebSocket frame.
+
+``encode`` uses orjson when it is installed (about 5-10x faster than
+``json.dumps`` on caption and status messages) and the standard library
+otherwise. Both produce the same compact JSON. Types the pipeline puts into
+messages are handled on the first pass, not by a retry with ``default=str``:
+
+  - NumPy arrays and scalars (RMS levels, confidences)
+  - protobuf messages and repeated fields (Riva responses)
+  - sets, tuples and other iterables
+
+``FrameTemplate`` caches the encoded text of a message's fixed parts (its
+``type`` and key names), so high-rate frames like ``audio_levels`` only
+encode their values — on the stdlib path. orjson encodes a small dict
+faster than Python can fill a template, so with orjson the template just
+hands the dict to the encoder. ``EncodedCache`` reuses the last encoding of
+a message that hasn't changed, such as a periodic ``model_status``.
+
+Clients may opt into a binary encoding instead of JSON (see ``Codec``):
+MessagePack (``msgpack``) or CBOR (``cbor2``), whichever is installed.
+Binary frames carry the same message objects as the JSON ones.
+"""
+
+import json
+import logging
+import math
+from collections.abc import Iterable
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson  # type: ignore[import]
+    HAS_ORJSON = True
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+try:
+    import msgpack  # type: ignore[import]
+    HAS_MSGPACK = True
+except ImportError:
+    msgpack = None
+    HAS_MSGPACK = False
+
+try:
+    import cbor2  # type: ignore[import]
+    HAS_CBOR = True
+except ImportError:
+    cbor2 = None
+    HAS_CBOR = False
+
+Frame = Union[str, bytes]
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types neither encoder handles natively."""
+    if hasattr(obj, "DESCRIPTOR") and hasattr(obj, "ListFields"):  # protobuf message
+        from google.protobuf.json_format import MessageToDict
+        return MessageToDict(obj)
+    if hasattr(obj, "tolist"):  # numpy (stdlib path)
+        return obj.tolist()
+    if hasattr(obj, "item"):  # numpy scalar
+        return obj.item()
+    # Registered ABC check: upb repeated fields have no __iter__ attribute
+    if isinstance(obj, Iterable) and not isinstance(obj, (str, bytes, dict)):
+        return list(obj)
+    try:
+        return str(obj)
+    except Exception:
+        return f"<unserializable {type(obj).__name__}>"
+
+
+def _encode_stdlib(obj: Any) -> str:
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def encode(message: Any) -> Optional[str]:
+    """Compact JSON text for *message*, or None if it can't be encoded at all."""
+    if HAS_ORJSON and orjson is not None:
+        try:
+            return orjson.dumps(message, default=_default, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits — the stdlib encoder copes
+    try:
+        return _encode_stdlib(message)
+    except Exception as e:
+        logging.error(f"[WS] Serialization failed: {e}")
+        return None
+
+
+def _encode_value(value: Any) -> str:
+    return encode(value) or "null"
+
+
+class FrameTemplate:
+    """Pre-encoded ``{"type": ..., "<field>": <value>, ...}`` frame with fixed fields.
+
+    ``render`` fills the encoded values into the cached frame text, so only
+    the values are serialized per frame.
+    """
+
+    def __init__(self, msg_type: str, fields: Tuple[str, ...], static: Optional[Dict[str, Any]] = None):
+        self.msg_type = msg_type
+        self.fields = fields
+        head = {"type": msg_type, **(static or {})}
+        self._head = head
+        prefix = encode(head)[:-1]  # type: ignore[index]  # drop the closing brace
+        # One %-format with the encoded head and key names baked in
+        self._format = prefix.replace("%", "%%") + "".join(
+            f',"{name}":%s' for name in fields
+        ) + "}"
+
+    def render(self, *values: Any) -> str:
+        if len(values) != len(self.fields):
+            raise ValueError(f"{self.msg_type} frame expects {len(self.fields)} values, got {len(values)}")
+        if HAS_ORJSON:
+            return encode(self.message(*values))  # type: ignore[return-value]
+        return self._format % tuple(map(_encode_scalar, values))
+
+    def message(self, *values: Any) -> Dict[str, Any]:
+        """The frame as a dict (for binary codecs)."""
+        message = dict(self._head)
+        message.update(zip(self.fields, values))
+        return message
+
+
+def _encode_scalar(value: Any) -> str:
+    # Floats/ints/bools are the common case for templated frames — skip the encoder
+    if type(value) is float:
+        return repr(value) if math.isfinite(value) else "null"
+    if type(value) is int:
+        return str(value)
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if value is None:
+        return "null"
+    return _encode_value(value)
+
+
+class Codec:
+    """One wire encoding: how messages become frames and frames become messages."""
+
+    def __init__(self, name: str, binary: bool, encode_fn: Callable[[Any], Optional[Frame]],
+                 decode_fn: Callable[[Frame], Any]):
+        self.name = name
+        self.binary = binary
+        self._encode = encode_fn
+        self._decode = decode_fn
+
+    def encode(self, message: Any) -> Optional[Frame]:
+        try:
+            return self._encode(message)
+        except Exception as e:
+            logging.error(f"[WS] {self.name} serialization failed: {e}")
+            return None
+
+    def decode(self, frame: Frame) -> Any:
+        return self._decode(frame)
+
+    def __repr__(self) -> str:
+        return f"Codec({self.name!r})"
+
+
+def _decode_json(frame: Frame) -> Any:
+    if HAS_ORJSON and orjson is not None:
+        return orjson.loads(frame)
+    return json.loads(frame)
+
+
+def _msgpack_codec(packer: Any) -> Codec:
+    def _encode(message):
+        return packer.packb(message, default=_default, use_bin_type=True)
+
+    def _decode(frame):
+        return packer.unpackb(frame, raw=False)
+
+    return Codec("msgpack", True, _encode, _decode)
+
+
+def _cbor_codec(cbor: Any) -> Codec:
+    def _encode(message):
+        return cbor.dumps(message, default=lambda encoder, value: encoder.encode(_default(value)))
+
+    return Codec("cbor", True, _encode, cbor.loads)
+
+
+JSON = Codec("json", False, encode, _decode_json)
+CODECS: Dict[str, Codec] = {"json": JSON}
+if HAS_MSGPACK:
+    CODECS["msgpack"] = _msgpack_codec(msgpack)
+if HAS_CBOR:
+    CODECS["cbor"] = _cbor_codec(cbor2)
+
+
+def available_encodings() -> List[str]:
+    """Encodings this server can speak, JSON (the default) first."""
+    return list(CODECS)
+
+
+class EncodedCache:
+    """Remembers the last message and its frame per codec; re-encodes only when it changed."""
+
+    __slots__ = ("_message", "_frames")
+
+    def __init__(self):
+        self._message: Any = None
+        self._frames: Dict[str, Optional[Frame]] = {}
+
+    def encode(self, message: Any, codec: Codec = JSON) -> Optional[Frame]:
+        if message != self._message or self._message is None:
+            self._message, self._frames = message, {}
+        if codec.name not in self._frames:
+            self._frames[codec.name] = codec.encode(message)
+        return self._frames[codec.name]
+
+
+AUDIO_LEVELS = FrameTemplate("audio_levels", ("input_level", "output_level", "input_peak", "output_peak"))
@@ -0,0 +1,94 @@
+"""
+status_tracker.py — Versioned model-status snapshots and the deltas between them.
+
+``get_all_statuses()`` returns one entry per model (every Whisper size, the
+GPU, each engine), and most of them don't change from one minute to the next.
+``StatusTracker`` keeps the last list and, for each new one, works out which
+entries changed. An unchanged list produces nothing, so an idle session sends
+no status traffic at all.
+
+Two message shapes go to clients:
+
+  model_status        ``version`` + the full ``models`` list (on connect, on
+                      request, and for clients that haven't opted into deltas)
+  model_status_delta  ``version``, ``base_version``, the ``changed`` entries and
+                      the names of ``removed`` ones
+
+A delta client that sees a ``base_version`` other than the version it holds
+has missed one and should ask for a snapshot (``get_model_status``).
+
+Updates are event-driven: the orchestrator calls ``notify`` (from any thread)
+when an engine finishes building, credentials reload or Whisper unloads, and
+``status_broadcast_loop`` wakes up. It only polls while something is loading
+or downloading, to follow its progress.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+# States whose progress is worth polling for
+_BUSY_STATES = frozenset({"loading", "downloading"})
+
+
+class StatusTracker:
+    """Last status snapshot, its version, and a change signal the broadcast loop waits on."""
+
+    def __init__(self):
+        self.version = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._order: List[str] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed: Optional[asyncio.Event] = None
+
+    @property
+    def busy(self) -> bool:
+        """True while any model is loading or downloading."""
+        return any(e.get("status") in _BUSY_STATES for e in self._entries.values())
+
+    def update(self, statuses: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Record *statuses*; the ``model_status_delta`` message, or None if nothing changed."""
+        entries = {s.get("name", f"#{i}"): s for i, s in enumerate(statuses)}
+        changed = [s for name, s in entries.items() if self._entries.get(name) != s]
+        removed = [name for name in self._order if name not in entries]
+        if not changed and not removed and self.version:
+            return None
+        self.version += 1
+        self._entries, self._order = entries, list(entries)
+        return {
+            "type": "model_status_delta",
+            "version": self.version,
+            "base_version": self.version - 1,
+            "changed": changed,
+            "removed": removed,
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The full ``model_status`` message for the current version."""
+        return {
+            "type": "model_status",
+            "version": self.version,
+            "models": [self._entries[name] for name in self._order],
+        }
+
+    def notify(self):
+        """Signal that statuses may have changed. Safe to call from any thread."""
+        loop, event = self._loop, self._changed
+        if loop is None or event is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass  # loop shut down between the check and the call
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait up to *timeout* seconds for ``notify``; True if it was called."""
+        if self._changed is None or self._loop is not asyncio.get_running_loop():
+            self._loop = asyncio.get_running_loop()
+            self._changed = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._changed.clear()
@@ -1,66 +1,320 @@
-import json
+"""
+ws_manager.py — WebSocket fan-out with a bounded send queue per client.
+
+``broadcast`` serializes a message once per wire encoding in use and
+appends the frame to every client's outbound queue; it never awaits a socket. Each client has its own
+writer task that drains the queue, so a stalled client (an OBS browser
+source on a busy machine, a remote viewer on bad Wi-Fi) only delays itself.
+
+Per-client overload handling:
+
+  - ``audio_levels`` frames coalesce: while one is still queued, a newer one
+    replaces it in place instead of queueing behind it.
+  - A client whose queue is full of frames it hasn't sent is disconnected
+    (close code 1013, "try again later") rather than buffering without bound.
+
+Encoding: clients speak JSON text frames unless they opt into a binary codec
+(``serialization.CODECS``) with ``/captions?encoding=msgpack`` or the
+``set_encoding`` command. The ``capabilities`` frame lists what the server
+supports. The switch covers both directions: the router decodes the
+client's binary frames with the same codec.
+
+Model status goes through ``StatusTracker``: ``broadcast_status`` sends
+nothing when no model changed. Clients that asked for deltas
+(``get_model_status`` with ``deltas: true``) get ``model_status_delta``
+frames; everyone else gets the full ``model_status`` list, and only when
+it changed.
+"""
+
+import asyncio
 import logging
-from typing import Set, Any
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Set, Tuple
 from fastapi import WebSocket
 
+from src.utils.metrics import metrics, WS_BROADCAST, WS_SEND
+from .serialization import CODECS, JSON, Codec, EncodedCache, Frame, FrameTemplate
+from .status_tracker import StatusTracker
+
+# Frames queued per client before it counts as lagging
+_SEND_QUEUE_MAX = 256
+# Message types where only the newest queued frame matters
+_COALESCED_TYPES = frozenset({"audio_levels"})
+# Close code for clients dropped for falling behind (RFC 6455 "Try Again Later")
+_LAGGING_CLOSE_CODE = 1013
+_CLOSE_TIMEOUT_S = 1.0
+# Socket-close tasks outlive their ClientConnection; the loop only holds them weakly
+_closing_tasks: Set[asyncio.Task] = set()
+
+
+class ClientConnection:
+    """One WebSocket, its outbound queue and the writer task draining it."""
+
+    def __init__(self, websocket: Any, manager: "ConnectionManager", maxsize: int = _SEND_QUEUE_MAX,
+                 codec: Codec = JSON):
+        self.websocket = websocket
+        self.manager = manager
+        self.maxsize = maxsize
+        self.codec = codec
+        # model_status_delta frames instead of full model_status lists
+        self.status_deltas = False
+        # audio_levels_batch frames instead of one audio_levels frame per change
+        self.levels_batched = False
+        # (enqueued_at, coalesce_key, frame); keyed entries take their frame from _latest
+        self._queue: Deque[Tuple[float, Optional[str], Optional[Frame]]] = deque()
+        self._latest: Dict[str, Frame] = {}
+        self._wakeup = asyncio.Event()
+        self.sent = 0
+        self.coalesced = 0
+        self.closed = False
+        self._task = asyncio.get_running_loop().create_task(self._writer())
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, text: Frame, coalesce_key: Optional[str] = None) -> bool:
+        """Queue frame *text*; False when the client is lagging and must be dropped."""
+        if self.closed:
+            return False
+        if coalesce_key is not None:
+            if coalesce_key in self._latest:
+                self._latest[coalesce_key] = text
+                self.coalesced += 1
+                return True
+            if len(self._queue) >= self.maxsize:
+                self.coalesced += 1  # levels are disposable — drop, don't disconnect
+                return True
+            self._latest[coalesce_key] = text
+            self._queue.append((time.perf_counter(), coalesce_key, None))
+        else:
+            if len(self._queue) >= self.maxsize:
+                return False
+            self._queue.append((time.perf_counter(), None, text))
+        self._wakeup.set()
+        return True
+
+    async def _writer(self):
+        ws = self.websocket
+        try:
+            while not self.closed:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                enqueued_at, key, text = self._queue.popleft()
+                if key is not None:
+                    text = self._latest.pop(key)
+                if isinstance(text, bytes):
+                    await ws.send_bytes(text)
+                else:
+                    await ws.send_text(text)
+                self.sent += 1
+                metrics.observe(WS_SEND, time.perf_counter() - enqueued_at)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Only log if it's not a normal disconnection
+            if "1001" not in str(e) and "1006" not in str(e):
+                logging.warning(f"[WS] Error sending to client: {e}")
+            self.manager._forget(ws)
+        finally:
+            self.closed = True
+
+    def close(self, code: Optional[int] = None, reason: str = ""):
+        """Stop the writer; with *code*, also close the socket (without waiting on it)."""
+        self.closed = True
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+        self._queue.clear()
+        self._latest.clear()
+        if code is not None and hasattr(self.websocket, "close"):
+            task = asyncio.get_running_loop().create_task(self._close_socket(code, reason))
+            _closing_tasks.add(task)
+            task.add_done_callback(_closing_tasks.discard)
+
+    async def _close_socket(self, code: int, reason: str):
+        try:
+            await asyncio.wait_for(self.websocket.close(code=code, reason=reason), _CLOSE_TIMEOUT_S)
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"queued": self.queued, "sent": self.sent, "coalesced": self.coalesced, "encoding": self.codec.name}
+
+
 class ConnectionManager:
-    def __init__(self):
+    def __init__(self, send_queue_max: int = _SEND_QUEUE_MAX):
         self.active_connections: Set[WebSocket] = set()
+        self.send_queue_max = send_queue_max
+        self._clients: Dict[Any, ClientConnection] = {}
+        self.dropped_lagging = 0
+        self.status = StatusTracker()
+        self._status_cache = EncodedCache()
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, encoding: Optional[str] = None):
         await websocket.accept()
         self.active_connections.add(websocket)
+        client = self._client(websocket)
+        if encoding in CODECS:
+            client.codec = CODECS[encoding]
+        elif encoding:
+            logging.warning(f"[WS] Unknown encoding {encoding!r} requested; using JSON.")
+
+    def codec_for(self, websocket: Any) -> Codec:
+        client = self._clients.get(websocket)
+        return client.codec if client is not None else JSON
 
     async def disconnect(self, websocket: WebSocket):
+        self._forget(websocket)
+
+    def _forget(self, websocket: Any):
         self.active_connections.discard(websocket)
+        client = self._clients.pop(websocket, None)
+        if client is not None:
+            client.close()
 
-    async def broadcast(self, message: dict):
-        """Send a JSON message to all connected Flutter clients."""
-        active_count = len(self.active_connections)
-        
+    def _client(self, websocket: Any) -> ClientConnection:
+        # Sockets added to active_connections directly get a writer on first use
+        client = self._clients.get(websocket)
+        if client is None or client.closed:
+            client = self._clients[websocket] = ClientConnection(websocket, self, self.send_queue_max)
+        return client
 
+    def _enqueue(self, websocket: Any, text: Frame, coalesce_key: Optional[str]):
+        if not self._client(websocket).enqueue(text, coalesce_key):
+            self.dropped_lagging += 1
+            logging.warning(f"[WS] Client fell {self.send_queue_max} frames behind; disconnecting it.")
+            self.active_connections.discard(websocket)
+            client = self._clients.pop(websocket)
+            client.close(_LAGGING_CLOSE_CODE, "client too slow")
+
+    async def broadcast(self, message: dict, clients: Optional[Iterable[Any]] = None):
+        """Queue a message for all connected clients, or just *clients* (returns without waiting on sockets)."""
         if not self.active_connections:
             return
 
-        # Sanitize message to ensure it's JSON serializable (handles gRPC objects, numpy, etc.)
-        try:
-            json_str = json.dumps(message, default=self._json_default)
-        except Exception as e:
-            logging.error(f"[WS] Serialization failed: {e}")
-            # Fallback: convert everything to string to at least send something
-            try:
-                json_str = json.dumps(message, default=str)
-            except Exception:
-                return
-
-        dead = set()
-        for ws in list(self.active_connections):
-            try:
-                await ws.send_text(json_str)
-            except Exception as e:
-                # Only print error if it's not a normal disconnection
-                if "1001" not in str(e) and "1006" not in str(e):
-                    logging.warning(f"[WS] Error sending to client: {e}")
-                dead.add(ws)
-        self.active_connections.difference_update(dead)
-
-    def _json_default(self, obj: Any) -> Any:
-        """Handle non-standard types like gRPC RepeatedScalarContainer or numpy arrays."""
-        if hasattr(obj, "tolist"): # numpy
-            return obj.tolist()
-        if hasattr(obj, "__iter__") and not isinstance(obj, (str, dict)):
-            return list(obj)
-        try:
-            return str(obj)
-        except Exception:
-            return f"<unserializable {type(obj).__name__}>"
+        self._fan_out(lambda codec: codec.encode(message), message.get("type"), time.perf_counter(), clients)
+
+    async def broadcast_text(self, json_str: str, msg_type: str, message: Optional[dict] = None):
+        """Queue an already-encoded JSON frame (e.g. from a ``FrameTemplate``) for all clients.
+
+        Binary-encoding clients get *message* (or the decoded JSON) in their codec.
+        """
+        if not self.active_connections:
+            return
+
+        def _frame(codec: Codec) -> Optional[Frame]:
+            if codec is JSON:
+                return json_str
+            return codec.encode(message if message is not None else JSON.decode(json_str))
+
+        self._fan_out(_frame, msg_type, time.perf_counter())
+
+    async def broadcast_template(self, template: FrameTemplate, *values: Any, clients: Optional[Iterable[Any]] = None):
+        """Broadcast a templated frame: JSON clients get ``render``, others the message in their codec."""
+        if not self.active_connections:
+            return
+
+        def _frame(codec: Codec) -> Optional[Frame]:
+            if codec is JSON:
+                return template.render(*values)
+            return codec.encode(template.message(*values))
+
+        self._fan_out(_frame, template.msg_type, time.perf_counter(), clients)
+
+    def _fan_out(self, frame_for: Callable[[Codec], Optional[Frame]], msg_type: Optional[str], start: float,
+                 clients: Optional[Iterable[Any]] = None):
+        """Enqueue to every client (or just *clients*), encoding at most once per codec in use."""
+        coalesce_key = msg_type if msg_type in _COALESCED_TYPES else None
+        frames: Dict[str, Optional[Frame]] = {}
+        for ws in list(self.active_connections if clients is None else clients):
+            codec = self.codec_for(ws)
+            if codec.name not in frames:
+                frames[codec.name] = frame_for(codec)
+            frame = frames[codec.name]
+            if frame is not None:
+                self._enqueue(ws, frame, coalesce_key)
+        metrics.observe(WS_BROADCAST, time.perf_counter() - start)
+
+    async def send(self, websocket: Any, message: dict):
+        """Queue a message for one client, in order with its broadcasts."""
+        if websocket not in self.active_connections:
+            return
+        frame = self.codec_for(websocket).encode(message)
+        if frame is not None:
+            self._enqueue(websocket, frame, None)
+
+    async def set_encoding(self, websocket: Any, msg: Dict[str, Any]):
+        """``{"cmd": "set_encoding", "encoding": "msgpack"}`` — switch this client's codec.
+
+        The ``encoding`` acknowledgement is the last frame in the old encoding;
+        everything after it, in both directions, uses the new one.
+        """
+        name = msg.get("encoding") or "json"
+        codec = CODECS.get(name)
+        if codec is None:
+            await self.send(websocket, {"type": "error", "text": f"Unsupported encoding: {name}",
+                                        "is_final": True, "original": "", "encodings": list(CODECS)})
+            return
+        await self.send(websocket, {"type": "encoding", "encoding": codec.name})
+        self._client(websocket).codec = codec
+
+    async def set_audio_levels_mode(self, websocket: Any, msg: Dict[str, Any]):
+        """``{"cmd": "set_audio_levels_mode", "mode": "batched"}`` — or ``"live"`` (the default)."""
+        if websocket in self.active_connections:
+            self._client(websocket).levels_batched = msg.get("mode") == "batched"
+
+    def level_subscribers(self) -> Tuple[list, list]:
+        """(live, batched) clients for audio levels."""
+        live, batched = [], []
+        for ws in self.active_connections:
+            (batched if self._client(ws).levels_batched else live).append(ws)
+        return live, batched
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "clients": len(self.active_connections),
+            "dropped_lagging": self.dropped_lagging,
+            "send_queues": [c.stats() for c in self._clients.values()],
+        }
 
     async def broadcast_status(self, orchestrator):
-        """Broadcast the current status of all models to all connected clients."""
+        """Broadcast model statuses that changed since the last call (nothing if none did)."""
+        if orchestrator:
+            delta = self.status.update(orchestrator.get_all_statuses())
+            if delta is not None:
+                self._publish_status(delta)
+
+    async def send_status(self, websocket: Any, orchestrator=None, deltas: Optional[bool] = None):
+        """Send one client the full ``model_status`` snapshot; *deltas* sets whether later updates are deltas."""
+        if websocket not in self.active_connections:
+            return
+        client = self._client(websocket)
+        if deltas is not None:
+            client.status_deltas = bool(deltas)
         if orchestrator:
-            status_data = orchestrator.get_all_statuses()
-            message = {
-                "type": "model_status",
-                "models": status_data
-            }
-            await self.broadcast(message)
+            # Bring the snapshot up to date; the other clients get the change as usual
+            delta = self.status.update(orchestrator.get_all_statuses())
+            if delta is not None:
+                self._publish_status(delta, exclude=websocket)
+        frame = self._status_cache.encode(self.status.snapshot(), client.codec)
+        if frame is not None:
+            self._enqueue(websocket, frame, None)
+
+    def _publish_status(self, delta: Dict[str, Any], exclude: Any = None):
+        targets = [ws for ws in self.active_connections if ws is not exclude]
+        if not targets:
+            return
+        start = time.perf_counter()
+        by_mode: Dict[bool, list] = {True: [], False: []}
+        for ws in targets:
+            by_mode[self._client(ws).status_deltas].append(ws)
+        if by_mode[True]:
+            self._fan_out(lambda codec: codec.encode(delta), delta["type"], start, by_mode[True])
+        if by_mode[False]:
+            # Snapshots are also sent on connect — share their encoding
+            snapshot = self.status.snapshot()
+            self._fan_out(lambda codec: self._status_cache.encode(snapshot, codec), snapshot["type"], start,
+                          by_mode[False])
@@ -1 +1,6 @@
 from .orchestrator import InferenceOrchestrator
+from .async_pipeline import AsyncPipeline
+from .lazy_engine import LazyEngine
+from .model_registry import ModelRegistry
+from .session_manager import SessionManager, PipelineSession, stream_kwargs
+from .batch_jobs import JobManager, BatchJob
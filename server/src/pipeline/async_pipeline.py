@@ -0,0 +1,298 @@
+# Copyright (c) 2026 Omni Bridge. All rights reserved.
+#
+# Licensed under the PERSONAL STUDY & LEARNING LICENSE v1.0.
+# Commercial use and public redistribution of modified versions are strictly prohibited.
+# See the LICENSE file in the project root for full license terms.
+
+"""
+async_pipeline.py — Event-loop variant of the orchestrator's worker threads.
+
+The threaded pipeline hands every chunk across four threads (capture →
+10 ms poll loop → ASR worker → executor → translation worker) and every
+caption back to uvicorn's loop with ``run_coroutine_threadsafe``. Here the
+stages are asyncio tasks on uvicorn's loop joined by ``AsyncBoundedQueue``s;
+only the blocking engine calls leave the loop, on two small bounded
+executors. A translated caption comes back as the executor future's result
+and is broadcast on the loop (Llama streaming partials, emitted mid-request,
+still hop threads). Audio is pushed straight from the capture thread with
+``call_soon_threadsafe``, the collector sleeps until the next ASR result or
+held-fragment deadline (no polling), and ``stop`` cancels the tasks instead
+of waiting on sentinels and queue timeouts.
+
+Models, dispatchers, rate limiter, sentence aggregator and the caption
+callback are all the orchestrator's — this class only replaces the workers.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils import estimate_tokens
+from src.utils.bounded_queue import AsyncBoundedQueue
+from src.utils.metrics import metrics, CAPTURE_ENQUEUE
+from src.utils.tracing import Trace
+from .orchestrator import (
+    InferenceOrchestrator, _audio_len, _merge_audio, _merge_captions, _unpack_audio,
+    _MERGE_AUDIO_UNTIL_S, _MERGE_TEXT_UNTIL_TOKENS,
+)
+
+# In-flight ASR requests (same RPM reasoning as the threaded pool)
+_ASR_WORKERS = 2
+# Translation is strictly ordered — one request at a time
+_TRANSLATION_WORKERS = 1
+
+
+class AsyncPipeline:
+    """Runs one orchestrator session as asyncio tasks on the calling event loop."""
+
+    def __init__(self, orchestrator: InferenceOrchestrator, asr_workers: int = _ASR_WORKERS):
+        self.orch = orchestrator
+        self.asr_workers = max(1, asr_workers)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._audio_q: Optional[AsyncBoundedQueue] = None
+        self._translation_q: Optional[AsyncBoundedQueue] = None
+        self._results: Optional[asyncio.Queue] = None
+        self._asr_slots: Optional[asyncio.Semaphore] = None
+        self._asr_executor: Optional[ThreadPoolExecutor] = None
+        self._translation_executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._loop is not None and self.orch.is_running
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+
+    async def start(self, sample_rate: int, **session: Any) -> bool:
+        """Configure the session (``InferenceOrchestrator.prepare_session`` kwargs)
+        and start the stage tasks. Returns False if preflight failed."""
+        orch = self.orch
+        if orch.is_running or self._loop is not None:
+            return False
+
+        loop = asyncio.get_running_loop()
+        # Queues exist before preflight so audio captured meanwhile isn't lost
+        self._loop = loop
+        self._audio_q = AsyncBoundedQueue(
+            orch.audio_queue.limit, policy=orch.audio_queue.policy, merge_fn=orch._merge_audio_capped,
+            on_wait=orch.audio_queue.on_wait,
+        )
+        self._translation_q = AsyncBoundedQueue(
+            orch._translation_queue.limit, policy=orch._translation_queue.policy,
+            on_evict=orch._emit_untranslated, on_wait=orch._translation_queue.on_wait,
+        )
+        self._results = asyncio.Queue()
+        self._asr_slots = asyncio.Semaphore(self.asr_workers)
+
+        # Preflight may wait on a model reload lock — keep it off the loop
+        ok = await loop.run_in_executor(None, lambda: orch.prepare_session(sample_rate, **session))
+        if not ok or self._loop is None:
+            self._loop = None
+            return False
+        # prepare_session applied any queue_policy overrides to the orchestrator's queues
+        self._sync_queue_config()
+
+        orch.is_running = True
+        self._asr_executor = ThreadPoolExecutor(max_workers=self.asr_workers, thread_name_prefix="AsyncASR")
+        self._translation_executor = ThreadPoolExecutor(
+            max_workers=_TRANSLATION_WORKERS, thread_name_prefix="AsyncTranslation"
+        )
+        self._tasks = [
+            loop.create_task(self._asr_stage(), name="asr_stage"),
+            loop.create_task(self._collect_stage(), name="asr_collect"),
+            loop.create_task(self._translation_stage(), name="translation_stage"),
+        ]
+        orch.warmup_engines()
+        logging.info(
+            f"[AsyncPipeline] Stream started: ASR={orch.asr_dispatcher.transcription_model}, "
+            f"Translat={orch.translation_dispatcher.translation_model}"
+        )
+        return True
+
+    def stop(self):
+        """Cancel the stage tasks and end the orchestrator session. Safe from any thread."""
+        loop, self._loop = self._loop, None
+        if loop is not None and not loop.is_closed():
+            if _on_loop(loop):
+                self._cancel_tasks()
+            else:
+                loop.call_soon_threadsafe(self._cancel_tasks)
+        if self._asr_executor:
+            self._asr_executor.shutdown(wait=False, cancel_futures=True)
+        # Translate the held sentence fragment instead of dropping it; the
+        # translation executor has at most this and one in-flight caption
+        translation_executor = self._translation_executor
+        if translation_executor:
+            for item in self.orch.sentence_aggregator.flush():
+                translation_executor.submit(self.orch.process_transcript, item)
+            translation_executor.shutdown(wait=False)
+        self._asr_executor = self._translation_executor = None
+        self.orch.stop_stream()
+
+    def _cancel_tasks(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+
+    def append_audio(self, chunk: Any, trace: Optional[Trace] = None):
+        """Queue a captured chunk. Called from the capture thread or the loop."""
+        loop, q = self._loop, self._audio_q
+        if loop is None or q is None or loop.is_closed():
+            return
+        trace = trace or Trace()
+        if _on_loop(loop):
+            self._enqueue_audio(q, chunk, trace, None)
+        else:
+            loop.call_soon_threadsafe(self._enqueue_audio, q, chunk, trace, time.perf_counter())
+
+    @staticmethod
+    def _enqueue_audio(q: AsyncBoundedQueue, chunk: Any, trace: Trace, handed_off_at: Optional[float]):
+        if handed_off_at is not None:
+            metrics.observe(CAPTURE_ENQUEUE, time.perf_counter() - handed_off_at)
+        trace.step("capture_enqueue")
+        q.put_nowait((chunk, trace))
+
+    def configure_queues(self, policy: Dict[str, Any]):
+        """Live queue bound/policy update (same keys as ``InferenceOrchestrator.configure_queues``)."""
+        self.orch.configure_queues(policy)
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            if _on_loop(loop):
+                self._sync_queue_config()
+            else:
+                loop.call_soon_threadsafe(self._sync_queue_config)
+
+    def _sync_queue_config(self):
+        orch = self.orch
+        for q, src in ((self._audio_q, orch.audio_queue), (self._translation_q, orch._translation_queue)):
+            if q is not None:
+                q.configure(src.limit, src.policy)
+                q.reset_stats()
+
+    def get_queue_stats(self) -> Dict[str, Any]:
+        if self._audio_q is None or self._translation_q is None:
+            return self.orch.get_queue_stats()
+        return {"audio": self._audio_q.stats(), "translation": self._translation_q.stats()}
+
+    # ── Stages ───────────────────────────────────────────────────────────────
+
+    async def _asr_stage(self):
+        """Audio queue → ASR executor. Futures go to the collector in submission order."""
+        orch, loop = self.orch, asyncio.get_running_loop()
+        assert self._audio_q and self._results and self._asr_slots
+        config = orch.make_asr_config()
+        while True:
+            chunk = await self._audio_q.get()
+            engine = orch.asr_dispatcher.transcription_model
+            if orch.rate_limiter.is_limited(engine):
+                chunk, _ = await self._await_budget(
+                    engine, chunk, self._audio_q,
+                    cost=lambda c: 0,
+                    merge=_merge_audio,
+                    is_full=lambda c: _audio_len(c) >= _MERGE_AUDIO_UNTIL_S * orch._sample_rate,
+                )
+            # Bound in-flight requests so a backlog stays in the audio queue,
+            # where the overload policy can merge it, not in the executor
+            await self._asr_slots.acquire()
+            executor = self._asr_executor
+            if executor is None:
+                self._asr_slots.release()
+                return
+            samples, trace = _unpack_audio(chunk)
+            fut = loop.run_in_executor(
+                executor, partial(orch.asr_dispatcher.process_chunk, samples, config, trace=trace)
+            )
+            fut.add_done_callback(lambda _: self._asr_slots.release())  # type: ignore[union-attr]
+            self._results.put_nowait(fut)
+
+    async def _collect_stage(self):
+        """ASR results (in order) → sentence aggregator → translation queue."""
+        assert self._results and self._translation_q
+        agg = self.orch.sentence_aggregator
+        while True:
+            # Idle until the next ASR result, or the held fragment's deadline if there is one
+            try:
+                fut = await asyncio.wait_for(self._results.get(), timeout=agg.due_in())
+            except asyncio.TimeoutError:
+                fut = None
+            if fut is not None:
+                try:
+                    asr_result = await fut
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logging.error(f"[AsyncPipeline] ASR error: {e}")
+                    self.orch._emit_error(f"ASR Failure: {e}")
+                    asr_result = None
+                if asr_result:
+                    for item in agg.push(asr_result):
+                        self._translation_q.put_nowait(item)
+            # Release a held sentence fragment once its max-wait deadline passes
+            for item in agg.flush_due():
+                self._translation_q.put_nowait(item)
+
+    async def _translation_stage(self):
+        """Translation queue → translation executor → caption callback."""
+        orch, loop = self.orch, asyncio.get_running_loop()
+        assert self._translation_q
+        while True:
+            item = await self._translation_q.get()
+            engine = orch.translation_dispatcher.translation_model
+            throttled_ms = 0
+            if orch.is_translating and orch.rate_limiter.is_limited(engine):
+                item, throttled_ms = await self._await_budget(
+                    engine, item, self._translation_q,
+                    cost=orch._translation_cost,
+                    merge=_merge_captions,
+                    is_full=lambda c: estimate_tokens(c["text"]) >= _MERGE_TEXT_UNTIL_TOKENS,
+                )
+            executor = self._translation_executor
+            if executor is None:
+                return
+            try:
+                caption = await loop.run_in_executor(executor, orch.translate_transcript, item, throttled_ms)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"[AsyncPipeline] Translation error: {e}")
+                orch._emit_error(f"Translation Failure: {e}")
+                continue
+            # Back on the loop: the caption is broadcast here, with no further thread handoff
+            if caption is not None:
+                orch.deliver_caption(caption)
+
+    async def _await_budget(self, engine: str, item: Any, q: AsyncBoundedQueue,
+                            cost: Callable[[Any], int], merge: Callable[[Any, Any], Any],
+                            is_full: Callable[[Any], bool]) -> Tuple[Any, int]:
+        """Async twin of ``InferenceOrchestrator._await_budget`` — merges queued
+        items into *item* while the engine's budget refills."""
+        orch = self.orch
+        start = time.monotonic()
+        while True:
+            wait = orch.rate_limiter.try_acquire(engine, orch._engine_key(engine), cost(item))
+            if wait <= 0:
+                break
+            deadline = time.monotonic() + min(wait, 0.5)
+            while not is_full(item):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = await asyncio.wait_for(q.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                item = merge(item, nxt)
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+        return item, int((time.monotonic() - start) * 1000)
+
+
+def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
@@ -0,0 +1,382 @@
+"""
+batch_jobs.py — Transcribe and translate an uploaded audio file, faster than real time.
+
+Live sessions can only go as fast as the audio plays. For recorded content,
+``POST /jobs`` hands the whole file to a ``JobManager``:
+
+  1. The WAV is decoded to mono int16 and cut into segments by the same
+     ``VadChunker`` as live capture (``max_segment_s`` instead of the live
+     chunk length). Each segment keeps its start/end time in the file,
+     trimmed to its first and last voiced frame.
+  2. ASR runs over the segments in parallel, up to ``_ASR_CONCURRENCY`` for the
+     engine, through the job's own ``ASRDispatcher``.
+  3. Each transcript goes to the ``TranslationDispatcher`` as soon as it is
+     ready. Up to ``_TRANSLATION_CONCURRENCY`` requests are in flight at once.
+
+Each job gets its own orchestrator, built like a ``SessionManager`` session.
+It shares the model registry and ``RateLimiter``, so a job and a live session
+on the same NIM key draw from one budget. The live session's dispatchers and
+Llama conversation window are never touched. Jobs run one at a time.
+
+Results are rendered as SRT, WebVTT or JSON (``render``). Finished jobs are
+kept until ``_KEEP_FINISHED`` newer ones have finished.
+"""
+
+import io
+import itertools
+import logging
+import threading
+import time
+import wave
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.audio.chunker import SILENCE_THRESHOLD, VadChunker
+from .model_registry import ModelRegistry
+from .orchestrator import InferenceOrchestrator
+from .rate_limiter import RateLimiter
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+CANCELLED = "cancelled"
+_FINISHED = (DONE, ERROR, CANCELLED)
+
+FORMATS = ("srt", "vtt", "json")
+
+_TARGET_RATE = 16000
+_FRAME = 1024  # samples per VAD frame, as in live capture
+_MAX_SEGMENT_S = 6.0  # long enough for ASR context, short enough for one subtitle
+_MAX_AUDIO_S = 4 * 3600
+_MAX_QUEUED_JOBS = 8
+_KEEP_FINISHED = 20
+
+# Requests in flight per engine. Local Whisper runs one model; NIM engines
+# share a per-key RPM budget that the RateLimiter enforces on top.
+_ASR_CONCURRENCY = {"riva-asr": 4, "online": 4}
+_TRANSLATION_CONCURRENCY = {"llama": 2}
+_DEFAULT_ASR_CONCURRENCY = 1
+_DEFAULT_TRANSLATION_CONCURRENCY = 4
+
+
+def decode_wav(data: bytes) -> Tuple[np.ndarray, int]:
+    """Mono int16 samples and sample rate of a 16-bit PCM WAV file. Raises ValueError."""
+    try:
+        with wave.open(io.BytesIO(data), "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError("Only 16-bit PCM WAV is supported")
+            channels, rate = wf.getnchannels(), wf.getframerate()
+            frames = wf.readframes(wf.getnframes())
+    except (wave.Error, EOFError) as e:
+        raise ValueError(f"Not a readable WAV file: {e}") from e
+    samples = np.frombuffer(frames, dtype="<i2")
+    if channels > 1:
+        samples = samples[: len(samples) - len(samples) % channels]
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    samples = samples.astype(np.int16)
+    if not len(samples):
+        raise ValueError("The WAV file has no audio")
+    if len(samples) / rate > _MAX_AUDIO_S:
+        raise ValueError(f"Audio longer than {_MAX_AUDIO_S // 3600} hours")
+    return samples, rate
+
+
+def segment_audio(samples: np.ndarray, rate: int, max_segment_s: float = _MAX_SEGMENT_S,
+                  target_rate: int = _TARGET_RATE) -> List[Dict[str, Any]]:
+    """Cut *samples* into VAD segments: ``{"index", "start", "end", "audio"}``.
+
+    ``audio`` is resampled to *target_rate*; ``start``/``end`` are seconds in
+    the file, from the segment's first to its last voiced frame.
+    """
+    chunker = VadChunker(rate, target_rate, chunk_duration=max_segment_s)
+    segments: List[Dict[str, Any]] = []
+    voiced: Optional[Tuple[int, int]] = None  # first/last voiced sample of the buffer
+
+    def _add(chunk: Optional[np.ndarray]):
+        if chunk is not None and voiced is not None:
+            segments.append({"index": len(segments), "start": round(voiced[0] / rate, 3),
+                             "end": round(voiced[1] / rate, 3), "audio": chunk})
+
+    for offset in range(0, len(samples), _FRAME):
+        if chunker.buffered_frames == 0:
+            voiced = None
+        frame = samples[offset:offset + _FRAME]
+        if np.sqrt(np.mean(frame.astype(np.float32) ** 2)) >= SILENCE_THRESHOLD:
+            voiced = (voiced[0] if voiced else offset, offset + len(frame))
+        _add(chunker.push(frame))
+    _add(chunker.flush())
+    return segments
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    ms = int(round(seconds * 1000))
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    secs, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{ms:03d}"
+
+
+def _cues(segments: List[Dict[str, Any]]) -> List[Tuple[float, float, str]]:
+    """(start, end, text) per segment with a transcript; the translation where there is one."""
+    return [(s["start"], s["end"], s.get("translation") or s["text"])
+            for s in segments if s.get("text")]
+
+
+def to_srt(segments: List[Dict[str, Any]]) -> str:
+    blocks = [f"{n}\n{_timestamp(start, ',')} --> {_timestamp(end, ',')}\n{text}\n"
+              for n, (start, end, text) in enumerate(_cues(segments), 1)]
+    return "\n".join(blocks)
+
+
+def to_vtt(segments: List[Dict[str, Any]]) -> str:
+    blocks = [f"{_timestamp(start, '.')} --> {_timestamp(end, '.')}\n{text}\n"
+              for start, end, text in _cues(segments)]
+    return "\n".join(["WEBVTT\n", *blocks])
+
+
+class BatchJob:
+    """One uploaded file: its parameters, progress and segments."""
+
+    def __init__(self, job_id: str, config: Dict[str, Any], samples: np.ndarray, rate: int):
+        self.job_id = job_id
+        self.config = config
+        self.status = QUEUED
+        self.error: Optional[str] = None
+        self.duration_s = round(len(samples) / rate, 3)
+        self.segments: List[Dict[str, Any]] = []
+        self.transcribed = 0
+        self.translated = 0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._audio: Optional[Tuple[np.ndarray, int]] = (samples, rate)
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED
+
+    def _count(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def get_status(self) -> Dict[str, Any]:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.time()) - self.started_at, 2)
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "error": self.error,
+            "source_lang": self.config["source_lang"],
+            "target_lang": self.config["target_lang"],
+            "transcription_model": self.config["transcription_model"],
+            "translation_model": self.config["translation_model"],
+            "duration_s": self.duration_s,
+            "progress": {
+                "segments": len(self.segments),
+                "transcribed": self.transcribed,
+                "translated": self.translated,
+            },
+            "elapsed_s": elapsed,
+            # Seconds of audio processed per second of wall time
+            "speed": round(self.duration_s / elapsed, 2) if self.status == DONE and elapsed else None,
+            "created_at": self.created_at,
+        }
+
+    def render(self, fmt: str) -> Any:
+        """The result as ``srt`` / ``vtt`` text or a ``json`` dict. Raises ValueError for other formats."""
+        if fmt == "srt":
+            return to_srt(self.segments)
+        if fmt == "vtt":
+            return to_vtt(self.segments)
+        if fmt == "json":
+            return {
+                **self.get_status(),
+                "segments": [{k: v for k, v in s.items() if k != "audio"} for s in self.segments],
+            }
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+
+
+class JobManager:
+    """Queues ``BatchJob``s and runs them, one at a time, on a background thread."""
+
+    def __init__(self, registry: Optional[ModelRegistry] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 orchestrator_factory: Optional[Callable[..., InferenceOrchestrator]] = None,
+                 max_queued: int = _MAX_QUEUED_JOBS):
+        self.registry = registry or ModelRegistry()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_queued = max(1, max_queued)
+        self._orchestrator_factory = orchestrator_factory or InferenceOrchestrator
+        self._jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()  # _jobs is pruned from the job thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="BatchJob")
+
+    def submit(self, audio: bytes, config: Dict[str, Any]) -> BatchJob:
+        """Queue a job for a WAV file; *config* takes ``ServerContext.config`` keys
+        plus an optional ``max_segment_s``. Raises ValueError for unreadable audio
+        and RuntimeError when ``max_queued`` jobs are already waiting."""
+        samples, rate = decode_wav(audio)
+        with self._lock:
+            if sum(not j.finished for j in self._jobs.values()) >= self.max_queued:
+                raise RuntimeError(f"Job queue is full ({self.max_queued} jobs).")
+            job = BatchJob(f"job-{next(self._ids)}", dict(config), samples, rate)
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job)
+        logging.info(f"[Jobs] Queued {job.job_id}: {job.duration_s:.1f}s of audio, "
+                     f"{config['source_lang']}->{config['target_lang']}")
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job._cancel.set()
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {"max_queued": self.max_queued, "jobs": [job.get_status() for job in jobs]}
+
+    def shutdown(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job._cancel.set()
+        self._executor.shutdown(wait=False)
+
+    # ── Running ──────────────────────────────────────────────────────────────
+
+    def _run(self, job: BatchJob):
+        if job.cancelled:
+            self._finish(job, CANCELLED)
+            return
+        audio, job._audio = job._audio, None  # decoded audio is only needed until segmented
+        if audio is None:
+            job.error = "Job audio is no longer available; it can only run once"
+            self._finish(job, ERROR)
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        orch = None
+        try:
+            orch = self._build_orchestrator(job)
+            samples, rate = audio
+            max_segment_s = float(job.config.get("max_segment_s") or _MAX_SEGMENT_S)
+            job.segments = segment_audio(samples, rate, max(2.0, min(max_segment_s, 15.0)))
+            self._process(job, orch)
+            self._finish(job, CANCELLED if job.cancelled else DONE)
+        except Exception as e:
+            logging.error(f"[Jobs] {job.job_id} failed: {e}")
+            job.error = str(e)
+            self._finish(job, ERROR)
+        finally:
+            if orch is not None:
+                if orch.whisper:
+                    orch.whisper.release()
+                orch.close()
+
+    def _build_orchestrator(self, job: BatchJob) -> InferenceOrchestrator:
+        config = job.config
+        orch = self._orchestrator_factory(
+            nvidia_api_key=config.get("nvidia_nim_key", ""),
+            google_credentials=config.get("google_credentials", {}),
+            riva_translation_id=config.get("riva_translation_function_id", ""),
+            riva_asr_parakeet_id=config.get("riva_asr_parakeet_function_id", ""),
+            riva_asr_canary_id=config.get("riva_asr_canary_function_id", ""),
+            registry=self.registry,
+            rate_limiter=self.rate_limiter,
+        )
+        errors: List[str] = []
+        ready = orch.prepare_session(
+            _TARGET_RATE,
+            source_lang=config["source_lang"],
+            target_lang=config["target_lang"],
+            ai_engine=config.get("ai_engine", "google"),
+            transcription_model=config["transcription_model"],
+            translation_model=config["translation_model"],
+            callback=lambda text, is_error, **kw: errors.append(text) if is_error else None,
+            llama_context_pairs=0,  # segments are translated out of order
+        )
+        if not ready:
+            orch.close()
+            raise RuntimeError(errors[-1] if errors else "Preflight check failed")
+        # Segments don't overlap and finish out of order; neighbours may legitimately repeat
+        orch.asr_dispatcher.dedup.window_s = 0.0
+        return orch
+
+    def _process(self, job: BatchJob, orch: InferenceOrchestrator):
+        asr_engine = orch.asr_dispatcher.transcription_model
+        trans_engine = orch.translation_dispatcher.translation_model
+        asr_workers = _ASR_CONCURRENCY.get(asr_engine, _DEFAULT_ASR_CONCURRENCY)
+        trans_workers = _TRANSLATION_CONCURRENCY.get(trans_engine, _DEFAULT_TRANSLATION_CONCURRENCY)
+        config = orch.make_asr_config()
+
+        with ThreadPoolExecutor(asr_workers, thread_name_prefix="JobASR") as asr_pool, \
+                ThreadPoolExecutor(trans_workers, thread_name_prefix="JobTranslate") as trans_pool:
+            asr_futures = [asr_pool.submit(self._transcribe, job, orch, seg, config) for seg in job.segments]
+            translations = []
+            for fut in as_completed(asr_futures):
+                seg = fut.result()
+                if seg.get("text") and orch.is_translating and not job.cancelled:
+                    translations.append(trans_pool.submit(self._translate, job, orch, seg))
+            for fut in as_completed(translations):
+                fut.result()
+
+    def _transcribe(self, job: BatchJob, orch: InferenceOrchestrator, seg: Dict[str, Any], config: Any):
+        engine = orch.asr_dispatcher.transcription_model
+        if self._await_budget(job, orch, engine, 0):
+            result = orch.asr_dispatcher.process_chunk(seg.pop("audio"), config)
+            seg["text"] = result["text"] if result else ""
+            if result and result.get("asr_stats"):
+                seg["asr_stats"] = result["asr_stats"]
+            job._count("transcribed")
+        return seg
+
+    def _translate(self, job: BatchJob, orch: InferenceOrchestrator, seg: Dict[str, Any]):
+        engine = orch.translation_dispatcher.translation_model
+        if not self._await_budget(job, orch, engine, orch._translation_cost(seg)):
+            return
+        hint = (seg.get("asr_stats") or {}).get("detected_lang")
+        translated, stats = orch.translation_dispatcher.translate(seg["text"], hint)
+        seg["translation"] = translated
+        if stats:
+            seg["translation_stats"] = stats
+        job._count("translated")
+
+    def _await_budget(self, job: BatchJob, orch: InferenceOrchestrator, engine: str, cost: int) -> bool:
+        """Block until *engine*'s RPM/TPM budget admits one request; False if the job was cancelled."""
+        if not self.rate_limiter.is_limited(engine):
+            return not job.cancelled
+        key = orch._engine_key(engine)
+        while not job.cancelled:
+            wait = self.rate_limiter.try_acquire(engine, key, cost)
+            if wait <= 0:
+                return True
+            job._cancel.wait(min(wait, 0.5))
+        return False
+
+    def _finish(self, job: BatchJob, status: str):
+        job.status = status
+        job.finished_at = time.time()
+        logging.info(f"[Jobs] {job.job_id} {status}: {job.transcribed}/{len(job.segments)} segments "
+                     f"transcribed, {job.translated} translated")
+        with self._lock:
+            finished = [job_id for job_id, j in self._jobs.items() if j.finished]
+            for job_id in finished[:-_KEEP_FINISHED]:
+                del self._jobs[job_id]
@@ -0,0 +1,90 @@
+"""
+lazy_engine.py — Engine wrappers built on first use instead of at startup.
+
+Constructing every engine up front (Riva gRPC channels, the OpenAI client,
+the Google Cloud client, SpeechRecognition) made orchestrator creation slow
+even when a session only uses Google Free. ``LazyEngine`` stands in for an
+engine: the first attribute access builds it (once, thread-safe) and every
+access after that is forwarded to the real object. The orchestrator can
+also ``prewarm`` engines in a background thread after the handshake so the
+first session doesn't pay for the build.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class LazyEngine:
+    """Transparent proxy that builds its engine with *factory* on first use."""
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        # object.__setattr__: our own __setattr__ forwards to the engine
+        object.__setattr__(self, "_lazy_name", name)
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_target", None)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+
+    @property
+    def built(self) -> bool:
+        return self._lazy_target is not None
+
+    def resolve(self) -> Any:
+        """Return the engine, building it on first call."""
+        target = self._lazy_target
+        if target is not None:
+            return target
+        with self._lazy_lock:
+            if self._lazy_target is None:
+                logging.debug(f"[LazyEngine] Building {self._lazy_name}")
+                object.__setattr__(self, "_lazy_target", self._lazy_factory())
+            return self._lazy_target
+
+    def prewarm(self):
+        """Build now, logging instead of raising (background warm-up)."""
+        try:
+            self.resolve()
+        except Exception as e:
+            logging.error(f"[LazyEngine] Failed to build {self._lazy_name}: {e}")
+
+    def placeholder_status(self) -> Dict[str, Any]:
+        """Status shown while the engine hasn't been built yet."""
+        return {
+            "name": self._lazy_name,
+            "status": "loading",
+            "ready": False,
+            "message": f"{self._lazy_name} is initializing...",
+            "progress": 0.0,
+            "details": {},
+        }
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.resolve(), attr)
+
+    def __setattr__(self, attr: str, value: Any):
+        setattr(self.resolve(), attr, value)
+
+    def __repr__(self) -> str:
+        state = repr(self._lazy_target) if self.built else "unbuilt"
+        return f"<LazyEngine {self._lazy_name}: {state}>"
+
+
+def prewarm_all(engines: Dict[str, Optional[LazyEngine]], thread_name: str = "EnginePrewarm",
+                on_done: Optional[Callable[[], None]] = None) -> Optional[threading.Thread]:
+    """Build every unbuilt engine in one background thread, calling *on_done* after each.
+
+    Returns the thread (None if nothing to do).
+    """
+    pending = [e for e in engines.values() if isinstance(e, LazyEngine) and not e.built]
+    if not pending:
+        return None
+
+    def _run():
+        for engine in pending:
+            engine.prewarm()
+            if on_done is not None:
+                on_done()
+
+    thread = threading.Thread(target=_run, name=thread_name, daemon=True)
+    thread.start()
+    return thread
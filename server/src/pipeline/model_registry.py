@@ -0,0 +1,85 @@
+"""
+model_registry.py — Reference-counted model instances shared across sessions.
+
+Each concurrent session gets its own orchestrator (queues, dispatchers,
+conversation window), but the expensive, stateless-per-request parts — Riva
+gRPC channels, the Google Cloud client — should exist once per credential
+set, not once per session. ``acquire`` returns the shared instance for a key
+(building it on first use) and ``release`` drops a reference; the last
+release calls the instance's ``close()`` if it has one.
+
+Keys embed credentials, so they are stored as short digests, never raw.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+RegistryKey = Tuple[str, str]
+
+
+class ModelRegistry:
+    """Process-wide ``key -> (instance, refcount)`` map. Thread-safe."""
+
+    def __init__(self):
+        self._entries: Dict[RegistryKey, list] = {}
+        self._lock = threading.Lock()
+        # Factories run outside the registry lock (gRPC setup can take seconds);
+        # one lock per key keeps concurrent acquirers from building twice.
+        self._build_locks: Dict[RegistryKey, threading.Lock] = {}
+
+    @staticmethod
+    def key(kind: str, *parts: Any) -> RegistryKey:
+        """Stable key for *kind* built from (possibly secret) config *parts*."""
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return kind, hashlib.sha256(raw.encode()).hexdigest()[:12]
+
+    def acquire(self, key: RegistryKey, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] += 1
+                return entry[0]
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry[1] += 1
+                    return entry[0]
+            instance = factory()
+            with self._lock:
+                self._entries[key] = [instance, 1]
+            logging.debug(f"[ModelRegistry] Created {key[0]} ({key[1]})")
+            return instance
+
+    def release(self, key: RegistryKey):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._entries[key]
+            self._build_locks.pop(key, None)
+        close = getattr(entry[0], "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logging.warning(f"[ModelRegistry] Closing {key[0]} failed: {e}")
+        logging.debug(f"[ModelRegistry] Released last reference to {key[0]} ({key[1]})")
+
+    def refcount(self, key: RegistryKey) -> int:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry else 0
+
+    def stats(self) -> Dict[str, int]:
+        """``{"riva-asr:ab12cd34ef56": refs, ...}`` for status reporting."""
+        with self._lock:
+            return {f"{kind}:{digest}": entry[1] for (kind, digest), entry in self._entries.items()}
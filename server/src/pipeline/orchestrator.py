@@ -15,19 +15,27 @@ import threading
 import logging
 import time
 import structlog
-import pysbd
 import numpy as np
 from concurrent.futures import ThreadPoolExecutor, Future
 from collections import deque
+from functools import partial
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from src.models.asr import RivaASRModel, WhisperModel, get_gpu_info, SpeechRecognitionModel
+from src.models.asr import RivaASRModel, WhisperModel, SpeechRecognitionModel
 
 from src.models.translation import RivaNMTModel, LlamaModel, GoogleModel, MyMemoryModel, GoogleCloudTranslationModel
 
 from src.asr import ASRDispatcher
 from src.translation import TranslationDispatcher
-from src.utils import LANG_TO_BCP47
+from src.utils import LANG_TO_BCP47, estimate_tokens
+from src.utils.bounded_queue import BoundedQueue, MERGE, SHOW_ORIGINAL
+from src.utils.metrics import metrics, ASR_QUEUE_WAIT, TRANSLATION_QUEUE_WAIT
+from src.utils.system_probe import system_probe
+from src.utils.tracing import Trace, merge_traces
+from .lazy_engine import LazyEngine, prewarm_all
+from .model_registry import ModelRegistry, RegistryKey
+from .rate_limiter import RateLimiter
+from .sentence_aggregator import SentenceAggregator
 
 # Valid transcription model IDs
 _WHISPER_SIZES = {"whisper-tiny", "whisper-base", "whisper-small", "whisper-medium"}
@@ -35,6 +43,21 @@ _WHISPER_SIZES = {"whisper-tiny", "whisper-base", "whisper-small", "whisper-medi
 # BCP-47 language codes mapping
 _LANG_MAP = LANG_TO_BCP47
 
+# Engines billed against the NVIDIA NIM key (rate-limit buckets keyed by it)
+_NIM_ENGINES = {"riva-asr", "riva-nmt", "llama"}
+
+# While rate-limited, keep folding queued items into the pending one until
+# it reaches this size — then just wait for budget.
+_MERGE_AUDIO_UNTIL_S = 8.0
+_MERGE_TEXT_UNTIL_TOKENS = 200
+
+# Queue bounds — keep captions within a few chunks of live audio under overload.
+# Overflowing audio is merged into the newest queued chunk (up to
+# _MAX_MERGED_AUDIO_S), overflowing transcripts are shown untranslated.
+_AUDIO_QUEUE_MAX = 6
+_TRANSLATION_QUEUE_MAX = 8
+_MAX_MERGED_AUDIO_S = 15.0
+
 
 class InferenceOrchestrator:
     """
@@ -43,69 +66,156 @@ class InferenceOrchestrator:
     """
 
     def __init__(self, nvidia_api_key: str = "", google_credentials: Any = "", 
-                 riva_translation_id: str = "", riva_asr_parakeet_id: str = "", riva_asr_canary_id: str = ""):
+                 riva_translation_id: str = "", riva_asr_parakeet_id: str = "", riva_asr_canary_id: str = "",
+                 registry: Optional[ModelRegistry] = None, rate_limiter: Optional[RateLimiter] = None):
         self.nvidia_api_key = nvidia_api_key
         self.google_credentials = google_credentials
         self.riva_translation_id = riva_translation_id
         self.riva_asr_parakeet_id = riva_asr_parakeet_id
         self.riva_asr_canary_id = riva_asr_canary_id
         
-        # Explicitly define models for linter and clarity
-        self.riva_asr: Optional[RivaASRModel] = None
-        self.riva_nmt: Optional[RivaNMTModel] = None
+        # Explicitly define models for linter and clarity. LazyEngine proxies
+        # RivaASRModel, RivaNMTModel, LlamaModel, GoogleCloudTranslationModel
+        # and SpeechRecognitionModel respectively.
+        self.riva_asr: Optional[LazyEngine] = None
+        self.riva_nmt: Optional[LazyEngine] = None
         self.whisper: Optional[WhisperModel] = None
-        self.llama: Optional[LlamaModel] = None
+        self.llama: Optional[LazyEngine] = None
         self.google_free: Optional[GoogleModel] = None
-        self.google_api: Optional[GoogleCloudTranslationModel] = None
+        self.google_api: Optional[LazyEngine] = None
         self.mymemory: Optional[MyMemoryModel] = None
-        self.local_asr: Optional[SpeechRecognitionModel] = None
+        self.local_asr: Optional[LazyEngine] = None
 
         self.logger = structlog.get_logger()
 
         self.is_running = False
-        self.audio_queue: queue.Queue = queue.Queue()
-        self._translation_queue: queue.Queue = queue.Queue()
+        self.audio_queue = BoundedQueue(
+            _AUDIO_QUEUE_MAX, policy=MERGE, merge_fn=self._merge_audio_capped,
+            on_wait=partial(metrics.observe, ASR_QUEUE_WAIT),
+        )
+        self._translation_queue = BoundedQueue(
+            _TRANSLATION_QUEUE_MAX, policy=SHOW_ORIGINAL, on_evict=self._emit_untranslated,
+            on_wait=partial(metrics.observe, TRANSLATION_QUEUE_WAIT),
+        )
         self._reloader_lock = threading.Lock()
         # ThreadPoolExecutor for parallel ASR — max 2 workers so we never
         # double the RPM budget (chunks are still produced at the same rate,
         # but a slow Riva call won't stall the next chunk from starting).
         self._asr_executor: Optional[ThreadPoolExecutor] = None
+        # RPM/TPM budgets per remote engine + key (configured via settings_update).
+        # Sessions sharing an API key must share one limiter, so it can be injected.
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # Shared gRPC/credential-bound models (SessionManager); None = own instances
+        self.registry = registry
+        self._registry_refs: Dict[str, Tuple[RegistryKey, LazyEngine]] = {}
+        self._prewarm_thread: Optional[threading.Thread] = None
+        # Conversation window size for Llama; applied when the engine is built
+        self._llama_context_pairs = 0
+        # Called (from any thread) when model statuses may have changed
+        self.on_status_change: Optional[Callable[[], None]] = None
+        # Joins ASR fragments into sentences between the ASR and translation stages
+        self.sentence_aggregator = SentenceAggregator()
         
         # Models
         self._init_models()
         assert self.riva_asr and self.whisper and self.local_asr
         assert self.riva_nmt and self.llama and self.google_free and self.mymemory
 
-        # Dispatchers
+        # Dispatchers (the lazy proxies stand in for the engine types they expect)
         self.asr_dispatcher = ASRDispatcher(
-            riva=self.riva_asr,
+            riva=self.riva_asr,  # type: ignore[arg-type]
             whisper=self.whisper,
-            google_free=self.local_asr,
+            google_free=self.local_asr,  # type: ignore[arg-type]
             sample_rate=16000
         )
         self.translation_dispatcher = TranslationDispatcher(
-            riva_nmt=self.riva_nmt,
-            llama=self.llama,
+            riva_nmt=self.riva_nmt,  # type: ignore[arg-type]
+            llama=self.llama,  # type: ignore[arg-type]
             google_free=self.google_free,
             mymemory=self.mymemory,
-            google_api=self.google_api
+            google_api=self.google_api  # type: ignore[arg-type]
         )
+        self.translation_dispatcher.acquire_budget = self._acquire_translation_budget
+        self.translation_dispatcher.budget_headroom = self._budget_headroom
+        self.translation_dispatcher.charge_budget = self._charge_translation_budget
 
         # Session properties
         self._callback: Optional[Callable] = None
         self._sample_rate: int = 16000
+        # Push non-final captions while streaming-capable engines (Llama) generate
+        self.stream_partials: bool = False
 
     def _init_models(self):
-        """Pre-instantiate model wrappers."""
-        self.riva_asr = RivaASRModel(self.nvidia_api_key, parakeet_fid=self.riva_asr_parakeet_id, canary_fid=self.riva_asr_canary_id)
-        self.riva_nmt = RivaNMTModel(self.nvidia_api_key, function_id=self.riva_translation_id)
-        self.llama = LlamaModel(self.nvidia_api_key)
+        """Set up model wrappers. Engines with costly construction (gRPC channels,
+        API clients) are ``LazyEngine``s, built on first use or by ``prewarm_engines``."""
+        self._init_shared_models()
+        # Per-session: Llama carries this session's conversation window
+        self.llama = LazyEngine("llama", self._build_llama)
+        self.local_asr = LazyEngine("google_asr", SpeechRecognitionModel)
         self.google_free = GoogleModel()
-        self.google_api = GoogleCloudTranslationModel(self.google_credentials)
         self.mymemory = MyMemoryModel()
-        self.local_asr = SpeechRecognitionModel()
+        # Weights are cached process-wide; hold()/release() keep them loaded while any session uses them
         self.whisper = WhisperModel("base")
 
+    def _build_llama(self) -> LlamaModel:
+        # Current key and session window at build time — nothing to reload or resize afterwards
+        return LlamaModel(self.nvidia_api_key, context_pairs=self._llama_context_pairs)
+
+    def _init_shared_models(self):
+        """Riva gRPC clients and the Google Cloud client — from the registry when one is set."""
+        # partial() binds the classes and credentials now, not when the engine is built
+        key, parakeet, canary = self.nvidia_api_key, self.riva_asr_parakeet_id, self.riva_asr_canary_id
+        nmt_id, creds = self.riva_translation_id, self.google_credentials
+        self.riva_asr = self._shared("riva-asr", partial(RivaASRModel, key, parakeet_fid=parakeet, canary_fid=canary),
+                                     key, parakeet, canary)
+        self.riva_nmt = self._shared("riva-nmt", partial(RivaNMTModel, key, function_id=nmt_id), key, nmt_id)
+        self.google_api = self._shared("google_api", partial(GoogleCloudTranslationModel, creds), creds)
+
+    def _wire_shared_models(self):
+        """Point the dispatchers at the current shared engines (after ``_init_shared_models``)."""
+        self.asr_dispatcher.riva = self.riva_asr  # type: ignore[assignment]
+        self.translation_dispatcher.riva_nmt = self.riva_nmt  # type: ignore[assignment]
+        self.translation_dispatcher.google_api = self.google_api  # type: ignore[assignment]
+
+    def _shared(self, kind: str, factory: Callable[[], Any], *config: Any) -> LazyEngine:
+        """Lazy engine for *kind*; with a registry, building it takes a shared reference."""
+        old = self._registry_refs.pop(kind, None)
+        if old is not None and old[1].built and self.registry is not None:
+            self.registry.release(old[0])
+        if self.registry is None:
+            return LazyEngine(kind, factory)
+        registry = self.registry
+        key = registry.key(kind, *config)
+        engine = LazyEngine(kind, lambda: registry.acquire(key, factory))
+        self._registry_refs[kind] = (key, engine)
+        return engine
+
+    def close(self):
+        """Drop this orchestrator's references to shared models (session closed)."""
+        if self.registry is not None:
+            for key, engine in self._registry_refs.values():
+                if engine.built:
+                    self.registry.release(key)
+            self._registry_refs.clear()
+
+    def _lazy_engines(self) -> Dict[str, Any]:
+        return {"riva_asr": self.riva_asr, "riva_nmt": self.riva_nmt, "llama": self.llama,
+                "google_api": self.google_api, "local_asr": self.local_asr}
+
+    def prewarm_engines(self):
+        """Build any engines not built yet in a background thread (call after the handshake)."""
+        if self._prewarm_thread is not None and self._prewarm_thread.is_alive():
+            return
+        self._prewarm_thread = prewarm_all(self._lazy_engines(), on_done=self._status_changed)
+
+    def _status_changed(self):
+        listener = self.on_status_change
+        if listener is not None:
+            try:
+                listener()
+            except Exception as e:
+                logging.debug(f"[Orchestrator] Status listener failed: {e}")
+
     # ── Configuration ────────────────────────────────────────────────────────
 
     def set_api_keys(self, nvidia_key: str, google_credentials: Any, 
@@ -123,19 +233,38 @@ class InferenceOrchestrator:
         def _do_reload():
             with self._reloader_lock:
                 try:
-                    if self.riva_asr:
-                        self.riva_asr.reload(nvidia_key, parakeet_fid=self.riva_asr_parakeet_id, canary_fid=self.riva_asr_canary_id)
-                    if self.riva_nmt:
-                        self.riva_nmt.reload(nvidia_key, function_id=self.riva_translation_id)
-                    if self.llama:
+                    if self.registry is not None:
+                        # Shared instances may serve other sessions' keys — swap
+                        # references instead of reloading in place
+                        self._init_shared_models()
+                        self._wire_shared_models()
+                        if self.llama and self.llama.built:
+                            self.llama.reload(nvidia_key)
+                        logging.info("[Orchestrator] Shared models re-acquired for new credentials.")
+                        return
+                    # Built engines reload in place; unbuilt ones only get factories
+                    # bound to the new keys, so a key change never builds an engine
+                    riva_asr, riva_nmt, google_api = self.riva_asr, self.riva_nmt, self.google_api
+                    self._init_shared_models()
+                    if riva_asr and riva_asr.built:
+                        self.riva_asr = riva_asr
+                        riva_asr.reload(nvidia_key, parakeet_fid=self.riva_asr_parakeet_id, canary_fid=self.riva_asr_canary_id)
+                    if riva_nmt and riva_nmt.built:
+                        self.riva_nmt = riva_nmt
+                        riva_nmt.reload(nvidia_key, function_id=self.riva_translation_id)
+                    if google_api and google_api.built:
+                        self.google_api = google_api
+                        google_api.reload(self.google_credentials)
+                    self._wire_shared_models()
+                    if self.llama and self.llama.built:
                         self.llama.reload(nvidia_key)
-                    if self.google_api:
-                        self.google_api.reload(self.google_credentials)
                     logging.info("[Orchestrator] Background model reload complete.")
                 except Exception as e:
                     logging.error(f"Error updating model API keys: {e}")
+                finally:
+                    self._status_changed()
 
-        threading.Thread(target=_do_reload, daemon=True).start()
+        threading.Thread(target=_do_reload, name="ModelReload", daemon=True).start()
 
     # ── Stream Control ────────────────────────────────────────────────────────
 
@@ -148,11 +277,53 @@ class InferenceOrchestrator:
         transcription_model: str = "online",
         translation_model: str = "",        # empty → derive from ai_engine
         callback: Optional[Callable] = None,
+        stream_partials: bool = False,
+        llama_context_pairs: int = 0,
+        sentence_max_wait_ms: int = 0,
+        queue_policy: Optional[Dict[str, Any]] = None,
     ):
         """Initialize and start background worker threads."""
         if self.is_running:
             return
 
+        if not self.prepare_session(
+            sample_rate, source_lang=source_lang, target_lang=target_lang, ai_engine=ai_engine,
+            transcription_model=transcription_model, translation_model=translation_model,
+            callback=callback, stream_partials=stream_partials, llama_context_pairs=llama_context_pairs,
+            sentence_max_wait_ms=sentence_max_wait_ms, queue_policy=queue_policy,
+        ):
+            return
+
+        self.is_running = True
+        self.audio_clear()
+
+        # ASR thread pool — 2 workers so a slow Riva call (network jitter)
+        # doesn't stall the next chunk from starting immediately.
+        self._asr_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ASRWorker")
+
+        # Start Workers
+        threading.Thread(target=self._asr_worker, name="ASRWorker", daemon=True).start()
+        threading.Thread(target=self._translation_worker, name="TranslationWorker", daemon=True).start()
+
+        self.warmup_engines()
+        logging.info(f"[Orchestrator] Stream started: ASR={self.asr_dispatcher.transcription_model}, Translat={self.translation_dispatcher.translation_model}")
+
+    def prepare_session(
+        self,
+        sample_rate: int,
+        source_lang: str = "auto",
+        target_lang: Optional[str] = None,
+        ai_engine: str = "google",
+        transcription_model: str = "online",
+        translation_model: str = "",
+        callback: Optional[Callable] = None,
+        stream_partials: bool = False,
+        llama_context_pairs: int = 0,
+        sentence_max_wait_ms: int = 0,
+        queue_policy: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Apply per-session config to the dispatchers and run preflight checks.
+        Shared by the threaded workers and ``AsyncPipeline``. Returns False if the session can't start."""
         # Legacy Engine Mapping
         if not translation_model:
             translation_model = {
@@ -172,33 +343,59 @@ class InferenceOrchestrator:
 
         self._sample_rate = sample_rate
         self._callback = callback
-
-        if not self._validate_preflight():
-            return
-
-        self.is_running = True
-        self.audio_clear()
-
-        # ASR thread pool — 2 workers so a slow Riva call (network jitter)
-        # doesn't stall the next chunk from starting immediately.
-        self._asr_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ASRWorker")
-
-        # Start Workers
-        threading.Thread(target=self._asr_worker, name="ASRWorker", daemon=True).start()
-        threading.Thread(target=self._translation_worker, name="TranslationWorker", daemon=True).start()
-
-        # Warm up Riva gRPC connection in background so the first real chunk
-        # doesn't pay the ~5-6s TLS cold-start cost.
+        self.stream_partials = stream_partials
+        # Fresh conversation window per session — never leak captions across sessions
+        self._llama_context_pairs = llama_context_pairs
+        if self.llama and self.llama.built:  # an unbuilt Llama gets a fresh window when built
+            self.llama.set_context_window(llama_context_pairs)
+        self.sentence_aggregator.reset(max_wait_s=sentence_max_wait_ms / 1000.0, language=source_lang)
+        self.asr_dispatcher.dedup.reset()
+        self.asr_dispatcher.language.reset()
+        self.configure_queues(queue_policy or {})
+        if self.translation_dispatcher.translation_model == "auto":
+            self.prewarm_engines()  # "auto" only considers engines already built
+
+        return self._validate_preflight()
+
+    def warmup_engines(self):
+        """Warm up Riva gRPC connection in background so the first real chunk
+        doesn't pay the ~5-6s TLS cold-start cost."""
         if self.asr_dispatcher.transcription_model == "riva-asr" and self.riva_asr:
-            from src.utils import LANG_TO_BCP47
-            warmup_lang = "multi" if source_lang == "auto" else LANG_TO_BCP47.get(source_lang, "en-US")
-            self.riva_asr.warmup(sample_rate=sample_rate, lang=warmup_lang)
+            source_lang = self.asr_dispatcher.source_lang
+            warmup_lang = "multi" if source_lang == "auto" else _LANG_MAP.get(source_lang, "en-US")
+            self.riva_asr.warmup(sample_rate=self._sample_rate, lang=warmup_lang)
 
-        logging.info(f"[Orchestrator] Stream started: ASR={self.asr_dispatcher.transcription_model}, Translat={self.translation_dispatcher.translation_model}")
+    def make_asr_config(self) -> Any:
+        """Riva recognition config for the current session (None for other ASR engines)."""
+        use_auto = self.asr_dispatcher.source_lang == "auto"
+        asr_lang = "multi" if use_auto else _LANG_MAP.get(self.asr_dispatcher.source_lang, "en-US")
+        return (self.riva_asr.make_config(self._sample_rate, asr_lang)
+                if self.asr_dispatcher.transcription_model == "riva-asr" and self.riva_asr
+                else None)
 
     def stop_stream(self):
         """Signal workers to stop and clear queues."""
         self.is_running = False
+        agg = self.sentence_aggregator
+        # The last fragment of the session would otherwise wait for a sentence that never comes
+        for item in agg.flush():
+            self._translation_queue.put(item)
+        if agg.fragments_in:
+            logging.info(f"[Orchestrator] Sentence aggregation: {agg.fragments_in} ASR fragments -> {agg.items_out} translations")
+        dedup = self.asr_dispatcher.dedup
+        if dedup.dropped or dedup.trimmed:
+            logging.info(f"[Orchestrator] Transcript dedup: {dedup.dropped} repeats dropped, "
+                         f"{dedup.trimmed} overlaps trimmed, {dedup.chars_saved} chars not translated")
+        lang = self.asr_dispatcher.language.snapshot()
+        if lang["locks"]:
+            logging.info(f"[Orchestrator] Language lock: {lang['locked'] or 'none'} at stop, {lang['locks']} locks, "
+                         f"{lang['unlocks']} unlocks, {lang['forced_chunks']} chunks without detection")
+        for name, st in self.get_queue_stats().items():
+            if st["dropped"] or st["merged"] or st["evicted"]:
+                logging.warning(
+                    f"[Orchestrator] {name} queue overloaded: high_water={st['high_water']}, "
+                    f"dropped={st['dropped']}, merged={st['merged']}, shown_untranslated={st['evicted']}"
+                )
         self.audio_queue.put(None)
         self._translation_queue.put(None)
 
@@ -206,9 +403,9 @@ class InferenceOrchestrator:
             self._asr_executor.shutdown(wait=False)
             self._asr_executor = None
 
-        # Unload Whisper to free up VRAM when not in use
+        # Unload Whisper to free up VRAM when no other session is using it
         if self.whisper:
-            self.whisper.unload_model()
+            self.whisper.release()
 
     def audio_clear(self):
         """Empty both ASR and Translation queues."""
@@ -217,10 +414,35 @@ class InferenceOrchestrator:
                 try: q.get_nowait()
                 except queue.Empty: break
 
-    def append_audio(self, audio_data: bytes):
-        """Add new pcm data to the ASR queue."""
+    def configure_queues(self, policy: Dict[str, Any]):
+        """Apply ``{"audio_maxsize", "audio_policy", "translation_maxsize", "translation_policy"}`` and reset counters."""
+        self.audio_queue.configure(policy.get("audio_maxsize"), policy.get("audio_policy"))
+        self._translation_queue.configure(policy.get("translation_maxsize"), policy.get("translation_policy"))
+        self.audio_queue.reset_stats()
+        self._translation_queue.reset_stats()
+
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """High-water marks and drop/merge counters for the pipeline queues."""
+        return {"audio": self.audio_queue.stats(), "translation": self._translation_queue.stats()}
+
+    def _merge_audio_capped(self, a: Any, b: Any) -> Optional[np.ndarray]:
+        if _audio_len(a) + _audio_len(b) > _MAX_MERGED_AUDIO_S * self._sample_rate:
+            return None  # too long for one ASR request — drop the oldest instead
+        return _merge_audio(a, b)
+
+    def _emit_untranslated(self, item: Dict[str, Any]):
+        """Overload fallback: show the transcript as-is rather than translating it late."""
+        if self._callback and self.is_running:
+            asr_stats = item.get("asr_stats")
+            self._callback(item["text"], False, is_final=True, original_text=item["text"],
+                           usage_stats=[asr_stats] if asr_stats else None, trace=item.get("trace"))
+
+    def append_audio(self, audio_data: bytes, trace: Optional[Trace] = None):
+        """Add new pcm data to the ASR queue. *trace* is the one capture started at flush."""
         if self.is_running:
-            self.audio_queue.put(audio_data)
+            trace = trace or Trace()
+            trace.step("capture_enqueue")
+            self.audio_queue.put((audio_data, trace))
 
     def _validate_preflight(self) -> bool:
         """Check requirements for the selected models before starting."""
@@ -246,8 +468,9 @@ class InferenceOrchestrator:
                     if not self.whisper.is_downloaded():
                         self._emit_error(f"Whisper {whisper_size} model not downloaded. Open Settings to fix.")
                         return False
+                    self.whisper.hold()
             elif self.whisper:
-                self.whisper.unload_model()
+                self.whisper.release()
 
             # 3. Translation Checks
             if trans_id == "riva-nmt":
@@ -289,11 +512,7 @@ class InferenceOrchestrator:
         doesn't stall the next chunk from starting. Results are collected in
         submission order via a deque of Futures so captions are never reordered.
         """
-        use_auto = self.asr_dispatcher.source_lang == "auto"
-        asr_lang = "multi" if use_auto else _LANG_MAP.get(self.asr_dispatcher.source_lang, "en-US")
-        config = (self.riva_asr.make_config(self._sample_rate, asr_lang)
-                  if self.asr_dispatcher.transcription_model == "riva-asr" and self.riva_asr
-                  else None)
+        config = self.make_asr_config()
 
         pending: deque[Future] = deque()
 
@@ -304,9 +523,13 @@ class InferenceOrchestrator:
                 try:
                     asr_result = fut.result()
                     if asr_result:
-                        self._translation_queue.put(asr_result)
+                        for item in self.sentence_aggregator.push(asr_result):
+                            self._translation_queue.put(item)
                 except Exception as e:
                     logging.error(f"[ASRWorker] Future error: {e}")
+            # Release a held sentence fragment once its max-wait deadline passes
+            for item in self.sentence_aggregator.flush_due():
+                self._translation_queue.put(item)
 
         while self.is_running:
             try:
@@ -314,11 +537,21 @@ class InferenceOrchestrator:
                 if chunk is None:
                     break
 
+                asr_engine = self.asr_dispatcher.transcription_model
+                if self.rate_limiter.is_limited(asr_engine):
+                    chunk, _ = self._await_budget(
+                        asr_engine, chunk, self.audio_queue,
+                        cost=lambda c: 0,
+                        merge=_merge_audio,
+                        is_full=lambda c: _audio_len(c) >= _MERGE_AUDIO_UNTIL_S * self._sample_rate,
+                    )
+
                 executor = self._asr_executor
                 if executor is None:
                     break
 
-                fut = executor.submit(self.asr_dispatcher.process_chunk, chunk, config)
+                samples, trace = _unpack_audio(chunk)
+                fut = executor.submit(self.asr_dispatcher.process_chunk, samples, config, trace=trace)
                 pending.append(fut)
                 _drain_ordered()
 
@@ -337,45 +570,159 @@ class InferenceOrchestrator:
                 pass
 
     def _translation_worker(self):
-        """Processes transcripts into translations via TranslationDispatcher."""
-        while self.is_running:
+        """Processes transcripts into translations via TranslationDispatcher.
+
+        Runs until the stop sentinel, so captions queued ahead of it (including
+        the sentence fragment flushed at stop) are still delivered."""
+        while True:
             try:
                 item = self._translation_queue.get(timeout=1.0)
                 if item is None: break
                 
-                dwell_time = int((time.time() - item["created_at"]) * 1000)
-                text = item["text"]
-                asr_stats = item["asr_stats"]
-
-                if self.translation_dispatcher.target_lang and self.translation_dispatcher.target_lang != "none":
-                    detected_hint = asr_stats.get("detected_lang") if asr_stats else None
-                    translated, trans_stats = self.translation_dispatcher.translate(text, detected_hint)
-
-                    if translated is None:
-                        continue
-
-                    if trans_stats:
-                        trans_stats["queue_dwell_ms"] = dwell_time
-
-                    stats = [s for s in [asr_stats, trans_stats] if s]
-                    if self._callback:
-                        self._callback(translated, False, is_final=True, original_text=text, usage_stats=stats)
-                else:
-                    if self._callback:
-                        self._callback(text, False, is_final=True, original_text=text, usage_stats=[asr_stats] if asr_stats else None)
+                trans_engine = self.translation_dispatcher.translation_model
+                throttled_ms = 0
+                if self.is_translating and self.rate_limiter.is_limited(trans_engine):
+                    item, throttled_ms = self._await_budget(
+                        trans_engine, item, self._translation_queue,
+                        cost=self._translation_cost,
+                        merge=_merge_captions,
+                        is_full=lambda c: estimate_tokens(c["text"]) >= _MERGE_TEXT_UNTIL_TOKENS,
+                    )
+
+                self.process_transcript(item, throttled_ms)
 
             except queue.Empty:
+                if not self.is_running:
+                    break
                 continue
             except Exception as e:
                 logging.error(f"[TranslationWorker] Error: {e}")
                 self._emit_error(f"Translation Failure: {e}")
 
+    @property
+    def is_translating(self) -> bool:
+        target = self.translation_dispatcher.target_lang
+        return bool(target and target != "none")
+
+    def process_transcript(self, item: Dict[str, Any], throttled_ms: int = 0):
+        """Translate one transcript item (if a target is set) and deliver the caption."""
+        caption = self.translate_transcript(item, throttled_ms)
+        if caption is not None:
+            self.deliver_caption(caption)
+
+    def translate_transcript(self, item: Dict[str, Any], throttled_ms: int = 0) -> Optional[Dict[str, Any]]:
+        """The final caption for one transcript item (translated if a target is set), or None
+        if translation failed. Blocking, but delivers nothing: ``AsyncPipeline`` runs it on
+        its executor and hands the result to ``deliver_caption`` back on the loop."""
+        dwell_time = int((time.time() - item["created_at"]) * 1000)
+        text = item["text"]
+        asr_stats = item["asr_stats"]
+        trace = item.get("trace")
+        if trace is not None:
+            trace.step("translation_queue_wait")  # includes any sentence-aggregator hold
+
+        if not self.is_translating:
+            return {"text": text, "original_text": text,
+                    "usage_stats": [asr_stats] if asr_stats else None, "trace": trace}
+
+        detected_hint = asr_stats.get("detected_lang") if asr_stats else None
+        on_partial = self._make_partial_emitter(text, trace) if self.stream_partials else None
+        translated, trans_stats = self.translation_dispatcher.translate(
+            text, detected_hint, on_partial=on_partial, trace=trace
+        )
+
+        if translated is None:
+            if trace is not None:
+                trace.finish("translation_failed")
+            return None
+
+        if trans_stats:
+            trans_stats["queue_dwell_ms"] = dwell_time
+            if throttled_ms:
+                trans_stats["rate_limited_ms"] = throttled_ms
+            if item.get("merged"):
+                trans_stats["merged_captions"] = item["merged"]
+
+        stats = [s for s in [asr_stats, trans_stats] if s]
+        return {"text": translated, "original_text": text, "usage_stats": stats, "trace": trace}
+
+    def deliver_caption(self, caption: Dict[str, Any]):
+        """Send a caption from ``translate_transcript`` to the session callback."""
+        if self._callback:
+            self._callback(caption["text"], False, is_final=True, original_text=caption["original_text"],
+                           usage_stats=caption["usage_stats"], trace=caption["trace"])
+
+    # ── Rate Limiting ────────────────────────────────────────────────────────
+
+    def _engine_key(self, engine: str) -> str:
+        return self.nvidia_api_key if engine in _NIM_ENGINES else ""
+
+    def _translation_cost(self, item: Dict[str, Any], engine: Optional[str] = None) -> int:
+        """Estimated tokens (input + similar-sized output) for one translation request."""
+        tokens = estimate_tokens(item["text"]) * 2
+        if (engine or self.translation_dispatcher.translation_model) == "llama":
+            tokens += estimate_tokens(LlamaModel.build_system_prompt(self.translation_dispatcher.target_lang or ""))
+        return tokens
+
+    def _acquire_translation_budget(self, engine: str, text: str) -> float:
+        """For "auto": take *engine*'s budget for *text* now (0.0), or the seconds until it fits."""
+        return self.rate_limiter.try_acquire(engine, self._engine_key(engine),
+                                             self._translation_cost({"text": text}, engine))
+
+    def _charge_translation_budget(self, engine: str, text: str):
+        """A fallback *engine* answered *text*: its RPM/TPM budget pays for the request."""
+        self.rate_limiter.charge(engine, self._engine_key(engine),
+                                 self._translation_cost({"text": text}, engine))
+
+    def _budget_headroom(self, engine: str) -> Optional[float]:
+        return self.rate_limiter.headroom(engine, self._engine_key(engine))
+
+    def _await_budget(self, engine: str, item: Any, q: queue.Queue,
+                      cost: Callable[[Any], int], merge: Callable[[Any, Any], Any],
+                      is_full: Callable[[Any], bool]) -> Tuple[Any, int]:
+        """Block until *engine*'s RPM/TPM budget admits *item*.
+
+        While throttled, items queued behind it are merged into it (up to
+        *is_full*) so a burst turns into fewer, larger requests instead of
+        a 429 storm. Returns (possibly merged item, ms spent waiting).
+        """
+        start = time.monotonic()
+        while self.is_running:
+            wait = self.rate_limiter.try_acquire(engine, self._engine_key(engine), cost(item))
+            if wait <= 0:
+                break
+            deadline = time.monotonic() + min(wait, 0.5)
+            while not is_full(item):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    q.put(None)  # leave the stop sentinel for the worker loop
+                    return item, int((time.monotonic() - start) * 1000)
+                item = merge(item, nxt)
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+        return item, int((time.monotonic() - start) * 1000)
+
+    def _make_partial_emitter(self, original_text: str, trace: Optional[Trace] = None) -> Callable[[str], None]:
+        """Build an ``on_partial`` hook that pushes non-final captions for *original_text*."""
+        def _emit(partial: str):
+            if self._callback and self.is_running:
+                self._callback(partial, False, is_final=False, original_text=original_text, trace=trace)
+        return _emit
+
     # ── Status & Utilities ───────────────────────────────────────────────────
 
     def whisper_unload(self):
         """Unload Whisper model from memory."""
         if self.whisper:
             self.whisper.unload_model()
+            self._status_changed()
 
     def get_all_statuses(self) -> List[Dict]:
         """Collect statuses from all internal models."""
@@ -383,8 +730,8 @@ class InferenceOrchestrator:
         if self.whisper:
             statuses.extend(self.whisper.get_all_statuses())
         
-        # GPU Info
-        gpu = get_gpu_info()
+        # GPU Info (cached by the background probe — never imports torch here)
+        gpu = system_probe.gpu()
         statuses.append({
             "name": "system-gpu",
             "status": "available" if gpu["available"] else "unavailable",
@@ -397,31 +744,101 @@ class InferenceOrchestrator:
         })
             
         # Separate Riva ASR and NMT status
-        asr_status = self.riva_asr.get_status() if self.riva_asr else {"name": "riva-asr", "status": "error", "ready": False}
-        nmt_status = self.riva_nmt.get_status() if self.riva_nmt else {"name": "riva-nmt", "status": "error", "ready": False}
+        asr_status = _engine_status(self.riva_asr) if self.riva_asr else {"name": "riva-asr", "status": "error", "ready": False}
+        nmt_status = _engine_status(self.riva_nmt) if self.riva_nmt else {"name": "riva-nmt", "status": "error", "ready": False}
         
         statuses.append(asr_status)
         statuses.append(nmt_status)
         
-        if self.local_asr: statuses.append(self.local_asr.get_status())
-        if self.llama: statuses.append(self.llama.get_status())
+        if self.local_asr: statuses.append(_engine_status(self.local_asr))
+        if self.llama: statuses.append(_engine_status(self.llama))
         if self.google_free: statuses.append(self.google_free.get_status())
-        if self.google_api: statuses.append(self.google_api.get_status())
+        if self.google_api: statuses.append(_engine_status(self.google_api))
         if self.mymemory: statuses.append(self.mymemory.get_status())
+        statuses.append(self._leaderboard_status())
+        # Never builds engines: unbuilt ones report "loading" until used or prewarmed
         return statuses
 
 
+    def _leaderboard_status(self) -> Dict[str, Any]:
+        """Translation engines by health score per language pair (what "auto" picks from)."""
+        board = self.translation_dispatcher.selector.leaderboard(self._budget_headroom)
+        best: Dict[str, Dict[str, Any]] = {}
+        for row in board:
+            best.setdefault(row["pair"], row)
+        message = ", ".join(f"{pair}: {row['engine']} ({row['score_ms']} ms)" for pair, row in best.items())
+        return {
+            "name": "translation-leaderboard",
+            "status": "ready",
+            "ready": True,
+            "message": f"Best: {message}" if message else "No translations measured yet.",
+            "progress": 100.0,
+            "details": {"leaderboard": board},
+        }
+
     def get_capabilities(self) -> Dict[str, Any]:
         """Returns a map of server capabilities."""
-        gpu = get_gpu_info()
+        gpu = system_probe.gpu()
         return {
             "has_gpu": gpu["available"],
             "gpu_name": gpu["name"],
             "vram_gb": (gpu.get("vram_total", 0) / 1024) if gpu.get("vram_total") else 0,
-            "has_google_auth": bool(self.google_api and self.google_api.is_ready()),
-            "has_nvidia_auth": bool(self.riva_asr and self.riva_asr.is_ready()),
+            # Unbuilt engines: report whether credentials are configured instead of building them here
+            "has_google_auth": _ready_or_configured(self.google_api, bool(self.google_credentials)),
+            "has_nvidia_auth": _ready_or_configured(self.riva_asr, bool(self.nvidia_api_key)),
             "whisper_models": {
                 size.split("-")[1]: self.whisper.is_downloaded(size.split("-")[1]) if self.whisper else False
                 for size in _WHISPER_SIZES
             }
         }
+
+
+def _engine_status(engine: Any) -> Dict[str, Any]:
+    if isinstance(engine, LazyEngine) and not engine.built:
+        return engine.placeholder_status()
+    return engine.get_status()
+
+
+def _ready_or_configured(engine: Any, configured: bool) -> bool:
+    if isinstance(engine, LazyEngine) and not engine.built:
+        return configured
+    return bool(engine and engine.is_ready())
+
+
+def _unpack_audio(chunk: Any) -> Tuple[Any, Optional[Trace]]:
+    """``(samples, trace)`` from a queued ``(samples, trace)`` pair or bare samples."""
+    return chunk if isinstance(chunk, tuple) else (chunk, None)
+
+
+def _audio_len(chunk: Any) -> int:
+    """Sample count of a queued audio chunk (int16 bytes or ndarray)."""
+    samples, _ = _unpack_audio(chunk)
+    return len(samples) // 2 if isinstance(samples, (bytes, bytearray)) else len(samples)
+
+
+def _merge_audio(a: Any, b: Any) -> Any:
+    """Concatenate two queued audio chunks into one int16 array (traces folded into *a*'s)."""
+    def _as_array(c):
+        return np.frombuffer(c, dtype=np.int16) if isinstance(c, (bytes, bytearray)) else c
+    (samples_a, trace_a), (samples_b, trace_b) = _unpack_audio(a), _unpack_audio(b)
+    merged = np.concatenate([_as_array(samples_a), _as_array(samples_b)])
+    if trace_a is None and trace_b is None:
+        return merged
+    return merged, merge_traces(trace_a, trace_b)
+
+
+def _merge_captions(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold transcript *b* into *a* — one translation request for both."""
+    stats_a, stats_b = a.get("asr_stats") or {}, b.get("asr_stats") or {}
+    merged_stats = dict(stats_a or stats_b)
+    for key in ("input_tokens", "output_tokens"):
+        if key in stats_a or key in stats_b:
+            merged_stats[key] = stats_a.get(key, 0) + stats_b.get(key, 0)
+    return {
+        **a,
+        "text": f"{a['text']} {b['text']}".strip(),
+        "asr_stats": merged_stats or None,
+        "created_at": min(a["created_at"], b["created_at"]),
+        "merged": a.get("merged", 1) + b.get("merged", 1),
+        "trace": merge_traces(a.get("trace"), b.get("trace")),
+    }
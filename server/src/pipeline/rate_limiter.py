@@ -0,0 +1,170 @@
+"""
+rate_limiter.py — Token-bucket RPM/TPM budgets for remote engines.
+
+One bucket pair (requests/min + tokens/min) per (engine, API key). Workers ask
+how long until a request fits the budget instead of firing and eating a 429;
+while they wait they merge the next queued chunks/captions into the pending
+one, so a burst becomes fewer, larger requests rather than dropped captions.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.utils import safe_int
+
+# Defaults per engine id (transcription_model / translation_model values).
+# NVIDIA NIM free tier allows ~40 RPM per key; 0 = unlimited.
+DEFAULT_LIMITS: Dict[str, Dict[str, int]] = {
+    "riva-asr": {"rpm": 40, "tpm": 0},
+    "riva-nmt": {"rpm": 40, "tpm": 0},
+    "llama":    {"rpm": 40, "tpm": 0},
+}
+
+
+class TokenBucket:
+    """Classic token bucket: *capacity* tokens, refilled continuously at capacity/60 per second."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(max(0, per_minute))
+        self._tokens = self.capacity
+        self._rate = self.capacity / 60.0
+        self._stamp = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self, now: float):
+        if self._rate > 0:
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self._rate)
+        self._stamp = now
+
+    def delay_for(self, amount: float, now: float) -> float:
+        """Seconds until *amount* tokens are available (0 if available now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        # A single request larger than the whole bucket is admitted once full
+        amount = min(amount, self.capacity)
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self._rate
+
+    def consume(self, amount: float):
+        if not self.unlimited:
+            self._tokens -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Registry of per-(engine, API key) RPM/TPM buckets. Thread-safe."""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, int]]] = None):
+        self._limits: Dict[str, Dict[str, int]] = {k: dict(v) for k, v in DEFAULT_LIMITS.items()}
+        self._buckets: Dict[Tuple[str, str], Tuple[TokenBucket, TokenBucket]] = {}
+        self._throttled: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if limits:
+            self.configure(limits)
+
+    def configure(self, limits: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+        """Merge ``{"llama": {"rpm": 30, "tpm": 20000}, ...}`` into the limits. Resets affected buckets.
+
+        Non-numeric values keep the current limit. Returns the resulting limits
+        of the engines that were updated.
+        """
+        applied: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            for engine, spec in (limits or {}).items():
+                if not isinstance(spec, dict):
+                    continue
+                current = self._limits.setdefault(engine, {"rpm": 0, "tpm": 0})
+                for field in ("rpm", "tpm"):
+                    if field in spec:
+                        current[field] = max(0, safe_int(spec[field] or 0, default=current[field]))
+                for key in [k for k in self._buckets if k[0] == engine]:
+                    del self._buckets[key]
+                applied[engine] = dict(current)
+        return applied
+
+    def reset(self):
+        """Back to ``DEFAULT_LIMITS`` with fresh buckets and counters."""
+        with self._lock:
+            self._limits = {k: dict(v) for k, v in DEFAULT_LIMITS.items()}
+            self._buckets.clear()
+            self._throttled.clear()
+
+    def limits(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {k: dict(v) for k, v in self._limits.items()}
+
+    def is_limited(self, engine: str) -> bool:
+        with self._lock:
+            spec = self._limits.get(engine)
+            return bool(spec and (spec["rpm"] > 0 or spec["tpm"] > 0))
+
+    def try_acquire(self, engine: str, api_key: str = "", tokens: int = 0) -> float:
+        """Consume one request + *tokens* if the budget allows and return 0.0;
+        otherwise consume nothing and return the seconds to wait."""
+        if not self.is_limited(engine):
+            return 0.0
+        with self._lock:
+            rpm, tpm = self._bucket(engine, api_key)
+            now = time.monotonic()
+            wait = max(rpm.delay_for(1, now), tpm.delay_for(tokens, now))
+            if wait > 0:
+                self._throttled[engine] = self._throttled.get(engine, 0) + 1
+                return wait
+            rpm.consume(1)
+            tpm.consume(tokens)
+            return 0.0
+
+    def charge(self, engine: str, api_key: str = "", tokens: int = 0):
+        """Consume one request + *tokens* unconditionally — for a request already
+        made (e.g. by a fallback engine). An overdrawn bucket delays later requests."""
+        if not self.is_limited(engine):
+            return
+        with self._lock:
+            rpm, tpm = self._bucket(engine, api_key)
+            now = time.monotonic()
+            rpm._refill(now)
+            tpm._refill(now)
+            rpm.consume(1)
+            tpm.consume(tokens)
+
+    def headroom(self, engine: str, api_key: str = "") -> Optional[float]:
+        """Fraction (0–1) of *engine*'s tightest budget left for *api_key*; None if unlimited."""
+        if not self.is_limited(engine):
+            return None
+        with self._lock:
+            now = time.monotonic()
+            fractions = []
+            for bucket in self._bucket(engine, api_key):
+                if not bucket.unlimited:
+                    bucket._refill(now)
+                    fractions.append(max(0.0, bucket._tokens) / bucket.capacity)
+            return min(fractions) if fractions else None
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            buckets = {}
+            for (engine, key_id), (rpm, tpm) in self._buckets.items():
+                rpm._refill(now)
+                tpm._refill(now)
+                buckets[f"{engine}:{key_id}"] = {
+                    "rpm_available": None if rpm.unlimited else round(rpm._tokens, 1),
+                    "tpm_available": None if tpm.unlimited else round(tpm._tokens, 1),
+                }
+            return {"limits": {k: dict(v) for k, v in self._limits.items()},
+                    "buckets": buckets, "throttled": dict(self._throttled)}
+
+    def _bucket(self, engine: str, api_key: str) -> Tuple[TokenBucket, TokenBucket]:
+        # Never keep raw keys around as dict keys — a short digest identifies them
+        key_id = hashlib.sha256(api_key.encode()).hexdigest()[:8] if api_key else "-"
+        pair = self._buckets.get((engine, key_id))
+        if pair is None:
+            spec = self._limits[engine]
+            pair = self._buckets[(engine, key_id)] = (TokenBucket(spec["rpm"]), TokenBucket(spec["tpm"]))
+        return pair
@@ -0,0 +1,146 @@
+"""
+sentence_aggregator.py — Buffers ASR fragments into whole sentences before translation.
+
+Chunk boundaries come from VAD/time limits, not from the speaker, so a
+transcript often ends mid-sentence. Translating fragments costs one request
+each and loses context. The aggregator holds the trailing incomplete
+sentence until either the next fragment completes it or ``max_wait_s``
+passes, then hands complete sentences to the translation stage.
+
+Engines that never punctuate (Google web ASR, some Whisper output) would
+make every fragment wait the full deadline, so holding only starts once the
+session has produced at least one sentence-final punctuation mark.
+
+The ASR worker pushes while the translation side (or ``stop``) flushes, so
+all state changes happen under one lock.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from src.utils.language_support import make_segmenter
+from src.utils.tracing import merge_traces
+
+# Sentence-final marks incl. CJK/Devanagari full stops
+_TERMINATORS = (".", "?", "!", "…", "。", "？", "！", "।", "؟")
+_CLOSERS = "\"'”’)]」』"
+
+
+def _is_complete(sentence: str) -> bool:
+    return sentence.rstrip().rstrip(_CLOSERS).endswith(_TERMINATORS)
+
+
+def _merge_stats(a: Optional[Dict], b: Optional[Dict]) -> Optional[Dict]:
+    if not a or not b:
+        return a or b
+    merged = dict(a)
+    for key in ("input_tokens", "output_tokens"):
+        merged[key] = a.get(key, 0) + b.get(key, 0)
+    merged["latency_ms"] = max(a.get("latency_ms", 0), b.get("latency_ms", 0))
+    return merged
+
+
+class SentenceAggregator:
+    """Collects transcript items and releases them at sentence boundaries. Thread-safe."""
+
+    def __init__(self, max_wait_s: float = 0.0, language: str = "en"):
+        self.max_wait_s = max(0.0, float(max_wait_s))
+        self._language = language
+        self._seg = None  # pysbd segmenter, built on the first fragment
+        self._pending: Optional[Dict[str, Any]] = None
+        self._deadline = 0.0
+        self._seen_punctuation = False
+        self.fragments_in = 0
+        self.items_out = 0
+        self._lock = threading.RLock()  # push/flush_due re-enter through flush
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_wait_s > 0
+
+    def reset(self, max_wait_s: Optional[float] = None, language: Optional[str] = None):
+        with self._lock:
+            if max_wait_s is not None:
+                self.max_wait_s = max(0.0, float(max_wait_s))
+            if language is not None and language != self._language:
+                self._language = language
+                self._seg = None
+            self._pending = None
+            self._deadline = 0.0
+            self._seen_punctuation = False
+            self.fragments_in = 0
+            self.items_out = 0
+
+    def push(self, item: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Add one ASR result; return the items ready for translation (possibly none)."""
+        with self._lock:
+            self.fragments_in += 1
+            if not self.enabled:
+                return self._emit([item])
+
+            if self._pending is None:
+                self._pending = dict(item)
+                self._deadline = time.monotonic() + self.max_wait_s
+            else:
+                self._pending = {
+                    **self._pending,
+                    "text": f"{self._pending['text']} {item['text']}".strip(),
+                    "asr_stats": _merge_stats(self._pending.get("asr_stats"), item.get("asr_stats")),
+                    "created_at": min(self._pending["created_at"], item["created_at"]),
+                    "trace": merge_traces(self._pending.get("trace"), item.get("trace")),
+                }
+
+            text = self._pending["text"]
+            if self._seg is None:
+                self._seg = make_segmenter(self._language)
+            try:
+                sentences = [s.strip() for s in self._seg.segment(text) if s.strip()]
+            except Exception:
+                sentences = [text]
+            if not sentences:
+                self._pending = None
+                return []
+
+            if any(_is_complete(s) for s in sentences):
+                self._seen_punctuation = True
+            if not self._seen_punctuation or _is_complete(sentences[-1]):
+                return self.flush()
+            if len(sentences) == 1:
+                return []
+
+            # Release the complete sentences, keep the trailing fragment
+            ready = dict(self._pending)
+            ready["text"] = " ".join(sentences[:-1])
+            # ASR usage was already attributed to the released part; the held
+            # fragment continues on a child trace so each caption closes its own
+            trace = self._pending.get("trace")
+            self._pending = {**self._pending, "text": sentences[-1], "asr_stats": None,
+                             "trace": trace.fork() if trace is not None else None}
+            self._deadline = time.monotonic() + self.max_wait_s
+            return self._emit([ready])
+
+    def due_in(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the held fragment's deadline (0 if past), or None if nothing is held."""
+        with self._lock:
+            if self._pending is None:
+                return None
+            return max(0.0, self._deadline - (now if now is not None else time.monotonic()))
+
+    def flush_due(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Release the held fragment once its max-wait deadline has passed."""
+        with self._lock:
+            if self._pending is not None and (now if now is not None else time.monotonic()) >= self._deadline:
+                return self.flush()
+            return []
+
+    def flush(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            if self._pending is None:
+                return []
+            item, self._pending = self._pending, None
+            return self._emit([item])
+
+    def _emit(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self.items_out += len(items)
+        return items
@@ -0,0 +1,170 @@
+"""
+session_manager.py — Several concurrent caption pipelines in one process.
+
+Each ``PipelineSession`` has its own orchestrator (dispatchers, queues,
+sentence aggregator, Llama conversation window) running as an
+``AsyncPipeline`` on the server loop, so viewers can get different language
+pairs from the same audio. What is expensive to duplicate is shared:
+
+  * gRPC channels / cloud clients come from one ``ModelRegistry``
+    (reference-counted per credential set, closed with the last session)
+  * Whisper weights are cached process-wide and held per running session
+  * one ``RateLimiter``, so sessions on the same NIM key share its budget
+
+Captured audio is fanned out to every open session by ``append_audio``.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.utils import safe_int
+from src.utils.bounded_queue import clean_queue_policy
+from src.utils.tracing import Trace
+from .async_pipeline import AsyncPipeline
+from .model_registry import ModelRegistry
+from .orchestrator import InferenceOrchestrator
+from .rate_limiter import RateLimiter
+
+# Each session runs its own ASR/translation requests — keep the total sane
+_MAX_SESSIONS = 4
+
+
+def stream_kwargs(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Session kwargs for ``start_stream`` / ``AsyncPipeline.start`` from a server config dict."""
+    return {
+        "source_lang": config["source_lang"],
+        "target_lang": config["target_lang"],
+        "ai_engine": config["ai_engine"],
+        "transcription_model": config["transcription_model"],
+        "translation_model": config["translation_model"],
+        "stream_partials": bool(config.get("llama_streaming", False)),
+        "llama_context_pairs": safe_int(config.get("llama_context_pairs")),
+        "sentence_max_wait_ms": safe_int(config.get("sentence_max_wait_ms")),
+        "queue_policy": clean_queue_policy(config.get("queue_policy")),
+    }
+
+
+class PipelineSession:
+    """One caption stream: its config, orchestrator and running pipeline."""
+
+    def __init__(self, session_id: str, config: Dict[str, Any],
+                 orchestrator: InferenceOrchestrator, pipeline: AsyncPipeline):
+        self.session_id = session_id
+        self.config = config
+        self.orchestrator = orchestrator
+        self.pipeline = pipeline
+        self.created_at = time.time()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "running": self.pipeline.is_running,
+            "source_lang": self.config["source_lang"],
+            "target_lang": self.config["target_lang"],
+            "transcription_model": self.config["transcription_model"],
+            "translation_model": self.config["translation_model"],
+            "uptime_s": round(time.time() - self.created_at, 1),
+            "queues": self.pipeline.get_queue_stats(),
+        }
+
+
+class SessionManager:
+    """Opens, feeds and closes concurrent ``PipelineSession``s on the server loop."""
+
+    def __init__(self, max_sessions: int = _MAX_SESSIONS, registry: Optional[ModelRegistry] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 orchestrator_factory: Optional[Callable[..., InferenceOrchestrator]] = None):
+        self.max_sessions = max(1, max_sessions)
+        self.registry = registry or ModelRegistry()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self._orchestrator_factory = orchestrator_factory or InferenceOrchestrator
+        self._sessions: Dict[str, PipelineSession] = {}
+        # Immutable snapshot read by the capture thread in append_audio
+        self._fanout: Tuple[AsyncPipeline, ...] = ()
+        self._ids = itertools.count(1)
+        self._opening = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def open(self, config: Dict[str, Any], callback: Callable[[str], Callable],
+                   sample_rate: int = 16000) -> Optional[PipelineSession]:
+        """Start a session for *config* (``ServerContext.config`` keys).
+
+        *callback* is called with the new session id and returns that session's
+        caption callback. Returns None if preflight failed; raises RuntimeError
+        when ``max_sessions`` are already open.
+        """
+        if len(self._sessions) + self._opening >= self.max_sessions:
+            raise RuntimeError(f"Session limit reached ({self.max_sessions}).")
+        self._opening += 1
+        try:
+            return await self._open(config, callback, sample_rate)
+        finally:
+            self._opening -= 1
+
+    async def _open(self, config: Dict[str, Any], callback: Callable[[str], Callable],
+                    sample_rate: int) -> Optional[PipelineSession]:
+        session_id = f"pipeline-{next(self._ids)}"
+        loop = asyncio.get_running_loop()
+        # Model wrappers may open gRPC channels — build off the loop
+        orch = await loop.run_in_executor(None, lambda: self._orchestrator_factory(
+            nvidia_api_key=config.get("nvidia_nim_key", ""),
+            google_credentials=config.get("google_credentials", {}),
+            riva_translation_id=config.get("riva_translation_function_id", ""),
+            riva_asr_parakeet_id=config.get("riva_asr_parakeet_function_id", ""),
+            riva_asr_canary_id=config.get("riva_asr_canary_function_id", ""),
+            registry=self.registry,
+            rate_limiter=self.rate_limiter,
+        ))
+        pipeline = AsyncPipeline(orch)
+        started = await pipeline.start(sample_rate, callback=callback(session_id), **stream_kwargs(config))
+        if not started:
+            orch.close()
+            return None
+
+        session = PipelineSession(session_id, dict(config), orch, pipeline)
+        self._sessions[session_id] = session
+        self._refresh_fanout()
+        logging.info(
+            f"[SessionManager] Opened {session_id}: {config['source_lang']}->{config['target_lang']} "
+            f"({len(self._sessions)}/{self.max_sessions} sessions)"
+        )
+        return session
+
+    def close(self, session_id: str) -> bool:
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        self._refresh_fanout()
+        session.pipeline.stop()
+        session.orchestrator.close()
+        logging.info(f"[SessionManager] Closed {session_id} ({len(self._sessions)} left)")
+        return True
+
+    def close_all(self):
+        for session_id in list(self._sessions):
+            self.close(session_id)
+
+    def get(self, session_id: str) -> Optional[PipelineSession]:
+        return self._sessions.get(session_id)
+
+    def append_audio(self, chunk: Any, trace: Optional[Trace] = None):
+        """Fan one captured chunk out to every open session. Safe from the capture thread.
+
+        Each session gets a child of *trace*, so its caption closes its own trace."""
+        for pipeline in self._fanout:
+            pipeline.append_audio(chunk, trace.fork() if trace is not None else None)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "max_sessions": self.max_sessions,
+            "sessions": [s.get_status() for s in self._sessions.values()],
+            "shared_models": self.registry.stats(),
+        }
+
+    def _refresh_fanout(self):
+        self._fanout = tuple(s.pipeline for s in self._sessions.values())
@@ -1 +1,2 @@
 from .translation_dispatcher import TranslationDispatcher
+from .engine_selector import EngineSelector, engine_health
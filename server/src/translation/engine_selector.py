@@ -0,0 +1,156 @@
+"""
+engine_selector.py — Per-engine, per-language-pair health and the ``"auto"`` translation model.
+
+The fixed fallback chains in ``TranslationDispatcher`` (Riva → Llama,
+Google Cloud / MyMemory → Google Free, Google Free → Llama) only react once
+an engine has already failed. ``EngineSelector`` watches every translation
+and keeps, per (engine, source → target):
+
+  - an EWMA of latency (ms), weight ``alpha`` per request
+  - an EWMA of the error rate. It decays toward 0 with ``error_half_life_s``
+    while the engine isn't being used, so an engine that failed once is
+    tried again later.
+  - request and error counts
+
+``rank`` orders candidate engines by expected cost:
+
+    score = latency / (1 - error_rate) * (1 + quota_weight * (1 - headroom))
+
+``latency / (1 - error_rate)`` is the expected time to a successful answer.
+``headroom`` is the fraction of the engine's RPM budget left (``RateLimiter``).
+An engine close to its quota loses out to one that is nearly as fast and has
+budget to spare. Engines not yet measured for the pair use their average over
+other pairs, or a prior (``_PRIOR_LATENCY_MS``), so each gets tried.
+
+One process-wide instance, ``engine_health``, is fed by every session, and
+``get_all_statuses`` publishes its ``leaderboard``.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+_ALPHA = 0.2
+_ERROR_HALF_LIFE_S = 120.0
+_QUOTA_WEIGHT = 1.0
+_MAX_ERROR_RATE = 0.95
+
+# Starting latency estimates (ms) before an engine has answered anything
+_PRIOR_LATENCY_MS: Dict[str, float] = {
+    "riva-nmt": 250.0,
+    "google_api": 300.0,
+    "google": 400.0,
+    "mymemory": 700.0,
+    "llama": 900.0,
+}
+_DEFAULT_PRIOR_MS = 1000.0
+
+Headroom = Callable[[str], Optional[float]]
+
+
+class _Health:
+    __slots__ = ("latency_ms", "error_rate", "requests", "errors", "updated_at")
+
+    def __init__(self):
+        self.latency_ms: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.updated_at = 0.0
+
+
+class EngineSelector:
+    """EWMA latency / error-rate tracker and ranking of translation engines. Thread-safe."""
+
+    def __init__(self, alpha: float = _ALPHA, error_half_life_s: float = _ERROR_HALF_LIFE_S,
+                 quota_weight: float = _QUOTA_WEIGHT):
+        self.alpha = alpha
+        self.error_half_life_s = error_half_life_s
+        self.quota_weight = quota_weight
+        self._health: Dict[Tuple[str, str], _Health] = {}
+        self._lock = threading.Lock()
+
+    def record(self, engine: str, source: str, target: str, latency_ms: Optional[float],
+               ok: bool, now: Optional[float] = None):
+        """One request to *engine* for source → target: its latency (if it answered) and outcome."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            h = self._health.setdefault((engine, _pair(source, target)), _Health())
+            error_rate = self._decayed(h, now)
+            h.error_rate = error_rate + self.alpha * ((0.0 if ok else 1.0) - error_rate)
+            h.updated_at = now
+            h.requests += 1
+            if not ok:
+                h.errors += 1
+            if ok and latency_ms is not None:
+                h.latency_ms = (float(latency_ms) if h.latency_ms is None
+                                else h.latency_ms + self.alpha * (latency_ms - h.latency_ms))
+
+    def score(self, engine: str, source: str, target: str, headroom: Optional[float] = None,
+              now: Optional[float] = None) -> float:
+        """Expected ms to a successful answer from *engine* (lower is better)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return self._score(engine, _pair(source, target), headroom, now)
+
+    def rank(self, engines: Iterable[str], source: str, target: str,
+             headroom: Optional[Headroom] = None) -> List[str]:
+        """*engines* best first (ties keep the given order)."""
+        now = time.monotonic()
+        pair = _pair(source, target)
+        with self._lock:
+            scored = [(self._score(e, pair, headroom(e) if headroom else None, now), i, e)
+                      for i, e in enumerate(engines)]
+        return [e for _, _, e in sorted(scored)]
+
+    def leaderboard(self, headroom: Optional[Headroom] = None) -> List[Dict[str, Any]]:
+        """Every measured (engine, pair), best score first within each pair."""
+        now = time.monotonic()
+        with self._lock:
+            rows = []
+            for (engine, pair), h in self._health.items():
+                room = headroom(engine) if headroom else None
+                rows.append({
+                    "engine": engine,
+                    "pair": pair,
+                    "score_ms": round(self._score(engine, pair, room, now)),
+                    "latency_ms": round(h.latency_ms) if h.latency_ms is not None else None,
+                    "error_rate": round(self._decayed(h, now), 3),
+                    "requests": h.requests,
+                    "errors": h.errors,
+                    "headroom": round(room, 2) if room is not None else None,
+                })
+        return sorted(rows, key=lambda r: (r["pair"], r["score_ms"]))
+
+    def reset(self):
+        with self._lock:
+            self._health.clear()
+
+    def _decayed(self, h: _Health, now: float) -> float:
+        if not h.error_rate or self.error_half_life_s <= 0:
+            return h.error_rate
+        return h.error_rate * 0.5 ** (max(0.0, now - h.updated_at) / self.error_half_life_s)
+
+    def _latency(self, engine: str, pair: str) -> float:
+        h = self._health.get((engine, pair))
+        if h is not None and h.latency_ms is not None:
+            return h.latency_ms
+        others = [o.latency_ms for (e, _), o in self._health.items() if e == engine and o.latency_ms is not None]
+        if others:
+            return sum(others) / len(others)
+        return _PRIOR_LATENCY_MS.get(engine, _DEFAULT_PRIOR_MS)
+
+    def _score(self, engine: str, pair: str, headroom: Optional[float], now: float) -> float:
+        h = self._health.get((engine, pair))
+        error_rate = min(self._decayed(h, now), _MAX_ERROR_RATE) if h is not None else 0.0
+        score = self._latency(engine, pair) / (1.0 - error_rate)
+        if headroom is not None:
+            score *= 1.0 + self.quota_weight * (1.0 - min(1.0, max(0.0, headroom)))
+        return score
+
+
+def _pair(source: str, target: str) -> str:
+    return f"{source}->{target}"
+
+
+engine_health = EngineSelector()
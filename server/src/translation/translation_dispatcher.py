@@ -1,6 +1,6 @@
 import logging
 import time
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from src.models.translation import (
     RivaNMTModel,
@@ -9,6 +9,22 @@ from src.models.translation import (
     MyMemoryModel,
     GoogleCloudTranslationModel
 )
+from src.utils.metrics import metrics, TRANSLATION
+from src.utils.tracing import Trace
+from .engine_selector import EngineSelector, engine_health
+
+# Picks the engine per caption from live health scores (see engine_selector.py)
+AUTO = "auto"
+_AUTO_MAX_ATTEMPTS = 3
+
+# translation_model id of the engine behind each stats["engine"] label
+_ENGINE_IDS = {
+    "google-translate": "google",
+    "google-cloud-v3-grpc": "google_api",
+    "mymemory-translate": "mymemory",
+    "llama-translate": "llama",
+    "riva-grpc-mt": "riva-nmt",
+}
 
 class TranslationDispatcher:
     """
@@ -20,20 +36,40 @@ class TranslationDispatcher:
         llama: LlamaModel,
         google_free: GoogleModel,
         mymemory: MyMemoryModel,
-        google_api: Optional[GoogleCloudTranslationModel] = None
+        google_api: Optional[GoogleCloudTranslationModel] = None,
+        selector: Optional[EngineSelector] = None,
     ):
         self.riva_nmt = riva_nmt
         self.llama = llama
         self.google_free = google_free
         self.mymemory = mymemory
         self.google_api = google_api
+        # Health scores fed by every translation; ranks engines for "auto"
+        self.selector = selector or engine_health
+        # Set by the orchestrator for "auto": take an engine's RPM/TPM budget for
+        # a text now (0 = granted, else seconds to wait), and the budget left (0–1)
+        self.acquire_budget: Optional[Callable[[str, str], float]] = None
+        self.budget_headroom: Optional[Callable[[str], Optional[float]]] = None
+        # Set by the orchestrator: charge an engine's budget for a request it already answered
+        self.charge_budget: Optional[Callable[[str, str], None]] = None
 
         self.source_lang = "auto"
         self.target_lang: Optional[str] = None
         self.translation_model = "google"
 
-    def translate(self, text: str, source_hint: Optional[str] = None) -> Tuple[Optional[str], Optional[Dict]]:
-        """Routes translation to the correct engine with built-in fallbacks."""
+    def translate(
+        self,
+        text: str,
+        source_hint: Optional[str] = None,
+        on_partial: Optional[Callable[[str], None]] = None,
+        trace: Optional[Trace] = None,
+    ) -> Tuple[Optional[str], Optional[Dict]]:
+        """Routes translation to the correct engine with built-in fallbacks.
+
+        *on_partial* is forwarded to streaming-capable engines (Llama) so
+        partial captions can be emitted while the translation is generated.
+        *trace* gets a ``translation`` span naming the engine that answered.
+        """
         if not self.target_lang or self.target_lang == "none":
             return text, None
 
@@ -58,6 +94,30 @@ class TranslationDispatcher:
                 source = script_lang
 
         # 3. Dispatching
+        start = time.perf_counter()
+        if model == AUTO:
+            result, stats = self._auto_dispatch(text, source, target, on_partial)
+        else:
+            result, stats = self._dispatch(text, source, target, model, on_partial)
+            self._record_health(model, source, target, text, result, stats)
+            self._charge_fallback(model, text, stats)
+        # Labelled by the engine that answered (after any fallback)
+        engine = stats.get("engine") if isinstance(stats, dict) else None
+        metrics.observe(TRANSLATION, time.perf_counter() - start, engine or model)
+        if trace is not None:
+            fallback = stats.get("fallback_from") if isinstance(stats, dict) else None
+            trace.step("translation", engine=engine or model, **({"fallback_from": fallback} if fallback else {}))
+        return result, stats
+
+    def _dispatch(
+        self,
+        text: str,
+        source: str,
+        target: str,
+        model: str,
+        on_partial: Optional[Callable[[str], None]],
+    ) -> Tuple[Optional[str], Optional[Dict]]:
+        """Calls the selected engine, falling back along the usual chain."""
         try:
             if model == "google_api":
                 if self.google_api:
@@ -71,17 +131,17 @@ class TranslationDispatcher:
                 return self._google_fallback(text, source, target, "mymemory")
 
             if model == "llama":
-                return self.llama.translate(text, target)
+                return self._llama_translate(text, target, on_partial)
 
             if model == "riva-nmt":
                 if source != "auto" and not self.riva_nmt.supports_translation_pair(source, target):
                     logging.info(f"[Translation] Skipping Riva for {source}->{target}; using Llama fallback.")
-                    return self._llama_fallback(text, "riva")
+                    return self._llama_fallback(text, "riva", on_partial)
                 try: 
                     return self.riva_nmt.translate(text, source, target)
                 except Exception as e:
                     logging.warning(f"[Translation] Riva failed ({e}), falling back to Llama.")
-                    return self._llama_fallback(text, "riva")
+                    return self._llama_fallback(text, "riva", on_partial)
 
             # Default: Google Free
             res, stats = self.google_free.translate(text, source, target)
@@ -94,15 +154,114 @@ class TranslationDispatcher:
             logging.error(f"[TranslationDispatcher] Global translation error: {e}")
             return None, None
 
+    def _auto_dispatch(
+        self,
+        text: str,
+        source: str,
+        target: str,
+        on_partial: Optional[Callable[[str], None]],
+    ) -> Tuple[Optional[str], Optional[Dict]]:
+        """``"auto"``: the best-scoring engines that can take this pair, in order,
+        skipping any that is out of rate-limit budget right now."""
+        ranked = self.selector.rank(self._auto_candidates(source, target), source, target,
+                                    self.budget_headroom)
+        tried: List[str] = []
+        for engine in ranked:
+            if len(tried) >= _AUTO_MAX_ATTEMPTS:
+                break
+            if self.acquire_budget is not None and self.acquire_budget(engine, text) > 0:
+                continue
+            start = time.perf_counter()
+            try:
+                result, stats = self._call_engine(engine, text, source, target, on_partial)
+            except Exception as e:
+                logging.warning(f"[Translation] auto: {engine} failed ({e})")
+                result, stats = None, None
+            # Same measure as fixed models (_record_health): the engine's own latency_ms,
+            # wall time only for an engine that reports no stats
+            latency_ms = stats.get("latency_ms") if isinstance(stats, dict) else (time.perf_counter() - start) * 1000
+            self.selector.record(engine, source, target, latency_ms or None, ok=bool(result))
+            if result:
+                answer: Dict[str, Any] = dict(stats) if isinstance(stats, dict) else {"engine": engine}
+                answer["auto"] = True
+                if tried:
+                    answer["fallback_from"] = tried[0]
+                return result, answer
+            tried.append(engine)
+        return None, None
+
+    def _auto_candidates(self, source: str, target: str) -> List[str]:
+        """Engines that are ready and can translate source → target."""
+        known = source != "auto"
+        engines = []
+        if known and _usable(self.riva_nmt) and self.riva_nmt.supports_translation_pair(source, target):
+            engines.append("riva-nmt")
+        if _usable(self.llama):
+            engines.append("llama")
+        if _usable(self.google_api):
+            engines.append("google_api")
+        if known:
+            engines.append("mymemory")  # needs an explicit source language
+        engines.append("google")
+        return engines
+
+    def _call_engine(
+        self,
+        engine: str,
+        text: str,
+        source: str,
+        target: str,
+        on_partial: Optional[Callable[[str], None]],
+    ) -> Tuple[Optional[str], Optional[Dict]]:
+        """One request to *engine*, no fallback."""
+        if engine == "llama":
+            return self._llama_translate(text, target, on_partial)
+        model = {
+            "riva-nmt": self.riva_nmt,
+            "google_api": self.google_api,
+            "mymemory": self.mymemory,
+        }.get(engine, self.google_free)
+        return model.translate(text, source, target)
+
+    def _record_health(self, model: str, source: str, target: str, text: str,
+                       result: Optional[str], stats: Any):
+        """Feed a fixed-model translation into the health scores: the requested
+        engine failed if it fell back, and the engine that answered succeeded
+        unless it reported an error (the Google fallback then echoes *text*)."""
+        stats = stats if isinstance(stats, dict) else {}
+        fell_back = bool(stats.get("fallback_from"))
+        if result is None or fell_back:
+            self.selector.record(model, source, target, None, ok=False)
+        answered = _ENGINE_IDS.get(stats.get("engine"))
+        if result is None or answered is None:
+            return
+        if stats.get("error") or (fell_back and result == text):
+            self.selector.record(answered, source, target, None, ok=False)
+        else:
+            # latency_ms 0 marks an answer that never left the process (cache, empty text)
+            self.selector.record(answered, source, target, stats.get("latency_ms") or None, ok=True)
+
+    def _charge_fallback(self, model: str, text: str, stats: Any):
+        """The caller took *model*'s budget; a fallback engine that answered pays for its own request."""
+        answered = _ENGINE_IDS.get(stats.get("engine")) if isinstance(stats, dict) else None
+        if self.charge_budget is not None and answered is not None and answered != model:
+            self.charge_budget(answered, text)
+
     def _google_fallback(self, text, source, target, original_engine) -> Tuple[str, Dict]:
         res, stats = self.google_free.translate(text, source, target)
         if stats:
             stats["fallback_from"] = original_engine
         return res or text, stats
 
-    def _llama_fallback(self, text: str, original_engine: str) -> Tuple[Optional[str], Optional[Dict]]:
+    def _llama_translate(self, text: str, target: str, on_partial: Optional[Callable[[str], None]] = None):
+        if on_partial is not None:
+            return self.llama.translate(text, target, on_partial=on_partial)
+        return self.llama.translate(text, target)
+
+    def _llama_fallback(self, text: str, original_engine: str,
+                        on_partial: Optional[Callable[[str], None]] = None) -> Tuple[Optional[str], Optional[Dict]]:
         try:
-            res, stats = self.llama.translate(text, self.target_lang or "")
+            res, stats = self._llama_translate(text, self.target_lang or "", on_partial)
             if stats:
                 stats["fallback_from"] = original_engine
             return res, stats
@@ -125,3 +284,7 @@ class TranslationDispatcher:
         best_lang = max(counts.items(), key=lambda x: x[1])[0]
         return best_lang if counts[best_lang] > 0 else None
 
+
+def _usable(engine: Any) -> bool:
+    """Built (lazy engines are never built on the caption path) and ready."""
+    return engine is not None and bool(getattr(engine, "built", True)) and engine.is_ready()
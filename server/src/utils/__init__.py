@@ -5,6 +5,7 @@ from .language_support import (
     GOOGLE_FREE_LANGS,
     GOOGLE_CLOUD_LANGS,
     MYMEMORY_LANGS,
-    LLAMA_LANGS
+    LLAMA_LANGS,
+    make_segmenter,
 )
-from .server_utils import setup_logging, kill_other_instances, estimate_tokens
+from .server_utils import setup_logging, kill_other_instances, estimate_tokens, safe_int
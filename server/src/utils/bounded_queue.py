@@ -0,0 +1,212 @@
+"""
+bounded_queue.py — Non-blocking bounded queue with an overload policy.
+
+Producers (capture thread, ASR worker) must never block on a slow consumer,
+and an unbounded queue only turns "engine too slow" into ever-growing memory
+and caption lag. When a ``BoundedQueue`` is full, ``put`` applies its policy:
+
+  drop_oldest    discard the oldest queued item
+  merge          fold the new item into the newest queued one (merge_fn);
+                 falls back to drop_oldest when merge_fn returns None
+  show_original  evict the oldest item through ``on_evict`` (e.g. show the
+                 untranslated transcript) instead of silently dropping it
+
+``None`` (the worker stop sentinel) always bypasses the limit.
+
+``on_wait`` (optional) is called with the seconds each item spent queued
+when it is taken out — merged items keep the older arrival time. It runs
+under the queue lock, so it must be cheap (e.g. a histogram record).
+
+``AsyncBoundedQueue`` applies the same policies to an ``asyncio.Queue`` for
+the event-loop pipeline (``put_nowait`` only; must run on the loop thread).
+"""
+
+import asyncio
+import queue
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .server_utils import safe_int
+
+DROP_OLDEST = "drop_oldest"
+MERGE = "merge"
+SHOW_ORIGINAL = "show_original"
+POLICIES = (DROP_OLDEST, MERGE, SHOW_ORIGINAL)
+
+
+def clean_queue_policy(policy: Any) -> Dict[str, Any]:
+    """The valid ``{audio,translation}_{maxsize,policy}`` entries of a client ``queue_policy``."""
+    clean: Dict[str, Any] = {}
+    if not isinstance(policy, dict):
+        return clean
+    for stage in ("audio", "translation"):
+        if f"{stage}_maxsize" in policy:
+            maxsize = safe_int(policy[f"{stage}_maxsize"], default=-1)
+            if maxsize >= 0:
+                clean[f"{stage}_maxsize"] = maxsize
+        if policy.get(f"{stage}_policy") in POLICIES:
+            clean[f"{stage}_policy"] = policy[f"{stage}_policy"]
+    return clean
+
+
+class _OverloadPolicy:
+    """Limit/policy state and counters shared by both queue flavours."""
+
+    def _init_policy(self, maxsize: int, policy: str,
+                     merge_fn: Optional[Callable[[Any, Any], Any]],
+                     on_evict: Optional[Callable[[Any], None]],
+                     on_wait: Optional[Callable[[float], None]] = None):
+        self.limit = max(0, safe_int(maxsize))
+        self.policy = policy if policy in POLICIES else DROP_OLDEST
+        self.merge_fn = merge_fn
+        self.on_evict = on_evict
+        self.on_wait = on_wait
+        # Arrival times, parallel to the item deque
+        self._arrivals: deque = deque()
+        self.high_water = 0
+        self.dropped = 0
+        self.merged = 0
+        self.evicted = 0
+
+    def _set_policy(self, maxsize: Optional[int], policy: Optional[str]):
+        if maxsize is not None:
+            self.limit = max(0, safe_int(maxsize, default=self.limit))  # non-numeric: keep the limit
+        if policy in POLICIES:
+            self.policy = policy  # type: ignore[assignment]
+
+    def _admit(self, items: deque, item: Any) -> Tuple[bool, Any]:
+        """Make room for *item* in *items* per the policy.
+
+        Returns ``(merged, evicted)``: merged=True means *item* was folded into
+        the tail and must not be appended; *evicted* is an item for ``on_evict``.
+        """
+        if item is None or not self.limit or len(items) < self.limit:
+            return False, None
+        tail = items[-1] if items else None
+        if self.policy == MERGE and self.merge_fn and tail is not None:
+            merged = self.merge_fn(tail, item)
+            if merged is not None:
+                items[-1] = merged
+                self.merged += 1
+                return True, None
+        oldest = items.popleft()
+        self._arrivals.popleft()
+        if self.policy == SHOW_ORIGINAL and self.on_evict and oldest is not None:
+            self.evicted += 1
+            return False, oldest
+        self.dropped += 1
+        return False, None
+
+    def _stamp(self):
+        self._arrivals.append(time.perf_counter())
+
+    def _waited(self, item: Any):
+        arrived = self._arrivals.popleft()
+        if self.on_wait is not None and item is not None:
+            self.on_wait(time.perf_counter() - arrived)
+
+    def _snapshot(self, size: int) -> Dict[str, Any]:
+        return {
+            "size": size,
+            "maxsize": self.limit,
+            "policy": self.policy,
+            "high_water": self.high_water,
+            "dropped": self.dropped,
+            "merged": self.merged,
+            "evicted": self.evicted,
+        }
+
+
+class BoundedQueue(_OverloadPolicy, queue.Queue):
+    """``queue.Queue`` whose ``put`` never blocks and reports overload counters."""
+
+    def __init__(self, maxsize: int = 0, policy: str = DROP_OLDEST,
+                 merge_fn: Optional[Callable[[Any, Any], Any]] = None,
+                 on_evict: Optional[Callable[[Any], None]] = None,
+                 on_wait: Optional[Callable[[float], None]] = None):
+        queue.Queue.__init__(self, maxsize=0)  # limit enforced here, never by blocking
+        self._init_policy(maxsize, policy, merge_fn, on_evict, on_wait)
+
+    def _put(self, item: Any):
+        self.queue.append(item)
+        self._stamp()
+
+    def _get(self) -> Any:
+        item = self.queue.popleft()
+        self._waited(item)
+        return item
+
+    def configure(self, maxsize: Optional[int] = None, policy: Optional[str] = None):
+        with self.mutex:
+            self._set_policy(maxsize, policy)
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None):
+        with self.mutex:
+            size_before = len(self.queue)
+            merged, evicted = self._admit(self.queue, item)
+            if merged:
+                self.not_empty.notify()
+                return
+            if len(self.queue) < size_before:
+                self.unfinished_tasks = max(0, self.unfinished_tasks - 1)
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.high_water = max(self.high_water, self._qsize())
+            self.not_empty.notify()
+        if evicted is not None and self.on_evict:
+            # Outside the lock — the hook may take its time (e.g. send a caption)
+            self.on_evict(evicted)
+
+    def reset_stats(self):
+        with self.mutex:
+            self.high_water = self._qsize()
+            self.dropped = self.merged = self.evicted = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self.mutex:
+            return self._snapshot(self._qsize())
+
+
+class AsyncBoundedQueue(_OverloadPolicy, asyncio.Queue):
+    """``asyncio.Queue`` counterpart of ``BoundedQueue`` — ``put_nowait`` never raises ``QueueFull``."""
+
+    def __init__(self, maxsize: int = 0, policy: str = DROP_OLDEST,
+                 merge_fn: Optional[Callable[[Any, Any], Any]] = None,
+                 on_evict: Optional[Callable[[Any], None]] = None,
+                 on_wait: Optional[Callable[[float], None]] = None):
+        asyncio.Queue.__init__(self, maxsize=0)
+        self._init_policy(maxsize, policy, merge_fn, on_evict, on_wait)
+
+    def _put(self, item: Any):
+        self._queue.append(item)  # type: ignore[attr-defined]
+        self._stamp()
+
+    def _get(self) -> Any:
+        item = self._queue.popleft()  # type: ignore[attr-defined]
+        self._waited(item)
+        return item
+
+    def configure(self, maxsize: Optional[int] = None, policy: Optional[str] = None):
+        self._set_policy(maxsize, policy)
+
+    def put_nowait(self, item: Any):
+        size_before = self.qsize()
+        merged, evicted = self._admit(self._queue, item)  # type: ignore[attr-defined]
+        if self.qsize() < size_before:
+            self._unfinished_tasks = max(0, self._unfinished_tasks - 1)  # type: ignore[attr-defined]
+        if not merged:
+            super().put_nowait(item)
+            self.high_water = max(self.high_water, self.qsize())
+        if evicted is not None and self.on_evict:
+            self.on_evict(evicted)
+
+    async def put(self, item: Any):
+        self.put_nowait(item)
+
+    def reset_stats(self):
+        self.high_water = self.qsize()
+        self.dropped = self.merged = self.evicted = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return self._snapshot(self.qsize())
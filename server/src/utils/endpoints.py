@@ -0,0 +1,47 @@
+"""
+endpoints.py — Remote engine endpoints, overridable per process.
+
+Every remote engine has a public default host. Each one can be pointed
+elsewhere with an environment variable, for example at the stand-in servers
+in ``benchmarks/fake_engines.py`` when load-testing offline:
+
+  OMNI_BRIDGE_RIVA_URL            Riva ASR + NMT gRPC  (grpc.nvcf.nvidia.com:443)
+  OMNI_BRIDGE_NIM_URL             Llama, OpenAI-compatible (integrate.api.nvidia.com/v1)
+  OMNI_BRIDGE_GOOGLE_URL          Google free web translate (translate.google.com/m)
+  OMNI_BRIDGE_MYMEMORY_URL        MyMemory REST (api.mymemory.translated.net/get)
+  OMNI_BRIDGE_GOOGLE_ASR_URL      Google web speech API (SpeechRecognition)
+  OMNI_BRIDGE_GOOGLE_CLOUD_URL    Google Cloud Translation v3 ``api_endpoint``
+
+gRPC targets accept ``host:port`` (TLS), ``grpcs://host:port`` (TLS) or
+``grpc://host:port`` (plaintext, for local servers).
+"""
+
+import os
+from typing import Tuple
+
+RIVA = "riva"
+NIM = "nim"
+GOOGLE = "google"
+MYMEMORY = "mymemory"
+GOOGLE_ASR = "google_asr"
+GOOGLE_CLOUD = "google_cloud"
+
+ENDPOINT_NAMES = (RIVA, NIM, GOOGLE, MYMEMORY, GOOGLE_ASR, GOOGLE_CLOUD)
+
+
+def env_var(name: str) -> str:
+    return f"OMNI_BRIDGE_{name.upper()}_URL"
+
+
+def resolve(name: str, default: str = "") -> str:
+    """Override for engine *name* from the environment, else *default*."""
+    return os.environ.get(env_var(name), "").strip() or default
+
+
+def grpc_target(url: str) -> Tuple[str, bool]:
+    """``(host:port, use_ssl)`` for a gRPC endpoint spec."""
+    if url.startswith("grpc://"):
+        return url[len("grpc://"):], False
+    if url.startswith("grpcs://"):
+        return url[len("grpcs://"):], True
+    return url, True
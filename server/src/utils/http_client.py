@@ -0,0 +1,98 @@
+"""
+Shared, pooled HTTP client for the REST translation engines.
+
+Every caption used to open a fresh connection (DNS + TCP + TLS) to the same
+handful of hosts. All HTTP engines now share one keep-alive ``httpx.Client``:
+connections are reused across captions and threads, HTTP/2 is negotiated when
+the ``h2`` package is installed and the endpoint supports it, and a per-host
+semaphore caps how many requests run against any single host at once.
+
+The engines are called from worker threads, so the client is the synchronous
+(thread-safe) flavour of httpx rather than ``AsyncClient``.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+# Pool limits (whole process)
+_MAX_CONNECTIONS = 32
+_MAX_KEEPALIVE = 16
+_KEEPALIVE_EXPIRY_S = 60.0
+# Concurrent in-flight requests per host
+_PER_HOST_LIMIT = 4
+# Default timeouts — connect fast, leave room for slow translation backends
+_TIMEOUT = httpx.Timeout(8.0, connect=3.0)
+
+try:
+    import h2  # noqa: F401  # type: ignore[import]
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+
+class SharedHTTPClient:
+    """Thread-safe keep-alive client with a per-host concurrency cap."""
+
+    def __init__(self, per_host_limit: int = _PER_HOST_LIMIT, timeout: httpx.Timeout = _TIMEOUT,
+                 verify: Any = True):
+        self.per_host_limit = max(1, per_host_limit)
+        self._client = httpx.Client(
+            http2=HAS_HTTP2,
+            verify=verify,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=_MAX_CONNECTIONS,
+                max_keepalive_connections=_MAX_KEEPALIVE,
+                keepalive_expiry=_KEEPALIVE_EXPIRY_S,
+            ),
+            headers={"User-Agent": "Mozilla/5.0 (OmniBridge)"},
+            follow_redirects=True,
+        )
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._slots_lock = threading.Lock()
+
+    def _slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return slot
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            timeout: Optional[float] = None) -> httpx.Response:
+        with self._slot(url):
+            return self._client.get(
+                url, params=params,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            )
+
+    def close(self):
+        self._client.close()
+
+
+_client_instance: Optional[SharedHTTPClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> SharedHTTPClient:
+    """Return the process-wide pooled client, creating it on first use."""
+    global _client_instance
+    with _client_lock:
+        if _client_instance is None:
+            _client_instance = SharedHTTPClient()
+            logging.debug(f"[HTTP] Shared client created (http2={HAS_HTTP2})")
+    return _client_instance
+
+
+def close_http_client():
+    """Close the shared client (server shutdown)."""
+    global _client_instance
+    with _client_lock:
+        if _client_instance is not None:
+            _client_instance.close()
+            _client_instance = None
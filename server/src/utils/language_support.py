@@ -80,3 +80,13 @@ MYMEMORY_LANGS = None
 # ── Llama 3.1 8B (NVIDIA NIM) ─────────────────────────────────────────────────
 # LLM-based translation — handles any language pair. None = unrestricted.
 LLAMA_LANGS = None
+
+
+# ── Sentence segmentation (pysbd) ─────────────────────────────────────────────
+def make_segmenter(lang: str):
+    """pysbd segmenter for *lang*; English rules for "auto" and languages pysbd lacks."""
+    import pysbd
+    from pysbd.languages import LANGUAGE_CODES
+
+    code = (lang or "").split("-")[0].lower()
+    return pysbd.Segmenter(language=code if code in LANGUAGE_CODES else "en", clean=False)
@@ -0,0 +1,193 @@
+"""
+metrics.py — Per-stage latency histograms, exported in Prometheus text format.
+
+Engine stats carry ``latency_ms`` per caption, but those values were only
+logged. ``StageMetrics`` keeps an HDR-style histogram per (stage, engine):
+log-linear buckets (8 per power of two, each at most 12.5% wide) from
+100 µs to ~3.5 min, so recording is a ``frexp`` plus one counter increment
+and memory is fixed no matter how long the server runs. Cheap enough to stay on.
+
+Stages:
+
+  capture_enqueue         audio chunk flushed by capture → orchestrator queue
+  asr_queue_wait          time a chunk waits in the ASR audio queue
+  asr_inference           ASR engine call (label ``engine``)
+  translation_queue_wait  time a transcript waits in the translation queue
+  translation             translation call (label ``engine``, after fallbacks)
+  ws_broadcast            serializing one message + queueing it for every client
+  ws_send                 one frame's wait in a client's send queue + the send
+
+``render_prometheus`` emits one histogram family with ``le`` buckets at the
+power-of-two boundaries, plus full-resolution p50/p95/p99 as gauges.
+"""
+
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+CAPTURE_ENQUEUE = "capture_enqueue"
+ASR_QUEUE_WAIT = "asr_queue_wait"
+ASR_INFERENCE = "asr_inference"
+TRANSLATION_QUEUE_WAIT = "translation_queue_wait"
+TRANSLATION = "translation"
+WS_BROADCAST = "ws_broadcast"
+WS_SEND = "ws_send"
+
+_METRIC = "omnibridge_stage_latency_seconds"
+_QUANTILE_METRIC = "omnibridge_stage_latency_quantile_seconds"
+_QUANTILES = (0.5, 0.95, 0.99)
+
+# Bucket layout: [0, 100 µs) then 21 octaves of 8 sub-buckets up to ~210 s
+_MIN_S = 1e-4
+_SUB_BUCKETS = 8
+_OCTAVES = 21
+
+
+class LatencyHistogram:
+    """Fixed-size log-linear histogram of durations in seconds. Thread-safe."""
+
+    __slots__ = ("_counts", "_count", "_sum", "_max", "_lock")
+
+    def __init__(self):
+        self._counts = [0] * (1 + _OCTAVES * _SUB_BUCKETS)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _index(seconds: float) -> int:
+        units = seconds / _MIN_S
+        if units < 1.0:
+            return 0
+        mantissa, exp = math.frexp(units)  # units = mantissa * 2**exp, mantissa in [0.5, 1)
+        index = 1 + (exp - 1) * _SUB_BUCKETS + int((mantissa * 2.0 - 1.0) * _SUB_BUCKETS)
+        return min(index, _OCTAVES * _SUB_BUCKETS)
+
+    @staticmethod
+    def _upper_bound(index: int) -> float:
+        if index == 0:
+            return _MIN_S
+        octave, sub = divmod(index - 1, _SUB_BUCKETS)
+        return _MIN_S * (2 ** octave) * (1.0 + (sub + 1) / _SUB_BUCKETS)
+
+    def record(self, seconds: float):
+        if seconds < 0:
+            seconds = 0.0
+        index = self._index(seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += seconds
+            if seconds > self._max:
+                self._max = seconds
+
+    def _copy(self) -> Tuple[List[int], int, float, float]:
+        with self._lock:
+            return list(self._counts), self._count, self._sum, self._max
+
+    @classmethod
+    def _percentile(cls, counts: List[int], total: int, peak: float, q: float) -> float:
+        """Upper bound of the bucket holding the *q* quantile (capped at the max seen)."""
+        if not total:
+            return 0.0
+        rank = max(1, math.ceil(q * total))
+        seen = 0
+        for index, n in enumerate(counts):
+            seen += n
+            if seen >= rank:
+                return min(cls._upper_bound(index), peak)
+        return peak
+
+    def percentile(self, q: float) -> float:
+        counts, total, _, peak = self._copy()
+        return self._percentile(counts, total, peak, q)
+
+    def snapshot(self) -> Dict[str, float]:
+        """``count`` plus mean/p50/p95/p99/max in milliseconds."""
+        counts, total, total_s, peak = self._copy()
+        snap: Dict[str, float] = {"count": total}
+        snap["mean_ms"] = round(total_s / total * 1000, 2) if total else 0.0
+        for q in _QUANTILES:
+            snap[f"p{int(q * 100)}_ms"] = round(self._percentile(counts, total, peak, q) * 1000, 2)
+        snap["max_ms"] = round(peak * 1000, 2)
+        return snap
+
+    def prometheus_buckets(self) -> Tuple[List[Tuple[float, int]], int, float]:
+        """Cumulative ``(le, count)`` pairs at each power-of-two boundary, plus count and sum."""
+        counts, total, total_s, _ = self._copy()
+        buckets = []
+        cumulative = counts[0]
+        buckets.append((_MIN_S, cumulative))
+        for octave in range(_OCTAVES):
+            start = 1 + octave * _SUB_BUCKETS
+            cumulative += sum(counts[start:start + _SUB_BUCKETS])
+            buckets.append((_MIN_S * 2 ** (octave + 1), cumulative))
+        return buckets, total, total_s
+
+
+class StageMetrics:
+    """Histograms keyed by (stage, engine), created on first observation."""
+
+    def __init__(self):
+        self._hists: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float, engine: str = ""):
+        key = (stage, engine or "")
+        hist = self._hists.get(key)
+        if hist is None:
+            with self._lock:
+                hist = self._hists.setdefault(key, LatencyHistogram())
+        hist.record(seconds)
+
+    def histogram(self, stage: str, engine: str = "") -> Optional[LatencyHistogram]:
+        return self._hists.get((stage, engine or ""))
+
+    def reset(self):
+        with self._lock:
+            self._hists = {}
+
+    def _items(self) -> List[Tuple[Tuple[str, str], LatencyHistogram]]:
+        with self._lock:
+            return sorted(self._hists.items())
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """``{"asr_inference[riva-asr]": {"count": .., "p50_ms": ..}, ...}`` for JSON status."""
+        return {
+            (f"{stage}[{engine}]" if engine else stage): hist.snapshot()
+            for (stage, engine), hist in self._items()
+        }
+
+    def render_prometheus(self) -> str:
+        lines = [
+            f"# HELP {_METRIC} Pipeline stage latency.",
+            f"# TYPE {_METRIC} histogram",
+        ]
+        quantile_lines = []
+        for (stage, engine), hist in self._items():
+            labels = f'stage="{_escape(stage)}",engine="{_escape(engine)}"'
+            buckets, total, total_s = hist.prometheus_buckets()
+            for le, cumulative in buckets:
+                lines.append(f'{_METRIC}_bucket{{{labels},le="{le:.6g}"}} {cumulative}')
+            lines.append(f'{_METRIC}_bucket{{{labels},le="+Inf"}} {total}')
+            lines.append(f"{_METRIC}_sum{{{labels}}} {total_s:.6f}")
+            lines.append(f"{_METRIC}_count{{{labels}}} {total}")
+            for q in _QUANTILES:
+                quantile_lines.append(
+                    f'{_QUANTILE_METRIC}{{{labels},quantile="{q}"}} {hist.percentile(q):.6f}'
+                )
+        lines += [
+            f"# HELP {_QUANTILE_METRIC} Stage latency quantiles at full histogram resolution.",
+            f"# TYPE {_QUANTILE_METRIC} gauge",
+            *quantile_lines,
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide instance: every pipeline and session records here
+metrics = StageMetrics()
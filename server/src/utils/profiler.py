@@ -0,0 +1,197 @@
+"""
+profiler.py — On-demand stack sampling of the server's threads (``/debug/profile``).
+
+When caption latency spikes, the stage histograms show which stage is slow
+but not why. ``SamplingProfiler.run`` samples the Python stack of every
+thread (``sys._current_frames``) every ``interval_s`` for the requested
+duration. Nothing runs between profiles, so the cost is paid only while one
+is being taken. The endpoint is opt-in: it answers only when the server was
+started with ``OMNI_BRIDGE_PROFILING=true``.
+
+A ``Profile`` has:
+
+  - collapsed stacks, one ``thread;outer;...;inner count`` line per distinct
+    stack. ``flamegraph.pl``, speedscope and inferno read this directly.
+    Frames are ``module:function``; each stack is rooted at its thread name
+    (``ASRWorker``, ``TranslationWorker``, ``meter-input``...).
+  - per-thread CPU seconds over the window (psutil, or per-thread CPU clocks
+    where the platform has them) next to the samples taken. A thread with
+    many samples but little CPU was waiting: on a gRPC call, a lock or a
+    queue.
+
+Samples are wall-clock: a thread blocked in a call is sampled there. With
+``include_idle=False``, stacks parked in a queue, event or selector wait are
+dropped, leaving the threads that were doing (or blocked on) work.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import psutil  # type: ignore[import]
+    HAS_PSUTIL = True
+except ImportError:
+    psutil = None  # type: ignore[assignment]
+    HAS_PSUTIL = False
+
+PROFILING_ENV = "OMNI_BRIDGE_PROFILING"
+MAX_DURATION_S = 60.0
+_DEFAULT_INTERVAL_S = 0.005
+_MIN_INTERVAL_S = 0.001
+_MAX_DEPTH = 128
+
+# Leaf frames of a thread that is only waiting for work
+_IDLE_LEAVES = frozenset({
+    ("threading", "wait"), ("threading", "_wait_for_tstate_lock"),
+    ("queue", "get"), ("selectors", "select"),
+})
+
+
+def enabled() -> bool:
+    return os.environ.get(PROFILING_ENV) == "true"
+
+
+def _module(code) -> str:
+    return os.path.splitext(os.path.basename(code.co_filename))[0]
+
+
+def _collapse(frame) -> Tuple[List[str], Tuple[str, str]]:
+    """Frames root → leaf as ``module:function``, and the leaf's (module, function name)."""
+    leaf = (_module(frame.f_code), frame.f_code.co_name)
+    labels = []
+    while frame is not None and len(labels) < _MAX_DEPTH:
+        code = frame.f_code
+        labels.append(f"{_module(code)}:{getattr(code, 'co_qualname', code.co_name)}".replace(";", ":"))
+        frame = frame.f_back
+    labels.reverse()
+    return labels, leaf
+
+
+def _thread_cpu() -> Dict[int, float]:
+    """CPU seconds (user + system) per native thread id, where the platform tells."""
+    if HAS_PSUTIL and psutil is not None:
+        try:
+            return {t.id: t.user_time + t.system_time for t in psutil.Process().threads()}
+        except Exception:
+            pass
+    cpu: Dict[int, float] = {}
+    clock_id = getattr(time, "pthread_getcpuclockid", None)  # POSIX only
+    if clock_id is not None:
+        for thread in threading.enumerate():
+            if thread.ident is None or thread.native_id is None:
+                continue  # not started
+            try:
+                cpu[thread.native_id] = time.clock_gettime(clock_id(thread.ident))
+            except (OSError, TypeError, ValueError, OverflowError):
+                continue
+    return cpu
+
+
+class Profile:
+    """Result of one ``SamplingProfiler.run``."""
+
+    def __init__(self, duration_s: float, interval_s: float):
+        self.duration_s = duration_s
+        self.interval_s = interval_s
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self.threads: Dict[int, Dict[str, Any]] = {}
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed-stack text, heaviest stacks first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "duration_s": round(self.duration_s, 3),
+            "interval_ms": round(self.interval_s * 1000, 3),
+            "samples": self.samples,
+            "threads": sorted(self.threads.values(), key=lambda t: (-(t["cpu_s"] or 0), -t["samples"])),
+            "stacks": dict(self.stacks.most_common()),
+        }
+
+
+class SamplingProfiler:
+    """Samples all threads' stacks on the calling thread. One profile at a time."""
+
+    def __init__(self):
+        self._busy = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._busy.locked()
+
+    def run(self, duration_s: float, interval_s: float = _DEFAULT_INTERVAL_S,
+            threads: Optional[Iterable[str]] = None, include_idle: bool = True) -> Profile:
+        """Sample for *duration_s* (capped at ``MAX_DURATION_S``).
+
+        *threads* keeps only threads whose name starts with one of the given
+        prefixes. Raises RuntimeError if a profile is already running.
+        """
+        if not self._busy.acquire(blocking=False):
+            raise RuntimeError("A profile is already running.")
+        try:
+            return self._run(min(max(duration_s, interval_s), MAX_DURATION_S),
+                             max(interval_s, _MIN_INTERVAL_S), tuple(threads or ()), include_idle)
+        finally:
+            self._busy.release()
+
+    def _run(self, duration_s: float, interval_s: float, prefixes: Tuple[str, ...],
+             include_idle: bool) -> Profile:
+        me = threading.get_ident()
+        cpu_before = _thread_cpu()
+        start = time.perf_counter()
+        deadline = start + duration_s
+        profile = Profile(duration_s, interval_s)
+        names: Dict[int, threading.Thread] = {}
+        sampled: Counter = Counter()
+        idle: Counter = Counter()
+
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            frames = sys._current_frames()
+            if not names.keys() >= frames.keys():
+                names = {t.ident: t for t in threading.enumerate() if t.ident is not None}
+            for ident, frame in frames.items():
+                if ident == me:
+                    continue
+                thread = names.get(ident)
+                name = thread.name if thread is not None else f"thread-{ident}"
+                if prefixes and not name.startswith(prefixes):
+                    continue
+                labels, leaf = _collapse(frame)
+                sampled[ident] += 1
+                if leaf in _IDLE_LEAVES:
+                    idle[ident] += 1
+                    if not include_idle:
+                        continue
+                profile.stacks[";".join([name, *labels])] += 1
+            profile.samples += 1
+            time.sleep(max(0.0, interval_s - (time.perf_counter() - now)))
+
+        profile.duration_s = time.perf_counter() - start
+        cpu_after = _thread_cpu()
+        for ident, count in sampled.items():
+            thread = names.get(ident)
+            native_id = getattr(thread, "native_id", None)
+            cpu = None
+            if native_id in cpu_after:
+                cpu = round(cpu_after[native_id] - cpu_before.get(native_id, 0.0), 4)
+            profile.threads[ident] = {
+                "name": thread.name if thread is not None else f"thread-{ident}",
+                "native_id": native_id,
+                "samples": count,
+                "idle_samples": idle[ident],
+                "cpu_s": cpu,
+                "cpu_percent": round(100 * cpu / profile.duration_s, 1) if cpu is not None else None,
+            }
+        return profile
+
+
+profiler = SamplingProfiler()
@@ -39,6 +39,14 @@ def estimate_tokens(text: str) -> int:
 
     return dense_chars + (medium_chars + 1) // 2 + (latin_chars + 3) // 4
 
+
+def safe_int(value, default: int = 0) -> int:
+    """Integer client setting; *default* for missing or non-numeric values."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
 try:
     import psutil
     HAS_PSUTIL = True
@@ -0,0 +1,197 @@
+"""
+system_probe.py — GPU, VRAM, CPU and memory figures, sampled in the background.
+
+``get_all_statuses()`` and ``get_capabilities()`` used to ask torch for the
+GPU on every call. On a CPU-only machine that meant importing torch (seconds,
+hundreds of MB) just to learn there was no GPU. ``SystemProbe`` samples on a
+background thread every ``interval_s`` seconds (``OMNI_BRIDGE_PROBE_INTERVAL_S``,
+default 5), and readers get the cached snapshot without waiting.
+
+The probe never imports torch itself:
+
+  - torch already loaded (Whisper is in memory): device name, total VRAM and
+    this process's reserved VRAM come from ``torch.cuda``.
+  - otherwise, NVML (``pynvml``, optional) gives the name and total VRAM.
+    This process has no CUDA memory until torch loads, so ``vram_used`` is 0.
+  - with neither, the GPU counts as available when torch is installed and the
+    CUDA driver library is present. The name and total stay unknown until
+    torch loads.
+
+CPU load (system and this process) and RSS come from psutil when installed.
+"""
+
+import ctypes.util
+import importlib.util
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+try:
+    import psutil  # type: ignore[import]
+    HAS_PSUTIL = True
+except ImportError:
+    psutil = None  # type: ignore[assignment]
+    HAS_PSUTIL = False
+
+try:
+    import pynvml  # type: ignore[import]
+    HAS_NVML = True
+except ImportError:
+    pynvml = None
+    HAS_NVML = False
+
+_DEFAULT_INTERVAL_S = 5.0
+_INTERVAL_ENV = "OMNI_BRIDGE_PROBE_INTERVAL_S"
+_GB = 1024 ** 3
+
+
+def _no_gpu() -> Dict[str, Any]:
+    return {"available": False, "name": "None", "vram_used": 0.0, "vram_total": 0.0}
+
+
+def _gpu_from_torch(torch: Any) -> Dict[str, Any]:
+    info = _no_gpu()
+    if not torch.cuda.is_available():
+        return info
+    info["available"] = True
+    try:
+        info["name"] = torch.cuda.get_device_name(0)
+        info["vram_total"] = round(torch.cuda.get_device_properties(0).total_memory / _GB, 2)
+        # memory_reserved (held by the caching allocator) is closer to what the driver sees as used
+        info["vram_used"] = round(torch.cuda.memory_reserved(0) / _GB, 2)
+    except Exception:
+        info["name"] = "Unknown CUDA Device"
+    return info
+
+
+def _gpu_from_nvml() -> Optional[Dict[str, Any]]:
+    if not HAS_NVML or pynvml is None:
+        return None
+    try:
+        pynvml.nvmlInit()
+        try:
+            if pynvml.nvmlDeviceGetCount() == 0:
+                return None
+            handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+            name = pynvml.nvmlDeviceGetName(handle)
+            total = pynvml.nvmlDeviceGetMemoryInfo(handle).total
+        finally:
+            pynvml.nvmlShutdown()
+    except Exception:
+        return None
+    return {
+        "available": True,
+        "name": name.decode() if isinstance(name, bytes) else name,
+        "vram_used": 0.0,
+        "vram_total": round(total / _GB, 2),
+    }
+
+
+def _has_cuda_driver() -> bool:
+    return ctypes.util.find_library("nvcuda" if os.name == "nt" else "cuda") is not None
+
+
+def probe_gpu(import_torch: bool = False) -> Dict[str, Any]:
+    """GPU details now, without importing torch unless *import_torch*."""
+    torch = sys.modules.get("torch")
+    if torch is None and import_torch:
+        try:
+            import torch  # type: ignore[no-redef]
+        except ImportError:
+            return _no_gpu()
+    if torch is not None:
+        return _gpu_from_torch(torch)
+    if importlib.util.find_spec("torch") is None:
+        return _no_gpu()  # no torch, no GPU inference
+    if HAS_NVML:
+        info = _gpu_from_nvml()
+        if info is not None:
+            return info
+    if _has_cuda_driver():
+        info = _no_gpu()
+        info.update(available=True, name="CUDA Device")
+        return info
+    return _no_gpu()
+
+
+class SystemProbe:
+    """Background sampler; ``snapshot()`` returns the latest sample."""
+
+    def __init__(self, interval_s: Optional[float] = None):
+        self.interval_s = interval_s if interval_s is not None else _interval_from_env()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._process = psutil.Process() if HAS_PSUTIL and psutil is not None else None
+
+    def start(self, interval_s: Optional[float] = None):
+        """Start sampling in the background (no-op if already running)."""
+        if interval_s is not None:
+            self.interval_s = interval_s
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SystemProbe", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=1.0)
+
+    def refresh(self) -> Dict[str, Any]:
+        """Sample now and cache the result."""
+        sample = self._sample()
+        with self._lock:
+            self._snapshot = sample
+        return sample
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The latest sample (taken now only if there is none yet)."""
+        with self._lock:
+            sample = self._snapshot
+        return sample if sample is not None else self.refresh()
+
+    def gpu(self) -> Dict[str, Any]:
+        return self.snapshot()["gpu"]
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logging.warning(f"[SystemProbe] Sampling failed: {e}")
+            self._stop.wait(self.interval_s)
+
+    def _sample(self) -> Dict[str, Any]:
+        sample: Dict[str, Any] = {
+            "gpu": probe_gpu(),
+            "cpu_percent": None,
+            "process_cpu_percent": None,
+            "rss_mb": None,
+            "sampled_at": time.time(),
+        }
+        if self._process is not None and psutil is not None:
+            try:
+                # Both measure since the previous call, i.e. over the last interval
+                sample["cpu_percent"] = psutil.cpu_percent(interval=None)
+                sample["process_cpu_percent"] = self._process.cpu_percent(interval=None)
+                sample["rss_mb"] = round(self._process.memory_info().rss / 2**20, 1)
+            except Exception as e:
+                logging.debug(f"[SystemProbe] psutil sample failed: {e}")
+        return sample
+
+
+def _interval_from_env() -> float:
+    try:
+        return max(0.5, float(os.environ.get(_INTERVAL_ENV, _DEFAULT_INTERVAL_S)))
+    except ValueError:
+        return _DEFAULT_INTERVAL_S
+
+
+system_probe = SystemProbe()
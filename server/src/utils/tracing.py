@@ -0,0 +1,157 @@
+"""
+tracing.py — Per-chunk traces from capture flush to caption broadcast.
+
+``AudioCapture`` starts a ``Trace`` when it flushes a chunk. The trace
+travels with the audio through the queues, ``ASRDispatcher.process_chunk``,
+the sentence aggregator, ``TranslationDispatcher.translate`` and
+``caption_callback``. Each stage calls ``step``, which closes a span from
+the previous step to now. A caption's spans therefore tile its whole
+latency, and a slow caption shows which stage the time went to:
+
+  capture_enqueue → asr_queue_wait → asr → translation_queue_wait
+  → translation → ws_broadcast
+
+Chunks merged under overload, and fragments joined into one sentence, fold
+their traces together. The survivor lists the absorbed ids in ``merged``.
+The absorbed traces are kept with status ``merged`` so they still resolve.
+Finished traces go to a bounded ring buffer (``traces``), served by
+``GET /traces/recent``.
+"""
+
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+_MAX_TRACES = 256
+# Spans per trace — a merged trace can't grow without bound
+_MAX_SPANS = 64
+
+_ids = itertools.count(1)
+_PREFIX = os.urandom(3).hex()
+
+
+def _new_id() -> str:
+    return f"{_PREFIX}-{next(_ids):06x}"
+
+
+class Trace:
+    """Timestamped spans for one audio chunk and the caption it becomes."""
+
+    __slots__ = ("trace_id", "parent_id", "started_at", "_t0", "_last", "spans", "merged", "status", "_lock")
+
+    def __init__(self, parent_id: Optional[str] = None):
+        self.trace_id = _new_id()
+        self.parent_id = parent_id
+        self.started_at = time.time()
+        self._t0 = self._last = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.merged: List[str] = []
+        self.status = "open"
+        self._lock = threading.Lock()
+
+    def step(self, name: str, **attrs: Any):
+        """Close span *name* covering the time since the previous step."""
+        now = time.perf_counter()
+        with self._lock:
+            if len(self.spans) < _MAX_SPANS:
+                span = {
+                    "name": name,
+                    "start_ms": round((self._last - self._t0) * 1000, 2),
+                    "duration_ms": round((now - self._last) * 1000, 2),
+                }
+                if attrs:
+                    span.update(attrs)
+                self.spans.append(span)
+            self._last = now
+
+    def absorb(self, other: Optional["Trace"]) -> "Trace":
+        """Fold *other* (merged into this chunk/caption) into this trace."""
+        if other is None or other is self:
+            return self
+        with self._lock:
+            self.merged.append(other.trace_id)
+            self.merged.extend(other.merged)
+        other.finish("merged")
+        return self
+
+    def fork(self) -> "Trace":
+        """Child trace for a second consumer of the same chunk (split sentence, extra session)."""
+        child = Trace(parent_id=self.trace_id)
+        with self._lock:
+            child.started_at, child._t0, child._last = self.started_at, self._t0, self._last
+            child.spans = [dict(s) for s in self.spans]
+        return child
+
+    def finish(self, status: str = "ok"):
+        """Close the trace and keep it in the ring buffer (first call wins)."""
+        with self._lock:
+            if self.status != "open":
+                return
+            self.status = status
+        traces.add(self)
+
+    @property
+    def total_ms(self) -> float:
+        return round((self._last - self._t0) * 1000, 2)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "trace_id": self.trace_id,
+                "parent_id": self.parent_id,
+                "started_at": self.started_at,
+                "status": self.status,
+                "total_ms": self.total_ms,
+                "spans": [dict(s) for s in self.spans],
+                "merged": list(self.merged),
+            }
+
+
+class TraceStore:
+    """Ring buffer of finished traces, newest last. Thread-safe."""
+
+    def __init__(self, maxlen: int = _MAX_TRACES):
+        self._traces: deque = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def add(self, trace: Trace):
+        with self._lock:
+            self._traces.append(trace)
+
+    def recent(self, limit: int = 50, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Newest-first dicts, optionally only those with *status*."""
+        with self._lock:
+            items = list(self._traces)
+        out = []
+        for trace in reversed(items):
+            if status is None or trace.status == status:
+                out.append(trace.to_dict())
+                if len(out) >= limit:
+                    break
+        return out
+
+    def get(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            items = list(self._traces)
+        for trace in items:
+            if trace.trace_id == trace_id:
+                return trace.to_dict()
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+
+
+def merge_traces(a: Optional[Trace], b: Optional[Trace]) -> Optional[Trace]:
+    """Trace for an item built from *a* and *b* (either may be missing)."""
+    if a is None:
+        return b
+    return a.absorb(b)
+
+
+# Process-wide store: every pipeline and session finishes traces here
+traces = TraceStore()
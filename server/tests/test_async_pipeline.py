@@ -0,0 +1,87 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from src.pipeline import AsyncPipeline, InferenceOrchestrator
+from src.utils.bounded_queue import AsyncBoundedQueue, MERGE
+
+
+@pytest.fixture
+def orchestrator():
+    with patch("src.pipeline.orchestrator.RivaASRModel"), \
+         patch("src.pipeline.orchestrator.RivaNMTModel"), \
+         patch("src.pipeline.orchestrator.LlamaModel"), \
+         patch("src.pipeline.orchestrator.GoogleModel"), \
+         patch("src.pipeline.orchestrator.GoogleCloudTranslationModel"), \
+         patch("src.pipeline.orchestrator.MyMemoryModel"), \
+         patch("src.pipeline.orchestrator.SpeechRecognitionModel"), \
+         patch("src.pipeline.orchestrator.WhisperModel"):
+        orch = InferenceOrchestrator(nvidia_api_key="mock_nv_key", google_credentials={})
+
+    def _asr(chunk, config, trace=None):
+        time.sleep(0.02 if int(chunk[0]) % 2 else 0.005)  # out-of-order completion
+        return {"text": f"chunk {int(chunk[0])}", "asr_stats": None, "created_at": time.time()}
+
+    orch.asr_dispatcher.process_chunk = _asr
+    orch.translation_dispatcher.translate = lambda text, hint=None, on_partial=None, trace=None: (text.upper(), {"engine": "stub"})
+    return orch
+
+
+def test_async_pipeline_delivers_captions_in_order(orchestrator):
+    captions = []
+
+    async def _run():
+        pipeline = AsyncPipeline(orchestrator)
+        started = await pipeline.start(
+            16000, source_lang="en", target_lang="fr", translation_model="google",
+            callback=lambda text, is_error, **kw: captions.append(text),
+        )
+        assert started and pipeline.is_running
+        for i in range(6):
+            pipeline.append_audio(np.full(1600, 1000 + i, dtype=np.int16))
+        for _ in range(100):
+            if len(captions) == 6:
+                break
+            await asyncio.sleep(0.02)
+        pipeline.stop()
+        await asyncio.sleep(0)
+        assert not pipeline.is_running
+        assert all(t.done() for t in asyncio.all_tasks() if t.get_name() in ("asr_stage", "translation_stage"))
+
+    asyncio.run(_run())
+    assert captions == [f"CHUNK {1000 + i}" for i in range(6)]
+    assert not orchestrator.is_running
+
+
+def test_async_bounded_queue_merges_on_overflow():
+    async def _run():
+        q = AsyncBoundedQueue(2, policy=MERGE, merge_fn=lambda a, b: a + b)
+        for item in ("a", "b", "c"):
+            q.put_nowait(item)
+        return [q.get_nowait(), q.get_nowait()], q.stats()
+
+    items, stats = asyncio.run(_run())
+    assert items == ["a", "bc"]
+    assert stats["merged"] == 1 and stats["high_water"] == 2
+
+
+def test_async_captions_are_delivered_on_the_loop(orchestrator):
+    threads = []
+
+    async def _run():
+        import threading
+        pipeline = AsyncPipeline(orchestrator)
+        await pipeline.start(16000, source_lang="en", target_lang="fr", translation_model="google",
+                             callback=lambda text, is_error, **kw: threads.append(threading.current_thread()))
+        pipeline.append_audio(np.full(1600, 1000, dtype=np.int16))
+        for _ in range(100):
+            if threads:
+                break
+            await asyncio.sleep(0.01)
+        pipeline.stop()
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(_run())
+    assert threads == [loop_thread]
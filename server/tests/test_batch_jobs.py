@@ -0,0 +1,156 @@
+import io
+import threading
+import time
+import wave
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.network.handlers import JobHandler, ServerContext
+from src.network.ws_manager import ConnectionManager
+from src.pipeline import InferenceOrchestrator, JobManager
+from src.pipeline.batch_jobs import BatchJob, ERROR, segment_audio, to_srt, to_vtt
+
+_RATE = 16000
+_MODEL_CLASSES = (
+    "RivaASRModel", "RivaNMTModel", "LlamaModel", "GoogleModel",
+    "GoogleCloudTranslationModel", "MyMemoryModel", "SpeechRecognitionModel", "WhisperModel",
+)
+
+
+def _speech(pattern, amplitudes=None):
+    """(seconds, speaking) spans → int16 audio; each burst is a tone at its own amplitude."""
+    rng = np.random.default_rng(0)
+    amplitudes = iter(amplitudes or [3000] * len(pattern))
+    parts = []
+    for seconds, speaking in pattern:
+        n = int(seconds * _RATE)
+        if speaking:
+            parts.append(next(amplitudes) * np.sin(2 * np.pi * 440 * np.arange(n) / _RATE))
+        else:
+            parts.append(rng.normal(0, 10, n))
+    return np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16)
+
+
+def _wav(samples):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(_RATE)
+        wf.writeframes(samples.tobytes())
+    return buf.getvalue()
+
+
+def test_segments_carry_voiced_start_and_end_times():
+    audio = _speech([(1.0, False), (2.0, True), (1.5, False), (2.5, True), (1.0, False)])
+    segments = segment_audio(audio, _RATE, max_segment_s=6.0)
+
+    assert [s["index"] for s in segments] == [0, 1]
+    assert abs(segments[0]["start"] - 1.0) < 0.1 and abs(segments[0]["end"] - 3.0) < 0.1
+    assert abs(segments[1]["start"] - 4.5) < 0.1 and abs(segments[1]["end"] - 7.0) < 0.1
+    assert all(s["audio"].dtype == np.int16 for s in segments)
+
+
+def test_subtitle_rendering_prefers_translation_and_skips_empty_segments():
+    segments = [
+        {"index": 0, "start": 1.0, "end": 3.25, "text": "hello", "translation": "bonjour"},
+        {"index": 1, "start": 4.0, "end": 5.0, "text": ""},
+        {"index": 2, "start": 3661.5, "end": 3663.0, "text": "bye", "translation": None},
+    ]
+    assert to_srt(segments) == (
+        "1\n00:00:01,000 --> 00:00:03,250\nbonjour\n\n"
+        "2\n01:01:01,500 --> 01:01:03,000\nbye\n"
+    )
+    assert to_vtt(segments).startswith("WEBVTT\n\n00:00:01.000 --> 00:00:03.250\nbonjour\n")
+
+
+def _stub_factory(active, peak):
+    def _factory(**kwargs):
+        with patch.multiple("src.pipeline.orchestrator", **{
+            name: MagicMock(side_effect=lambda *a, **kw: MagicMock()) for name in _MODEL_CLASSES
+        }):
+            orch = InferenceOrchestrator(**kwargs)
+
+        def _asr(chunk, config, trace=None):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return {"text": f"loud {int(np.abs(chunk).max()) // 1000}", "asr_stats": None,
+                    "created_at": time.time()}
+
+        orch.asr_dispatcher.process_chunk = _asr
+        orch.translation_dispatcher.translate = (
+            lambda text, hint=None, on_partial=None, trace=None, _o=orch:
+            (f"{_o.translation_dispatcher.target_lang}:{text}", {}))
+        return orch
+    lock = threading.Lock()
+    return _factory
+
+
+def test_job_endpoints_transcribe_in_parallel_and_render_in_file_order():
+    active, peak = [0], [0]
+    ctx = ServerContext(ConnectionManager())
+    ctx.jobs = JobManager(orchestrator_factory=_stub_factory(active, peak))
+    handler = JobHandler(ctx)
+
+    app = FastAPI()
+
+    @app.post("/jobs")
+    async def create(request: Request):
+        return await handler.create_job(request)
+
+    @app.get("/jobs/{job_id}")
+    async def status(job_id: str):
+        return await handler.get_job(job_id)
+
+    @app.get("/jobs/{job_id}/result")
+    async def result(job_id: str, format: str = "json"):
+        return await handler.get_result(job_id, format)
+
+    # Four bursts; the stub transcript names each by its amplitude
+    pattern, amps = [], []
+    for n in range(4):
+        pattern += [(1.0, False), (2.0, True)]
+        amps.append(1000 * (n + 1) + 500)
+    audio = _speech(pattern + [(1.0, False)], amps)
+
+    client = TestClient(app)
+    assert client.post("/jobs", content=b"not a wav").status_code == 400
+    created = client.post("/jobs?target_lang=fr&transcription_model=online", content=_wav(audio))
+    assert created.status_code == 200
+    job_id = created.json()["job_id"]
+    assert client.get(f"/jobs/{job_id}/result?format=xml").status_code in (400, 409)
+
+    deadline = time.monotonic() + 5
+    while (state := client.get(f"/jobs/{job_id}").json())["status"] in ("queued", "running"):
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+    assert state["status"] == "done"
+    assert state["progress"] == {"segments": 4, "transcribed": 4, "translated": 4}
+    assert peak[0] > 1  # segments were transcribed concurrently
+
+    segments = client.get(f"/jobs/{job_id}/result").json()["segments"]
+    assert [s["translation"] for s in segments] == ["fr:loud 1", "fr:loud 2", "fr:loud 3", "fr:loud 4"]
+    assert [s["start"] < s["end"] for s in segments] == [True] * 4
+    srt = client.get(f"/jobs/{job_id}/result?format=srt")
+    assert srt.headers["content-type"].startswith("application/x-subrip")
+    assert srt.text.startswith("1\n00:00:00,960 --> 00:00:03,008\nfr:loud 1\n\n2\n")  # 1024-sample frames
+    assert client.get("/jobs/job-99").status_code == 404
+
+
+def test_job_without_audio_fails_with_a_clear_error():
+    factory = MagicMock()
+    manager = JobManager(orchestrator_factory=factory)
+    job = BatchJob("job-1", {}, np.zeros(_RATE, dtype=np.int16), _RATE)
+    job._audio = None
+
+    manager._run(job)
+    assert job.status == ERROR and "audio" in job.error
+    factory.assert_not_called()
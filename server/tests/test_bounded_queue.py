@@ -0,0 +1,71 @@
+from src.utils.bounded_queue import BoundedQueue, DROP_OLDEST, MERGE, SHOW_ORIGINAL, clean_queue_policy
+
+
+def _drain(q):
+    out = []
+    while not q.empty():
+        out.append(q.get_nowait())
+    return out
+
+
+def test_drop_oldest_keeps_newest_items():
+    q = BoundedQueue(2, policy=DROP_OLDEST)
+    for i in range(4):
+        q.put(i)
+
+    assert _drain(q) == [2, 3]
+    assert q.stats()["dropped"] == 2
+    assert q.stats()["high_water"] == 2
+
+
+def test_merge_folds_into_newest_and_falls_back_to_drop():
+    q = BoundedQueue(2, policy=MERGE, merge_fn=lambda a, b: a + b if len(a + b) <= 2 else None)
+    q.put("a")
+    q.put("b")
+    q.put("c")   # merged into "b"
+    q.put("d")   # "bcd" too long → oldest dropped
+
+    assert _drain(q) == ["bc", "d"]
+    stats = q.stats()
+    assert stats["merged"] == 1 and stats["dropped"] == 1
+
+
+def test_show_original_evicts_through_hook():
+    shown = []
+    q = BoundedQueue(1, policy=SHOW_ORIGINAL, on_evict=shown.append)
+    q.put("first")
+    q.put("second")
+
+    assert shown == ["first"]
+    assert _drain(q) == ["second"]
+    assert q.stats()["evicted"] == 1
+
+
+def test_stop_sentinel_bypasses_limit():
+    q = BoundedQueue(1, policy=DROP_OLDEST)
+    q.put("x")
+    q.put(None)
+
+    assert _drain(q) == ["x", None]
+
+
+def test_on_wait_reports_queue_time_and_survives_eviction():
+    waits = []
+    q = BoundedQueue(2, policy=DROP_OLDEST, on_wait=waits.append)
+    for i in range(3):
+        q.put(i)     # 0 dropped — its arrival time must go with it
+    q.put(None)      # stop sentinel isn't timed
+
+    assert _drain(q) == [1, 2, None]
+    assert len(waits) == 2 and all(w >= 0 for w in waits)
+
+
+def test_invalid_client_queue_policy_is_ignored():
+    q = BoundedQueue(3, policy=MERGE)
+    q.configure("lots", "fastest")
+    assert q.limit == 3 and q.policy == MERGE
+
+    policy = {"audio_maxsize": "ten", "audio_policy": "merge", "translation_maxsize": "5",
+              "translation_policy": "fastest"}
+    assert clean_queue_policy(policy) == {"audio_policy": "merge", "translation_maxsize": 5}
+    assert clean_queue_policy("drop_oldest") == {}
@@ -0,0 +1,30 @@
+import numpy as np
+from src.audio.chunker import VadChunker
+
+_RATE = 16000
+_FRAME = 1024
+
+
+def _frames(samples):
+    for i in range(0, len(samples), _FRAME):
+        yield samples[i:i + _FRAME]
+
+
+def test_vad_chunker_flushes_speech_early_on_silence():
+    rng = np.random.default_rng(0)
+    speech = (rng.standard_normal(2 * _RATE) * 3000).astype(np.int16)
+    silence = np.zeros(_RATE, dtype=np.int16)
+    chunker = VadChunker(_RATE, chunk_duration=5.0)
+
+    chunks = [c for f in _frames(np.concatenate([speech, silence])) if (c := chunker.push(f)) is not None]
+    assert len(chunks) == 1
+    assert 2 * _RATE < len(chunks[0]) < 4 * _RATE  # before the 5 s time limit
+    assert not chunker.first_chunk_pending
+
+
+def test_vad_chunker_discards_silence_only_buffers():
+    chunker = VadChunker(_RATE, chunk_duration=1.0)
+    chunks = [chunker.push(f) for f in _frames(np.full(3 * _RATE, 20, dtype=np.int16))]
+    assert all(c is None for c in chunks)
+    assert chunker.flush() is None
+    assert chunker.first_chunk_pending
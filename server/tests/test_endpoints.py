@@ -0,0 +1,18 @@
+from src.models.translation import LlamaModel, MyMemoryModel, RivaNMTModel
+from src.utils.endpoints import grpc_target
+
+
+def test_engines_use_endpoint_overrides(monkeypatch):
+    monkeypatch.setenv("OMNI_BRIDGE_RIVA_URL", "grpc://127.0.0.1:8812")
+    monkeypatch.setenv("OMNI_BRIDGE_MYMEMORY_URL", "http://127.0.0.1:8811/get")
+
+    nmt = RivaNMTModel("")  # no key: nothing connects
+    assert (nmt.uri, nmt.use_ssl) == ("127.0.0.1:8812", False)
+    assert MyMemoryModel().base_url == "http://127.0.0.1:8811/get"
+    assert MyMemoryModel(base_url="http://explicit/get").base_url == "http://explicit/get"
+    assert LlamaModel("").base_url == LlamaModel.BASE_URL
+
+
+def test_grpc_target_defaults_to_tls():
+    assert grpc_target("grpc.nvcf.nvidia.com:443") == ("grpc.nvcf.nvidia.com:443", True)
+    assert grpc_target("grpcs://riva.internal:50051") == ("riva.internal:50051", True)
@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock
+
+from src.translation import EngineSelector, TranslationDispatcher
+
+
+def test_ewma_latency_and_errors_order_engines():
+    selector = EngineSelector(alpha=0.5, error_half_life_s=10.0)
+    for _ in range(5):
+        selector.record("google", "en", "fr", 400, ok=True, now=0.0)
+        selector.record("google_api", "en", "fr", 150, ok=True, now=0.0)
+    assert selector.rank(["google", "google_api"], "en", "fr") == ["google_api", "google"]
+
+    # Failing engine drops behind; its error rate decays while it is left alone
+    for _ in range(3):
+        selector.record("google_api", "en", "fr", None, ok=False, now=1.0)
+    assert selector.score("google_api", "en", "fr", now=1.0) > selector.score("google", "en", "fr", now=1.0)
+    assert selector.score("google_api", "en", "fr", now=60.0) < selector.score("google", "en", "fr", now=60.0)
+
+    # Unmeasured pair: the engine's average over other pairs, else the prior
+    assert selector.score("google_api", "en", "de") == 150
+    assert selector.rank(["llama", "riva-nmt"], "en", "de") == ["riva-nmt", "llama"]
+
+
+def test_low_quota_headroom_costs_score():
+    selector = EngineSelector()
+    selector.record("llama", "en", "ja", 300, ok=True)
+    selector.record("google", "en", "ja", 400, ok=True)
+    assert selector.rank(["llama", "google"], "en", "ja") == ["llama", "google"]
+    headroom = {"llama": 0.1, "google": None}.get
+    assert selector.rank(["llama", "google"], "en", "ja", headroom) == ["google", "llama"]
+
+    board = selector.leaderboard(headroom)
+    assert [(r["engine"], r["headroom"]) for r in board] == [("google", None), ("llama", 0.1)]
+
+
+def _engine(result, latency_ms=100):
+    engine = MagicMock()
+    engine.built = True
+    engine.is_ready.return_value = True
+    engine.supports_translation_pair.return_value = True
+    engine.translate.return_value = (result, {"engine": "stub", "latency_ms": latency_ms})
+    return engine
+
+
+def test_auto_routes_to_best_engine_and_falls_back_on_failure():
+    riva, llama = _engine("riva", latency_ms=200), _engine("llama", latency_ms=900)
+    google, mymemory = _engine("google", latency_ms=150), _engine("mymemory", latency_ms=700)
+    google_api = MagicMock(built=False)  # not built yet: never a candidate
+    selector = EngineSelector()
+    td = TranslationDispatcher(riva, llama, google, mymemory, google_api, selector=selector)
+    td.source_lang, td.target_lang, td.translation_model = "en", "de", "auto"
+
+    assert td.translate("hello")[0] == "riva"  # lowest prior latency
+
+    riva.translate.side_effect = RuntimeError("UNAVAILABLE")
+    result, stats = td.translate("hello")
+    assert result == "google" and stats["auto"] and stats["fallback_from"] == "riva-nmt"
+    assert selector.rank(["riva-nmt", "google"], "en", "de")[0] == "google"
+    google_api.translate.assert_not_called()
+
+    # Out of budget: skipped without a request
+    td.acquire_budget = lambda engine, text: 5.0 if engine == "google" else 0.0
+    assert td.translate("hello")[0] == "mymemory"  # riva still failing, then the next best
+
+
+def test_fixed_model_fallbacks_feed_the_scores():
+    riva, llama = _engine("riva"), _engine("llama", latency_ms=800)
+    riva.translate.side_effect = RuntimeError("UNAVAILABLE")
+    llama.translate.return_value = ("llama", {"engine": "llama-translate", "latency_ms": 800})
+    selector = EngineSelector()
+    td = TranslationDispatcher(riva, llama, _engine("g"), _engine("m"), None, selector=selector)
+    td.source_lang, td.target_lang, td.translation_model = "en", "de", "riva-nmt"
+
+    assert td.translate("hello")[0] == "llama"
+    board = {r["engine"]: r for r in selector.leaderboard()}
+    assert board["riva-nmt"]["errors"] == 1
+    assert board["llama"]["latency_ms"] == 800 and board["llama"]["errors"] == 0
+
+    # The Google fallback failing too echoes the source text: an error for both engines
+    td.translation_model = "mymemory"
+    td.mymemory.translate.return_value = (None, {"engine": "mymemory", "error": "quota"})
+    td.google_free.translate.return_value = (None, {"engine": "google-translate", "error": "429"})
+    assert td.translate("hello")[0] == "hello"
+    board = {r["engine"]: r for r in selector.leaderboard()}
+    assert board["mymemory"]["errors"] == 1 and board["google"]["errors"] == 1
@@ -0,0 +1,84 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from src.models.translation import GoogleModel, MyMemoryModel
+from src.models.translation.google_translation import _extract_result
+
+
+class _StubTranslateHandler(BaseHTTPRequestHandler):
+    """Serves MyMemory-style JSON on /get and Google-style HTML on /m."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # keep-alive, like the real endpoints
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        self.server.connections.add(self.client_address)  # type: ignore[attr-defined]
+        if url.path == "/get":
+            body = json.dumps({"responseData": {"translatedText": f"[{query['langpair'][0]}] {query['q'][0]}"}})
+            ctype = "application/json"
+        else:
+            body = f'<html><div class="result-container">{query["tl"][0]}: {query["q"][0]} &amp; co</div></html>'
+            ctype = "text/html"
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubTranslateHandler)
+    server.connections = set()  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    yield f"http://{host}:{port}", server
+    server.shutdown()
+    server.server_close()
+
+
+def test_mymemory_reuses_pooled_connection(stub_url):
+    base, server = stub_url
+    model = MyMemoryModel(base_url=f"{base}/get")
+
+    for _ in range(3):
+        result, stats = model.translate("hello", "en", "fr")
+
+    assert result == "[en|fr] hello"
+    assert "error" not in stats
+    # All three captions went over a single keep-alive connection
+    assert len(server.connections) == 1
+
+
+def test_google_free_parses_result_container(stub_url):
+    base, _ = stub_url
+    model = GoogleModel(base_url=f"{base}/m")
+
+    result, stats = model.translate("hello", "auto", "hi")
+
+    assert result == "hi: hello & co"
+    assert stats["engine"] == "google-translate"
+
+    # Names resolve to codes through deep-translator's public table; unknown languages never hit the wire
+    assert model.translate("hello", "english", "zh-CN")[0] == "zh-CN: hello & co"
+    result, stats = model.translate("hello", "en", "klingon")
+    assert result is None and "klingon" in stats["error"]
+
+
+def test_google_free_result_container_markup():
+    # Class matched as a whole token; nested divs do not cut the text short
+    page = ('<div class="result-container-old">no</div>'
+            '<div class="tl result-container" dir="ltr">Bonjour <div><b>le</b> monde</div> &lt;3</div>')
+    assert _extract_result(page) == "Bonjour le monde <3"
+    # Only the innermost container's text is returned
+    assert _extract_result('<div class="t0">outer <div class="result-container">inner &amp; co</div></div>') == "inner & co"
+    assert _extract_result("<div>nothing here</div>") is None
@@ -0,0 +1,52 @@
+import numpy as np
+from unittest.mock import MagicMock
+
+from src.asr import ASRDispatcher, LanguageTracker
+
+
+def test_locks_on_dominant_language_and_unlocks_on_change():
+    tracker = LanguageTracker(recheck_every=0)
+    assert tracker.observe("hi-IN") is None
+    tracker.observe("en", confidence=0.2)  # weak outlier
+    assert tracker.observe("hi") is None
+    assert tracker.observe("hi") == "hi" and tracker.language_for_chunk() == "hi"
+
+    # One disagreeing chunk is not enough, two in a row are
+    assert tracker.observe("ta") == "hi"
+    assert tracker.observe("ta") is None
+    # The old language's evidence is dropped: the new one locks after three chunks
+    assert tracker.observe("ta") == "ta"
+    assert tracker.snapshot()["locks"] == 2 and tracker.snapshot()["unlocks"] == 1
+
+    tracker.reset()
+    assert tracker.locked is None and tracker.observe("multi") is None
+
+
+def test_locked_session_rechecks_periodically():
+    tracker = LanguageTracker(recheck_every=3)
+    for _ in range(3):
+        tracker.observe("fr")
+    assert [tracker.language_for_chunk() for _ in range(3)] == ["fr", "fr", None]
+    # A disagreeing recheck makes the next chunk a recheck too
+    tracker.observe("de")
+    assert tracker.language_for_chunk() is None
+
+
+def test_dispatcher_forces_locked_language_on_whisper():
+    whisper = MagicMock()
+    texts = iter(["uno dos tres", "cuatro cinco seis", "siete ocho nueve", "diez once doce"])
+    whisper.transcribe.side_effect = lambda audio, rate, lang: (
+        next(texts), {"engine": "whisper-asr", "detected_lang": "es" if lang == "auto" else lang})
+    dispatcher = ASRDispatcher(MagicMock(), whisper, MagicMock(), sample_rate=16000)
+    dispatcher.transcription_model = "whisper-base"
+    audio = (np.sin(np.linspace(0, 100, 1600)) * 10000).astype(np.int16)
+
+    results = [dispatcher.process_chunk(audio, config=None) for _ in range(4)]
+    assert [c.args[2] for c in whisper.transcribe.call_args_list] == ["auto", "auto", "auto", "es"]
+    assert results[3]["asr_stats"]["detected_lang"] == "es" and results[3]["asr_stats"]["lang_locked"]
+    assert "lang_locked" not in results[1]["asr_stats"]
+
+    # A fixed source language bypasses the tracker
+    dispatcher.source_lang = "en"
+    whisper.transcribe.side_effect = lambda audio, rate, lang: ("hello there friend", {"detected_lang": lang})
+    assert dispatcher.process_chunk(audio, config=None)["asr_stats"] == {"detected_lang": "en"}
@@ -0,0 +1,26 @@
+from src.audio.levels import LevelStream
+
+
+def test_silence_and_small_changes_send_nothing():
+    stream = LevelStream(threshold=0.02, gate_open=0.06, gate_close=0.03)
+    # Noise under the gate never opens it
+    assert all(stream.sample(0.05, 0.0) is None for _ in range(20))
+    assert stream.idle
+
+    assert stream.sample(0.5, 0.0) == (0.5, 0.0, 0.5, 0.0)
+    assert stream.sample(0.51, 0.0) is None            # within threshold
+    assert stream.sample(0.04, 0.0) == (0.04, 0.0, 0.04, 0.0)  # gate stays open above gate_close
+    assert stream.sample(0.02, 0.0) == (0.0, 0.0, 0.0, 0.0)    # closes below it; zero is always sent
+    assert stream.idle
+    assert stream.sample(0.0, 0.0) is None
+    assert stream.sent == 3
+
+
+def test_batches_collect_sent_samples_with_offsets():
+    stream = LevelStream(batch_interval_s=0.5)
+    stream.sample(0.5, 0.2, 0.8, 0.3, now=10.0)
+    stream.sample(0.5, 0.2, 0.8, 0.3, now=10.1)  # unchanged, not batched
+    stream.sample(0.7, 0.2, 0.8, 0.3, now=10.2)
+    assert stream.take_batch(now=10.3) is None
+    assert stream.take_batch(now=10.5) == [[0, 0.5, 0.2, 0.8, 0.3], [200, 0.7, 0.2, 0.8, 0.3]]
+    assert stream.take_batch(now=11.5) is None
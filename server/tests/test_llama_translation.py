@@ -0,0 +1,117 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.models.translation import LlamaModel
+
+# Tokens the stub "model" emits, including a preamble split across tokens
+_TOKENS = ["Trans", "lation", ": ", "Bonjour ", "tout ", "le ", "monde, ", "comment ", "allez-", "vous ", "?"]
+
+
+class _StubChatHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible /v1/chat/completions endpoint."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(body)  # type: ignore[attr-defined]
+        if not body.get("stream"):
+            payload = json.dumps({
+                "id": "cmpl-1", "object": "chat.completion", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": "".join(_TOKENS)}}],
+                "usage": {"prompt_tokens": 50, "completion_tokens": 11, "total_tokens": 61},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+
+        def _send(obj):
+            self.wfile.write(f"data: {json.dumps(obj)}\n\n".encode())
+            self.wfile.flush()
+
+        base = {"id": "cmpl-1", "object": "chat.completion.chunk", "created": 0, "model": body["model"]}
+        for tok in _TOKENS:
+            _send({**base, "choices": [{"index": 0, "delta": {"content": tok}, "finish_reason": None}]})
+        _send({**base, "choices": [], "usage": {"prompt_tokens": 50, "completion_tokens": 11, "total_tokens": 61}})
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubChatHandler)
+    server.requests = []  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _model(server) -> LlamaModel:
+    host, port = server.server_address
+    return LlamaModel("stub-key", base_url=f"http://{host}:{port}/v1")
+
+
+def test_llama_streaming_emits_partials_without_preamble(stub_server):
+    llama = _model(stub_server)
+    partials = []
+
+    result, stats = llama.translate("Hello everyone, how are you?", "French", on_partial=partials.append)
+
+    assert result == "Bonjour tout le monde, comment allez-vous ?"
+    assert partials, "expected non-final partial captions"
+    assert all(not p.lower().startswith("translation") for p in partials)
+    assert all(result.startswith(p) for p in partials)
+    assert stats["streamed"] is True
+    assert stats["api_prompt_tokens"] == 50
+    assert stats["api_completion_tokens"] == 11
+    assert stub_server.requests[-1]["stream"] is True
+
+
+def test_llama_non_streaming_matches_streaming_result(stub_server):
+    llama = _model(stub_server)
+
+    result, stats = llama.translate("Hello everyone, how are you?", "French")
+
+    assert result == "Bonjour tout le monde, comment allez-vous ?"
+    assert "streamed" not in stats
+    assert not stub_server.requests[-1].get("stream")
+
+
+def test_llama_context_window_keeps_stable_prefix(stub_server):
+    llama = _model(stub_server)
+    llama.set_context_window(4)
+
+    for text in ["first caption", "second caption", "third caption"]:
+        llama.translate(text, "French")
+
+    first, second, third = (r["messages"] for r in stub_server.requests[-3:])
+    assert len(first) == 2
+    assert len(third) == 2 + 2 * 2
+    # Each request starts with the full previous request's prefix (system + history)
+    assert third[:len(second) - 1] == second[:-1]
+    assert third[0]["content"] == first[0]["content"]
+
+
+def test_conversation_window_trims_in_blocks():
+    from src.models.translation import ConversationWindow
+
+    window = ConversationWindow(max_pairs=4, token_budget=1000)
+    for i in range(5):
+        window.add(f"source {i}", f"target {i}", "fr")
+
+    # Exceeding 4 pairs evicts down to half capacity, keeping the newest
+    assert len(window) == 2
+    assert window.messages("fr")[0]["content"] == "source 3"
+    # Switching target language drops history for the old language
+    assert window.messages("de") == []
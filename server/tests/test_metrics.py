@@ -0,0 +1,31 @@
+from src.utils.metrics import LatencyHistogram, StageMetrics
+
+
+def test_histogram_percentiles_within_bucket_error():
+    hist = LatencyHistogram()
+    for ms in range(1, 1001):          # 1 ms .. 1 s, uniform
+        hist.record(ms / 1000)
+
+    snap = hist.snapshot()
+    assert snap["count"] == 1000
+    assert abs(snap["mean_ms"] - 500.5) < 0.01
+    for key, expected in (("p50_ms", 500), ("p95_ms", 950), ("p99_ms", 990)):
+        assert expected <= snap[key] <= expected * 1.125
+    assert snap["max_ms"] == 1000.0
+
+
+def test_prometheus_output_is_cumulative_per_stage_and_engine():
+    m = StageMetrics()
+    m.observe("asr_inference", 0.06, "riva-asr")
+    m.observe("asr_inference", 0.5, "riva-asr")
+    m.observe("ws_broadcast", 0.0002)
+
+    text = m.render_prometheus()
+    assert "# TYPE omnibridge_stage_latency_seconds histogram" in text
+    labels = 'stage="asr_inference",engine="riva-asr"'
+    assert f'omnibridge_stage_latency_seconds_bucket{{{labels},le="0.0512"}} 0' in text
+    assert f'omnibridge_stage_latency_seconds_bucket{{{labels},le="0.1024"}} 1' in text
+    assert f'omnibridge_stage_latency_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"omnibridge_stage_latency_seconds_count{{{labels}}} 2" in text
+    assert 'stage="ws_broadcast",engine=""' in text
+    assert set(m.snapshot()) == {"asr_inference[riva-asr]", "ws_broadcast"}
@@ -56,6 +56,10 @@ def test_orchestrator_api_key_update(orchestrator):
             
         mock_thread.side_effect = run_sync
 
+        # Built engines reload in place
+        for engine in (orchestrator.riva_asr, orchestrator.riva_nmt, orchestrator.google_api):
+            engine.resolve()
+
         # Update API keys
         orchestrator.set_api_keys(nvidia_key="new_nv_key", google_credentials={})
         
@@ -63,3 +67,60 @@ def test_orchestrator_api_key_update(orchestrator):
         orchestrator.riva_asr.reload.assert_called_with("new_nv_key", parakeet_fid="", canary_fid="")
         orchestrator.riva_nmt.reload.assert_called_with("new_nv_key", function_id="")
         orchestrator.google_api.reload.assert_called_with({})
+
+def test_orchestrator_builds_engines_lazily():
+    with patch("src.pipeline.orchestrator.RivaASRModel") as riva_asr, \
+         patch("src.pipeline.orchestrator.LlamaModel") as llama, \
+         patch("src.pipeline.orchestrator.RivaNMTModel") as riva_nmt, \
+         patch("src.pipeline.orchestrator.GoogleCloudTranslationModel"), \
+         patch("src.pipeline.orchestrator.SpeechRecognitionModel"), \
+         patch("src.pipeline.orchestrator.WhisperModel"):
+        orch = InferenceOrchestrator(nvidia_api_key="mock_nv_key", google_credentials={})
+        riva_asr.assert_not_called()
+        llama.assert_not_called()
+
+        # Neither status polls nor a Google-only session build engines
+        statuses = {s["name"]: s for s in orch.get_all_statuses()}
+        assert statuses["llama"]["status"] == "loading"
+        assert orch.prepare_session(16000, source_lang="en", target_lang="fr", translation_model="google",
+                                    llama_context_pairs=3)
+        assert orch._prewarm_thread is None
+        riva_asr.assert_not_called()
+        llama.assert_not_called()
+
+        orch.riva_asr.prewarm()
+        riva_asr.assert_called_once_with("mock_nv_key", parakeet_fid="", canary_fid="")
+        assert orch.riva_asr.built and not orch.llama.built
+
+        # The session's context window is applied when Llama is finally built
+        orch.llama.prewarm()
+        llama.assert_called_once_with("mock_nv_key", context_pairs=3)
+
+        # A key change reloads built engines and rebinds unbuilt ones without building them
+        with patch("threading.Thread", side_effect=lambda target, **kw: target() or MagicMock()):
+            orch.set_api_keys("new_nv_key", None)
+        riva_asr.return_value.reload.assert_called_once_with("new_nv_key", parakeet_fid="", canary_fid="")
+        llama.return_value.reload.assert_called_once_with("new_nv_key")
+        riva_nmt.assert_not_called()
+        assert not orch.riva_nmt.built and orch.translation_dispatcher.riva_nmt is orch.riva_nmt
+        orch.riva_nmt.prewarm()
+        riva_nmt.assert_called_once_with("new_nv_key", function_id="")
+
+
+def test_stop_stream_delivers_held_fragment(orchestrator):
+    import time
+    captions = []
+    orchestrator.translation_dispatcher.translate = lambda text, hint=None, on_partial=None, trace=None: (text.upper(), {"engine": "stub"})
+    orchestrator.start_stream(sample_rate=16000, source_lang="en", target_lang="fr", translation_model="google",
+                              sentence_max_wait_ms=60000, callback=lambda text, is_error, **kw: captions.append(text))
+    agg = orchestrator.sentence_aggregator
+    for text in ("Done.", "and then we"):
+        for item in agg.push({"text": text, "asr_stats": None, "created_at": time.time()}):
+            orchestrator._translation_queue.put(item)
+
+    orchestrator.stop_stream()
+    for _ in range(100):
+        if len(captions) == 2:
+            break
+        time.sleep(0.01)
+    assert captions == ["DONE.", "AND THEN WE"]
@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.utils.profiler import SamplingProfiler
+
+
+def _spin(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def workers():
+    stop = threading.Event()
+    threads = [threading.Thread(target=_spin, args=(stop,), name="BusyWorker", daemon=True),
+               threading.Thread(target=stop.wait, name="IdleWorker", daemon=True)]
+    for t in threads:
+        t.start()
+    yield
+    stop.set()
+    for t in threads:
+        t.join()
+
+
+def test_profile_splits_stacks_and_cpu_by_thread_name(workers):
+    profile = SamplingProfiler().run(0.3, interval_s=0.005, threads=["BusyWorker", "IdleWorker"])
+
+    threads = {t["name"]: t for t in profile.to_dict()["threads"]}
+    assert set(threads) == {"BusyWorker", "IdleWorker"}
+    assert threads["BusyWorker"]["cpu_s"] > threads["IdleWorker"]["cpu_s"]
+    assert threads["IdleWorker"]["idle_samples"] == threads["IdleWorker"]["samples"] > 0
+
+    lines = profile.collapsed().splitlines()
+    busy = [line for line in lines if line.startswith("BusyWorker;")]
+    # The leaf may be _spin or whatever it calls (Event.is_set, sum) at sample time
+    assert busy and all("test_profiler:_spin" in line.rsplit(" ", 1)[0].split(";") for line in busy)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == sum(t["samples"] for t in threads.values())
+
+    active = SamplingProfiler().run(0.05, threads=["BusyWorker", "IdleWorker"], include_idle=False)
+    assert all(stack.startswith("BusyWorker;") for stack in active.stacks)
+
+
+def test_one_profile_at_a_time():
+    profiler = SamplingProfiler()
+    runner = threading.Thread(target=profiler.run, args=(0.3,))
+    runner.start()
+    while not profiler.busy:
+        time.sleep(0.001)
+    with pytest.raises(RuntimeError):
+        profiler.run(0.01)
+    runner.join()
+
+
+def test_profile_endpoint_is_opt_in(monkeypatch, workers):
+    from flutter_server import app
+
+    client = TestClient(app)
+    monkeypatch.delenv("OMNI_BRIDGE_PROFILING", raising=False)
+    assert client.get("/debug/profile?seconds=0.05").status_code == 404
+
+    monkeypatch.setenv("OMNI_BRIDGE_PROFILING", "true")
+    assert client.get("/debug/profile?seconds=0.05&format=svg").status_code == 400
+    text = client.get("/debug/profile?seconds=0.1&interval_ms=2&threads=BusyWorker").text
+    assert text and all(line.startswith("BusyWorker;") for line in text.splitlines())
+    report = client.get("/debug/profile?seconds=0.1&threads=BusyWorker,IdleWorker&idle=false&format=json").json()
+    assert report["interval_ms"] == 5.0
+    assert {t["name"] for t in report["threads"]} == {"BusyWorker", "IdleWorker"}
+    assert all(stack.startswith("BusyWorker;") for stack in report["stacks"])
@@ -0,0 +1,107 @@
+import queue
+import time
+
+import numpy as np
+from unittest.mock import patch
+
+from src.pipeline.rate_limiter import RateLimiter, TokenBucket
+
+
+def test_token_bucket_delay_and_refill():
+    bucket = TokenBucket(per_minute=60)  # 1 token/s
+    now = time.monotonic()
+    assert bucket.delay_for(60, now) == 0.0
+    bucket.consume(60)
+    assert bucket.delay_for(1, now) > 0.9
+    assert bucket.delay_for(1, now + 1.0) == 0.0
+
+
+def test_rate_limiter_per_engine_and_key():
+    limiter = RateLimiter({"llama": {"rpm": 2, "tpm": 0}})
+
+    assert limiter.try_acquire("llama", "key-a") == 0.0
+    assert limiter.try_acquire("llama", "key-a") == 0.0
+    assert limiter.try_acquire("llama", "key-a") > 0
+    # A different API key has its own bucket; unlimited engines never wait
+    assert limiter.try_acquire("llama", "key-b") == 0.0
+    assert limiter.try_acquire("google", "") == 0.0
+    assert limiter.get_status()["throttled"] == {"llama": 1}
+
+
+def test_rate_limiter_tpm_budget():
+    limiter = RateLimiter({"mymemory": {"rpm": 0, "tpm": 100}})
+
+    assert limiter.try_acquire("mymemory", tokens=80) == 0.0
+    assert limiter.try_acquire("mymemory", tokens=80) > 0
+
+
+def test_rate_limiter_ignores_non_numeric_limits():
+    limiter = RateLimiter({"llama": {"rpm": 2, "tpm": 0}})
+
+    applied = limiter.configure({"llama": {"rpm": "abc", "tpm": "500"}, "bad": 3})
+    assert applied == {"llama": {"rpm": 2, "tpm": 500}}
+    assert limiter.limits()["llama"] == {"rpm": 2, "tpm": 500}
+
+    limiter.reset()
+    assert limiter.limits()["llama"] == {"rpm": 40, "tpm": 0}
+
+
+def test_orchestrator_merges_captions_while_throttled():
+    with patch("src.pipeline.orchestrator.RivaASRModel"), \
+         patch("src.pipeline.orchestrator.RivaNMTModel"), \
+         patch("src.pipeline.orchestrator.LlamaModel"), \
+         patch("src.pipeline.orchestrator.GoogleModel"), \
+         patch("src.pipeline.orchestrator.GoogleCloudTranslationModel"), \
+         patch("src.pipeline.orchestrator.MyMemoryModel"), \
+         patch("src.pipeline.orchestrator.SpeechRecognitionModel"), \
+         patch("src.pipeline.orchestrator.WhisperModel"):
+        from src.pipeline import InferenceOrchestrator
+        from src.pipeline.orchestrator import _merge_captions
+        orch = InferenceOrchestrator(nvidia_api_key="k")
+
+    orch.is_running = True
+    orch.rate_limiter.configure({"mymemory": {"rpm": 60, "tpm": 0}})
+    for _ in range(60):
+        orch.rate_limiter.try_acquire("mymemory")  # exhaust the bucket
+
+    q: queue.Queue = queue.Queue()
+    q.put({"text": "world", "asr_stats": {"input_tokens": 5}, "created_at": 2.0})
+    first = {"text": "hello", "asr_stats": {"input_tokens": 5}, "created_at": 1.0}
+    merged, waited_ms = orch._await_budget(
+        "mymemory", first, q,
+        cost=lambda c: 0,
+        merge=_merge_captions,
+        is_full=lambda c: False,
+    )
+
+    assert merged["text"] == "hello world"
+    assert merged["asr_stats"]["input_tokens"] == 10
+    assert merged["created_at"] == 1.0
+    assert merged["merged"] == 2
+    assert waited_ms > 0
+
+
+def test_merge_audio_chunks():
+    from src.pipeline.orchestrator import _merge_audio
+
+    a = np.ones(10, dtype=np.int16)
+    b = np.zeros(5, dtype=np.int16).tobytes()
+    assert len(_merge_audio(a, b)) == 15
+
+
+def test_fallback_engine_pays_its_own_budget():
+    from unittest.mock import MagicMock
+    from src.translation import EngineSelector, TranslationDispatcher
+
+    limiter = RateLimiter({"riva-nmt": {"rpm": 10, "tpm": 0}, "llama": {"rpm": 1, "tpm": 0}})
+    riva, llama = MagicMock(), MagicMock()
+    riva.supports_translation_pair.return_value = True
+    riva.translate.side_effect = RuntimeError("UNAVAILABLE")
+    llama.translate.return_value = ("bonjour", {"engine": "llama-translate", "latency_ms": 300})
+    td = TranslationDispatcher(riva, llama, MagicMock(), MagicMock(), selector=EngineSelector())
+    td.source_lang, td.target_lang, td.translation_model = "en", "fr", "riva-nmt"
+    td.charge_budget = lambda engine, text: limiter.charge(engine, "k", 0)
+
+    assert limiter.try_acquire("riva-nmt", "k") == 0.0  # what the worker takes up front
+    assert td.translate("hello")[0] == "bonjour"
+    assert limiter.try_acquire("llama", "k") > 0
@@ -0,0 +1,73 @@
+import struct
+
+import numpy as np
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+from src.audio.remote import JitterBuffer, RemoteAudioSource
+from src.network.handlers import IngestHandler, ServerContext
+from src.network.ws_manager import ConnectionManager
+
+_RATE = 16000
+_FRAME = 320  # 20 ms
+
+
+def _frame(seq, samples):
+    return struct.pack("<I", seq) + samples.astype("<i2").tobytes()
+
+
+def _speech_then_silence(seconds_speech=2.0, seconds_silence=1.2):
+    t = np.arange(int(_RATE * seconds_speech)) / _RATE
+    speech = (3000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+    audio = np.concatenate([speech, np.zeros(int(_RATE * seconds_silence), dtype=np.int16)])
+    return [audio[i:i + _FRAME] for i in range(0, len(audio) - _FRAME + 1, _FRAME)]
+
+
+def test_jitter_buffer_reorders_and_gives_up_on_gaps():
+    jb = JitterBuffer(max_delay_frames=2)
+    assert jb.push(10, b"a") == [b"a"]
+    assert jb.push(12, b"c") == []           # 11 missing, wait
+    assert jb.push(11, b"b") == [b"b", b"c"]  # arrived in time
+    assert jb.push(14, b"e") == []
+    assert jb.push(15, b"f") == [None, b"e", b"f"]  # 13 given up after 2 later frames
+    assert jb.push(13, b"d") == [] and jb.late == 1
+    assert jb.lost == 1
+
+    assert jb.push(17, b"h") == []
+    assert jb.drain() == [None, b"h"] and jb.lost == 2
+    assert JitterBuffer().drain() == []
+
+
+def test_ingest_endpoint_chunks_reordered_lossy_stream_and_acks():
+    ctx = ServerContext(ConnectionManager())
+    source = RemoteAudioSource(sample_rate=_RATE, chunk_duration=3.0)
+    chunks = []
+    source.on_chunk = lambda chunk, trace: chunks.append(chunk)
+    source.start()
+    ctx.audio_capture, ctx.is_running = source, True
+
+    app = FastAPI()
+    handler = IngestHandler(ctx)
+
+    @app.websocket("/ingest")
+    async def ingest(websocket: WebSocket):
+        await handler.serve(websocket)
+
+    frames = _speech_then_silence()
+    order = list(range(len(frames)))
+    order[5], order[6] = order[6], order[5]  # one swap
+    del order[40]                            # one lost frame
+    acks = []
+    with TestClient(app).websocket_connect(f"/ingest?sample_rate={_RATE}&channels=1&codec=pcm16") as ws:
+        for n, seq in enumerate(order, 1):
+            ws.send_bytes(_frame(seq, frames[seq]))
+            if n % 10 == 0:
+                acks.append(ws.receive_json())
+        ws.send_json({"cmd": "end"})
+
+    assert len(chunks) == 1
+    assert 1.9 * _RATE <= len(chunks[0]) <= 3.2 * _RATE
+    assert all(a["type"] == "audio_ack" and a["window"] > 0 for a in acks)
+    assert acks[-1]["lost"] == 1 and acks[-1]["late"] == 0
+    assert source.stream is None
+    assert source.input_level == 0.0 and source.input_peak > 0  # silence now, speech peak still held
@@ -0,0 +1,81 @@
+import threading
+
+from src.pipeline.sentence_aggregator import SentenceAggregator
+
+
+def _item(text, t=0.0):
+    return {"text": text, "asr_stats": {"input_tokens": len(text), "latency_ms": 100}, "created_at": t}
+
+
+def test_fragments_are_joined_into_sentences():
+    agg = SentenceAggregator(max_wait_s=5.0)
+
+    assert [o["text"] for o in agg.push(_item("It was late.", 1.0))] == ["It was late."]
+    assert agg.push(_item("The meeting ran", 2.0)) == []
+    out = agg.push(_item("long. And then we", 3.0))
+
+    assert [o["text"] for o in out] == ["The meeting ran long."]
+    assert out[0]["created_at"] == 2.0
+    assert out[0]["asr_stats"]["input_tokens"] == len("The meeting ran") + len("long. And then we")
+    # Trailing fragment is held; its ASR usage was already counted
+    assert agg.flush()[0]["text"] == "And then we"
+
+
+def test_fragment_released_at_deadline():
+    agg = SentenceAggregator(max_wait_s=1.0)
+    agg.push(_item("Done."))
+
+    assert agg.push(_item("and then")) == []
+    assert agg.flush_due(now=0.0) == []
+    released = agg.flush_due(now=float("inf"))
+    assert [r["text"] for r in released] == ["and then"]
+
+
+def test_unpunctuated_engine_is_never_held():
+    agg = SentenceAggregator(max_wait_s=2.0)
+
+    out = agg.push(_item("no punctuation from this engine"))
+    assert [o["text"] for o in out] == ["no punctuation from this engine"]
+
+
+def test_disabled_passes_through():
+    agg = SentenceAggregator(max_wait_s=0)
+    agg.push(_item("Done."))
+    assert len(agg.push(_item("half a"))) == 1
+
+
+def test_segments_with_the_session_language():
+    agg = SentenceAggregator(max_wait_s=5.0)
+    agg.reset(language="hi")
+    agg.push(_item("ठीक है।"))
+
+    out = agg.push(_item("यह ठीक है। और फिर"))
+    assert [o["text"] for o in out] == ["यह ठीक है।"]
+    assert agg.flush()[0]["text"] == "और फिर"
+
+
+def test_concurrent_push_and_flush_lose_no_words():
+    agg = SentenceAggregator(max_wait_s=60.0)
+    agg.push(_item("Start."))
+    out, lock = [], threading.Lock()
+
+    def pusher():
+        for _ in range(50):
+            released = agg.push(_item("one two"))
+            with lock:
+                out.extend(released)
+
+    def flusher():
+        for _ in range(50):
+            released = agg.flush()
+            with lock:
+                out.extend(released)
+
+    threads = [threading.Thread(target=pusher) for _ in range(3)] + [threading.Thread(target=flusher)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    out.extend(agg.flush())
+
+    assert sum(len(o["text"].split()) for o in out) == 3 * 50 * 2
@@ -0,0 +1,43 @@
+import json
+
+import numpy as np
+import pytest
+from src.network import serialization
+from src.network.serialization import AUDIO_LEVELS, EncodedCache, encode
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson" and not serialization.HAS_ORJSON:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(serialization, "HAS_ORJSON", request.param == "orjson")
+    return request.param
+
+
+def test_encode_handles_numpy_and_protobuf(encoder):
+    from riva.client.proto import riva_nmt_pb2
+
+    response = riva_nmt_pb2.TranslateTextResponse(translations=[riva_nmt_pb2.Translation(text="salut")])
+    request = riva_nmt_pb2.TranslateTextRequest(texts=["a", "b"])
+    message = {"level": np.float32(0.5), "vram": np.int64(8192), "samples": np.arange(3),
+               "texts": request.texts, "response": response, "tags": ("x",), "text": "héllo"}
+
+    assert json.loads(encode(message)) == {
+        "level": 0.5, "vram": 8192, "samples": [0, 1, 2], "texts": ["a", "b"],
+        "response": {"translations": [{"text": "salut"}]}, "tags": ["x"], "text": "héllo",
+    }
+
+
+def test_frame_template_matches_encoder(encoder):
+    frame = AUDIO_LEVELS.render(0.25, np.float32(0.5), 0.75, 1.0)
+    assert json.loads(frame) == {"type": "audio_levels", "input_level": 0.25, "output_level": 0.5,
+                                 "input_peak": 0.75, "output_peak": 1.0}
+    assert AUDIO_LEVELS.render(0.1, 0.2, 0.3, 0.4) == encode(
+        {"type": "audio_levels", "input_level": 0.1, "output_level": 0.2, "input_peak": 0.3, "output_peak": 0.4})
+
+
+def test_encoded_cache_reencodes_only_on_change():
+    cache = EncodedCache()
+    first = cache.encode({"type": "model_status", "models": [{"name": "llama", "ready": True}]})
+    assert cache.encode({"type": "model_status", "models": [{"name": "llama", "ready": True}]}) is first
+    assert '"ready":false' in cache.encode({"type": "model_status", "models": [{"name": "llama", "ready": False}]})
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from src.pipeline import InferenceOrchestrator, ModelRegistry, SessionManager
+
+_MODEL_CLASSES = (
+    "RivaASRModel", "RivaNMTModel", "LlamaModel", "GoogleModel",
+    "GoogleCloudTranslationModel", "MyMemoryModel", "SpeechRecognitionModel", "WhisperModel",
+)
+
+
+def _patched_models():
+    # A fresh mock per construction, like real classes
+    return patch.multiple("src.pipeline.orchestrator", **{
+        name: MagicMock(side_effect=lambda *a, **kw: MagicMock()) for name in _MODEL_CLASSES
+    })
+
+
+def test_registry_shares_instances_and_closes_on_last_release():
+    registry = ModelRegistry()
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    key = registry.key("riva-asr", "secret-key", "fid")
+
+    a = registry.acquire(key, factory)
+    b = registry.acquire(key, factory)
+    assert a is b and factory.call_count == 1
+    assert "secret-key" not in str(registry.stats())
+
+    registry.release(key)
+    a.close.assert_not_called()
+    registry.release(key)
+    a.close.assert_called_once()
+    assert registry.refcount(key) == 0
+
+
+def test_orchestrators_share_riva_clients_per_credentials():
+    registry = ModelRegistry()
+    with _patched_models():
+        first = InferenceOrchestrator(nvidia_api_key="k1", registry=registry)
+        second = InferenceOrchestrator(nvidia_api_key="k1", registry=registry)
+        other = InferenceOrchestrator(nvidia_api_key="k2", registry=registry)
+
+    assert first.riva_asr.resolve() is second.riva_asr.resolve()
+    assert first.riva_asr.resolve() is not other.riva_asr.resolve()
+    assert first.llama.resolve() is not second.llama.resolve()  # per-session conversation window
+    first.close()
+    second.close()
+    assert registry.refcount(registry.key("riva-asr", "k1", "", "")) == 0
+
+
+def _stub_factory(**kwargs):
+    with _patched_models():
+        orch = InferenceOrchestrator(**kwargs)
+    orch.asr_dispatcher.process_chunk = lambda chunk, config, trace=None: {
+        "text": f"chunk {int(chunk[0])}", "asr_stats": None, "created_at": time.time()}
+    orch.translation_dispatcher.translate = (
+        lambda text, hint=None, on_partial=None, trace=None, _o=orch: (f"{_o.translation_dispatcher.target_lang}:{text}", {}))
+    return orch
+
+
+_CONFIG = {"source_lang": "en", "target_lang": "fr", "ai_engine": "google",
+           "transcription_model": "online", "translation_model": "google", "sentence_max_wait_ms": 0}
+
+
+def test_session_manager_fans_audio_out_to_each_language_pair():
+    captions = {}
+
+    def _callback(session_id):
+        return lambda text, is_error, **kw: captions.setdefault(session_id, []).append(text)
+
+    async def _run():
+        manager = SessionManager(max_sessions=2, orchestrator_factory=_stub_factory)
+        fr = await manager.open(_CONFIG, _callback)
+        de = await manager.open({**_CONFIG, "target_lang": "de"}, _callback)
+        with pytest.raises(RuntimeError):
+            await manager.open(_CONFIG, _callback)
+
+        manager.append_audio(np.full(1600, 7, dtype=np.int16))
+        for _ in range(100):
+            if len(captions) == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert len(manager.get_status()["sessions"]) == 2
+        manager.close_all()
+        return fr, de
+
+    fr, de = asyncio.run(_run())
+    assert captions[fr.session_id] == ["fr:chunk 7"]
+    assert captions[de.session_id] == ["de:chunk 7"]
+    assert not fr.orchestrator.is_running and not de.orchestrator.is_running
+
+
+def test_stream_kwargs_tolerates_bad_numeric_settings():
+    from src.pipeline.session_manager import stream_kwargs
+    config = {"source_lang": "en", "target_lang": "fr", "ai_engine": "llama", "transcription_model": "online",
+              "translation_model": "llama", "llama_context_pairs": "four", "sentence_max_wait_ms": None}
+    kwargs = stream_kwargs(config)
+    assert kwargs["llama_context_pairs"] == 0 and kwargs["sentence_max_wait_ms"] == 0
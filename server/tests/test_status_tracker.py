@@ -0,0 +1,71 @@
+import asyncio
+import json
+import threading
+
+from src.network.status_tracker import StatusTracker
+from src.network.ws_manager import ConnectionManager
+
+
+def _status(name, status="ready", progress=1.0):
+    return {"name": name, "status": status, "ready": status == "ready", "progress": progress}
+
+
+def test_update_reports_only_changed_and_removed_entries():
+    tracker = StatusTracker()
+    first = tracker.update([_status("riva-asr"), _status("whisper-base", "downloading", 10.0)])
+    assert first["version"] == 1 and len(first["changed"]) == 2
+    assert tracker.busy
+
+    assert tracker.update([_status("riva-asr"), _status("whisper-base", "downloading", 10.0)]) is None
+
+    delta = tracker.update([_status("whisper-base")])
+    assert delta == {"type": "model_status_delta", "version": 2, "base_version": 1,
+                     "changed": [_status("whisper-base")], "removed": ["riva-asr"]}
+    assert tracker.snapshot() == {"type": "model_status", "version": 2, "models": [_status("whisper-base")]}
+    assert not tracker.busy
+
+
+class _Client:
+    def __init__(self):
+        self.frames = []
+
+    async def send_text(self, text):
+        self.frames.append(json.loads(text))
+
+
+class _Orchestrator:
+    def __init__(self):
+        self.statuses = [_status("riva-asr", "loading", 0.0), _status("llama")]
+
+    def get_all_statuses(self):
+        return list(self.statuses)
+
+
+def test_delta_clients_get_deltas_and_others_full_lists_only_on_change():
+    async def _run():
+        manager = ConnectionManager()
+        orchestrator = _Orchestrator()
+        legacy, delta = _Client(), _Client()
+        manager.active_connections.update({legacy, delta})
+        await manager.send_status(delta, orchestrator, deltas=True)
+
+        for _ in range(3):  # idle polls send nothing
+            await manager.broadcast_status(orchestrator)
+
+        # An engine finishing its build in a worker thread wakes the loop
+        waiter = asyncio.ensure_future(manager.status.wait(5.0))
+        await asyncio.sleep(0)
+        orchestrator.statuses[0] = _status("riva-asr")
+        threading.Thread(target=manager.status.notify).start()
+        assert await waiter
+        await manager.broadcast_status(orchestrator)
+        await asyncio.sleep(0.01)
+        return legacy, delta
+
+    legacy, delta = asyncio.run(_run())
+    # legacy: the change that happened while the delta client connected, then the build
+    assert [f["type"] for f in legacy.frames] == ["model_status", "model_status"]
+    assert legacy.frames[-1]["models"][0]["status"] == "ready"
+    assert [f["type"] for f in delta.frames] == ["model_status", "model_status_delta"]
+    assert delta.frames[1]["base_version"] == delta.frames[0]["version"]
+    assert delta.frames[1]["changed"] == [_status("riva-asr")]
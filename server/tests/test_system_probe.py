@@ -0,0 +1,45 @@
+import sys
+import time
+
+from src.utils import system_probe as probe_module
+from src.utils.system_probe import SystemProbe, probe_gpu
+
+
+def test_gpu_probe_does_not_import_torch(monkeypatch):
+    # torch "installed" but not loaded, a CUDA driver present, no NVML
+    monkeypatch.delitem(sys.modules, "torch", raising=False)
+    monkeypatch.setattr(probe_module.importlib.util, "find_spec", lambda name: object())
+    monkeypatch.setattr(probe_module, "HAS_NVML", False)
+    monkeypatch.setattr(probe_module, "_has_cuda_driver", lambda: True)
+
+    gpu = probe_gpu()
+    assert gpu["available"] is True and gpu["vram_used"] == 0.0
+    assert "torch" not in sys.modules
+
+
+def test_snapshot_is_cached_and_refreshed_in_background(monkeypatch):
+    calls = []
+    probe = SystemProbe(interval_s=0.05)
+    real_sample = probe._sample
+
+    def _counting_sample():
+        calls.append(time.monotonic())
+        return real_sample()
+
+    monkeypatch.setattr(probe, "_sample", _counting_sample)
+
+    first = probe.snapshot()
+    assert probe.snapshot() is first and len(calls) == 1  # readers never sample
+
+    probe.start()
+    try:
+        deadline = time.monotonic() + 2.0
+        while len(calls) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        probe.stop()
+    assert len(calls) >= 3
+    snap = probe.snapshot()
+    assert set(snap["gpu"]) == {"available", "name", "vram_used", "vram_total"}
+    if probe_module.HAS_PSUTIL:
+        assert snap["rss_mb"] > 0
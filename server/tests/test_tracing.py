@@ -0,0 +1,50 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+from src.asr import ASRDispatcher
+from src.translation import TranslationDispatcher
+from src.utils.tracing import Trace, TraceStore, merge_traces, traces
+
+
+def test_merged_traces_keep_absorbed_ids_and_forks_copy_spans():
+    a, b = Trace(), Trace()
+    a.step("capture_enqueue")
+    assert merge_traces(a, b) is a and a.merged == [b.trace_id]
+    assert b.status == "merged"
+
+    child = a.fork()
+    assert child.parent_id == a.trace_id and child.trace_id != a.trace_id
+    assert [s["name"] for s in child.spans] == ["capture_enqueue"]
+
+    store = TraceStore(maxlen=2)
+    for t in (a, b, child):
+        store.add(t)
+    assert [t["trace_id"] for t in store.recent()] == [child.trace_id, b.trace_id]
+
+
+def test_trace_spans_cover_asr_and_translation():
+    traces.clear()
+    asr = ASRDispatcher(MagicMock(), MagicMock(), MagicMock())
+    asr.google_free.transcribe.return_value = ("hello world.", {"engine": "google-asr"})
+    translation = TranslationDispatcher(MagicMock(), MagicMock(), MagicMock(), MagicMock())
+    translation.target_lang = "fr"
+    translation.google_free.translate.return_value = ("bonjour le monde.", {"engine": "google-translate"})
+
+    trace = Trace()
+    trace.step("capture_enqueue")
+    item = asr.process_chunk(np.full(1600, 4000, dtype=np.int16), None, trace=trace)
+    assert item["trace"] is trace
+    translation.translate(item["text"], "en", trace=trace)
+    trace.step("ws_broadcast")
+    trace.finish()
+
+    [recorded] = traces.recent(status="ok")
+    assert [s["name"] for s in recorded["spans"]] == [
+        "capture_enqueue", "asr_queue_wait", "asr", "translation", "ws_broadcast"]
+    assert recorded["spans"][3]["engine"] == "google-translate"
+    assert abs(sum(s["duration_ms"] for s in recorded["spans"]) - recorded["total_ms"]) < 0.1
+
+    # A chunk that yields no transcript still closes its trace, with the reason
+    silent = Trace()
+    assert asr.process_chunk(np.zeros(1600, dtype=np.int16), None, trace=silent) is None
+    assert traces.recent(status="silence")[0]["trace_id"] == silent.trace_id
@@ -0,0 +1,40 @@
+from src.asr import TranscriptDedup
+
+
+def test_near_repeats_are_dropped():
+    dedup = TranscriptDedup()
+    assert dedup.filter("We should ship the new build on Friday.", now=0.0)
+    # Re-punctuated, re-cased, one word different
+    assert dedup.filter("we should ship the new build on Friday", now=1.0) is None
+    assert dedup.filter("We should ship the new build on Monday.", now=2.0) is None
+    assert dedup.filter("Then we can plan the next release.", now=3.0)
+    assert dedup.dropped == 2
+
+    # Too short to shingle: only exact repeats count
+    assert dedup.filter("Thank you.", now=4.0)
+    assert dedup.filter("thank you!", now=5.0) is None
+    assert dedup.filter("Thank them.", now=6.0) == "Thank them."
+
+
+def test_overlap_with_previous_transcript_is_trimmed():
+    dedup = TranscriptDedup()
+    dedup.filter("The meeting is moved to the", now=0.0)
+    assert dedup.filter("to the, afternoon because of traffic", now=1.0) == "afternoon because of traffic"
+    assert dedup.trimmed == 1 and dedup.chars_saved == len("to the, ")
+
+    # A single shared word is not treated as overlap, and one word is always left
+    assert dedup.filter("traffic lights were out", now=2.0) == "traffic lights were out"
+    assert dedup.filter("were out", now=3.0) == "were out"
+
+
+def test_window_and_entry_limit():
+    dedup = TranscriptDedup(window_s=5.0, max_entries=2)
+    dedup.filter("one two three four", now=0.0)
+    assert dedup.filter("one two three four", now=6.0) == "one two three four"  # expired
+
+    dedup.filter("five six seven eight", now=7.0)
+    dedup.filter("nine ten eleven twelve", now=8.0)
+    assert dedup.filter("one two three four", now=9.0) == "one two three four"  # evicted
+
+    off = TranscriptDedup(window_s=0.0)
+    assert off.filter("same words again here", now=0.0) == off.filter("same words again here", now=0.1)
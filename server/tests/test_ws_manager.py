@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+from src.network.ws_manager import ConnectionManager
+
+
+class _Client:
+    def __init__(self, stall: bool = False):
+        self.frames = []
+        self.closed_with = None
+        self._release = asyncio.Event()
+        if not stall:
+            self._release.set()
+
+    async def send_text(self, text):
+        await self._release.wait()
+        self.frames.append(json.loads(text))
+
+    async def close(self, code=1000, reason=""):
+        self.closed_with = code
+
+
+def test_stalled_client_does_not_delay_others_and_is_dropped_when_lagging():
+    async def _run():
+        manager = ConnectionManager(send_queue_max=4)
+        fast, stalled = _Client(), _Client(stall=True)
+        manager.active_connections.update({fast, stalled})
+
+        for i in range(6):
+            await asyncio.wait_for(manager.broadcast({"type": "caption", "text": str(i)}), 0.1)
+        await asyncio.sleep(0.01)
+        return manager, fast, stalled
+
+    manager, fast, stalled = asyncio.run(_run())
+    assert [f["text"] for f in fast.frames] == ["0", "1", "2", "3", "4", "5"]
+    assert stalled not in manager.active_connections
+    assert stalled.closed_with == 1013
+    assert manager.get_stats()["dropped_lagging"] == 1
+
+
+def test_audio_levels_coalesce_while_queued():
+    async def _run():
+        manager = ConnectionManager()
+        client = _Client(stall=True)
+        manager.active_connections.add(client)
+        await manager.broadcast({"type": "caption", "text": "a"})
+        for level in (0.1, 0.2, 0.3):
+            await manager.broadcast({"type": "audio_levels", "input_level": level})
+        await manager.broadcast({"type": "caption", "text": "b"})
+        client._release.set()
+        await asyncio.sleep(0.01)
+        return client
+
+    client = asyncio.run(_run())
+    assert [f["type"] for f in client.frames] == ["caption", "audio_levels", "caption"]
+    assert client.frames[1]["input_level"] == 0.3
+
+
+def test_set_encoding_acks_in_old_codec_then_switches(monkeypatch):
+    from src.network import serialization, ws_manager
+    from src.network.router import CommandRouter
+
+    # A stand-in binary codec, so the test doesn't depend on msgpack/cbor2 being installed
+    binary = serialization.Codec("test-bin", True, lambda m: json.dumps(m).encode(), lambda f: json.loads(f))
+    monkeypatch.setitem(ws_manager.CODECS, "test-bin", binary)
+
+    class _BinaryClient(_Client):
+        async def send_bytes(self, data):
+            self.frames.append(("bytes", json.loads(data)))
+
+    async def _run():
+        manager = ConnectionManager()
+        client = _BinaryClient()
+        manager.active_connections.add(client)
+        await manager.set_encoding(client, {"cmd": "set_encoding", "encoding": "nope"})
+        await manager.set_encoding(client, {"cmd": "set_encoding", "encoding": "test-bin"})
+        await manager.broadcast({"type": "caption", "text": "hi"})
+
+        received = []
+        router = CommandRouter()
+
+        async def _record(ws, msg):
+            received.append(msg)
+
+        router.register("ping", _record)
+        await router.handle(client, b'{"cmd": "ping"}', manager.codec_for(client))
+        await asyncio.sleep(0.01)
+        return client, received
+
+    client, received = asyncio.run(_run())
+    assert client.frames[0]["type"] == "error"
+    assert client.frames[1] == {"type": "encoding", "encoding": "test-bin"}
+    assert client.frames[2] == ("bytes", {"type": "caption", "text": "hi"})
+    assert received == [{"cmd": "ping"}]